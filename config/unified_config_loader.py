@@ -211,7 +211,17 @@ class UnifiedConfigLoader:
             'dtype': 'int16',
             'buffer_size': 512,
             'max_memory_mb': 50,
-            'auto_device_selection': True
+            'auto_device_selection': True,
+            'jitter_buffer_enabled': True,
+            'jitter_initial_ms': 60,
+            'jitter_min_ms': 20,
+            'jitter_max_ms': 500,
+            'jitter_target_underrun_rate': 0.05,
+            'jitter_max_start_delay_ms': 400,
+            'backpressure_policy': 'block',
+            'seam_crossfade_ms': 2.5,
+            'stop_fade_ms': 5.0,
+            'output_backend': 'sounddevice'
         })
     
     def get_stt_config(self) -> Dict[str, Any]:
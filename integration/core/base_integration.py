@@ -10,6 +10,8 @@ from .event_bus import EventBus
 from .state_manager import ApplicationStateManager
 from .error_handler import ErrorHandler
 
+from modules.metrics import get_registry
+
 logger = logging.getLogger(__name__)
 
 
@@ -162,6 +164,10 @@ class BaseIntegration(ABC):
             "running": self._running
         }
     
+    def get_metrics(self) -> Dict[str, Any]:
+        """Срез метрик интеграции (пространство метрик = имя интеграции)"""
+        return get_registry(self.name).snapshot()
+    
     @property
     def is_initialized(self) -> bool:
         """Проверить, инициализирована ли интеграция"""
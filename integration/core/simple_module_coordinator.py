@@ -286,6 +286,18 @@ class SimpleModuleCoordinator:
                     simulate_min_delay_sec=vrec_cfg_raw.get('simulate_min_delay_sec', 1.0),
                     simulate_max_delay_sec=vrec_cfg_raw.get('simulate_max_delay_sec', 3.0),
                     language=language,
+                    streaming=bool(vrec_cfg_raw.get('streaming', False)),
+                    streaming_engine=str(vrec_cfg_raw.get('streaming_engine', 'vosk')),
+                    streaming_model_path=str(vrec_cfg_raw.get('streaming_model_path', '') or ''),
+                    backend=str(vrec_cfg_raw.get('backend', 'google')),
+                    backend_workers=int(vrec_cfg_raw.get('backend_workers', 2)),
+                    backend_timeout_sec=float(vrec_cfg_raw.get('backend_timeout_sec', 8.0)),
+                    backend_model_path=str(vrec_cfg_raw.get('backend_model_path', '') or ''),
+                    vad=bool(vrec_cfg_raw.get('vad', True)),
+                    vad_trim=bool(vrec_cfg_raw.get('vad_trim', True)),
+                    vad_energy_threshold=float(vrec_cfg_raw.get('vad_energy_threshold', 0.01)),
+                    warm_microphone=bool(vrec_cfg_raw.get('warm_microphone', False)),
+                    preroll_ms=int(vrec_cfg_raw.get('preroll_ms', 300)),
                 )
             except Exception:
                 # Fallback с централизованным языком
@@ -738,7 +750,7 @@ class SimpleModuleCoordinator:
         """Логирование результата захвата скриншота"""
         try:
             data = (event or {}).get("data", {})
-            path = data.get("image_path")
+            path = data.get("image_path") or data.get("blob_handle")
             width = data.get("width")
             height = data.get("height")
             size_bytes = data.get("size_bytes")
@@ -798,6 +810,19 @@ class SimpleModuleCoordinator:
             }
         }
 
+    def get_metrics(self) -> Dict[str, Any]:
+        """Получить метрики интеграций, которые их собирают"""
+        metrics = {}
+        for name, integration in self.integrations.items():
+            get_metrics = getattr(integration, 'get_metrics', None)
+            if get_metrics is None:
+                continue
+            try:
+                metrics[name] = get_metrics()
+            except Exception as e:
+                logger.debug(f"Failed to collect metrics from {name}: {e}")
+        return metrics
+
     def _start_background_loop(self):
         """Запускает отдельный поток с asyncio loop, чтобы не блокироваться на app.run()."""
         import asyncio, threading
@@ -10,9 +10,10 @@ GrpcClientIntegration — интеграция gRPC клиента с EventBus
 import asyncio
 import base64
 import logging
-from dataclasses import dataclass
+import time
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
 from integration.core.event_bus import EventBus, EventPriority
 from integration.core.state_manager import ApplicationStateManager
@@ -22,6 +23,10 @@ from config.unified_config_loader import UnifiedConfigLoader
 
 # Модульный gRPC клиент
 from modules.grpc_client.core.grpc_client import GrpcClient
+from modules.hardware_id import get_hardware_id_provider
+from modules.screenshot_capture.core.blob_store import get_screenshot_store
+from modules.speech_playback.utils.audio_codecs import supported_codecs
+from modules.metrics import get_registry, SampledLogger
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +39,25 @@ class GrpcClientIntegrationConfig:
     retry_delay_sec: float = 1.0
     server: str = "production"  # local|production|fallback (по умолчанию production для Azure)
     use_network_gate: bool = True
+    # Скриншот в StreamAudio: base64 (прежнее поле screenshot, понимают все серверы) |
+    # bytes (поле screenshot_data - только серверы с его поддержкой). StreamAudioV2 всегда передаёт байты
+    screenshot_transport: str = "base64"
+    # Прогрев канала до запроса: при старте и по нажатию клавиши (пока пользователь говорит)
+    warmup_on_start: bool = True
+    warmup_on_long_press: bool = True
+    # API запроса: v2 (StreamAudioV2 - вызов открывается при начале записи, скриншот
+    # уходит параллельно с распознаванием, промпт последним) | v1 (StreamAudio)
+    stream_api: str = "v2"
+    # Кодеки аудио ответа по предпочтению (объявляются только доступные декодеры; pcm - всегда)
+    audio_codecs: Tuple[str, ...] = ("flac", "pcm")
+    # Hedged подключение: серверы-кандидаты (по RTT); пусто - только server
+    hedge_servers: Tuple[str, ...] = ()
+    hedge_max_parallel: int = 2
+    # Прерывание: кроме отмены вызова - InterruptSession, чтобы сервер прекратил генерацию
+    server_interrupt: bool = True
+    interrupt_timeout_sec: float = 1.0
+    # Ожидание Hardware ID, если запрос пришёл раньше конца определения на холодном старте
+    hardware_id_wait_ms: int = 3000
 
 
 class GrpcClientIntegration:
@@ -62,6 +86,16 @@ class GrpcClientIntegration:
                     retry_delay_sec=float(cfg.get('retry_delay', 1.0)),
                     server=str(cfg.get('server', 'production')),
                     use_network_gate=bool(cfg.get('use_network_gate', True)),
+                    screenshot_transport=str(cfg.get('screenshot_transport', 'base64')),
+                    warmup_on_start=bool(cfg.get('warmup_on_start', True)),
+                    warmup_on_long_press=bool(cfg.get('warmup_on_long_press', True)),
+                    stream_api=str(cfg.get('stream_api', 'v2')),
+                    audio_codecs=tuple(cfg.get('audio_codecs') or ("flac", "pcm")),
+                    hedge_servers=tuple(cfg.get('hedge_servers') or ()),
+                    hedge_max_parallel=int(cfg.get('hedge_max_parallel', 2)),
+                    server_interrupt=bool(cfg.get('server_interrupt', True)),
+                    interrupt_timeout_sec=float(cfg.get('interrupt_timeout_sec', 1.0)),
+                    hardware_id_wait_ms=int(cfg.get('hardware_id_wait_ms', 3000)),
                 )
             except Exception as e:
                 logger.warning(f"⚠️ Ошибка загрузки конфигурации gRPC, используем defaults: {e}")
@@ -71,19 +105,47 @@ class GrpcClientIntegration:
         # gRPC клиент
         self._client: Optional[GrpcClient] = None
 
-        # Кэш hardware_id
+        # Кэш hardware_id (hardware.id_obtained); основной источник - мемоизированный ID процесса
         self._hardware_id: Optional[str] = None
-        # Ожидание ответа на hardware.id_request по request_id
-        self._pending_hwid: Dict[str, asyncio.Future] = {}
+        self._hwid_provider = get_hardware_id_provider()
 
         # Агрегатор данных по session_id
         self._sessions: Dict[Any, Dict[str, Any]] = {}
+        # Скриншоты приходят handle на байты в памяти (ScreenshotCaptureIntegration)
+        self._screenshots = get_screenshot_store()
         # Активные отправки: session_id -> asyncio.Task
         self._inflight: Dict[Any, asyncio.Task] = {}
+        # Открытые до промпта вызовы StreamAudioV2: session_id -> StreamAudioSession
+        self._streams: Dict[Any, Any] = {}
+        self._stream_opening: Dict[Any, asyncio.Task] = {}
+        # Прерванные отправки: session_id -> время прерывания (loop.time()), до закрытия потока
+        self._interrupted_at: Dict[Any, float] = {}
+        self._interrupt_tasks: set = set()
+
+        # Кодеки, которые клиент умеет декодировать (accept_codecs запроса)
+        self._accept_codecs = supported_codecs(list(self.config.audio_codecs))
 
         # Сеть
         self._network_connected: Optional[bool] = None
 
+        # Метрики потока ответов вместо INFO лога на каждый чанк
+        self._metrics = get_registry('grpc_client')
+        self._m_streams = self._metrics.counter('streams')
+        self._m_audio_chunks = self._metrics.counter('audio_chunks')
+        self._m_audio_bytes = self._metrics.counter('audio_bytes')
+        self._m_text_chunks = self._metrics.counter('text_chunks')
+        self._m_first_audio = self._metrics.histogram('time_to_first_audio_ms')
+        self._m_interarrival = self._metrics.histogram('chunk_interarrival_ms')
+        self._m_cancelled_calls = self._metrics.counter('cancelled_calls')
+        self._m_server_interrupts = self._metrics.counter('server_interrupts')
+        self._m_server_interrupt_failures = self._metrics.counter('server_interrupt_failures')
+        self._m_interrupt_to_closed = self._metrics.histogram('interrupt_to_stream_closed_ms')
+        self._m_hwid_cold_waits = self._metrics.counter('hardware_id_cold_waits')
+        self._m_hwid_wait = self._metrics.histogram('hardware_id_wait_ms')
+        self._chunk_log = SampledLogger(logger, every=10)
+
+        self._warmup_task: Optional[asyncio.Task] = None
+
         self._initialized = False
         self._running = False
 
@@ -111,18 +173,28 @@ class GrpcClientIntegration:
                     'connection_timeout': net.connection_check_interval,
                     'max_retry_attempts': self.config.max_retries,
                     'retry_delay': self.config.retry_delay_sec,
+                    'stream_v2': self.config.stream_api == "v2",
+                    'hedge': {
+                        'servers': list(self.config.hedge_servers),
+                        'max_parallel': self.config.hedge_max_parallel,
+                    },
                 }
             except Exception:
                 client_cfg = None
 
             self._client = GrpcClient(config=client_cfg)
+            # Hardware ID определяется в фоне уже сейчас - запрос прочитает его из памяти
+            self._hwid_provider.prefetch()
 
             # Подписки
             await self.event_bus.subscribe("voice.recognition_completed", self._on_voice_completed, EventPriority.HIGH)
+            await self.event_bus.subscribe("voice.recording_start", self._on_recording_start, EventPriority.MEDIUM)
+            await self.event_bus.subscribe("voice.recognition_failed", self._on_recognition_failed, EventPriority.MEDIUM)
+            await self.event_bus.subscribe("voice.recognition_timeout", self._on_recognition_failed, EventPriority.MEDIUM)
             await self.event_bus.subscribe("screenshot.captured", self._on_screenshot_captured, EventPriority.HIGH)
             await self.event_bus.subscribe("hardware.id_obtained", self._on_hardware_id, EventPriority.HIGH)
-            await self.event_bus.subscribe("hardware.id_response", self._on_hardware_id_response, EventPriority.HIGH)
             await self.event_bus.subscribe("keyboard.short_press", self._on_interrupt, EventPriority.CRITICAL)
+            await self.event_bus.subscribe("keyboard.long_press", self._on_long_press, EventPriority.MEDIUM)
             # УБРАНО: interrupt.request - обрабатывается централизованно в InterruptManagementIntegration
             # Адресная отмена активного запроса по session_id (или последний активный)
             try:
@@ -146,12 +218,11 @@ class GrpcClientIntegration:
         if self._running:
             return True
         
-        # Проверяем наличие hardware_id перед запуском
-        await self._check_hardware_id_availability()
-        
-        # Ленивая коннекция — подключимся при первой отправке
         self._running = True
-        logger.info("GrpcClientIntegration started (lazy connect)")
+        # Прогрев канала в фоне - первый запрос не платит за DNS/TCP/TLS/HTTP2
+        if self.config.warmup_on_start:
+            self._schedule_warmup("startup")
+        logger.info("GrpcClientIntegration started")
         return True
 
     async def stop(self) -> bool:
@@ -160,6 +231,12 @@ class GrpcClientIntegration:
             for sid, task in list(self._inflight.items()):
                 task.cancel()
             self._inflight.clear()
+            for sid in list(self._streams) + list(self._stream_opening):
+                self._discard_stream(sid)
+            for task in list(self._interrupt_tasks):
+                task.cancel()
+            if self._warmup_task and not self._warmup_task.done():
+                self._warmup_task.cancel()
             # Чистим клиент
             if self._client:
                 await self._client.cleanup()
@@ -187,13 +264,18 @@ class GrpcClientIntegration:
         try:
             data = (event or {}).get("data", {})
             sid = data.get("session_id")
+            handle = data.get("blob_handle")
             path = data.get("image_path")
-            if not sid or not path:
+            if not sid or not (handle or path):
                 return
             sess = self._sessions.setdefault(sid, {})
+            sess['screenshot_handle'] = handle
             sess['screenshot_path'] = path
             sess['width'] = data.get('width')
             sess['height'] = data.get('height')
+            sess['mime_type'] = data.get('mime_type') or "image/jpeg"
+            # Вызов уже открыт - скриншот уходит сразу, пока идёт распознавание
+            self._push_screenshot(sid)
             await self._maybe_send(sid)
         except Exception as e:
             await self._handle_error(e, where="grpc.on_screenshot_captured", severity="warning")
@@ -207,17 +289,6 @@ class GrpcClientIntegration:
         except Exception:
             pass
 
-    async def _on_hardware_id_response(self, event):
-        try:
-            data = (event or {}).get("data", {})
-            req_id = data.get("request_id")
-            uuid = data.get("uuid")
-            fut = self._pending_hwid.pop(req_id, None)
-            if fut and not fut.done():
-                fut.set_result(uuid)
-        except Exception:
-            pass
-
     async def _on_interrupt(self, event):
         try:
             # Отменяем активную задачу для текущей сессии, если известна
@@ -225,7 +296,10 @@ class GrpcClientIntegration:
             sid = None
             if self._sessions:
                 sid = list(self._sessions.keys())[-1]
+            if sid:
+                self._discard_stream(sid)
             if sid and sid in self._inflight:
+                self._abort_calls(sid, event)
                 task = self._inflight.pop(sid)
                 task.cancel()
                 await self.event_bus.publish("grpc.request_failed", {"session_id": sid, "error": "cancelled"})
@@ -249,6 +323,7 @@ class GrpcClientIntegration:
                 return
             task = self._inflight.pop(target_sid, None)
             if task and not task.done():
+                self._abort_calls(target_sid, event)
                 task.cancel()
                 await self.event_bus.publish("grpc.request_failed", {"session_id": target_sid, "error": "cancelled"})
             else:
@@ -256,6 +331,50 @@ class GrpcClientIntegration:
         except Exception as e:
             await self._handle_error(e, where="grpc.on_request_cancel", severity="warning")
 
+    async def _on_recording_start(self, event):
+        """Началась запись - открываем StreamAudioV2, чтобы скриншот ушёл до конца распознавания"""
+        try:
+            sid = ((event or {}).get("data", {}) or {}).get("session_id")
+            if sid is None or not self._use_stream_v2():
+                return
+            if self.config.use_network_gate and self._network_connected is False:
+                return
+            if sid in self._streams or sid in self._stream_opening:
+                return
+            # Незавершённые сессии (промпт так и не пришёл) закрываем
+            for stale in list(self._streams) + list(self._stream_opening):
+                self._discard_stream(stale)
+            self._stream_opening[sid] = asyncio.create_task(self._open_stream(sid))
+        except Exception as e:
+            await self._handle_error(e, where="grpc.on_recording_start", severity="warning")
+
+    async def _on_recognition_failed(self, event):
+        """Промпта не будет - закрываем открытый вызов сессии"""
+        sid = ((event or {}).get("data", {}) or {}).get("session_id")
+        if sid is not None:
+            self._discard_stream(sid)
+
+    async def _on_long_press(self, event):
+        """Пользователь начал говорить - прогреваем канал, пока идёт запись и распознавание"""
+        if self.config.warmup_on_long_press:
+            self._schedule_warmup("long_press")
+
+    def _schedule_warmup(self, reason: str):
+        """Запустить прогрев канала (не более одного одновременно)"""
+        if not self._client or (self._warmup_task and not self._warmup_task.done()):
+            return
+        if self.config.use_network_gate and self._network_connected is False:
+            return
+
+        async def _warmup():
+            try:
+                ok = await self._client.warm_up(self.config.server)
+                logger.debug(f"gRPC warm-up ({reason}): {'ok' if ok else 'failed'}")
+            except Exception as e:
+                logger.debug(f"gRPC warm-up ({reason}) failed: {e}")
+
+        self._warmup_task = asyncio.create_task(_warmup())
+
     async def _on_network_status_changed(self, event):
         try:
             data = (event or {}).get("data", {})
@@ -280,13 +399,14 @@ class GrpcClientIntegration:
 
         # Сеть: если явно оффлайн и включена сет.защелка — не отправляем
         if self.config.use_network_gate and self._network_connected is False:
+            self._discard_stream(session_id)
             await self.event_bus.publish("grpc.request_failed", {"session_id": session_id, "error": "offline"})
             return
 
         async def _delayed_send():
             try:
                 # Ждём скриншот небольшую паузу, если его ещё нет
-                if not sess.get('screenshot_path') and self.config.aggregate_timeout_sec > 0:
+                if not (sess.get('screenshot_handle') or sess.get('screenshot_path')) and self.config.aggregate_timeout_sec > 0:
                     try:
                         await asyncio.sleep(self.config.aggregate_timeout_sec)
                     except asyncio.CancelledError:
@@ -294,6 +414,11 @@ class GrpcClientIntegration:
                 await self._send(session_id)
             finally:
                 self._inflight.pop(session_id, None)
+                interrupted_at = self._interrupted_at.pop(session_id, None)
+                if interrupted_at is not None:
+                    closed_ms = (asyncio.get_running_loop().time() - interrupted_at) * 1000.0
+                    self._m_interrupt_to_closed.observe(closed_ms)
+                    logger.debug(f"gRPC stream closed {closed_ms:.1f}ms after interrupt (session {session_id})")
 
         task = asyncio.create_task(_delayed_send())
         self._inflight[session_id] = task
@@ -303,12 +428,10 @@ class GrpcClientIntegration:
         text = sess.get('text')
         if not text:
             return
-        # Получаем hardware_id
-        hwid = await self._await_hardware_id(timeout_ms=3000)
+        # Hardware ID из памяти; ожидание - только если определение на старте ещё идёт
+        hwid = self._get_hardware_id()
         if not hwid:
-            logger.warning(f"Hardware ID not available for session {session_id} - requesting explicitly")
-            await self.event_bus.publish("hardware.id_request", {"request_id": f"grpc-{session_id}", "wait_ready": True})
-            hwid = await self._await_hardware_id(timeout_ms=3000, request_id=f"grpc-{session_id}")
+            hwid = await self._await_cold_hardware_id(session_id)
         if not hwid:
             logger.error(f"No Hardware ID available for gRPC request - session {session_id}")
             await self.event_bus.publish("grpc.request_failed", {"session_id": session_id, "error": "no_hardware_id"})
@@ -316,37 +439,35 @@ class GrpcClientIntegration:
         
         logger.info(f"Using Hardware ID: {hwid[:8]}... for session {session_id}")
 
-        # Кодируем скриншот (если есть)
+        # StreamAudioV2, открытый при начале записи (скриншот мог уже уйти)
+        stream = await self._take_stream(session_id)
+
+        # Скриншот (если есть): байты из памяти по handle, base64 только для legacy транспорта
+        screenshot_bytes = None
         screenshot_b64 = None
         width = sess.get('width')
         height = sess.get('height')
-        path = sess.get('screenshot_path')
-        if path:
-            try:
-                p = Path(path)
-                if p.exists():
-                    data = p.read_bytes()
-                    screenshot_b64 = base64.b64encode(data).decode('ascii')
-            except Exception as e:
-                logger.debug(f"Failed to read screenshot: {e}")
+        if stream is None or not stream.has_screenshot:
+            screenshot_bytes = self._load_screenshot(sess)
+        if screenshot_bytes and stream is None and self.config.screenshot_transport == "base64":
+            screenshot_b64 = base64.b64encode(screenshot_bytes).decode('ascii')
+            screenshot_bytes = None
 
         # Публикуем старт
-        await self.event_bus.publish("grpc.request_started", {"session_id": session_id, "has_screenshot": bool(screenshot_b64)})
+        has_screenshot = bool(screenshot_bytes or screenshot_b64 or (stream is not None and stream.has_screenshot))
+        await self.event_bus.publish("grpc.request_started", {"session_id": session_id, "has_screenshot": has_screenshot})
 
-        # Ленивая коннекция к серверу
+        # Готовый канал (обычно уже прогрет при старте/нажатии клавиши)
         try:
-            if self._client and not self._client.is_connected():
-                logger.info(f"Connecting to gRPC server: {self.config.server}")
-                # Явно выбираем окружение из конфигурации интеграции (local|production|fallback)
-                success = await self._client.connect(self.config.server)
-                if success:
-                    logger.info(f"✅ gRPC connected to {self.config.server}")
-                else:
-                    logger.error(f"❌ Failed to connect to gRPC server: {self.config.server}")
-                    await self.event_bus.publish("grpc.request_failed", {"session_id": session_id, "error": "connect_failed"})
-                    return
+            if stream is not None:
+                connect_ms = 0.0
             else:
-                logger.info(f"gRPC already connected to {self.config.server}")
+                connect_ms = await self._client.ensure_ready(self.config.server) if self._client else None
+            if connect_ms is None:
+                logger.error(f"❌ Failed to connect to gRPC server: {self.config.server}")
+                await self.event_bus.publish("grpc.request_failed", {"session_id": session_id, "error": "connect_failed"})
+                return
+            logger.debug(f"gRPC channel ready for session {session_id}: waited {connect_ms:.1f}ms")
         except Exception as e:
             logger.error(f"gRPC connection error: {e}")
             await self._handle_error(e, where="grpc.connect", severity="warning")
@@ -358,25 +479,44 @@ class GrpcClientIntegration:
             logger.info(f"Starting gRPC stream for session {session_id} with prompt: '{text[:50]}...'")
             got_terminal = False
             chunk_count = 0
-            async for resp in self._client.stream_audio(
-                prompt=text,
-                screenshot_base64=screenshot_b64 or "",
-                screen_info={"width": width, "height": height},
-                hardware_id=hwid,
-            ):
+            self._m_streams.inc()
+            stream_started = time.perf_counter()
+            last_chunk_at = None
+            got_audio = False
+            if stream is not None:
+                if screenshot_bytes:
+                    stream.send_screenshot(screenshot_bytes, sess.get('mime_type'), width, height)
+                stream.send_prompt(text, hwid)
+                responses = stream.responses()
+            else:
+                responses = self._client.stream_audio(
+                    prompt=text,
+                    screenshot_base64=screenshot_b64 or "",
+                    screen_info={"width": width, "height": height},
+                    hardware_id=hwid,
+                    screenshot_bytes=screenshot_bytes,
+                    screenshot_mime_type=sess.get('mime_type'),
+                    accept_codecs=self._accept_codecs,
+                )
+            async for resp in responses:
                 chunk_count += 1
-                if chunk_count % 10 == 0:  # Логируем каждый 10-й чанк
-                    logger.debug(f"gRPC stream progress: {chunk_count} chunks received")
+                now = time.perf_counter()
+                if last_chunk_at is not None:
+                    self._m_interarrival.observe((now - last_chunk_at) * 1000.0)
+                last_chunk_at = now
                 # oneof content
                 if hasattr(resp, 'text_chunk') and resp.text_chunk:
-                    logger.info(f"gRPC received text_chunk len={len(resp.text_chunk)} for session {session_id}")
+                    self._m_text_chunks.inc()
+                    self._chunk_log.debug("gRPC received text_chunk len=%d for session %s (chunk #%d)",
+                                          len(resp.text_chunk), session_id, chunk_count)
                     await self.event_bus.publish("grpc.response.text", {"session_id": session_id, "text": resp.text_chunk})
                 elif hasattr(resp, 'audio_chunk') and resp.audio_chunk:
                     ch = resp.audio_chunk
-                    data = bytes(getattr(ch, 'audio_data', b""))
+                    data = getattr(ch, 'audio_data', b"")  # bytes protobuf - передаём без копии
                     dtype = getattr(ch, 'dtype', 'int16')
                     shape = list(getattr(ch, 'shape', []))
-                    logger.info(f"gRPC received audio_chunk bytes={len(data)} dtype={dtype} shape={shape} for session {session_id}")
+                    self._chunk_log.debug("gRPC received audio_chunk bytes=%d dtype=%s shape=%s for session %s (chunk #%d)",
+                                          len(data), dtype, shape, session_id, chunk_count)
                     
                     # Если получен пустой аудио чанк - это признак завершения потока
                     if len(data) == 0:
@@ -385,8 +525,17 @@ class GrpcClientIntegration:
                         got_terminal = True
                         break
                     
+                    if not got_audio:
+                        got_audio = True
+                        self._m_first_audio.observe((now - stream_started) * 1000.0)
+                    self._m_audio_chunks.inc()
+                    self._m_audio_bytes.inc(len(data))
+                    # publish ждёт обработчик плеера (add_audio_data_async): пока буфер
+                    # заполнен, следующее сообщение потока не читается - backpressure
                     await self.event_bus.publish("grpc.response.audio", {
                         "session_id": session_id,
+                        # pcm или сжатый кодек (декодирует speech_playback)
+                        "codec": getattr(ch, 'codec', '') or "pcm",
                         "dtype": dtype,
                         # Явно передаём метаданные формата, чтобы избежать искажений при воспроизведении
                         "sample_rate": getattr(ch, 'sample_rate', None),
@@ -414,31 +563,137 @@ class GrpcClientIntegration:
         except Exception as e:
             await self._handle_error(e, where="grpc.stream_audio", severity="warning")
             await self.event_bus.publish("grpc.request_failed", {"session_id": session_id, "error": str(e)})
+        finally:
+            if stream is not None:
+                stream.cancel()
+
+    # ---------------- Interrupt ----------------
+    def _abort_calls(self, session_id, event):
+        """
+        Прерывание отправки: отменить открытые вызовы, не дожидаясь задачи
+
+        task.cancel() закрывает вызов только когда задача дойдёт до точки
+        отмены, а сервер до того продолжает генерировать и слать аудио.
+        Отмена вызова сразу закрывает HTTP/2 поток, InterruptSession
+        параллельно останавливает генерацию на сервере.
+        """
+        loop = asyncio.get_running_loop()
+        self._interrupted_at[session_id] = (event or {}).get("timestamp") or loop.time()
+        if self._client is None:
+            return
+        cancelled = self._client.cancel_active_calls()
+        if cancelled:
+            self._m_cancelled_calls.inc(cancelled)
+        hwid = self._get_hardware_id()
+        if self.config.server_interrupt and hwid:
+            task = asyncio.create_task(self._interrupt_server(session_id, hwid))
+            self._interrupt_tasks.add(task)
+            task.add_done_callback(self._interrupt_tasks.discard)
+
+    async def _interrupt_server(self, session_id, hardware_id: str):
+        """InterruptSession в фоне: ошибка не мешает локальной отмене"""
+        try:
+            interrupted = await self._client.interrupt_session(
+                hardware_id, timeout=self.config.interrupt_timeout_sec
+            )
+            self._m_server_interrupts.inc()
+            logger.info(f"🛑 InterruptSession for session {session_id}: server interrupted {interrupted or 'nothing'}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._m_server_interrupt_failures.inc()
+            logger.warning(f"⚠️ InterruptSession failed for session {session_id}: {e}")
+
+    # ---------------- StreamAudioV2 ----------------
+    def _use_stream_v2(self) -> bool:
+        return (
+            self._client is not None
+            and self.config.stream_api == "v2"
+            and self._client.stream_v2_enabled
+        )
+
+    async def _open_stream(self, session_id):
+        """Открыть StreamAudioV2 сессии (канал обычно уже прогрет)"""
+        try:
+            stream = await self._client.open_stream(
+                session_id=session_id,
+                hardware_id=self._get_hardware_id(),
+                timeout=self.config.request_timeout_sec,
+                accept_codecs=self._accept_codecs,
+            )
+        except Exception as e:
+            logger.debug(f"StreamAudioV2 not opened for session {session_id}: {e}")
+            return
+        finally:
+            self._stream_opening.pop(session_id, None)
+        if stream is None:
+            return
+        self._streams[session_id] = stream
+        # Скриншот мог прийти раньше, чем открылся вызов
+        self._push_screenshot(session_id)
+
+    async def _take_stream(self, session_id):
+        """Забрать открытый StreamAudioV2 сессии (дождавшись открытия) или None"""
+        opening = self._stream_opening.get(session_id)
+        if opening is not None:
+            try:
+                await opening
+            except (asyncio.CancelledError, Exception):
+                pass
+        return self._streams.pop(session_id, None)
 
-    # ---------------- Utilities ----------------
-    async def _await_hardware_id(self, timeout_ms: int = 1500, request_id: Optional[str] = None) -> Optional[str]:
-        if self._hardware_id:
-            return self._hardware_id
-        # Если ждём конкретный request_id ответа
-        if request_id:
-            fut = asyncio.get_running_loop().create_future()
-            self._pending_hwid[request_id] = fut
+    def _push_screenshot(self, session_id):
+        """Отправить скриншот в открытый вызов, не дожидаясь промпта"""
+        stream = self._streams.get(session_id)
+        sess = self._sessions.get(session_id) or {}
+        if stream is None or stream.has_screenshot:
+            return
+        if not (sess.get('screenshot_handle') or sess.get('screenshot_path')):
+            return
+        data = self._load_screenshot(sess)
+        if data and stream.send_screenshot(data, sess.get('mime_type'), sess.get('width'), sess.get('height')):
+            logger.debug(f"Screenshot sent early via StreamAudioV2 for session {session_id} ({len(data)} bytes)")
+
+    def _discard_stream(self, session_id):
+        """Закрыть StreamAudioV2 сессии без промпта"""
+        opening = self._stream_opening.pop(session_id, None)
+        if opening is not None and not opening.done():
+            opening.cancel()
+        stream = self._streams.pop(session_id, None)
+        if stream is not None:
+            stream.cancel()
+
+    def _load_screenshot(self, sess: Dict[str, Any]) -> Optional[bytes]:
+        """Байты скриншота сессии: из памяти по handle, иначе из debug файла"""
+        blob = self._screenshots.take(sess.get('screenshot_handle'))
+        if blob is not None:
+            sess['mime_type'] = blob.mime_type
+            return blob.data
+        path = sess.get('screenshot_path')
+        if path:
             try:
-                return await asyncio.wait_for(fut, timeout=timeout_ms / 1000.0)
-            except asyncio.TimeoutError:
-                return None
-        # Иначе ждём событие hardware.id_obtained (кэш интеграции HardwareID заполнит _hardware_id)
-        try:
-            # Неблокирующее ожидание: опрашиваем несколько раз
-            deadline = asyncio.get_event_loop().time() + (timeout_ms / 1000.0)
-            while asyncio.get_event_loop().time() < deadline:
-                if self._hardware_id:
-                    return self._hardware_id
-                await asyncio.sleep(0.05)
-        except Exception:
-            pass
+                p = Path(path)
+                if p.exists():
+                    return p.read_bytes()
+            except Exception as e:
+                logger.debug(f"Failed to read screenshot: {e}")
         return None
 
+    # ---------------- Utilities ----------------
+    def _get_hardware_id(self) -> Optional[str]:
+        """Hardware ID без ожидания (None - ещё не определён)"""
+        return self._hardware_id or self._hwid_provider.uuid
+
+    async def _await_cold_hardware_id(self, session_id) -> Optional[str]:
+        """Холодный старт: дождаться уже идущего определения (новый поиск не запускается)"""
+        self._m_hwid_cold_waits.inc()
+        started = time.perf_counter()
+        hwid = await self._hwid_provider.wait_ready(timeout=self.config.hardware_id_wait_ms / 1000.0)
+        self._m_hwid_wait.observe_since(started)
+        logger.warning(f"Hardware ID not ready for session {session_id}: waited "
+                       f"{(time.perf_counter() - started) * 1000:.0f}ms ({'ok' if hwid else 'unavailable'})")
+        return hwid
+
     async def _handle_error(self, e: Exception, *, where: str, severity: str = "error"):
         if hasattr(self.error_handler, 'handle'):
             await self.error_handler.handle(
@@ -450,25 +705,21 @@ class GrpcClientIntegration:
         else:
             logger.error(f"gRPC integration error at {where}: {e}")
 
-    async def _check_hardware_id_availability(self):
-        """Проверяем доступность hardware_id перед запуском"""
-        if not self._hardware_id:
-            logger.warning("Hardware ID not available - requesting from hardware_id integration")
-            # Запрашиваем hardware_id через EventBus
-            await self.event_bus.publish("hardware.id_request", {"wait_ready": True})
-            # Ждем ответ (с таймаутом)
-            try:
-                # Ждем дольше для получения Hardware ID
-                await asyncio.sleep(0.5)
-                if not self._hardware_id:
-                    logger.warning("Hardware ID still not available - continuing without it")
-            except Exception as e:
-                logger.warning(f"Hardware ID check failed: {e}")
-
     def get_status(self) -> Dict[str, Any]:
         return {
             "initialized": self._initialized,
             "running": self._running,
-            "hardware_id_cached": bool(self._hardware_id),
+            "hardware_id_cached": bool(self._get_hardware_id()),
             "inflight": list(self._inflight.keys()),
         }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Срез метрик потока ответов (и метрик соединения клиента)"""
+        snapshot = self._metrics.snapshot()
+        if self._client is not None:
+            try:
+                snapshot['connection'] = asdict(self._client.get_metrics())
+                snapshot['server_latency'] = self._client.get_server_latency()
+            except Exception:
+                pass
+        return snapshot
@@ -2,8 +2,10 @@
 HardwareIdIntegration — тонкая обёртка над modules.hardware_id
 Задачи:
 - Получить стабильный hardware_id один раз на запуск и кэшировать в памяти
+  (общий для процесса HardwareIdProvider: определение начинается в
+  initialize(), потребители читают ID синхронно)
 - Отдавать ID по запросу мгновенно через EventBus
-- Поддерживать принудительное обновление без блокировки потребителей
+- Поддерживать принудительное и периодическое обновление без блокировки потребителей
 """
 
 import asyncio
@@ -18,7 +20,8 @@ from integration.core.state_manager import ApplicationStateManager
 from integration.core.error_handler import ErrorHandler
 
 # Модуль hardware_id
-from modules.hardware_id.core import HardwareIdentifier, HardwareIdResult, HardwareIdStatus
+from modules.hardware_id import get_hardware_id_provider
+from modules.hardware_id.core import HardwareIdResult
 
 # Конфиг (опционально используем unified_config для интеграционных параметров)
 from config.unified_config_loader import UnifiedConfigLoader
@@ -31,6 +34,8 @@ class HardwareIdIntegrationConfig:
     """Небольшая конфигурация уровня интеграции (не дублирует модуль)."""
     wait_ready_timeout_ms: int = 1500
     refresh_on_ttl_expired: bool = True
+    # Фоновое переопределение ID (кэш на диске, по истечении TTL - system_profiler); 0 - выкл
+    refresh_interval_sec: float = 3600.0
 
 
 class HardwareIdIntegration:
@@ -56,18 +61,16 @@ class HardwareIdIntegration:
                 config = HardwareIdIntegrationConfig(
                     wait_ready_timeout_ms=int(cfg.get('wait_ready_timeout_ms', 1500)),
                     refresh_on_ttl_expired=bool(cfg.get('refresh_on_ttl_expired', True)),
+                    refresh_interval_sec=float(cfg.get('refresh_interval_sec', 3600.0)),
                 )
             except Exception:
                 config = HardwareIdIntegrationConfig()
         self.config = config
 
-        # Модульный идентификатор
-        self._identifier: Optional[HardwareIdentifier] = None
-
-        # Памятный кэш результата
-        self._id_result: Optional[HardwareIdResult] = None
-        self._ready_event: asyncio.Event = asyncio.Event()
-        self._lock: asyncio.Lock = asyncio.Lock()
+        # Мемоизированный ID процесса (общий с GrpcClientIntegration)
+        self._provider = get_hardware_id_provider()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._refresh_task: Optional[asyncio.Task] = None
 
         self._initialized = False
         self._running = False
@@ -76,7 +79,10 @@ class HardwareIdIntegration:
     async def initialize(self) -> bool:
         try:
             logger.info("Initializing HardwareIdIntegration...")
-            self._identifier = HardwareIdentifier()
+            # Определение ID сразу в фоне - к первому запросу он уже в памяти
+            self._loop = asyncio.get_running_loop()
+            self._provider.add_listener(self._on_provider_result)
+            self._provider.prefetch()
 
             # Подписки на события
             await self.event_bus.subscribe("app.startup", self._on_app_startup, EventPriority.HIGH)
@@ -100,28 +106,33 @@ class HardwareIdIntegration:
         self._running = True
         logger.info("HardwareIdIntegration started")
         
-        # Принудительно публикуем Hardware ID при старте для gRPC клиента
-        try:
-            await self._ensure_id_ready()
-            if self._id_result:
-                await self._publish_obtained(self._id_result)
-                logger.info(f"Hardware ID published on startup: {self._id_result.uuid[:8]}...")
-        except Exception as e:
-            logger.warning(f"Failed to publish Hardware ID on startup: {e}")
+        # Публикуем Hardware ID, если уже определён; иначе его опубликует _on_provider_result
+        if self._id_result:
+            await self._publish_obtained(self._id_result)
+            logger.info(f"Hardware ID published on startup: {self._id_result.uuid[:8]}...")
+        if self.config.refresh_interval_sec > 0:
+            self._refresh_task = asyncio.create_task(self._refresh_loop())
         
         return True
 
     async def stop(self) -> bool:
         self._running = False
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
         return True
 
+    @property
+    def _id_result(self) -> Optional[HardwareIdResult]:
+        return self._provider.result
+
     # --------------------- Event Handlers ---------------------
     async def _on_app_startup(self, event):
-        """Первичное получение ID на старте приложения."""
+        """Первичное получение ID на старте приложения (не ждёт определения)."""
         try:
-            await self._ensure_id_ready()
             if self._id_result:
                 await self._publish_obtained(self._id_result)
+            else:
+                self._provider.prefetch()
         except Exception as e:
             await self._handle_error(e, where="hardware_id.on_app_startup")
 
@@ -140,15 +151,13 @@ class HardwareIdIntegration:
             wait_ready = data.get("wait_ready", True)
 
             if not self._id_result and wait_ready:
-                # Ждём готовности с таймаутом
-                try:
-                    await asyncio.wait_for(self._ensure_id_ready(), timeout=self.config.wait_ready_timeout_ms / 1000.0)
-                except asyncio.TimeoutError:
+                # Ждём уже идущее определение с таймаутом
+                if not await self._provider.wait_ready(timeout=self.config.wait_ready_timeout_ms / 1000.0):
                     logger.warning("hardware.id_request: timeout waiting for id ready")
 
-            # Если всё ещё нет — пытаемся немедленно получить без блокировки
+            # Если всё ещё нет — повторяем определение в фоне
             if not self._id_result:
-                asyncio.create_task(self._obtain_id_background(force=False))
+                self._provider.prefetch()
 
             # Публикуем ответ тем, что есть (может быть None)
             if self._id_result:
@@ -165,52 +174,32 @@ class HardwareIdIntegration:
     async def _on_id_refresh(self, event):
         """Принудительное обновление ID (в фоне)."""
         try:
-            asyncio.create_task(self._obtain_id_background(force=True))
+            self._provider.refresh(force=True)
         except Exception as e:
             await self._handle_error(e, where="hardware_id.on_id_refresh", severity="warning")
 
     # --------------------- Core logic ---------------------
-    async def _ensure_id_ready(self):
-        """Гарантирует, что ID получен и сохранён в памяти (однократно)."""
-        if self._id_result:
-            # Проверка TTL и фонового рефреша
-            if self.config.refresh_on_ttl_expired:
-                try:
-                    info = self._identifier.get_cache_info() if self._identifier else {}
-                    if info and isinstance(info, dict):
-                        ttl = info.get("ttl_remaining")
-                        is_valid = info.get("is_valid")
-                        if isinstance(ttl, int) and ttl <= 0 and is_valid is False:
-                            asyncio.create_task(self._obtain_id_background(force=False))
-                except Exception:
-                    pass
+    def _on_provider_result(self, res: HardwareIdResult):
+        """ID определён (фоновый поток провайдера) - публикуем в event loop"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
             return
-
-        async with self._lock:
-            if self._id_result:
-                return
-            await self._obtain_id(force=False)
-
-    async def _obtain_id(self, force: bool) -> Optional[HardwareIdResult]:
-        if not self._identifier:
-            return None
         try:
-            res = await asyncio.get_event_loop().run_in_executor(None, self._identifier.get_hardware_id, force)
-            self._id_result = res
-            self._ready_event.set()
-            logger.info(self._fmt_log(f"Hardware ID ready ({res.source}, cached={res.cached})"))
-            return res
-        except Exception as e:
-            await self._handle_error(e, where="hardware_id.obtain")
-            return None
+            loop.call_soon_threadsafe(lambda: asyncio.ensure_future(self._publish_obtained(res)))
+        except RuntimeError:
+            pass
 
-    async def _obtain_id_background(self, force: bool):
+    async def _refresh_loop(self):
+        """Периодическое обновление ID в фоне: запросы читают прежнее значение"""
         try:
-            res = await self._obtain_id(force=force)
-            if res:
-                await self._publish_obtained(res)
+            while self._running:
+                await asyncio.sleep(self.config.refresh_interval_sec)
+                if self.config.refresh_on_ttl_expired:
+                    self._provider.refresh(force=False)
+        except asyncio.CancelledError:
+            pass
         except Exception as e:
-            await self._handle_error(e, where="hardware_id.obtain_background", severity="warning")
+            await self._handle_error(e, where="hardware_id.refresh_loop", severity="warning")
 
     # --------------------- Publishing helpers ---------------------
     async def _publish_obtained(self, res: HardwareIdResult):
@@ -266,5 +255,6 @@ class HardwareIdIntegration:
             "source": getattr(res, 'source', None) if res else None,
             "cached": getattr(res, 'cached', None) if res else None,
             "status": (res.status.value if res and hasattr(res.status, 'value') else None),
+            "cold_start_ms": self._provider.cold_start_ms,
         }
 
@@ -22,6 +22,7 @@ from integration.core.error_handler import ErrorHandler
 
 # Модуль захвата скриншотов
 from modules.screenshot_capture.core.screenshot_capture import ScreenshotCapture
+from modules.screenshot_capture.core.blob_store import get_screenshot_store
 from modules.screenshot_capture.core.types import (
     ScreenshotConfig, ScreenshotFormat, ScreenshotQuality, ScreenshotRegion
 )
@@ -39,6 +40,10 @@ class ScreenshotCaptureIntegrationConfig:
     max_height: int = 1080
     quality: int = 85
     region: str = "full_screen"  # full_screen|primary_monitor|custom
+    # Скриншот передаётся gRPC интеграции в памяти (handle); файл - только для отладки
+    blob_budget_mb: float = 16.0
+    blob_max_items: int = 8
+    debug_write_files: bool = False
 
 
 class ScreenshotCaptureIntegration:
@@ -69,12 +74,15 @@ class ScreenshotCaptureIntegration:
         self._prepared_screens: Dict[float, Dict[str, Any]] = {}
         self._prepare_tasks: Dict[float, asyncio.Task] = {}
         self._enforce_permissions = self._detect_packaged_environment()
+        self._store = get_screenshot_store()
+        self._store.configure(max_bytes=int(self._config.blob_budget_mb * 1024 * 1024),
+                              max_items=self._config.blob_max_items)
 
     def _load_config(self) -> ScreenshotCaptureIntegrationConfig:
         try:
             loader = UnifiedConfigLoader()
             cfg = loader.get_screen_capture_config()
-            return ScreenshotCaptureIntegrationConfig(
+            config = ScreenshotCaptureIntegrationConfig(
                 format=str(cfg.get("format", "jpeg")).lower(),
                 max_width=int(cfg.get("max_width", 1920)),
                 max_height=int(cfg.get("max_height", 1080)),
@@ -82,7 +90,16 @@ class ScreenshotCaptureIntegration:
                 region=str(cfg.get("region", "full_screen")).lower() if isinstance(cfg.get("region", "full_screen"), str) else "full_screen",
             )
         except Exception:
-            return ScreenshotCaptureIntegrationConfig()
+            config = ScreenshotCaptureIntegrationConfig()
+        # Передача в памяти: integrations.screenshot_capture
+        try:
+            icfg = (UnifiedConfigLoader()._load_config().get('integrations', {}) or {}).get('screenshot_capture', {}) or {}
+            config.blob_budget_mb = float(icfg.get("blob_budget_mb", config.blob_budget_mb))
+            config.blob_max_items = int(icfg.get("blob_max_items", config.blob_max_items))
+            config.debug_write_files = bool(icfg.get("debug_write_files", config.debug_write_files))
+        except Exception:
+            pass
+        return config
 
     async def initialize(self) -> bool:
         try:
@@ -112,7 +129,7 @@ class ScreenshotCaptureIntegration:
 
             self._initialized = True
             logger.info("ScreenshotCaptureIntegration initialized")
-            # Плановая очистка старых файлов
+            # Плановая очистка старых файлов (прежние версии и debug режим)
             try:
                 asyncio.create_task(self._cleanup_old_screenshots())
             except Exception:
@@ -273,18 +290,15 @@ class ScreenshotCaptureIntegration:
             # Fallback: используем системную утилиту screencapture (macOS)
             ok, out_path, meta = await self._fallback_capture_cli()
             if ok and out_path:
-                await self.event_bus.publish("screenshot.captured", {
-                    "session_id": session_id,
-                    "image_path": str(out_path),
-                    "format": "jpeg",
-                    "width": meta.get("width"),
-                    "height": meta.get("height"),
-                    "size_bytes": meta.get("size_bytes"),
-                    "mime_type": "image/jpeg",
-                    "capture_time": 0.0,
-                })
-                self._captured_for_session = session_id
-                logger.info(f"Screenshot (CLI) captured: {out_path}")
+                # screencapture пишет только в файл - переносим байты в память
+                raw = out_path.read_bytes()
+                if not self._config.debug_write_files:
+                    with contextlib.suppress(Exception):
+                        out_path.unlink()
+                    out_path = None
+                await self._publish_captured(session_id, raw, "image/jpeg", meta.get("width"),
+                                             meta.get("height"), 0.0, out_path)
+                logger.info(f"Screenshot (CLI) captured: {len(raw)} bytes")
             else:
                 logger.info("ScreenshotCaptureIntegration: module unavailable, publishing screenshot.error(module_unavailable)")
                 await self.event_bus.publish("screenshot.error", {
@@ -478,37 +492,45 @@ class ScreenshotCaptureIntegration:
         await self._store_and_publish(session_id, result)
 
     async def _store_and_publish(self, session_id: Optional[float], result):
-        tmp_dir = Path(tempfile.gettempdir()) / "nexy_screenshots"
-        tmp_dir.mkdir(parents=True, exist_ok=True)
-        filename = f"shot_{int(asyncio.get_event_loop().time()*1000)}.jpg"
-        out_path = tmp_dir / filename
-
-        import base64
-        raw = base64.b64decode(result.data.base64_data)
-        out_path.write_bytes(raw)
-
-        size_bytes = None
-        try:
-            size_bytes = os.path.getsize(out_path)
-        except Exception:
-            pass
-
-        await self.event_bus.publish("screenshot.captured", {
+        # Байты JPEG от моста захвата - без base64 и без записи на диск
+        raw = result.data.get_bytes()
+        out_path = self._write_debug_file(raw) if self._config.debug_write_files else None
+        await self._publish_captured(session_id, raw, result.data.mime_type or "image/jpeg",
+                                     result.data.width, result.data.height, result.capture_time, out_path)
+        logger.info(f"Screenshot captured: {len(raw)} bytes (session {session_id})")
+
+    async def _publish_captured(self, session_id: Optional[float], raw: bytes, mime_type: str,
+                                width: Optional[int], height: Optional[int], capture_time: float,
+                                out_path: Optional[Path] = None):
+        """Положить скриншот в хранилище в памяти и опубликовать handle"""
+        handle = self._store.put(session_id, raw, mime_type=mime_type, width=width, height=height)
+        payload = {
             "session_id": session_id,
-            "image_path": str(out_path),
+            "blob_handle": handle,
             "format": "jpeg",
-            "width": result.data.width,
-            "height": result.data.height,
-            "size_bytes": size_bytes,
-            "mime_type": "image/jpeg",
-            "capture_time": result.capture_time,
-        })
+            "width": width,
+            "height": height,
+            "size_bytes": len(raw),
+            "mime_type": mime_type,
+            "capture_time": capture_time,
+        }
+        if out_path is not None:
+            payload["image_path"] = str(out_path)
+        await self.event_bus.publish("screenshot.captured", payload)
         self._captured_for_session = session_id
-        logger.info(f"Screenshot captured: {out_path}")
+
+    def _write_debug_file(self, raw: bytes) -> Optional[Path]:
+        """Debug sink: копия скриншота во временный каталог"""
         try:
+            tmp_dir = Path(tempfile.gettempdir()) / "nexy_screenshots"
+            tmp_dir.mkdir(parents=True, exist_ok=True)
+            out_path = tmp_dir / f"shot_{int(asyncio.get_event_loop().time()*1000)}.jpg"
+            out_path.write_bytes(raw)
             asyncio.create_task(self._cleanup_old_screenshots())
-        except Exception:
-            pass
+            return out_path
+        except Exception as e:
+            logger.debug(f"Screenshot debug file skipped: {e}")
+            return None
 
     async def _request_initial_permission_status(self):
         if not self._enforce_permissions:
@@ -18,13 +18,20 @@ from integration.core.state_manager import ApplicationStateManager, AppMode
 from integration.core.error_handler import ErrorHandler
 
 from modules.speech_playback.core.player import SequentialSpeechPlayer, PlayerConfig
+from modules.speech_playback.core.decoder_stage import StreamingDecoder
 from modules.speech_playback.core.state import PlaybackState
+from modules.speech_playback.utils.pcm_format import PcmFormatNegotiator
+from modules.speech_playback.utils.audio_codecs import is_compressed
+from modules.metrics import get_registry, SampledLogger
 
 # ЦЕНТРАЛИЗОВАННАЯ КОНФИГУРАЦИЯ АУДИО
 from config.unified_config_loader import unified_config
 
 logger = logging.getLogger(__name__)
 
+# Отрезок блокирующего ожидания в executor (между отрезками - отмена и проверки)
+_WAIT_STEP_SEC = 0.25
+
 
 class SpeechPlaybackIntegration:
     """Интеграция SequentialSpeechPlayer с EventBus"""
@@ -55,10 +62,22 @@ class SpeechPlaybackIntegration:
         self._current_session_id: Optional[Any] = None
         # Пометки отменённых сессий для фильтрации поздних чанков
         self._cancelled_sessions: set = set()
-        # Защита от WAV: пометка, что заголовок уже отброшен для сессии
-        self._wav_header_skipped: Dict[Any, bool] = {}
+        # Формат PCM по сессиям (WAV заголовок, порядок байт, float32) - решается на первом чанке
+        self._pcm_negotiator = PcmFormatNegotiator()
+        # Сжатые чанки (flac) декодируются в рабочем потоке и пишутся в буфер плеера оттуда
+        self._decoder = StreamingDecoder(self._on_decoded_pcm)
         # Основной event loop, используется для публикации из фоновых потоков
         self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Метрики аудио пути вместо INFO лога на каждый чанк
+        self._metrics = get_registry('speech_playback')
+        self._m_chunks_received = self._metrics.counter('audio_chunks_received')
+        self._m_bytes_received = self._metrics.counter('audio_bytes_received')
+        self._m_backpressure_events = self._metrics.counter('backpressure_events')
+        self._m_chunk_handling = self._metrics.histogram('chunk_handling_ms')
+        # Прерывание: время до тишины и аудио, пришедшее уже после отмены (должно быть 0)
+        self._m_interrupt_to_silence = self._metrics.histogram('interrupt_to_silence_ms')
+        self._m_chunks_after_cancel = self._metrics.counter('audio_chunks_after_cancel')
+        self._chunk_log = SampledLogger(logger)
 
     async def initialize(self) -> bool:
         try:
@@ -70,6 +89,7 @@ class SpeechPlaybackIntegration:
                 buffer_size=self.config['buffer_size'],
                 max_memory_mb=self.config['max_memory_mb'],
                 auto_device_selection=self.config['auto_device_selection'],
+                **PlayerConfig.tuning_kwargs(self.config),
             )
             self._player = SequentialSpeechPlayer(pc)
             # Коллбек завершения воспроизведения — сигнализируем в EventBus
@@ -123,9 +143,10 @@ class SpeechPlaybackIntegration:
 
     async def stop(self) -> bool:
         try:
+            self._decoder.stop()
             if self._player:
                 try:
-                    self._player.stop_playback()
+                    await self._player.stop_playback_async()
                     self._player.shutdown()
                 except Exception:
                     pass
@@ -137,16 +158,19 @@ class SpeechPlaybackIntegration:
 
     # -------- Event Handlers --------
     async def _on_audio_chunk(self, event):
+        started = time.perf_counter()
         try:
             data = (event or {}).get("data", {})
             sid = data.get("session_id")
             # Фильтрация поздних чанков после отмены
             if sid is not None and (sid in self._cancelled_sessions):
                 logger.debug(f"Ignoring audio chunk for cancelled sid={sid}")
+                self._m_chunks_after_cancel.inc()
                 return
             if sid is not None:
                 self._current_session_id = sid
             audio_bytes: bytes = data.get("bytes") or b""
+            codec: str = (data.get("codec") or 'pcm').lower()
             dtype: str = (data.get("dtype") or 'int16').lower()
             shape = data.get("shape") or []
             src_sample_rate: Optional[int] = data.get("sample_rate")
@@ -155,7 +179,10 @@ class SpeechPlaybackIntegration:
                 logger.debug(f"🔇 Пустой аудио чанк для сессии {sid}")
                 return
             
-            logger.info(f"🔊 Получен аудио чанк: {len(audio_bytes)} bytes, dtype={dtype}, shape={shape}, sr={src_sample_rate}, ch={src_channels} для сессии {sid}")
+            self._m_chunks_received.inc()
+            self._m_bytes_received.inc(len(audio_bytes))
+            self._chunk_log.debug("🔊 Получен аудио чанк: %d bytes, codec=%s, dtype=%s, shape=%s, sr=%s, ch=%s для сессии %s",
+                                  len(audio_bytes), codec, dtype, shape, src_sample_rate, src_channels, sid)
 
             # Инициализация плеера при первом чанке
             if self._player and not self._player.state_manager.is_playing and not self._player.state_manager.is_paused:
@@ -163,127 +190,60 @@ class SpeechPlaybackIntegration:
                     await self._handle_error(Exception("player_init_failed"), where="speech.player_init")
                     return
 
-            # Декодирование в numpy + диагностика формата
-            try:
-                audio_bytes_in = audio_bytes
-                # Если пришёл WAV (RIFF) — на первом чанке отбросим заголовок до data
-                try:
-                    if sid is not None and not self._wav_header_skipped.get(sid):
-                        b = audio_bytes
-                        if len(b) >= 12 and b[:4] == b'RIFF' and b[8:12] == b'WAVE':
-                            i = 12
-                            data_offset = None
-                            while i + 8 <= len(b):
-                                chunk_id = b[i:i+4]
-                                chunk_size = int.from_bytes(b[i+4:i+8], 'little', signed=False)
-                                i += 8
-                                if chunk_id == b'data':
-                                    data_offset = i
-                                    break
-                                i += chunk_size
-                            if data_offset is not None:
-                                audio_bytes_in = b[data_offset:]
-                                self._wav_header_skipped[sid] = True
-                        else:
-                            self._wav_header_skipped[sid] = True
-                except Exception:
-                    pass
-                # Определяем dtype с учётом возможной эндИанности
-                dt: Any
-                if dtype in ('float32', 'float'):
-                    dt = np.float32
-                elif dtype in ('int16_be', 'pcm_s16be'):
-                    dt = np.dtype('>i2')
-                elif dtype in ('int16_le', 'pcm_s16le'):
-                    dt = np.dtype('<i2')
-                elif dtype in ('int16', 'short'):
-                    # По умолчанию считаем little-endian, но проверим byteswap эвристикой
-                    dt = np.dtype('<i2')
-                else:
-                    dt = np.dtype('<i2')
-
-                arr = np.frombuffer(audio_bytes_in, dtype=dt)
-                # Если тип int16 без явной эндИанности — эвристика byteswap по пику сигнала
-                try:
-                    if dt.kind == 'i' and dt.itemsize == 2 and dtype in ('int16', 'short'):
-                        peak = float(np.max(np.abs(arr))) if arr.size else 0.0
-                        swapped = arr.byteswap().newbyteorder()
-                        peak_sw = float(np.max(np.abs(swapped))) if swapped.size else 0.0
-                        if peak_sw > peak * 1.8:
-                            arr = swapped
-                except Exception:
-                    pass
-
-                # Доп. эвристика: если dtype не указан/"int16", а данные выглядят как float32 PCM
-                # (длина кратна 4, а пик у int16-представления слишком мал),
-                # попробуем интерпретировать как float32 и передать в модуль для конвертации.
-                try:
-                    if dtype in ('int16', 'short') and (len(audio_bytes_in) % 4 == 0):
-                        peak_i16 = float(np.max(np.abs(arr))) if arr.size else 0.0
-                        arr_f32 = np.frombuffer(audio_bytes_in, dtype=np.float32)
-                        peak_f32 = float(np.max(np.abs(arr_f32))) if arr_f32.size else 0.0
-                        # Считаем «правдоподобным» float32, если значения в пределах [-1,1]
-                        looks_like_f32 = (peak_f32 > 0 and peak_f32 <= 1.2)
-                        looks_like_bad_i16 = (peak_i16 > 0 and peak_i16 < 256)
-                        if looks_like_f32 and looks_like_bad_i16:
-                            # ✅ ПРАВИЛЬНО: Передаем float32 в модуль, не конвертируем здесь
-                            arr = arr_f32
-                            dtype = 'float32'  # для логов ниже
-                except Exception:
-                    pass
-                if shape and len(shape) > 0:
-                    try:
-                        arr = arr.reshape(shape)
-                    except Exception:
-                        pass
-                # ✅ ПРАВИЛЬНО: Не конвертируем здесь - передаем сырые данные в модуль
-                # Модуль speech_playback сам выполнит конвертацию float32 → int16
-                # Прочее приведение формата (ресемплинг/каналы) выполняет плеер на основе metadata
+            # Сжатый чанк - в очередь декодера; PCM попадёт в буфер из рабочего потока
+            if is_compressed(codec):
+                await self._submit_encoded(sid, codec, audio_bytes)
+                self._m_chunk_handling.observe_since(started)
+                self._last_audio_ts = asyncio.get_running_loop().time()
+                return
 
-                # Диагностика: логируем основы формата (без спамма)
-                try:
-                    _min = float(arr.min()) if arr.size else 0.0
-                    _max = float(arr.max()) if arr.size else 0.0
-                    logger.info(
-                        f"🔍 audio_chunk: sid={sid}, in_dtype='{(data.get('dtype') or 'auto')}', dec_dtype={arr.dtype}, shape={getattr(arr,'shape',())}, min={_min:.3f}, max={_max:.3f}, bytes={len(audio_bytes_in)}"
-                    )
-                except Exception:
-                    pass
+            # Декодирование: формат согласуется на первом чанке сессии,
+            # далее np.frombuffer поверх memoryview payload - без копий
+            try:
+                arr, pcm_format = self._pcm_negotiator.decode(
+                    sid,
+                    audio_bytes,
+                    dtype_hint=dtype,
+                    sample_rate=src_sample_rate,
+                    channels=src_channels,
+                    shape=shape,
+                )
             except Exception as e:
                 await self._handle_error(e, where="speech.decode_audio", severity="warning")
                 return
+            if arr.size == 0:
+                return
 
             # Добавляем чанк и запускаем/возобновляем воспроизведение
             try:
                 if self._player:
-                    self._player.add_audio_data(
+                    # Первый чанк сессии - jitter buffer выбирает порог старта
+                    if not self._had_audio_for_session.get(sid):
+                        self._player.begin_stream(sid)
+                    # Backpressure: пока плеер отстаёт, ждём место в буфере - публикация
+                    # grpc.response.audio (и чтение gRPC потока) ждёт этот обработчик
+                    if not self._player.has_buffer_space(arr.nbytes):
+                        self._m_backpressure_events.inc()
+                    chunk_id = await self._player.add_audio_data_async(
                         arr,
                         priority=0,
                         metadata={
                             "session_id": sid,
-                            "sample_rate": src_sample_rate,
-                            "channels": src_channels,
+                            "sample_rate": pcm_format.sample_rate,
+                            "channels": pcm_format.channels,
                             "original_dtype": dtype,  # ✅ Передаем оригинальный тип для диагностики
                             "original_bytes": len(audio_bytes),  # ✅ Для диагностики
                         },
                     )
-                    # Определяем текущее состояние плеера и корректно управляем
-                    state = self._player.state_manager.get_state()
-                    if state == PlaybackState.PAUSED:
-                        # Если пауза — резюмируем
-                        self._player.resume_playback()
-                    elif state != PlaybackState.PLAYING:
-                        # IDLE/ERROR/STOPPING — пытаемся запустить воспроизведение
-                        # Повторная/идемпотентная инициализация безопасна
-                        if not self._player.initialize():
-                            await self._handle_error(Exception("player_init_failed"), where="speech.player_init")
-                            return
-                        if not self._player.start_playback():
-                            await self._handle_error(Exception("start_failed"), where="speech.start_playback")
-                            return
-                        await self.event_bus.publish("playback.started", {"session_id": sid})
+                    # Воспроизведение остановили, пока ждали место - чанк устарел
+                    if chunk_id is None or sid in self._cancelled_sessions:
+                        return
+                    if not await self._ensure_playing(sid):
+                        return
                 self._had_audio_for_session[sid] = True
 
+                self._m_chunk_handling.observe_since(started)
+
                 # Обновляем метку времени последнего аудио (НЕ запускаем таймер тишины при каждом чанке)
                 try:
                     self._last_audio_ts = asyncio.get_event_loop().time()
@@ -296,6 +256,72 @@ class SpeechPlaybackIntegration:
         except Exception as e:
             await self._handle_error(e, where="speech.on_audio_chunk", severity="warning")
 
+    async def _ensure_playing(self, sid) -> bool:
+        """Запустить/возобновить воспроизведение после добавления чанка"""
+        if not self._player or sid in self._cancelled_sessions:
+            return False
+        # Определяем текущее состояние плеера и корректно управляем
+        state = self._player.state_manager.get_state()
+        if state == PlaybackState.PAUSED:
+            # Если пауза — резюмируем
+            self._player.resume_playback()
+        elif state != PlaybackState.PLAYING:
+            # IDLE/ERROR/STOPPING — пытаемся запустить воспроизведение
+            # Повторная/идемпотентная инициализация безопасна
+            if not self._player.initialize():
+                await self._handle_error(Exception("player_init_failed"), where="speech.player_init")
+                return False
+            if not self._player.start_playback():
+                await self._handle_error(Exception("start_failed"), where="speech.start_playback")
+                return False
+            await self.event_bus.publish("playback.started", {"session_id": sid})
+        return True
+
+    async def _submit_encoded(self, sid, codec: str, payload: bytes):
+        """
+        Сжатый чанк в очередь декодера
+        
+        Пока очередь полна, ждём место (чтение gRPC тоже ждёт) столько, сколько
+        сессия активна: max_pending - граница памяти, сверх неё чанк не ставится.
+        """
+        if self._player and not self._had_audio_for_session.get(sid):
+            self._player.begin_stream(sid)
+        self._had_audio_for_session[sid] = True
+        if not self._decoder.has_space():
+            self._m_backpressure_events.inc()
+            loop = asyncio.get_running_loop()
+            while not self._decoder.has_space():
+                if sid in self._cancelled_sessions:
+                    return
+                freed = await loop.run_in_executor(None, self._decoder.wait_for_space, _WAIT_STEP_SEC)
+                if freed and not self._decoder.has_space():
+                    # Декодер остановлен (завершение работы) - чанк некуда ставить
+                    return
+            if sid in self._cancelled_sessions:
+                return
+        self._decoder.submit(sid, codec, payload, {"original_codec": codec, "original_bytes": len(payload)})
+
+    def _on_decoded_pcm(self, sid, pcm: np.ndarray, sample_rate: int, channels: int, metadata: Dict[str, Any]):
+        """PCM из декодера (рабочий поток): запись в буфер плеера, старт - в event loop"""
+        if not self._player:
+            return
+        # Поколение буфера - до проверки отмены: clear_all прерывания после неё
+        # (в том числе пока ждём место) отбрасывает чанк, а не пишет его в новую сессию
+        generation = self._player.chunk_buffer.generation
+        if sid in self._cancelled_sessions:
+            return
+        # Массив декодера больше никто не меняет - буферу не нужно его копировать
+        pcm.setflags(write=False)
+        # Буфер заполнен - ждём здесь, очередь декодера растёт и включает backpressure
+        chunk_id = self._player.add_audio_data(pcm, priority=0, metadata={
+            "session_id": sid,
+            "sample_rate": sample_rate,
+            "channels": channels,
+            **metadata,
+        }, generation=generation)
+        if chunk_id is not None and self._loop is not None and sid not in self._cancelled_sessions:
+            asyncio.run_coroutine_threadsafe(self._ensure_playing(sid), self._loop)
+
     async def _on_audio_device_switched(self, event):
         """Мягкое перестроение числа каналов при смене устройства вывода"""
         try:
@@ -327,6 +353,13 @@ class SpeechPlaybackIntegration:
             if sid is not None:
                 self._grpc_done_sessions[sid] = True
                 logger.info(f"SpeechPlayback: установлен флаг _grpc_done_sessions[{sid}] = True")
+                # Сжатые чанки ещё декодируются - конец потока только после последнего PCM
+                if self._decoder.pending(sid):
+                    await asyncio.get_running_loop().run_in_executor(None, self._decoder.drain, sid, 5.0)
+                self._decoder.forget(sid)
+            # Поток завершён - остаток играем без ожидания порога jitter buffer
+            if self._player:
+                self._player.end_stream(sid)
             # Запускаем таймер тишины для завершения воспроизведения
             if self._silence_task and not self._silence_task.done():
                 self._silence_task.cancel()
@@ -343,13 +376,15 @@ class SpeechPlaybackIntegration:
                 self._grpc_done_sessions[sid] = True
                 if err == 'cancelled':
                     self._cancelled_sessions.add(sid)
+                self._decoder.cancel(sid)
             if self._player:
                 try:
-                    self._player.stop_playback()
+                    await self._player.stop_playback_async()
                 except Exception:
                     pass
             await self.event_bus.publish("playback.failed", {"session_id": sid, "error": data.get("error")})
             self._finalized_sessions[sid] = True
+            self._pcm_negotiator.forget(sid)
             # Возврат в SLEEPING не инициируем, если ошибка — отмена (cancelled)
             if err != 'cancelled':
                 try:
@@ -374,6 +409,7 @@ class SpeechPlaybackIntegration:
             # Помечаем текущую сессию как отменённую (если есть)
             if self._current_session_id is not None:
                 self._cancelled_sessions.add(self._current_session_id)
+                self._decoder.cancel(self._current_session_id)
                 
             # Отменяем таймер тишины, если активен
             try:
@@ -384,7 +420,10 @@ class SpeechPlaybackIntegration:
             
             # Останавливаем воспроизведение только если реально играем/на паузе
             if self._player and self._player.state_manager.current_state in (PlaybackState.PLAYING, PlaybackState.PAUSED):
-                self._player.stop_playback()
+                await self._player.stop_playback_async()
+                # Поток вывода остановлен - тишина; отсчёт от исходного события прерывания,
+                # а не от playback.cancelled, переопубликованного нашими же обработчиками
+                self._observe_interrupt_to_silence(data.get("interrupted_at", event.get("timestamp")))
             
             # Очищаем все сессии
             self._finalized_sessions.clear()
@@ -407,7 +446,8 @@ class SpeechPlaybackIntegration:
                 "session_id": data.get("session_id"),
                 "reason": "legacy_interrupt",
                 "source": f"legacy_{event_type}",
-                "original_event": event_type
+                "original_event": event_type,
+                "interrupted_at": event.get("timestamp"),
             })
             
         except Exception as e:
@@ -471,7 +511,8 @@ class SpeechPlaybackIntegration:
                     "sample_rate": sample_rate,
                     "channels": channels
                 }
-                self._player.add_audio_data(audio_data, priority=priority, metadata=meta)
+                if await self._player.add_audio_data_async(audio_data, priority=priority, metadata=meta) is None:
+                    return
                 state = self._player.state_manager.get_state()
                 if state == PlaybackState.PAUSED:
                     self._player.resume_playback()
@@ -543,7 +584,8 @@ class SpeechPlaybackIntegration:
             # Добавляем данные и при необходимости запускаем воспроизведение
             try:
                 meta = {"kind": "signal", "pattern": pattern}
-                self._player.add_audio_data(a, priority=priority, metadata=meta)
+                if await self._player.add_audio_data_async(a, priority=priority, metadata=meta) is None:
+                    return
                 state = self._player.state_manager.get_state()
                 if state == PlaybackState.PAUSED:
                     self._player.resume_playback()
@@ -572,23 +614,36 @@ class SpeechPlaybackIntegration:
             except Exception:
                 pass
             try:
-                self._player.stop_playback()
+                was_playing = self._player.state_manager.current_state in (PlaybackState.PLAYING, PlaybackState.PAUSED)
+                await self._player.stop_playback_async()
+                if was_playing:
+                    # Тишина наступила здесь: playback.cancelled ниже уже не застанет воспроизведение
+                    self._observe_interrupt_to_silence(event.get("timestamp"))
             except Exception:
                 pass
             await self.event_bus.publish("playback.cancelled", {
                 "session_id": self._current_session_id,
-                "source": "grpc_cancel"
+                "source": "grpc_cancel",
+                "interrupted_at": event.get("timestamp"),
             })
         except Exception as e:
             await self._handle_error(e, where="speech.on_grpc_cancel", severity="warning")
 
     # -------- Utils --------
+    def _observe_interrupt_to_silence(self, interrupted_at: Optional[float]):
+        """Метрика прерывание -> тишина от времени события прерывания (время event loop)"""
+        if interrupted_at is not None:
+            self._m_interrupt_to_silence.observe(
+                (asyncio.get_running_loop().time() - interrupted_at) * 1000.0
+            )
+
     async def _finalize_on_silence(self, sid, timeout: float = 3.0):
         """Фолбэк: если после последнего чанка наступила тишина и плеер остановился — завершаем PROCESSING."""
         try:
             logger.info(f"SpeechPlayback: запуск _finalize_on_silence для сессии {sid}, timeout={timeout}s")
             start = self._last_audio_ts
-            await asyncio.sleep(timeout)
+            # Ждём события опустошения буфера плеера (не дольше timeout) вместо фиксированной паузы
+            await self._wait_player_drained(timeout, sid)
             logger.info(f"SpeechPlayback: _finalize_on_silence завершен для сессии {sid}")
             
             # Если не было новых чанков
@@ -612,7 +667,7 @@ class SpeechPlaybackIntegration:
                     # Корректно останавливаем воспроизведение и завершаем
                     try:
                         if self._player:
-                            self._player.stop_playback()
+                            await self._player.stop_playback_async()
                     except Exception:
                         pass
                     await self.event_bus.publish("playback.completed", {"session_id": sid})
@@ -637,7 +692,7 @@ class SpeechPlaybackIntegration:
                             logger.info(f"SpeechPlayback: _finalize_on_silence принудительно завершаем сессию {sid}")
                             try:
                                 if self._player:
-                                    self._player.stop_playback()
+                                    await self._player.stop_playback_async()
                             except Exception:
                                 pass
                             await self.event_bus.publish("playback.completed", {"session_id": sid})
@@ -653,13 +708,8 @@ class SpeechPlaybackIntegration:
                             # Для raw-сессий (welcome, signals) просто ждем пока доиграют естественным образом
                             # НЕТ ЛИМИТОВ - играем до конца
                             logger.info(f"SpeechPlayback: ожидаем естественного завершения воспроизведения для {sid}")
-                            while True:
-                                await asyncio.sleep(0.5)  # проверяем каждые 500мс
-                                # Проверяем завершилось ли естественным образом
-                                buf_check = (getattr(self._player, 'chunk_buffer', None) and self._player.chunk_buffer.is_empty)
-                                if buf_check or not self._player or not self._player.state_manager.is_playing:
-                                    logger.info(f"SpeechPlayback: воспроизведение завершено естественным образом")
-                                    break
+                            await self._wait_player_drained(None, sid)
+                            logger.info(f"SpeechPlayback: воспроизведение завершено естественным образом")
                             
                             await self.event_bus.publish("playback.completed", {"session_id": sid})
                             self._finalized_sessions[sid] = True
@@ -682,6 +732,37 @@ class SpeechPlaybackIntegration:
             # Тихо игнорируем ошибки фолбэка
             pass
 
+    async def _wait_player_drained(self, timeout: Optional[float], sid=None):
+        """
+        Дождаться опустошения буфера плеера
+        
+        Блокирующее ожидание - в executor отрезками по _WAIT_STEP_SEC:
+        поток executor'а не занят дольше отрезка после отмены корутины. Без
+        таймаута ожидание заканчивается и когда плеер не играет (пауза,
+        остановка) или сессия отменена - буфер тогда может не опустеть никогда.
+        """
+        if not self._player:
+            if timeout:
+                await asyncio.sleep(timeout)
+            return
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            step = _WAIT_STEP_SEC
+            if deadline is not None:
+                step = min(step, deadline - loop.time())
+                if step <= 0:
+                    return
+            if await loop.run_in_executor(None, self._player.wait_for_completion, step):
+                return
+            player = self._player
+            if deadline is None and (
+                player is None
+                or not player.state_manager.is_playing()
+                or (sid is not None and sid in self._cancelled_sessions)
+            ):
+                return
+
     def _on_player_completed(self):
         """Коллбек плеера: воспроизведение завершено (буфер пуст, поток завершён)."""
         try:
@@ -740,3 +821,10 @@ class SpeechPlaybackIntegration:
             "running": self._running,
             "player": (self._player.get_status() if self._player else {}),
         }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Срез метрик аудио пути (интеграция, плеер, буфер чанков)"""
+        snapshot = self._metrics.snapshot()
+        if self._player:
+            snapshot['realtime'] = self._player.get_realtime_stats()
+        return snapshot
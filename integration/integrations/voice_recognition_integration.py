@@ -5,7 +5,7 @@ VoiceRecognitionIntegration - координация распознавания
 
 import asyncio
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, replace
 from typing import Optional, Dict, Any
 import random
 
@@ -15,7 +15,9 @@ from integration.core.error_handler import ErrorHandler
 
 # Опциональная реальная реализация распознавания
 try:
-    from modules.voice_recognition import SpeechRecognizer, DEFAULT_RECOGNITION_CONFIG, RecognitionResult
+    from modules.voice_recognition import (
+        SpeechRecognizer, DEFAULT_RECOGNITION_CONFIG, RecognitionResult, RecognitionEventType
+    )
     _REAL_VOICE_AVAILABLE = True
 except Exception:
     # Зависимости могут отсутствовать; в этом случае используем только симуляцию
@@ -33,6 +35,22 @@ class VoiceRecognitionConfig:
     simulate_min_delay_sec: float = 1.0
     simulate_max_delay_sec: float = 3.0
     language: str = "en-US"
+    # Потоковое распознавание во время записи (voice.partial_result); движок недоступен - как раньше
+    streaming: bool = False
+    streaming_engine: str = "vosk"
+    streaming_model_path: str = ""
+    # Бэкенд распознавания записи: google | vosk | stub (пул потоков, таймаут вызова)
+    backend: str = "google"
+    backend_workers: int = 2
+    backend_timeout_sec: float = 8.0
+    backend_model_path: str = ""
+    # VAD: voice.activity во время записи, обрезка тишины перед распознаванием
+    vad: bool = True
+    vad_trim: bool = True
+    vad_energy_threshold: float = 0.01
+    # Тёплый микрофон: поток открыт между записями, запись начинается с pre-roll (индикатор микрофона горит всегда)
+    warm_microphone: bool = False
+    preroll_ms: int = 300
 
 
 class VoiceRecognitionIntegration:
@@ -54,6 +72,8 @@ class VoiceRecognitionIntegration:
         self._current_session_id: Optional[float] = None
         self._recording_active: bool = False
         self._recognition_task: Optional[asyncio.Task] = None
+        # Распознавание реальным бэкендом после отпускания клавиши
+        self._stop_task: Optional[asyncio.Task] = None
         self._initialized: bool = False
         self._running: bool = False
         # Реальный распознаватель (если доступен и симуляция отключена)
@@ -65,6 +85,8 @@ class VoiceRecognitionIntegration:
             await self.event_bus.subscribe("voice.recording_start", self._on_recording_start, EventPriority.HIGH)
             await self.event_bus.subscribe("voice.recording_stop", self._on_recording_stop, EventPriority.HIGH)
             await self.event_bus.subscribe("keyboard.short_press", self._on_cancel_request, EventPriority.CRITICAL)
+            # Тёплый микрофон: на long_press убеждаемся, что поток открыт (переоткрываем после потери устройства)
+            await self.event_bus.subscribe("keyboard.long_press", self._on_long_press, EventPriority.HIGH)
             # УБРАНО: interrupt.request - обрабатывается централизованно в InterruptManagementIntegration
             # Гарантированно закрываем прослушивание при выходе из LISTENING
             await self.event_bus.subscribe("app.mode_changed", self._on_app_mode_changed, EventPriority.MEDIUM)
@@ -73,7 +95,23 @@ class VoiceRecognitionIntegration:
             if not self.config.simulate and _REAL_VOICE_AVAILABLE:
                 try:
                     # ИСПОЛЬЗУЕМ ГОТОВУЮ КОНФИГУРАЦИЮ ИЗ МОДУЛЯ - тонкая интеграция
-                    self._recognizer = SpeechRecognizer(DEFAULT_RECOGNITION_CONFIG)
+                    self._recognizer = SpeechRecognizer(replace(
+                        DEFAULT_RECOGNITION_CONFIG,
+                        streaming=self.config.streaming,
+                        streaming_engine=self.config.streaming_engine,
+                        streaming_model_path=self.config.streaming_model_path,
+                        backend=self.config.backend,
+                        backend_workers=self.config.backend_workers,
+                        backend_timeout=self.config.backend_timeout_sec,
+                        backend_model_path=self.config.backend_model_path,
+                        vad_enabled=self.config.vad,
+                        vad_trim=self.config.vad_trim,
+                        vad_energy_threshold=self.config.vad_energy_threshold,
+                        warm_microphone=self.config.warm_microphone,
+                        preroll_ms=self.config.preroll_ms,
+                    ))
+                    self._recognizer.register_event_callback(RecognitionEventType.PARTIAL_RESULT, self._on_partial_result)
+                    self._recognizer.register_event_callback(RecognitionEventType.VOICE_ACTIVITY, self._on_voice_activity)
                     logger.info("VoiceRecognitionIntegration: real SpeechRecognizer initialized")
                 except Exception as e:
                     logger.warning(f"VoiceRecognitionIntegration: failed to init real recognizer, fallback to simulate. Error: {e}")
@@ -103,6 +141,8 @@ class VoiceRecognitionIntegration:
         
         # Проверяем разрешения микрофона перед запуском
         await self._check_microphone_permissions()
+        # Тёплый микрофон открываем заранее - первая запись без открытия устройства
+        self._ensure_warm_microphone()
         
         self._running = True
         logger.info("VoiceRecognitionIntegration started")
@@ -112,6 +152,9 @@ class VoiceRecognitionIntegration:
         try:
             self._running = False
             await self._cancel_recognition(reason="stopping")
+            await self._cancel_stop_task(reason="stopping")
+            if self._recognizer is not None:
+                self._recognizer.stop_warm_microphone()
             logger.info("VoiceRecognitionIntegration stopped")
             return True
         except Exception as e:
@@ -197,18 +240,58 @@ class VoiceRecognitionIntegration:
                         })
 
                 loop = asyncio.get_running_loop()
-                loop.create_task(_stop_and_publish())
+                self._stop_task = loop.create_task(_stop_and_publish())
             else:
                 # Симуляция распознавания
                 await self._start_recognition(session_id)
         except Exception as e:
             logger.error(f"VOICE: error in recording_stop handler: {e}")
 
+    async def _on_partial_result(self, event):
+        """Частичная гипотеза потокового движка (пока пользователь говорит)"""
+        try:
+            if not self._recording_active or self._current_session_id is None:
+                return
+            await self.event_bus.publish("voice.partial_result", {
+                "session_id": self._current_session_id,
+                "text": (event.data or {}).get("text", ""),
+                "language": self.config.language,
+            })
+        except Exception as e:
+            logger.debug(f"VOICE: partial result publish failed: {e}")
+
+    async def _on_voice_activity(self, event):
+        """Переход речь/тишина по VAD во время записи"""
+        try:
+            if not self._recording_active or self._current_session_id is None:
+                return
+            data = event.data or {}
+            await self.event_bus.publish("voice.activity", {
+                "session_id": self._current_session_id,
+                "speech": bool(data.get("speech")),
+                "offset_ms": data.get("offset_ms", 0.0),
+            })
+        except Exception as e:
+            logger.debug(f"VOICE: voice activity publish failed: {e}")
+
+    async def _on_long_press(self, event: Dict[str, Any]):
+        """long_press приходит до voice.recording_start: тёплый поток должен быть открыт"""
+        try:
+            self._ensure_warm_microphone()
+        except Exception as e:
+            logger.debug(f"VOICE: warm microphone check failed: {e}")
+
+    def _ensure_warm_microphone(self):
+        if self.config.warm_microphone and not self.config.simulate and self._recognizer is not None:
+            self._recognizer.start_warm_microphone()
+
     # Отмена/прерывание
     async def _on_cancel_request(self, event: Dict[str, Any]):
         try:
             logger.debug("VOICE: cancel requested")
             await self._cancel_recognition(reason="cancel_requested")
+            # Прерывание во время распознавания - результат больше не нужен
+            await self._cancel_stop_task(reason="cancel_requested")
             # Останавливаем реальное прослушивание, если активно
             if not self.config.simulate and self._recognizer is not None:
                 try:
@@ -320,17 +403,31 @@ class VoiceRecognitionIntegration:
                 logger.debug(f"VOICE: recognition cancelled ({reason})")
         self._recognition_task = None
 
+    async def _cancel_stop_task(self, reason: str = ""):
+        task = self._stop_task
+        if task and not task.done():
+            task.cancel()
+            try:
+                await task
+            except asyncio.CancelledError:
+                logger.debug(f"VOICE: backend recognition cancelled ({reason})")
+        self._stop_task = None
+
     def get_status(self) -> Dict[str, Any]:
         return {
             "initialized": self._initialized,
             "running": self._running,
             "session_id": self._current_session_id,
             "recording": self._recording_active,
-            "recognizing": self._recognition_task is not None and not self._recognition_task.done(),
+            "recognizing": any(t is not None and not t.done() for t in (self._recognition_task, self._stop_task)),
             "config": {
                 "timeout_sec": self.config.timeout_sec,
                 "simulate": self.config.simulate,
                 "language": self.config.language,
+                "streaming": self.config.streaming,
+                "backend": self.config.backend,
+                "vad": self.config.vad,
+                "warm_microphone": self.config.warm_microphone,
             }
         }
     
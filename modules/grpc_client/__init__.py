@@ -13,7 +13,7 @@
 from .core.grpc_client import GrpcClient
 from .core.types import (
     ConnectionState, RetryStrategy, ServerConfig, 
-    ConnectionMetrics, RetryConfig, HealthCheckConfig
+    ConnectionMetrics, RetryConfig, HealthCheckConfig, HedgeConfig
 )
 # Конфигурация теперь централизована в unified_config.yaml
 # Функции конфигурации удалены в пользу централизованной системы
@@ -33,6 +33,7 @@ __all__ = [
     "ConnectionMetrics",
     "RetryConfig",
     "HealthCheckConfig",
+    "HedgeConfig",
     
     # Конфигурация централизована в unified_config.yaml
     
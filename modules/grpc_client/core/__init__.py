@@ -5,11 +5,14 @@
 from .grpc_client import GrpcClient
 from .types import (
     ConnectionState, RetryStrategy, ServerConfig, 
-    ConnectionMetrics, RetryConfig, HealthCheckConfig
+    ConnectionMetrics, RetryConfig, HealthCheckConfig, HedgeConfig
 )
 from .retry_manager import RetryManager
 from .health_checker import HealthChecker
 from .connection_manager import ConnectionManager
+from .stream_session import StreamAudioSession
+from .latency_tracker import ServerLatencyTracker
+from .rpc_metrics import RpcMetricsInterceptor, RpcCallStats
 
 __all__ = [
     "GrpcClient",
@@ -19,7 +22,12 @@ __all__ = [
     "ConnectionMetrics",
     "RetryConfig",
     "HealthCheckConfig",
+    "HedgeConfig",
     "RetryManager",
     "HealthChecker",
-    "ConnectionManager"
+    "ConnectionManager",
+    "StreamAudioSession",
+    "ServerLatencyTracker",
+    "RpcMetricsInterceptor",
+    "RpcCallStats"
 ]
@@ -5,12 +5,15 @@
 import asyncio
 import logging
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import grpc
 import grpc.aio
 
-from .types import ConnectionState, ServerConfig, ConnectionMetrics
+from modules.metrics import get_registry
+
+from .types import ConnectionState, ServerConfig, ConnectionMetrics, HedgeConfig
 from .health_checker import HealthChecker
+from .latency_tracker import ServerLatencyTracker
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +30,25 @@ class ConnectionManager:
         # gRPC компоненты
         self.channel: Optional[grpc.aio.Channel] = None
         self.stub: Optional[Any] = None
+        # Клиентские interceptors каналов (метрики вызовов)
+        self.interceptors: List[grpc.aio.ClientInterceptor] = []
+        
+        # Прогрев: наблюдение за состоянием канала и повторное подключение после простоя
+        self.keep_warm = True
+        self.rewarm_delay = 1.0
+        self.channel_state: Optional[grpc.ChannelConnectivity] = None
+        self.channel_state_changes = 0
+        self.last_connect_wait: Optional[float] = None
+        self._watch_task: Optional[asyncio.Task] = None
+        
+        # Hedged подключение: RTT по серверам и группа взаимозаменяемых серверов
+        self.hedge = HedgeConfig()
+        self.latency = ServerLatencyTracker()
+        self.hedged_connects = 0
+        metrics = get_registry('grpc_client')
+        self._m_hedged = metrics.counter('hedged_connects')
+        self._m_hedge_wins = metrics.counter('hedge_wins')
+        self._m_connect_rtt = metrics.histogram('connect_rtt_ms')
         
         # Thread safety
         self._connection_lock = asyncio.Lock()
@@ -45,13 +67,46 @@ class ConnectionManager:
             self.current_server = name
         logger.info(f"🌐 Добавлен сервер {name}: {config.address}:{config.port}")
     
+    def configure_hedging(self, config: HedgeConfig):
+        """Настроить hedged подключение (группа серверов и задержки)"""
+        self.hedge = config
+        self.latency = ServerLatencyTracker(
+            alpha=config.ewma_alpha,
+            initial_delay=config.initial_delay,
+            min_delay=config.min_delay,
+            max_delay=config.max_delay,
+        )
+    
+    def _hedge_group(self, server_name: Optional[str] = None) -> Optional[List[str]]:
+        """Серверы для hedged подключения или None (один сервер, hedge выключен)"""
+        if not self.hedge.enabled or self.hedge.max_parallel < 2:
+            return None
+        group = [name for name in self.hedge.servers if name in self.servers]
+        if len(group) < 2 or (server_name and server_name not in group):
+            return None
+        return group
+    
+    def _is_switch(self, server_name: Optional[str]) -> bool:
+        """Запрошен другой сервер (внутри hedge группы серверы взаимозаменяемы)"""
+        if not server_name or server_name not in self.servers or server_name == self.current_server:
+            return False
+        group = self._hedge_group(server_name)
+        return not (group and self.current_server in group)
+    
     async def connect(self, server_name: Optional[str] = None) -> bool:
         """Подключается к серверу"""
         try:
             async with self._connection_lock:
+                same_server = not self._is_switch(server_name)
+                if same_server and self.channel is not None and self.connection_state == ConnectionState.CONNECTED:
+                    # Канал уже установлен (например, параллельным прогревом) - не пересоздаём
+                    return True
+                group = self._hedge_group(server_name)
+                if group:
+                    return await self._connect_hedged(group, preferred=server_name or self.current_server)
                 if server_name and server_name in self.servers:
                     self.current_server = server_name
-                
+
                 return await self._connect()
         except Exception as e:
             logger.error(f"❌ Ошибка подключения: {e}")
@@ -71,47 +126,27 @@ class ConnectionManager:
             address = f"{server_config.address}:{server_config.port}"
             
             # Закрываем предыдущее соединение
-            if self.channel:
-                try:
-                    await self.channel.close()
-                except:
-                    pass
-            
-            # Настройки gRPC
-            options = self._create_grpc_options(server_config)
+            await self._close_channel(self.channel)
             
             # Создаем канал
-            if server_config.use_ssl:
-                self.channel = grpc.aio.secure_channel(
-                    address, 
-                    grpc.aio.ssl_channel_credentials(), 
-                    options=options
-                )
-            else:
-                self.channel = grpc.aio.insecure_channel(address, options=options)
+            self.channel = self._open_channel(server_config)
             
             # Создаем stub
             self.stub = self._create_stub()
             
             # Ждем готовности канала
+            started = time.perf_counter()
             try:
                 await asyncio.wait_for(
                     self.channel.channel_ready(),
                     timeout=server_config.timeout
                 )
-                
-                self.connection_state = ConnectionState.CONNECTED
-                self.metrics.successful_connections += 1
-                self.metrics.last_connection_time = time.time()
-                self._notify_connection_changed()
-                
-                # Запускаем health checker
-                self.health_checker.start(self._check_connection_health)
-                
-                logger.info(f"✅ Подключение к {address} установлено")
+                self._observe_rtt(self.current_server, time.perf_counter() - started)
+                self._mark_connected(address)
                 return True
                 
             except asyncio.TimeoutError:
+                self.latency.observe_failure(self.current_server, time.perf_counter() - started)
                 logger.error(f"⏰ Таймаут подключения к {address}")
                 self.connection_state = ConnectionState.FAILED
                 self.metrics.failed_connections += 1
@@ -126,6 +161,207 @@ class ConnectionManager:
             self._notify_connection_changed()
             return False
     
+    async def _connect_hedged(self, group: List[str], preferred: Optional[str] = None) -> bool:
+        """
+        Hedged подключение к группе серверов
+        
+        Первым подключается сервер с наименьшим RTT. Если он не стал READY
+        за p95 своего RTT, параллельно запускается следующий кандидат;
+        первый готовый канал становится текущим, остальные попытки
+        отменяются. Hedge бывает только при установке соединения - запросы
+        идут по одному каналу, нагрузка в установившемся режиме не растёт.
+        """
+        candidates = self.latency.rank(group, preferred)
+        primary = candidates[0]
+        self.connection_state = ConnectionState.CONNECTING
+        self._notify_connection_changed()
+        await self._close_channel(self.channel)
+        self.channel = None
+        self.stub = None
+        
+        attempts: Dict[asyncio.Task, Tuple[str, grpc.aio.Channel, float]] = {}
+        
+        def launch() -> str:
+            name = candidates.pop(0)
+            server_config = self.servers[name]
+            channel = self._open_channel(server_config)
+            task = asyncio.create_task(
+                asyncio.wait_for(channel.channel_ready(), timeout=server_config.timeout)
+            )
+            attempts[task] = (name, channel, time.perf_counter())
+            return name
+        
+        winner: Optional[Tuple[str, grpc.aio.Channel, float]] = None
+        last = launch()
+        try:
+            while attempts and winner is None:
+                can_hedge = bool(candidates) and len(attempts) < self.hedge.max_parallel
+                delay = self.latency.hedge_delay(last) if can_hedge else None
+                done, _ = await asyncio.wait(list(attempts), timeout=delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    slow = last
+                    last = launch()
+                    self.hedged_connects += 1
+                    self._m_hedged.inc()
+                    logger.info(f"🏁 {slow} не готов за {delay * 1000:.0f}мс - параллельно подключаемся к {last}")
+                    continue
+                for task in done:
+                    name, channel, started = attempts.pop(task)
+                    elapsed = time.perf_counter() - started
+                    if task.exception() is None:
+                        self._observe_rtt(name, elapsed)
+                        if winner is None:
+                            winner = (name, channel, elapsed)
+                            continue
+                    else:
+                        self.latency.observe_failure(name, elapsed)
+                        logger.warning(f"⏰ Не удалось подключиться к {name} за {elapsed:.1f}с")
+                    await self._close_channel(channel)
+                # Упавший кандидат освобождает место следующему
+                if winner is None and candidates and not attempts:
+                    last = launch()
+        finally:
+            now = time.perf_counter()
+            for task, (name, channel, started) in attempts.items():
+                task.cancel()
+                self.latency.observe_censored(name, now - started)
+                await self._close_channel(channel)
+        
+        if winner is None:
+            logger.error(f"❌ Нет готового сервера среди {', '.join(group)}")
+            self.connection_state = ConnectionState.FAILED
+            self.metrics.failed_connections += 1
+            self._notify_connection_changed()
+            return False
+        
+        name, channel, elapsed = winner
+        if name != primary:
+            self._m_hedge_wins.inc()
+        self.current_server = name
+        self.channel = channel
+        self.stub = self._create_stub()
+        server_config = self.servers[name]
+        self._mark_connected(f"{server_config.address}:{server_config.port}")
+        logger.debug(f"🏁 Победил {name} за {elapsed * 1000:.1f}мс")
+        return True
+    
+    def _open_channel(self, server_config: ServerConfig) -> grpc.aio.Channel:
+        """Создает канал к серверу (соединение устанавливается асинхронно)"""
+        address = f"{server_config.address}:{server_config.port}"
+        options = self._create_grpc_options(server_config)
+        if server_config.use_ssl:
+            return grpc.aio.secure_channel(
+                address,
+                grpc.aio.ssl_channel_credentials(),
+                options=options,
+                interceptors=self.interceptors or None
+            )
+        return grpc.aio.insecure_channel(address, options=options, interceptors=self.interceptors or None)
+    
+    async def _close_channel(self, channel: Optional[grpc.aio.Channel]):
+        if channel is None:
+            return
+        try:
+            await channel.close()
+        except Exception:
+            pass
+    
+    def _observe_rtt(self, server_name: str, seconds: float):
+        self.latency.observe(server_name, seconds)
+        self._m_connect_rtt.observe(seconds * 1000.0)
+    
+    def _mark_connected(self, address: str):
+        """Канал готов: состояние, метрики, health checker и наблюдение за каналом"""
+        self.connection_state = ConnectionState.CONNECTED
+        self.metrics.successful_connections += 1
+        self.metrics.last_connection_time = time.time()
+        self._notify_connection_changed()
+        
+        # Запускаем health checker
+        self.health_checker.start(self._check_connection_health)
+        self._start_connectivity_watch()
+        
+        logger.info(f"✅ Подключение к {address} установлено")
+    
+    async def ensure_ready(self, server_name: Optional[str] = None) -> Optional[float]:
+        """
+        Дождаться готового (READY) канала, подключаясь при необходимости
+        
+        Прогретый канал возвращается сразу; канал после простоя (IDLE)
+        переподключается без пересоздания.
+        
+        Returns:
+            Время ожидания соединения в секундах или None, если подключиться не удалось
+        """
+        started = time.perf_counter()
+        switch = self._is_switch(server_name)
+        if self.channel is None or switch or self.connection_state in (ConnectionState.DISCONNECTED, ConnectionState.FAILED):
+            if not await self.connect(server_name):
+                return None
+        else:
+            try:
+                if self.channel.get_state(try_to_connect=True) != grpc.ChannelConnectivity.READY:
+                    timeout = self.servers[self.current_server].timeout
+                    await asyncio.wait_for(self.channel.channel_ready(), timeout=timeout)
+                    self.connection_state = ConnectionState.CONNECTED
+                    self._notify_connection_changed()
+            except Exception as e:
+                logger.warning(f"⚠️ Канал не готов, переподключаемся: {e}")
+                if not await self.connect(server_name):
+                    return None
+        self.last_connect_wait = time.perf_counter() - started
+        return self.last_connect_wait
+    
+    async def warm_up(self, server_name: Optional[str] = None) -> bool:
+        """Прогреть канал заранее (DNS, TCP, TLS, HTTP/2), чтобы запрос не ждал соединения"""
+        waited = await self.ensure_ready(server_name)
+        if waited is not None:
+            logger.debug(f"🔥 gRPC канал прогрет ({waited * 1000:.1f}мс)")
+        return waited is not None
+    
+    def _start_connectivity_watch(self):
+        """Запустить наблюдение за состоянием текущего канала"""
+        if self._watch_task and not self._watch_task.done():
+            self._watch_task.cancel()
+        self._watch_task = asyncio.create_task(self._watch_connectivity(self.channel))
+    
+    async def _watch_connectivity(self, channel: grpc.aio.Channel):
+        """
+        Следит за переходами состояния канала
+        
+        Сервер закрывает простаивающие соединения (max_connection_idle, GOAWAY),
+        а ping без активных вызовов он не разрешает. Поэтому вместо keepalive
+        без вызовов канал после перехода в IDLE переподключается в фоне -
+        установка соединения не попадает на путь следующего запроса.
+        """
+        try:
+            state = channel.get_state(try_to_connect=False)
+            while channel is self.channel:
+                self.channel_state = state
+                await channel.wait_for_state_change(state)
+                if channel is not self.channel:
+                    break
+                state = channel.get_state(try_to_connect=False)
+                self.channel_state_changes += 1
+                logger.debug(f"🔄 gRPC канал: {state.name}")
+                if state == grpc.ChannelConnectivity.READY:
+                    if self.connection_state != ConnectionState.CONNECTED:
+                        self.connection_state = ConnectionState.CONNECTED
+                        self._notify_connection_changed()
+                elif state == grpc.ChannelConnectivity.TRANSIENT_FAILURE:
+                    self.connection_state = ConnectionState.RECONNECTING
+                    self._notify_connection_changed()
+                elif state == grpc.ChannelConnectivity.SHUTDOWN:
+                    break
+                elif state == grpc.ChannelConnectivity.IDLE and self.keep_warm:
+                    await asyncio.sleep(self.rewarm_delay)
+                    if channel is self.channel:
+                        state = channel.get_state(try_to_connect=True)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.debug(f"Наблюдение за gRPC каналом остановлено: {e}")
+    
     def _create_grpc_options(self, server_config: ServerConfig) -> list:
         """Создает опции gRPC"""
         # Консервативные keepalive-настройки, чтобы избежать ENHANCE_YOUR_CALM/too_many_pings
@@ -162,6 +398,8 @@ class ConnectionManager:
             async with self._connection_lock:
                 # Останавливаем health checker
                 self.health_checker.stop()
+                if self._watch_task and not self._watch_task.done():
+                    self._watch_task.cancel()
                 
                 if self.channel:
                     await self.channel.close()
@@ -4,6 +4,7 @@
 
 import asyncio
 import logging
+import time
 from typing import Optional, Dict, Any, AsyncGenerator, Tuple, List
 import importlib
 import sys
@@ -13,10 +14,13 @@ from datetime import datetime
 import numpy as np
 
 from integration.utils.resource_path import get_resource_path
+from modules.metrics import get_registry
 
-from .types import ServerConfig, RetryConfig, HealthCheckConfig, RetryStrategy
+from .types import ServerConfig, RetryConfig, HealthCheckConfig, RetryStrategy, HedgeConfig
 from .retry_manager import RetryManager
 from .connection_manager import ConnectionManager
+from .stream_session import StreamAudioSession
+from .rpc_metrics import RpcMetricsInterceptor, mark_request_queued
 
 logger = logging.getLogger(__name__)
 
@@ -37,8 +41,24 @@ class GrpcClient:
             )
         )
         
+        # Время ожидания соединения на запрос (0 - канал был прогрет)
+        self._m_connect_wait = get_registry('grpc_client').histogram('connect_wait_ms')
+        self.last_connect_wait_ms: Optional[float] = None
+        
+        # Тайминги каждого потокового вызова: клиент (отправка) vs сервер (первый ответ)
+        self.rpc_metrics = RpcMetricsInterceptor(self.connection_manager.metrics)
+        self.connection_manager.interceptors.extend(self.rpc_metrics.channel_interceptors())
+        
+        # StreamAudioV2 (запрос частями); выключается, если сервер ответил UNIMPLEMENTED
+        self.stream_v2_enabled = bool(self.config.get('stream_v2', True))
+        
+        # Открытые потоковые вызовы - при прерывании отменяются сразу (cancel_active_calls)
+        self._active_calls: set = set()
+        self._m_interrupt_rpc = get_registry('grpc_client').histogram('interrupt_rpc_ms')
+        
         # Инициализация
         self._initialize_servers()
+        self._configure_hedging()
         self._setup_callbacks()
         
         # Устанавливаем сервер по умолчанию из конфигурации
@@ -70,6 +90,7 @@ class GrpcClient:
             
             return {
                 'servers': servers,
+                'hedge': grpc_data.get('hedge', {}),
                 'auto_fallback': True,
                 'health_check_interval': 30,
                 'connection_timeout': grpc_data.get('connection_timeout', 10),
@@ -124,6 +145,22 @@ class GrpcClient:
         except Exception as e:
             logger.error(f"❌ Ошибка инициализации серверов: {e}")
     
+    def _configure_hedging(self):
+        """Hedged подключение к группе серверов (config['hedge'])"""
+        hedge_cfg = self.config.get('hedge') or {}
+        try:
+            self.connection_manager.configure_hedging(HedgeConfig(
+                enabled=bool(hedge_cfg.get('enabled', True)),
+                servers=list(hedge_cfg.get('servers') or []),
+                max_parallel=int(hedge_cfg.get('max_parallel', 2)),
+                initial_delay=float(hedge_cfg.get('initial_delay', 0.3)),
+                min_delay=float(hedge_cfg.get('min_delay', 0.05)),
+                max_delay=float(hedge_cfg.get('max_delay', 2.0)),
+                ewma_alpha=float(hedge_cfg.get('ewma_alpha', 0.2)),
+            ))
+        except Exception as e:
+            logger.warning(f"⚠️ Некорректная конфигурация hedge, подключение к одному серверу: {e}")
+    
     def _setup_callbacks(self):
         """Настраивает callback'и"""
         self.connection_manager.set_connection_callback(self._on_connection_changed)
@@ -168,6 +205,24 @@ class GrpcClient:
         """Подключается к серверу"""
         return await self.connection_manager.connect(server_name)
     
+    async def ensure_ready(self, server_name: Optional[str] = None) -> Optional[float]:
+        """
+        Готовый канал для запроса (подключение, если канал не прогрет)
+        
+        Returns:
+            Время ожидания соединения в мс или None, если подключиться не удалось
+        """
+        waited = await self.connection_manager.ensure_ready(server_name)
+        if waited is None:
+            return None
+        self.last_connect_wait_ms = waited * 1000.0
+        self._m_connect_wait.observe(self.last_connect_wait_ms)
+        return self.last_connect_wait_ms
+    
+    async def warm_up(self, server_name: Optional[str] = None) -> bool:
+        """Прогреть канал до запроса (старт приложения, нажатие клавиши)"""
+        return await self.connection_manager.warm_up(server_name)
+    
     async def disconnect(self):
         """Отключается от сервера"""
         await self.connection_manager.disconnect()
@@ -185,21 +240,38 @@ class GrpcClient:
         return self.connection_manager.get_connection_state()
     
     def get_metrics(self):
-        """Возвращает метрики соединения"""
-        return self.connection_manager.get_metrics()
+        """Возвращает метрики соединения и тайминги вызовов (metrics.rpc)"""
+        metrics = self.connection_manager.get_metrics()
+        metrics.rpc = self.rpc_metrics.snapshot()
+        return metrics
+    
+    def get_server_latency(self) -> Dict[str, Dict[str, float]]:
+        """RTT подключения по серверам (скользящее среднее и p95)"""
+        return self.connection_manager.latency.snapshot()
     
     def is_connected(self) -> bool:
         """Проверяет, подключен ли клиент"""
         return self.connection_manager.is_connected()
     
-    async def stream_audio(self, prompt: str, screenshot_base64: str, screen_info: dict, hardware_id: str) -> AsyncGenerator[Any, None]:
-        """Стриминг аудио и текста на сервер"""
+    async def stream_audio(self, prompt: str, screenshot_base64: Optional[str], screen_info: dict, hardware_id: str,
+                           screenshot_bytes: Optional[bytes] = None,
+                           screenshot_mime_type: Optional[str] = None,
+                           accept_codecs: Optional[List[str]] = None) -> AsyncGenerator[Any, None]:
+        """
+        Стриминг аудио и текста на сервер
+        
+        Скриншот передаётся либо байтами (screenshot_bytes + mime тип, поле
+        screenshot_data - без base64 и +33% трафика), либо строкой base64 в
+        прежнем поле screenshot для серверов без поддержки screenshot_data.
+        accept_codecs - кодеки аудио ответа, которые клиент умеет декодировать.
+        """
+        mark_request_queued()
         try:
             logger.info(f"🔍 screen_info type: {type(screen_info)}")
             logger.info(f"🔍 screen_info content: {screen_info}")
             
             if not self.is_connected():
-                await self.connect()
+                await self.ensure_ready()
 
             # Импортируем protobuf-модули с фолбэком на server/
             streaming_pb2, streaming_pb2_grpc = self._import_proto_modules()
@@ -221,23 +293,117 @@ class GrpcClient:
             
             request = streaming_pb2.StreamRequest(
                 prompt=prompt,
-                screenshot=screenshot_base64,
                 screen_width=screen_width,
                 screen_height=screen_height,
                 hardware_id=hardware_id,
                 session_id=None
             )
+            if screenshot_bytes:
+                request.screenshot_data = screenshot_bytes
+                request.screenshot_mime_type = screenshot_mime_type or "image/jpeg"
+            elif screenshot_base64 is not None:
+                request.screenshot = screenshot_base64
+            if accept_codecs:
+                request.accept_codecs.extend(accept_codecs)
             
             # Выполняем стриминг
-            async for response in streaming_pb2_grpc.StreamingServiceStub(
+            call = self._track_call(streaming_pb2_grpc.StreamingServiceStub(
                 self.connection_manager.channel
-            ).StreamAudio(request, timeout=30):
-                yield response
+            ).StreamAudio(request, timeout=30))
+            try:
+                async for response in call:
+                    yield response
+            finally:
+                self._active_calls.discard(call)
                 
         except Exception as e:
             logger.error(f"❌ Ошибка стриминга аудио: {e}")
             raise
 
+    async def open_stream(self, session_id: Optional[Any] = None, hardware_id: Optional[str] = None,
+                          timeout: float = 30.0,
+                          accept_codecs: Optional[List[str]] = None) -> Optional[StreamAudioSession]:
+        """
+        Открыть StreamAudioV2 до готовности промпта (при нажатии клавиши)
+        
+        Returns:
+            Сессия для отправки скриншота и промпта по мере готовности или None,
+            если V2 недоступен - тогда запрос идёт через stream_audio()
+        """
+        if not self.stream_v2_enabled:
+            return None
+        if not self.is_connected() and await self.ensure_ready() is None:
+            return None
+        streaming_pb2, streaming_pb2_grpc = self._import_proto_modules()
+        if not hasattr(streaming_pb2, 'StreamRequestPart'):
+            logger.warning("⚠️ Protobuf модули без StreamAudioV2 - используем StreamAudio")
+            self.disable_stream_v2()
+            return None
+        stub = streaming_pb2_grpc.StreamingServiceStub(self.connection_manager.channel)
+        session = StreamAudioSession(self, streaming_pb2, stub, session_id=session_id,
+                                     hardware_id=hardware_id, timeout=timeout,
+                                     accept_codecs=accept_codecs)
+        self._track_call(session._call)
+        return session
+    
+    def disable_stream_v2(self):
+        """Сервер не поддерживает StreamAudioV2 - дальше только StreamAudio"""
+        self.stream_v2_enabled = False
+
+    def _track_call(self, call):
+        """Учесть открытый потоковый вызов до его завершения"""
+        self._active_calls.add(call)
+        try:
+            call.add_done_callback(lambda _: self._active_calls.discard(call))
+        except Exception:
+            pass
+        return call
+
+    def cancel_active_calls(self) -> int:
+        """
+        Отменить все открытые потоковые вызовы (прерывание пользователем)
+        
+        Отмена уходит серверу сразу (RST_STREAM), не дожидаясь, пока задача
+        чтения ответа дойдёт до точки отмены.
+        
+        Returns:
+            Число отменённых вызовов
+        """
+        cancelled = 0
+        for call in list(self._active_calls):
+            try:
+                if call.cancel():
+                    cancelled += 1
+            except Exception as e:
+                logger.debug(f"Отмена вызова: {e}")
+        self._active_calls.clear()
+        return cancelled
+
+    async def interrupt_session(self, hardware_id: str, timeout: float = 1.0) -> List[str]:
+        """
+        InterruptSession: сервер прекращает генерацию ответов для hardware_id
+        
+        Без открытого канала не подключается: активного потока на сервере
+        у этого клиента тогда нет.
+        
+        Returns:
+            Сессии, прерванные сервером
+        """
+        if not hardware_id:
+            raise ValueError("hardware_id is required")
+        if not self.is_connected():
+            return []
+        streaming_pb2, streaming_pb2_grpc = self._import_proto_modules()
+        stub = streaming_pb2_grpc.StreamingServiceStub(self.connection_manager.channel)
+        started = time.perf_counter()
+        response = await stub.InterruptSession(
+            streaming_pb2.InterruptRequest(hardware_id=hardware_id), timeout=timeout
+        )
+        self._m_interrupt_rpc.observe_since(started)
+        if not response.success:
+            logger.warning(f"⚠️ InterruptSession: {response.message}")
+        return list(response.interrupted_sessions)
+
     async def generate_welcome_audio(
         self,
         text: str,
@@ -254,6 +420,7 @@ class GrpcClient:
         """
         if not text or not text.strip():
             raise ValueError("Welcome text must be non-empty")
+        mark_request_queued()
 
         target_server = server_name or self.connection_manager.current_server
 
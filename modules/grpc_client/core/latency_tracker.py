@@ -0,0 +1,120 @@
+"""
+Скользящая оценка RTT подключения к серверам gRPC
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+# z-оценка 95-го перцентиля нормального распределения
+_P95_Z = 1.645
+
+
+@dataclass
+class ServerLatency:
+    """RTT подключения к одному серверу (экспоненциальное скользящее среднее)"""
+    samples: int = 0
+    ewma: float = 0.0       # секунды
+    variance: float = 0.0   # EW дисперсия
+    failures: int = 0
+
+    @property
+    def p95(self) -> float:
+        return self.ewma + _P95_Z * math.sqrt(self.variance)
+
+
+class ServerLatencyTracker:
+    """
+    RTT установки соединения по серверам
+
+    Замер - время от создания канала до READY (DNS, TCP, TLS, HTTP/2).
+    По оценкам выбирается порядок кандидатов и срок, после которого
+    подключение считается медленным и запускается следующий кандидат.
+    """
+
+    def __init__(self, alpha: float = 0.2, initial_delay: float = 0.3,
+                 min_delay: float = 0.05, max_delay: float = 2.0):
+        self.alpha = min(1.0, max(0.01, float(alpha)))
+        self.initial_delay = float(initial_delay)
+        self.min_delay = float(min_delay)
+        self.max_delay = float(max_delay)
+        self._servers: Dict[str, ServerLatency] = {}
+
+    def get(self, name: str) -> ServerLatency:
+        latency = self._servers.get(name)
+        if latency is None:
+            latency = self._servers[name] = ServerLatency()
+        return latency
+
+    def observe(self, name: str, seconds: float):
+        """Успешное подключение за seconds"""
+        latency = self.get(name)
+        if latency.samples == 0:
+            latency.ewma = seconds
+            latency.variance = (seconds / 2) ** 2
+        else:
+            diff = seconds - latency.ewma
+            incr = self.alpha * diff
+            latency.ewma += incr
+            latency.variance = (1 - self.alpha) * (latency.variance + diff * incr)
+        latency.samples += 1
+
+    def observe_censored(self, name: str, seconds: float):
+        """
+        Подключение отменено через seconds (победил другой кандидат)
+
+        Настоящее RTT не меньше seconds: уже известная оценка поднимается,
+        если она ниже, иначе медленный сервер навсегда оставался бы первым
+        кандидатом. Без успешных замеров оценка не появляется - нижняя
+        граница не должна ставить сервер впереди измеренных.
+        """
+        latency = self.get(name)
+        if latency.samples and seconds > latency.ewma:
+            self.observe(name, seconds)
+
+    def observe_failure(self, name: str, seconds: float):
+        """Подключение не удалось (таймаут, ошибка)"""
+        self.get(name).failures += 1
+        self.observe_censored(name, seconds)
+
+    def estimate(self, name: str) -> Optional[float]:
+        """Среднее RTT или None, если замеров ещё нет"""
+        latency = self._servers.get(name)
+        return latency.ewma if latency and latency.samples else None
+
+    def hedge_delay(self, name: str) -> float:
+        """Сколько ждать READY от сервера, прежде чем запускать следующего кандидата"""
+        latency = self._servers.get(name)
+        if not latency or not latency.samples:
+            return self.initial_delay
+        return min(self.max_delay, max(self.min_delay, latency.p95))
+
+    def rank(self, names: Sequence[str], preferred: Optional[str] = None) -> List[str]:
+        """
+        Кандидаты по возрастанию RTT
+
+        Серверы без успешных замеров - после измеренных (сначала с меньшим
+        числом неудач); среди равных первым идёт preferred, затем порядок
+        конфигурации.
+        """
+        order = {name: i for i, name in enumerate(names)}
+
+        def key(name):
+            estimate = self.estimate(name)
+            if estimate is None:
+                latency = self._servers.get(name)
+                return (True, latency.failures if latency else 0, name != preferred, order[name])
+            return (False, estimate, name != preferred, order[name])
+
+        return sorted(names, key=key)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            name: {
+                'samples': latency.samples,
+                'ewma_ms': latency.ewma * 1000.0,
+                'p95_ms': latency.p95 * 1000.0,
+                'failures': latency.failures,
+            }
+            for name, latency in self._servers.items()
+        }
@@ -0,0 +1,243 @@
+"""
+Метрики вызовов gRPC - клиентский aio interceptor для потоковых RPC
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, AsyncIterator, Deque, Dict, List, Optional
+
+import grpc
+import grpc.aio
+
+from modules.metrics import get_registry
+
+from .types import ConnectionMetrics
+
+logger = logging.getLogger(__name__)
+
+# Момент постановки запроса в очередь (задача вызывающего): начало queue_to_send
+_request_queued_at: ContextVar[Optional[float]] = ContextVar('grpc_request_queued_at', default=None)
+
+# Длительность потока ответа - секунды, а не миллисекунды горячего пути
+DURATION_BUCKETS_MS = (
+    100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0,
+    10000.0, 20000.0, 30000.0, 60000.0, 120000.0,
+)
+
+
+def mark_request_queued():
+    """
+    Отметить начало запроса (до подключения и сборки сообщения)
+
+    Следующий вызов, созданный в этой задаче, считает queue_to_send от
+    этой отметки, а не от создания вызова.
+    """
+    _request_queued_at.set(time.perf_counter())
+
+
+@dataclass
+class RpcCallStats:
+    """Тайминги одного вызова (мс от начала вызова или от конца запроса)"""
+    method: str
+    started: float = 0.0
+    queue_to_send_ms: Optional[float] = None    # запрос поставлен -> отдан gRPC на отправку
+    request_done_at: Optional[float] = None     # последняя часть запроса отдана (stream-stream)
+    first_response_ms: Optional[float] = None   # конец запроса -> первый ответ
+    first_audio_ms: Optional[float] = None      # конец запроса -> первый audio_chunk
+    max_gap_ms: float = 0.0
+    responses: int = 0
+    response_bytes: int = 0
+    duration_ms: Optional[float] = None
+    status: str = "PENDING"
+    _last_response_at: Optional[float] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop('started')
+        data.pop('request_done_at')
+        data.pop('_last_response_at')
+        return data
+
+
+class _MethodMetrics:
+    """Метрики одного метода в реестре grpc_rpc (создаются при первом вызове)"""
+
+    def __init__(self, registry, method: str):
+        self.calls = registry.counter(f"{method}.calls")
+        self.errors = registry.counter(f"{method}.errors")
+        self.response_bytes = registry.counter(f"{method}.response_bytes")
+        self.queue_to_send = registry.histogram(f"{method}.queue_to_send_ms")
+        self.first_response = registry.histogram(f"{method}.first_response_ms")
+        self.first_audio = registry.histogram(f"{method}.first_audio_ms")
+        self.chunk_gap = registry.histogram(f"{method}.chunk_gap_ms")
+        self.duration = registry.histogram(f"{method}.duration_ms", DURATION_BUCKETS_MS)
+
+
+class _UnaryStreamInterceptor(grpc.aio.UnaryStreamClientInterceptor):
+    def __init__(self, owner: "RpcMetricsInterceptor"):
+        self._owner = owner
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        return await self._owner.intercept_unary_stream(continuation, client_call_details, request)
+
+
+class _StreamStreamInterceptor(grpc.aio.StreamStreamClientInterceptor):
+    def __init__(self, owner: "RpcMetricsInterceptor"):
+        self._owner = owner
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        return await self._owner.intercept_stream_stream(continuation, client_call_details, request_iterator)
+
+
+class RpcMetricsInterceptor:
+    """
+    Тайминги потоковых вызовов (StreamAudio, StreamAudioV2, GenerateWelcomeAudio)
+
+    Разделяет задержку на клиентскую и серверную часть:
+    - queue_to_send: сторона клиента. Unary запрос - от mark_request_queued()
+      (начало stream_audio: подключение, сборка запроса) до создания вызова;
+      поток частей - запись последней части в транспорт (HTTP/2 flow
+      control, например за ещё не ушедшим скриншотом)
+    - first_response / first_audio: от конца запроса до первого ответа и
+      первого аудио чанка - сервер (плюс один RTT сети)
+    - chunk_gap: интервалы между ответами (поток генерации сервера)
+    - duration и байты ответа
+
+    Для StreamAudioV2 "конец запроса" - последняя часть (промпт), а не
+    открытие вызова: вызов открыт ещё во время записи речи.
+
+    Канал выбирает тип interceptor по первому совпавшему классу, поэтому
+    в канал передаются отдельные interceptors из channel_interceptors().
+    """
+
+    def __init__(self, connection_metrics: Optional[ConnectionMetrics] = None,
+                 namespace: str = 'grpc_rpc', keep_last: int = 20):
+        self._registry = get_registry(namespace)
+        self._methods: Dict[str, _MethodMetrics] = {}
+        self._connection_metrics = connection_metrics
+        self.last_calls: Deque[RpcCallStats] = deque(maxlen=keep_last)
+
+    def channel_interceptors(self) -> List[grpc.aio.ClientInterceptor]:
+        """Interceptors для grpc.aio.*_channel(interceptors=...)"""
+        return [_UnaryStreamInterceptor(self), _StreamStreamInterceptor(self)]
+
+    def _method_metrics(self, method: str) -> _MethodMetrics:
+        metrics = self._methods.get(method)
+        if metrics is None:
+            metrics = self._methods[method] = _MethodMetrics(self._registry, method)
+        return metrics
+
+    @staticmethod
+    def _method_name(client_call_details) -> str:
+        method = client_call_details.method
+        if isinstance(method, bytes):
+            method = method.decode('utf-8', 'replace')
+        return method.rsplit('/', 1)[-1]
+
+    async def intercept_unary_stream(self, continuation, client_call_details, request):
+        now = time.perf_counter()
+        queued_at = _request_queued_at.get()
+        if queued_at is None or queued_at > now:
+            queued_at = now
+        stats = RpcCallStats(self._method_name(client_call_details), started=queued_at)
+        call = await continuation(client_call_details, request)
+        stats.request_done_at = time.perf_counter()
+        stats.queue_to_send_ms = (stats.request_done_at - queued_at) * 1000.0
+        return self._observe(call, stats)
+
+    async def intercept_stream_stream(self, continuation, client_call_details, request_iterator):
+        stats = RpcCallStats(self._method_name(client_call_details), started=time.perf_counter())
+        call = await continuation(client_call_details, self._track_requests(request_iterator, stats))
+        return self._observe(call, stats)
+
+    async def _track_requests(self, request_iterator, stats: RpcCallStats) -> AsyncIterator[Any]:
+        """Части запроса: gRPC забирает следующую, когда предыдущая записана в транспорт"""
+        async for request in request_iterator:
+            taken = time.perf_counter()
+            yield request
+            stats.queue_to_send_ms = (time.perf_counter() - taken) * 1000.0
+        stats.request_done_at = time.perf_counter()
+        if stats.queue_to_send_ms is not None:
+            self._method_metrics(stats.method).queue_to_send.observe(stats.queue_to_send_ms)
+
+    async def _observe(self, call, stats: RpcCallStats) -> AsyncIterator[Any]:
+        metrics = self._method_metrics(stats.method)
+        metrics.calls.inc()
+        if stats.request_done_at is not None and stats.queue_to_send_ms is not None:
+            metrics.queue_to_send.observe(stats.queue_to_send_ms)
+        status = "OK"
+        try:
+            async for response in call:
+                self._on_response(response, stats, metrics)
+                yield response
+        except grpc.aio.AioRpcError as e:
+            status = e.code().name
+            raise
+        except (asyncio.CancelledError, GeneratorExit):
+            status = "CANCELLED"
+            raise
+        except Exception:
+            status = "ERROR"
+            raise
+        finally:
+            self._finish(stats, metrics, status)
+
+    def _on_response(self, response, stats: RpcCallStats, metrics: _MethodMetrics):
+        now = time.perf_counter()
+        size = response.ByteSize()
+        stats.responses += 1
+        stats.response_bytes += size
+        metrics.response_bytes.inc(size)
+        since_request = (now - (stats.request_done_at or stats.started)) * 1000.0
+        if stats._last_response_at is None:
+            stats.first_response_ms = since_request
+            metrics.first_response.observe(since_request)
+        else:
+            gap = (now - stats._last_response_at) * 1000.0
+            stats.max_gap_ms = max(stats.max_gap_ms, gap)
+            metrics.chunk_gap.observe(gap)
+        stats._last_response_at = now
+        if stats.first_audio_ms is None and response.WhichOneof('content') == 'audio_chunk':
+            stats.first_audio_ms = since_request
+            metrics.first_audio.observe(since_request)
+
+    def _finish(self, stats: RpcCallStats, metrics: _MethodMetrics, status: str):
+        stats.duration_ms = (time.perf_counter() - stats.started) * 1000.0
+        stats.status = status
+        metrics.duration.observe(stats.duration_ms)
+        ok = status == "OK"
+        if not ok and status != "CANCELLED":
+            metrics.errors.inc()
+        self.last_calls.append(stats)
+
+        connection = self._connection_metrics
+        if connection is not None and status != "CANCELLED":
+            connection.total_requests += 1
+            if ok:
+                connection.successful_requests += 1
+                # Скользящее среднее длительности успешных вызовов (секунды)
+                n = connection.successful_requests
+                connection.average_response_time += (stats.duration_ms / 1000.0 - connection.average_response_time) / n
+            else:
+                connection.failed_requests += 1
+                connection.last_error = f"{stats.method}: {status}"
+        logger.debug(
+            f"📊 {stats.method} {status}: send {stats.queue_to_send_ms}мс, "
+            f"first response {stats.first_response_ms}мс, first audio {stats.first_audio_ms}мс, "
+            f"{stats.responses} ответов / {stats.response_bytes} байт за {stats.duration_ms:.0f}мс"
+        )
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Срез: гистограммы по методам и последние вызовы"""
+        return {
+            'methods': self._registry.snapshot(),
+            'last_calls': [stats.to_dict() for stats in list(self.last_calls)],
+        }
+
+    def reset(self):
+        self._registry.reset()
+        self.last_calls.clear()
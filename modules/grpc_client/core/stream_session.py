@@ -0,0 +1,199 @@
+"""
+Сессия StreamAudioV2 - запрос частями по мере готовности данных
+"""
+
+import asyncio
+import base64
+import logging
+from typing import Any, AsyncGenerator, List, Optional
+
+import grpc
+
+logger = logging.getLogger(__name__)
+
+# Маркер конца отправки (после промпта)
+_END = object()
+
+
+class StreamAudioSession:
+    """
+    Открытый вызов StreamAudioV2
+
+    Вызов открывается при нажатии клавиши: HTTP/2 поток создаётся сразу,
+    скриншот уходит, как только захвачен (загрузка идёт параллельно с
+    распознаванием), промпт - последним и закрывает отправку. Ответ - тот же
+    поток StreamResponse, что у StreamAudio.
+
+    Если сервер не знает StreamAudioV2 (UNIMPLEMENTED до первого ответа) или
+    закрыл вызов раньше, чем ушли все части (промпт до него не дошёл),
+    responses() повторяет запрос через StreamAudio из сохранённых частей.
+    Ошибка сервера после полученного промпта не повторяется.
+
+    Таймаут отсчитывается от промпта: запись и распознавание в него не входят.
+    """
+
+    def __init__(self, client: Any, streaming_pb2: Any, stub: Any,
+                 session_id: Optional[Any] = None, hardware_id: Optional[str] = None,
+                 timeout: float = 30.0, accept_codecs: Optional[List[str]] = None):
+        self._client = client
+        self._pb2 = streaming_pb2
+        self._parts: asyncio.Queue = asyncio.Queue()
+        self.session_id = session_id
+        self.hardware_id = hardware_id
+        self.accept_codecs = list(accept_codecs or [])
+        self.prompt: Optional[str] = None
+        self.screenshot_bytes: Optional[bytes] = None
+        self.screenshot_mime_type: Optional[str] = None
+        self.screen_width: Optional[int] = None
+        self.screen_height: Optional[int] = None
+        self.used_fallback = False
+        # Сервер завершил вызов раньше, чем ушли все части
+        self._write_failed = False
+        # Дедлайн ответа: ставится при отправке промпта
+        self._timeout = timeout
+        self._deadline: Optional[asyncio.TimerHandle] = None
+        self._deadline_exceeded = False
+
+        start = streaming_pb2.StreamStart()
+        if hardware_id:
+            start.hardware_id = hardware_id
+        if session_id is not None:
+            start.session_id = str(session_id)
+        start.accept_codecs.extend(self.accept_codecs)
+        self._parts.put_nowait(streaming_pb2.StreamRequestPart(start=start))
+        # Без дедлайна вызова: до промпта идёт запись и распознавание речи
+        self._call = stub.StreamAudioV2()
+        self._writer = asyncio.create_task(self._write_parts())
+
+    @property
+    def has_screenshot(self) -> bool:
+        """Скриншот уже отправлен в этой сессии"""
+        return self.screenshot_bytes is not None
+
+    async def _write_parts(self):
+        """
+        Отправка частей по мере готовности
+
+        Ошибки записи не поднимаются: если сервер уже завершил вызов
+        (например, UNIMPLEMENTED), статус вызова получает responses().
+        """
+        try:
+            while True:
+                part = await self._parts.get()
+                if self._call.done():
+                    # Сервер закрыл вызов до конца отправки - промпт до него не дошёл
+                    self._write_failed = part is not _END
+                    return
+                if part is _END:
+                    await self._call.done_writing()
+                    return
+                await self._call.write(part)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            # Запись после закрытия вызова сервером: grpc подменяет статус на INTERNAL
+            self._write_failed = True
+            logger.debug(f"StreamAudioV2: отправка части прервана: {e}")
+
+    def send_screenshot(self, data: bytes, mime_type: str = "image/jpeg",
+                        width: Optional[int] = None, height: Optional[int] = None) -> bool:
+        """Отправить скриншот (до промпта, один раз за сессию)"""
+        if self.prompt is not None or self.screenshot_bytes is not None or not data:
+            return False
+        self.screenshot_bytes = data
+        self.screenshot_mime_type = mime_type or "image/jpeg"
+        self.screen_width = width
+        self.screen_height = height
+        part = self._pb2.ScreenshotPart(data=data, mime_type=self.screenshot_mime_type)
+        if width is not None:
+            part.screen_width = int(width)
+        if height is not None:
+            part.screen_height = int(height)
+        self._parts.put_nowait(self._pb2.StreamRequestPart(screenshot=part))
+        return True
+
+    def send_prompt(self, prompt: str, hardware_id: Optional[str] = None):
+        """Отправить промпт - последняя часть запроса, сервер начинает генерацию"""
+        if self.prompt is not None:
+            return
+        self.prompt = prompt
+        part = self._pb2.PromptPart(prompt=prompt)
+        if hardware_id:
+            self.hardware_id = hardware_id
+            part.hardware_id = hardware_id
+        self._parts.put_nowait(self._pb2.StreamRequestPart(prompt=part))
+        self._parts.put_nowait(_END)
+        self._deadline = asyncio.get_running_loop().call_later(self._timeout, self._on_deadline)
+
+    def _on_deadline(self):
+        """Нет ответа за timeout после промпта - отменяем вызов"""
+        if not self._call.done():
+            self._deadline_exceeded = True
+            self._call.cancel()
+
+    async def responses(self) -> AsyncGenerator[Any, None]:
+        """Поток ответов (с переходом на StreamAudio, если сервер не знает V2)"""
+        if self.prompt is None:
+            raise RuntimeError("Промпт не отправлен - ответов не будет")
+        received = False
+        try:
+            async for response in self._call:
+                received = True
+                yield response
+            return
+        except asyncio.CancelledError:
+            if self._deadline_exceeded:
+                raise asyncio.TimeoutError(f"StreamAudioV2: нет ответа за {self._timeout}s после промпта")
+            raise
+        except grpc.aio.AioRpcError as e:
+            unimplemented = e.code() == grpc.StatusCode.UNIMPLEMENTED
+            # Запись части после закрытия вызова сервером: статус сервера теряется
+            # (вместо него INTERNAL). Дожидаемся отправки, чтобы знать, дошёл ли промпт
+            await asyncio.wait({self._writer}, timeout=1.0)
+            write_failed = self._write_failed
+            if received or not (unimplemented or write_failed):
+                raise
+        finally:
+            self._cancel_deadline()
+
+        if unimplemented:
+            logger.info("ℹ️ Сервер не поддерживает StreamAudioV2 - повторяем запрос через StreamAudio")
+            self._client.disable_stream_v2()
+        else:
+            logger.info("ℹ️ Сервер закрыл StreamAudioV2 до промпта - повторяем запрос через StreamAudio")
+        self.used_fallback = True
+        screenshot_base64 = None
+        screenshot_bytes = self.screenshot_bytes
+        if screenshot_bytes:
+            # Сервер без V2 (или закрывший вызов - grpc мог подменить UNIMPLEMENTED на INTERNAL)
+            # может не знать и поле screenshot_data - только прежнее base64 поле
+            screenshot_base64 = base64.b64encode(screenshot_bytes).decode('ascii')
+            screenshot_bytes = None
+        async for response in self._client.stream_audio(
+            prompt=self.prompt,
+            screenshot_base64=screenshot_base64,
+            screen_info={"width": self.screen_width, "height": self.screen_height},
+            hardware_id=self.hardware_id or "",
+            screenshot_bytes=screenshot_bytes,
+            screenshot_mime_type=self.screenshot_mime_type,
+            accept_codecs=self.accept_codecs,
+        ):
+            yield response
+
+    def _cancel_deadline(self):
+        if self._deadline is not None:
+            self._deadline.cancel()
+            self._deadline = None
+
+    def cancel(self):
+        """Отменить вызов (прерывание, сессия без промпта)"""
+        try:
+            self._cancel_deadline()
+            self._writer.cancel()
+            self._call.cancel()
+        except Exception as e:
+            logger.debug(f"Отмена StreamAudioV2: {e}")
+
+    def done(self) -> bool:
+        """Вызов завершён (ответ получен или отменён)"""
+        return self._call.done()
@@ -3,7 +3,7 @@
 """
 
 from enum import Enum
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime
 
@@ -53,6 +53,8 @@ class ConnectionMetrics:
     average_response_time: float = 0.0
     last_connection_time: Optional[float] = None
     last_error: Optional[str] = None
+    # Тайминги потоковых вызовов (RpcMetricsInterceptor), заполняется в get_metrics()
+    rpc: Dict[str, Any] = field(default_factory=dict)
 
 
 @dataclass
@@ -75,6 +77,18 @@ class HealthCheckConfig:
     recovery_threshold: int = 1
 
 
+@dataclass
+class HedgeConfig:
+    """Конфигурация параллельного (hedged) подключения к нескольким серверам"""
+    enabled: bool = True
+    servers: List[str] = field(default_factory=list)  # Группа взаимозаменяемых серверов
+    max_parallel: int = 2           # Сколько кандидатов может подключаться одновременно
+    initial_delay: float = 0.3      # Задержка hedge, пока нет замеров RTT (секунды)
+    min_delay: float = 0.05
+    max_delay: float = 2.0
+    ewma_alpha: float = 0.2         # Вес нового замера в скользящем среднем
+
+
 # Callback типы
 ConnectionCallback = Callable[[ConnectionState], None]
 ErrorCallback = Callable[[Exception, str], None]
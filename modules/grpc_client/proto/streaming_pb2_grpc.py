@@ -40,6 +40,11 @@ class StreamingServiceStub(object):
                 request_serializer=streaming__pb2.StreamRequest.SerializeToString,
                 response_deserializer=streaming__pb2.StreamResponse.FromString,
                 _registered_method=True)
+        self.StreamAudioV2 = channel.stream_stream(
+                '/streaming.StreamingService/StreamAudioV2',
+                request_serializer=streaming__pb2.StreamRequestPart.SerializeToString,
+                response_deserializer=streaming__pb2.StreamResponse.FromString,
+                _registered_method=True)
         self.GenerateWelcomeAudio = channel.unary_stream(
                 '/streaming.StreamingService/GenerateWelcomeAudio',
                 request_serializer=streaming__pb2.WelcomeRequest.SerializeToString,
@@ -63,6 +68,14 @@ class StreamingServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def StreamAudioV2(self, request_iterator, context):
+        """Тот же ответ, но запрос частями: вызов открывается при нажатии клавиши,
+        скриншот уходит сразу после захвата, промпт - последним (параллельно с STT)
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
     def GenerateWelcomeAudio(self, request, context):
         """Генерация приветственного аудио на сервере
         """
@@ -85,6 +98,11 @@ def add_StreamingServiceServicer_to_server(servicer, server):
                     request_deserializer=streaming__pb2.StreamRequest.FromString,
                     response_serializer=streaming__pb2.StreamResponse.SerializeToString,
             ),
+            'StreamAudioV2': grpc.stream_stream_rpc_method_handler(
+                    servicer.StreamAudioV2,
+                    request_deserializer=streaming__pb2.StreamRequestPart.FromString,
+                    response_serializer=streaming__pb2.StreamResponse.SerializeToString,
+            ),
             'GenerateWelcomeAudio': grpc.unary_stream_rpc_method_handler(
                     servicer.GenerateWelcomeAudio,
                     request_deserializer=streaming__pb2.WelcomeRequest.FromString,
@@ -134,6 +152,33 @@ class StreamingService(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def StreamAudioV2(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/streaming.StreamingService/StreamAudioV2',
+            streaming__pb2.StreamRequestPart.SerializeToString,
+            streaming__pb2.StreamResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GenerateWelcomeAudio(request,
             target,
@@ -3,6 +3,8 @@
 Упрощенная версия - только Hardware UUID
 """
 
+from typing import Optional
+
 from .core.hardware_identifier import HardwareIdentifier
 from .core.types import (
     HardwareIdResult, HardwareIdStatus, HardwareIdConfig,
@@ -10,9 +12,11 @@ from .core.types import (
     CacheInfo
 )
 from .core.config import get_hardware_id_config, HardwareIdConfigManager
+from .core.provider import HardwareIdProvider
 
 # Глобальный экземпляр для переиспользования
 _hardware_identifier = None
+_hardware_id_provider = None
 
 def get_hardware_identifier() -> HardwareIdentifier:
     """Получает глобальный экземпляр HardwareIdentifier"""
@@ -21,6 +25,23 @@ def get_hardware_identifier() -> HardwareIdentifier:
         _hardware_identifier = HardwareIdentifier()
     return _hardware_identifier
 
+def get_hardware_id_provider() -> HardwareIdProvider:
+    """Получает глобальный мемоизированный Hardware ID процесса"""
+    global _hardware_id_provider
+    if _hardware_id_provider is None:
+        _hardware_id_provider = HardwareIdProvider(get_hardware_identifier)
+    return _hardware_id_provider
+
+def get_cached_hardware_id() -> Optional[str]:
+    """
+    Hardware ID без ожидания (None, пока первое определение не завершено)
+    
+    Первый вызов запускает определение в фоне.
+    """
+    provider = get_hardware_id_provider()
+    provider.prefetch()
+    return provider.uuid
+
 def get_hardware_id(force_regenerate: bool = False) -> str:
     """
     Получает Hardware ID (синглтон) с кэшированием
@@ -78,6 +99,7 @@ __all__ = [
     # Основные классы
     'HardwareIdentifier',
     'HardwareIdConfigManager',
+    'HardwareIdProvider',
     
     # Типы данных
     'HardwareIdResult',
@@ -97,5 +119,7 @@ __all__ = [
     'validate_hardware_id',
     'is_available',
     'get_hardware_identifier',
+    'get_hardware_id_provider',
+    'get_cached_hardware_id',
     'get_hardware_id_config'
 ]
@@ -9,6 +9,7 @@ from .types import (
     CacheInfo
 )
 from .config import get_hardware_id_config, HardwareIdConfigManager
+from .provider import HardwareIdProvider
 
 __all__ = [
     'HardwareIdentifier',
@@ -20,5 +21,6 @@ __all__ = [
     'HardwareIdValidationError',
     'CacheInfo',
     'get_hardware_id_config',
-    'HardwareIdConfigManager'
+    'HardwareIdConfigManager',
+    'HardwareIdProvider'
 ]
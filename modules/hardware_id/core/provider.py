@@ -0,0 +1,184 @@
+"""
+Hardware ID процесса - определяется один раз в фоне, читается без ожидания
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+from modules.metrics import get_registry
+
+from .types import HardwareIdResult, HardwareIdStatus
+
+logger = logging.getLogger(__name__)
+
+
+class HardwareIdProvider:
+    """
+    Мемоизированный Hardware ID
+
+    prefetch() при старте запускает определение в фоновом потоке (кэш на
+    диске или system_profiler), дальше uuid читается синхронно. refresh()
+    переопределяет ID в фоне: до готовности нового значения отдаётся
+    прежнее, неудачное обновление прежнее значение не затирает.
+
+    Метрики (реестр hardware_id): resolve_ms - каждое определение,
+    cold_start_ms - от prefetch() до первого ID, refreshes, failures.
+    """
+
+    def __init__(self, identifier_factory: Optional[Callable[[], object]] = None):
+        self._identifier_factory = identifier_factory
+        self._identifier = None
+        self._result: Optional[HardwareIdResult] = None
+        self._lock = threading.Lock()
+        # Определение первого ID завершено (успешно или нет); сбрасывается при повторе
+        self._settled = threading.Event()
+        # wait_ready(): future ожидающих корутин и их event loop
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = []
+        self._thread: Optional[threading.Thread] = None
+        self._prefetch_started: Optional[float] = None
+        self._listeners: List[Callable[[HardwareIdResult], None]] = []
+        self.cold_start_ms: Optional[float] = None
+
+        metrics = get_registry('hardware_id')
+        self._m_resolve = metrics.histogram('resolve_ms')
+        self._m_cold_start = metrics.gauge('cold_start_ms')
+        self._m_refreshes = metrics.counter('refreshes')
+        self._m_failures = metrics.counter('failures')
+
+    @property
+    def uuid(self) -> Optional[str]:
+        """Hardware ID без ожидания (None - ещё не определён)"""
+        result = self._result
+        return result.uuid if result is not None else None
+
+    @property
+    def result(self) -> Optional[HardwareIdResult]:
+        return self._result
+
+    def is_ready(self) -> bool:
+        return self._result is not None
+
+    def add_listener(self, callback: Callable[[HardwareIdResult], None]):
+        """callback(result) после каждого успешного определения (из фонового потока)"""
+        self._listeners.append(callback)
+
+    def prefetch(self) -> bool:
+        """
+        Начать определение в фоне, если ID ещё нет и определение не идёт
+
+        Returns:
+            True, если запущено новое определение
+        """
+        with self._lock:
+            if self._result is not None or self._busy():
+                return False
+            if self._prefetch_started is None:
+                self._prefetch_started = time.perf_counter()
+            return self._spawn(force=False)
+
+    def refresh(self, force: bool = False) -> bool:
+        """Переопределить ID в фоне (текущее значение остаётся доступным)"""
+        with self._lock:
+            if self._busy():
+                return False
+            self._m_refreshes.inc()
+            return self._spawn(force=force)
+
+    def resolve(self, force: bool = False) -> Optional[HardwareIdResult]:
+        """Определить ID в текущем потоке (блокирует - только вне event loop)"""
+        started = time.perf_counter()
+        try:
+            if self._identifier is None:
+                self._identifier = self._make_identifier()
+            result = self._identifier.get_hardware_id(force)
+        except Exception as e:
+            result = None
+            logger.error(f"❌ Ошибка определения Hardware ID: {e}")
+        self._m_resolve.observe_since(started)
+
+        if result is None or not result.uuid or result.status not in (HardwareIdStatus.SUCCESS, HardwareIdStatus.CACHED):
+            self._m_failures.inc()
+            error = getattr(result, 'error_message', None)
+            logger.warning(f"⚠️ Hardware ID не определён: {error or 'нет результата'}"
+                           + (" - остаётся прежний" if self._result is not None else ""))
+            self._settle()
+            return self._result
+
+        first = self._result is None
+        self._result = result
+        if first and self._prefetch_started is not None:
+            self.cold_start_ms = (time.perf_counter() - self._prefetch_started) * 1000.0
+            self._m_cold_start.set(self.cold_start_ms)
+            logger.info(f"🆔 Hardware ID готов через {self.cold_start_ms:.0f}мс после старта ({result.source})")
+        self._settle()
+        for callback in list(self._listeners):
+            try:
+                callback(result)
+            except Exception as e:
+                logger.debug(f"Hardware ID listener: {e}")
+        return result
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Дождаться первого определения (блокирует поток)"""
+        self.prefetch()
+        self._settled.wait(timeout)
+        return self.uuid
+
+    async def wait_ready(self, timeout: Optional[float] = None) -> Optional[str]:
+        """Дождаться определения ID, не блокируя event loop (после неудачи запускается повтор)"""
+        if self._result is not None:
+            return self._result.uuid
+        self.prefetch()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        waiter = (loop, future)
+        with self._lock:
+            if self._settled.is_set():
+                return self.uuid
+            self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            with self._lock:
+                if waiter in self._waiters:
+                    self._waiters.remove(waiter)
+        return self.uuid
+
+    def _settle(self):
+        """Определение завершено: будим wait() и wait_ready() (из фонового потока)"""
+        with self._lock:
+            self._settled.set()
+            waiters, self._waiters = self._waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(self._wake, future)
+            except RuntimeError:
+                # Event loop ожидающего уже закрыт
+                pass
+
+    @staticmethod
+    def _wake(future: asyncio.Future):
+        if not future.done():
+            future.set_result(None)
+
+    def _busy(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _spawn(self, force: bool) -> bool:
+        if self._result is None:
+            # Повтор после неудачи: ожидающие ждут его, а не прошлый результат
+            self._settled.clear()
+        self._thread = threading.Thread(target=self.resolve, args=(force,), name="HardwareIdResolve", daemon=True)
+        self._thread.start()
+        return True
+
+    def _make_identifier(self):
+        if self._identifier_factory is not None:
+            return self._identifier_factory()
+        from .hardware_identifier import HardwareIdentifier
+        return HardwareIdentifier()
@@ -22,7 +22,9 @@ class SpeechInterruptHandler:
             
             # Останавливаем плеер через speech_playback
             if self.speech_player:
-                success = self.speech_player.stop_playback()
+                # Затухание ждём без блокировки event loop (если плеер умеет)
+                stop_async = getattr(self.speech_player, 'stop_playback_async', None)
+                success = await stop_async() if stop_async else self.speech_player.stop_playback()
                 if success:
                     logger.info("✅ Речь остановлена через speech_playback")
                 else:
@@ -0,0 +1,22 @@
+"""
+Модуль metrics - метрики горячего пути (аудио, gRPC) вместо логирования каждого события
+
+Счётчики, gauge и гистограммы задержек с фиксированными корзинами;
+интеграции отдают срез через get_metrics().
+"""
+
+from .core.registry import (
+    Counter, Gauge, Histogram, MetricsRegistry,
+    get_registry, DEFAULT_LATENCY_BUCKETS_MS
+)
+from .core.sampled_log import SampledLogger
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'get_registry',
+    'DEFAULT_LATENCY_BUCKETS_MS',
+    'SampledLogger'
+]
@@ -0,0 +1,19 @@
+"""
+Основные компоненты модуля metrics
+"""
+
+from .registry import (
+    Counter, Gauge, Histogram, MetricsRegistry,
+    get_registry, DEFAULT_LATENCY_BUCKETS_MS
+)
+from .sampled_log import SampledLogger
+
+__all__ = [
+    'Counter',
+    'Gauge',
+    'Histogram',
+    'MetricsRegistry',
+    'get_registry',
+    'DEFAULT_LATENCY_BUCKETS_MS',
+    'SampledLogger'
+]
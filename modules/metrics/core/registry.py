@@ -0,0 +1,197 @@
+"""
+Metrics Registry - Счётчики, gauge и гистограммы задержек горячего пути
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Метрики создаются заранее (при инициализации), на горячем пути - только инкремент
+2. Гистограммы - фиксированные границы и предвыделенный массив счётчиков
+3. Без блокировок - под GIL редкая потеря инкремента при гонке допустима для метрик
+4. snapshot() - согласованный по смыслу (не атомарный) срез для get_metrics()
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Any, Optional, Sequence
+
+# Границы гистограмм задержек по умолчанию (мс): от десятков мкс до секунд
+DEFAULT_LATENCY_BUCKETS_MS = (
+    0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 25.0, 50.0,
+    100.0, 250.0, 500.0, 1000.0, 2500.0, 5000.0,
+)
+
+
+class Counter:
+    """Монотонный счётчик"""
+
+    __slots__ = ('name', 'value')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0
+
+    def inc(self, amount: int = 1):
+        """Увеличить счётчик"""
+        self.value += amount
+
+
+class Gauge:
+    """Текущее значение (глубина очереди, размер буфера)"""
+
+    __slots__ = ('name', 'value', 'max_value')
+
+    def __init__(self, name: str):
+        self.name = name
+        self.value = 0.0
+        self.max_value = 0.0
+
+    def set(self, value: float):
+        """Установить значение (запоминается максимум)"""
+        self.value = value
+        if value > self.max_value:
+            self.max_value = value
+
+
+class Histogram:
+    """
+    Гистограмма с фиксированными границами
+
+    counts[i] - число наблюдений <= bounds[i]; последний элемент -
+    наблюдения больше всех границ. Массив выделяется в конструкторе.
+    """
+
+    __slots__ = ('name', 'bounds', 'counts', 'count', 'total', 'max_value')
+
+    def __init__(self, name: str, bounds: Sequence[float] = DEFAULT_LATENCY_BUCKETS_MS):
+        self.name = name
+        self.bounds = tuple(sorted(float(b) for b in bounds))
+        self.counts = array('q', bytes(8 * (len(self.bounds) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.max_value = 0.0
+
+    def observe(self, value: float):
+        """Добавить наблюдение (O(log buckets))"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max_value:
+            self.max_value = value
+
+    def observe_since(self, started: float):
+        """Добавить длительность в мс от started (time.perf_counter())"""
+        self.observe((time.perf_counter() - started) * 1000.0)
+
+    def percentile(self, q: float) -> float:
+        """Оценка перцентиля сверху - граница корзины, в которую он попадает"""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank and n:
+                return self.bounds[i] if i < len(self.bounds) else self.max_value
+        return self.max_value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Срез гистограммы"""
+        count = self.count
+        buckets = {f"le_{b:g}": self.counts[i] for i, b in enumerate(self.bounds)}
+        buckets['inf'] = self.counts[len(self.bounds)]
+        return {
+            'count': count,
+            'mean': (self.total / count) if count else 0.0,
+            'max': self.max_value,
+            'p50': self.percentile(0.5),
+            'p95': self.percentile(0.95),
+            'p99': self.percentile(0.99),
+            'buckets': buckets,
+        }
+
+    def reset(self):
+        """Обнулить наблюдения"""
+        for i in range(len(self.counts)):
+            self.counts[i] = 0
+        self.count = 0
+        self.total = 0.0
+        self.max_value = 0.0
+
+
+class MetricsRegistry:
+    """
+    Набор метрик одного компонента (namespace)
+
+    counter()/gauge()/histogram() возвращают существующую метрику с тем
+    же именем - компоненты одного пространства (плеер, буфер, интеграция)
+    пишут в общие метрики. Ссылку на метрику следует сохранить при
+    инициализации, а не искать по имени на каждом событии.
+    """
+
+    def __init__(self, namespace: str):
+        self.namespace = namespace
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Counter] = {}
+        self._gauges: Dict[str, Gauge] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def counter(self, name: str) -> Counter:
+        """Получить или создать счётчик"""
+        with self._lock:
+            metric = self._counters.get(name)
+            if metric is None:
+                metric = self._counters[name] = Counter(name)
+            return metric
+
+    def gauge(self, name: str) -> Gauge:
+        """Получить или создать gauge"""
+        with self._lock:
+            metric = self._gauges.get(name)
+            if metric is None:
+                metric = self._gauges[name] = Gauge(name)
+            return metric
+
+    def histogram(self, name: str, bounds: Optional[Sequence[float]] = None) -> Histogram:
+        """Получить или создать гистограмму (границы задаются при первом создании)"""
+        with self._lock:
+            metric = self._histograms.get(name)
+            if metric is None:
+                metric = self._histograms[name] = Histogram(name, bounds or DEFAULT_LATENCY_BUCKETS_MS)
+            return metric
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Срез всех метрик пространства"""
+        with self._lock:
+            counters = list(self._counters.values())
+            gauges = list(self._gauges.values())
+            histograms = list(self._histograms.values())
+        return {
+            'namespace': self.namespace,
+            'counters': {m.name: m.value for m in counters},
+            'gauges': {m.name: {'value': m.value, 'max': m.max_value} for m in gauges},
+            'histograms': {m.name: m.snapshot() for m in histograms},
+        }
+
+    def reset(self):
+        """Обнулить все метрики (сами объекты сохраняются - ссылки остаются валидными)"""
+        with self._lock:
+            for metric in self._counters.values():
+                metric.value = 0
+            for metric in self._gauges.values():
+                metric.value = 0.0
+                metric.max_value = 0.0
+            for metric in self._histograms.values():
+                metric.reset()
+
+
+_registries: Dict[str, MetricsRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_registry(namespace: str) -> MetricsRegistry:
+    """Глобальный реестр метрик пространства (создаётся при первом обращении)"""
+    with _registries_lock:
+        registry = _registries.get(namespace)
+        if registry is None:
+            registry = _registries[namespace] = MetricsRegistry(namespace)
+        return registry
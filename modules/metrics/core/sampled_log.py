@@ -0,0 +1,38 @@
+"""
+Sampled Log - Отладочное логирование горячего пути с прореживанием
+"""
+
+import logging
+
+
+class SampledLogger:
+    """
+    DEBUG лог каждого N-го события
+
+    Сообщение форматируется (%-аргументы) только для записываемых событий
+    и только если DEBUG включён - на остальных вызовах один инкремент.
+    """
+
+    __slots__ = ('_logger', '_every', '_count')
+
+    def __init__(self, logger: logging.Logger, every: int = 100):
+        """
+        Args:
+            logger: Логгер компонента
+            every: Писать каждое every-е событие (первое пишется всегда)
+        """
+        self._logger = logger
+        self._every = max(1, int(every))
+        self._count = 0
+
+    def debug(self, msg: str, *args):
+        """Записать событие (в лог попадает 1 из every)"""
+        count = self._count
+        self._count = count + 1
+        if count % self._every == 0 and self._logger.isEnabledFor(logging.DEBUG):
+            self._logger.debug(msg + " [1/%d, всего %d]", *args, self._every, count + 1)
+
+    @property
+    def count(self) -> int:
+        """Сколько событий прошло через логгер"""
+        return self._count
@@ -18,6 +18,7 @@ from .core.types import (
     ScreenshotTimeoutError
 )
 from .core.config import get_screenshot_config
+from .core.blob_store import ScreenshotBlob, ScreenshotBlobStore, get_screenshot_store
 
 __all__ = [
     # Основные классы
@@ -41,7 +42,12 @@ __all__ = [
     'ScreenshotTimeoutError',
     
     # Конфигурация
-    'get_screenshot_config'
+    'get_screenshot_config',
+    
+    # Передача скриншота в памяти
+    'ScreenshotBlob',
+    'ScreenshotBlobStore',
+    'get_screenshot_store'
 ]
 
 # Версия модуля
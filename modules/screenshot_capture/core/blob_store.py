@@ -0,0 +1,160 @@
+"""
+Screenshot Blob Store - Передача скриншота между интеграциями в памяти
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Захват кладёт байты изображения по session_id и публикует только handle
+2. gRPC интеграция забирает байты по handle (тот же объект bytes, без копий)
+3. Бюджет по байтам и количеству - старые (LRU) записи вытесняются
+4. Диск не участвует - запись файла остаётся опциональным debug sink интеграции
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScreenshotBlob:
+    """Скриншот в памяти"""
+    session_id: Any
+    data: bytes
+    mime_type: str = "image/jpeg"
+    width: Optional[int] = None
+    height: Optional[int] = None
+
+
+class ScreenshotBlobStore:
+    """
+    LRU хранилище скриншотов с бюджетом по байтам
+
+    handle - строка "<session_id>#<n>": повторный захват той же сессии
+    получает новый handle, старый скриншот сессии заменяется.
+    """
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, max_items: int = 8):
+        """
+        Args:
+            max_bytes: Бюджет памяти на все скриншоты
+            max_items: Максимум скриншотов одновременно
+        """
+        self.max_bytes = int(max_bytes)
+        self.max_items = max(1, int(max_items))
+        self._lock = threading.Lock()
+        self._blobs: "OrderedDict[str, ScreenshotBlob]" = OrderedDict()
+        self._by_session: Dict[Any, str] = {}
+        self._bytes = 0
+        self._seq = count(1)
+        self._stats = {'puts': 0, 'takes': 0, 'misses': 0, 'evictions': 0, 'rejected': 0}
+
+    def configure(self, max_bytes: Optional[int] = None, max_items: Optional[int] = None):
+        """Изменить бюджет (лишние записи вытесняются сразу)"""
+        with self._lock:
+            if max_bytes is not None:
+                self.max_bytes = int(max_bytes)
+            if max_items is not None:
+                self.max_items = max(1, int(max_items))
+            self._evict_locked()
+
+    def put(self, session_id: Any, data: bytes, mime_type: str = "image/jpeg",
+            width: Optional[int] = None, height: Optional[int] = None) -> Optional[str]:
+        """
+        Положить скриншот сессии
+
+        Returns:
+            handle для события screenshot.captured или None, если скриншот больше бюджета
+        """
+        size = len(data)
+        if size > self.max_bytes:
+            self._stats['rejected'] += 1
+            logger.warning(f"⚠️ Скриншот {size} байт больше бюджета {self.max_bytes} - не сохранён")
+            return None
+        with self._lock:
+            previous = self._by_session.pop(session_id, None)
+            if previous is not None:
+                self._drop_locked(previous)
+            handle = f"{session_id}#{next(self._seq)}"
+            self._blobs[handle] = ScreenshotBlob(session_id, data, mime_type, width, height)
+            self._by_session[session_id] = handle
+            self._bytes += size
+            self._stats['puts'] += 1
+            self._evict_locked()
+        return handle
+
+    def take(self, handle: Optional[str]) -> Optional[ScreenshotBlob]:
+        """Забрать скриншот по handle (запись удаляется, байты не копируются)"""
+        if not handle:
+            return None
+        with self._lock:
+            blob = self._drop_locked(handle)
+            if blob is None:
+                self._stats['misses'] += 1
+                return None
+            if self._by_session.get(blob.session_id) == handle:
+                del self._by_session[blob.session_id]
+            self._stats['takes'] += 1
+            return blob
+
+    def discard_session(self, session_id: Any):
+        """Удалить скриншот сессии (сессия отменена)"""
+        with self._lock:
+            handle = self._by_session.pop(session_id, None)
+            if handle is not None:
+                self._drop_locked(handle)
+
+    def clear(self):
+        """Удалить все скриншоты"""
+        with self._lock:
+            self._blobs.clear()
+            self._by_session.clear()
+            self._bytes = 0
+
+    @property
+    def size_bytes(self) -> int:
+        """Занятая память"""
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Статистика хранилища"""
+        return {
+            **self._stats,
+            'items': len(self._blobs),
+            'size_bytes': self._bytes,
+            'max_bytes': self.max_bytes,
+            'max_items': self.max_items,
+        }
+
+    def _drop_locked(self, handle: str) -> Optional[ScreenshotBlob]:
+        blob = self._blobs.pop(handle, None)
+        if blob is not None:
+            self._bytes -= len(blob.data)
+        return blob
+
+    def _evict_locked(self):
+        while self._blobs and (self._bytes > self.max_bytes or len(self._blobs) > self.max_items):
+            handle, blob = self._blobs.popitem(last=False)
+            self._bytes -= len(blob.data)
+            if self._by_session.get(blob.session_id) == handle:
+                del self._by_session[blob.session_id]
+            self._stats['evictions'] += 1
+            logger.debug(f"📸 Скриншот {handle} вытеснен из памяти (LRU)")
+
+
+_store: Optional[ScreenshotBlobStore] = None
+_store_lock = threading.Lock()
+
+
+def get_screenshot_store() -> ScreenshotBlobStore:
+    """Общее хранилище скриншотов процесса (создаётся при первом обращении)"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ScreenshotBlobStore()
+        return _store
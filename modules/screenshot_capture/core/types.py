@@ -41,21 +41,39 @@ class ScreenshotConfig:
 
 @dataclass
 class ScreenshotData:
-    """Данные скриншота"""
-    base64_data: str
+    """
+    Данные скриншота
+
+    Основное представление - raw_bytes (закодированное изображение как есть).
+    base64_data - для совместимости: вычисляется при первом обращении к get_base64().
+    """
     format: ScreenshotFormat
     width: int
     height: int
     size_bytes: int
     mime_type: str
     metadata: Dict[str, Any]
+    raw_bytes: Optional[bytes] = None
+    base64_data: Optional[str] = None
+    
+    def get_bytes(self) -> bytes:
+        """Изображение в байтах (без base64, если захват отдал байты)"""
+        if self.raw_bytes is None and self.base64_data:
+            self.raw_bytes = base64.b64decode(self.base64_data)
+        return self.raw_bytes or b""
+    
+    def get_base64(self) -> str:
+        """Изображение в base64 (legacy путь)"""
+        if self.base64_data is None and self.raw_bytes is not None:
+            self.base64_data = base64.b64encode(self.raw_bytes).decode("ascii")
+        return self.base64_data or ""
     
     def to_dict(self) -> Dict[str, Any]:
         """Конвертирует в словарь для совместимости с text_processor"""
         return {
             "mime_type": self.mime_type,
-            "data": self.base64_data,
-            "raw_bytes": None,
+            "data": self.get_base64(),
+            "raw_bytes": self.raw_bytes,
             "width": self.width,
             "height": self.height,
             "size_bytes": self.size_bytes,
@@ -66,12 +84,15 @@ class ScreenshotData:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ScreenshotData':
         """Создает из словаря"""
+        raw_bytes = data.get("raw_bytes")
+        base64_data = data.get("data")
         return cls(
-            base64_data=data["data"],
+            raw_bytes=raw_bytes,
+            base64_data=base64_data,
             format=ScreenshotFormat(data.get("format", "jpeg")),
             width=data.get("width", 0),
             height=data.get("height", 0),
-            size_bytes=data.get("size_bytes", len(data["data"])),
+            size_bytes=data.get("size_bytes", len(raw_bytes) if raw_bytes is not None else len(base64_data or "")),
             mime_type=data["mime_type"],
             metadata=data.get("metadata", {})
         )
@@ -98,7 +119,7 @@ class ScreenshotResult:
     
     def is_valid(self) -> bool:
         """Проверяет валидность результата"""
-        return self.success and self.data is not None and self.data.base64_data
+        return self.success and self.data is not None and bool(self.data.raw_bytes or self.data.base64_data)
 
 class ScreenshotError(Exception):
     """Базовое исключение для модуля скриншотов"""
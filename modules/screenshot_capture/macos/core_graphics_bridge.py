@@ -8,7 +8,6 @@ Requirements (ensure in requirements.txt and PyInstaller hiddenimports):
 - pyobjc-framework-Cocoa
 """
 
-import base64
 import time
 from typing import Any, Dict, Tuple
 
@@ -99,7 +98,6 @@ class CoreGraphicsBridge:
             NSBitmapImageFileTypeJPEG, {NSImageCompressionFactor: compression}
         )
         blob = bytes(nsdata)
-        b64 = base64.b64encode(blob).decode("utf-8")
         width, height = rep.pixelsWide(), rep.pixelsHigh()
 
         metadata = {
@@ -111,7 +109,7 @@ class CoreGraphicsBridge:
         return ScreenshotResult(
             success=True,
             data=ScreenshotData(
-                base64_data=b64,
+                raw_bytes=blob,
                 width=width,
                 height=height,
                 format=ScreenshotFormat.JPEG,
@@ -9,7 +9,6 @@ import tempfile
 import subprocess
 import shlex
 import time
-import base64
 from pathlib import Path
 from typing import Tuple, Optional, Dict, Any
 
@@ -85,18 +84,16 @@ class SimpleCoreGraphicsBridge:
             width, height = self._get_image_dimensions(temp_file)
             file_size = temp_file.stat().st_size
             
-            # Читаем файл и кодируем в base64
+            # Читаем файл (байты как есть, без base64)
             with open(temp_file, 'rb') as f:
                 image_data = f.read()
             
-            base64_data = base64.b64encode(image_data).decode('utf-8')
-            
             # Удаляем временный файл
             temp_file.unlink()
             
             # Создаем результат
             screenshot_data = ScreenshotData(
-                base64_data=base64_data,
+                raw_bytes=image_data,
                 width=width,
                 height=height,
                 format=ScreenshotFormat.JPEG,
@@ -190,18 +187,16 @@ class SimpleCoreGraphicsBridge:
             actual_width, actual_height = self._get_image_dimensions(temp_file)
             file_size = temp_file.stat().st_size
             
-            # Читаем файл и кодируем в base64
+            # Читаем файл (байты как есть, без base64)
             with open(temp_file, 'rb') as f:
                 image_data = f.read()
             
-            base64_data = base64.b64encode(image_data).decode('utf-8')
-            
             # Удаляем временный файл
             temp_file.unlink()
             
             # Создаем результат
             screenshot_data = ScreenshotData(
-                base64_data=base64_data,
+                raw_bytes=image_data,
                 width=actual_width,
                 height=actual_height,
                 format=ScreenshotFormat.JPEG,
@@ -17,8 +17,14 @@ Speech Playback Module - Модуль воспроизведения речи
 
 from .core.player import SequentialSpeechPlayer, PlayerConfig
 from .core.buffer import ChunkBuffer, ChunkInfo
+from .core.ring_buffer import AudioRingBuffer
+from .core.jitter_buffer import AdaptiveJitterBuffer, JitterBufferConfig
+from .core.fade import FadeStage
+from .core.output_backends import NullOutputStream, RecordingOutputStream, get_output_backend
+from .core.decoder_stage import StreamingDecoder
 from .core.state import PlaybackState, ChunkState
-from .utils.audio_utils import resample_audio, convert_channels
+from .utils.audio_utils import resample_audio, convert_channels, StreamingResampler
+from .utils.audio_codecs import get_decoder, register_decoder, supported_codecs
 from .utils.device_utils import get_best_audio_device
 from .macos.core_audio import CoreAudioManager
 from .macos.security import SecurityManager
@@ -33,10 +39,22 @@ __all__ = [
     'PlayerConfig',
     'ChunkBuffer',
     'ChunkInfo',
+    'AudioRingBuffer',
+    'AdaptiveJitterBuffer',
+    'JitterBufferConfig',
+    'FadeStage',
+    'NullOutputStream',
+    'RecordingOutputStream',
+    'get_output_backend',
+    'StreamingDecoder',
     'PlaybackState',
     'ChunkState',
     'resample_audio',
     'convert_channels',
+    'StreamingResampler',
+    'get_decoder',
+    'register_decoder',
+    'supported_codecs',
     'get_best_audio_device',
     'CoreAudioManager',
     'SecurityManager',
@@ -2,21 +2,27 @@
 Buffer Management - Управление буферами чанков
 
 ОСНОВНЫЕ ПРИНЦИПЫ:
-1. Без лимитов размера - накопление всех данных
+1. Ограничение памяти - max_memory_mb на очередь и буфер воспроизведения
 2. FIFO порядок - строгий порядок чанков
 3. Thread-safety - безопасная работа в многопоточной среде
-4. Memory protection - защита от критических утечек памяти
+4. Backpressure - при нехватке места политика BLOCK ждёт место (без потери аудио),
+   DROP_OLDEST выбрасывает старые чанки очереди
+5. Event-driven - ожидающие будятся событиями (приход чанка, опустошение, освобождение места), без опроса
 """
 
+import asyncio
 import logging
-import queue
 import threading
 import time
 import numpy as np
+from collections import deque
 from dataclasses import dataclass
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 from datetime import datetime
-from .state import ChunkState
+from .state import ChunkState, BackpressurePolicy
+from .ring_buffer import AudioRingBuffer
+from .fade import FadeStage
+from modules.metrics import get_registry, SampledLogger
 
 logger = logging.getLogger(__name__)
 
@@ -30,21 +36,37 @@ class ChunkInfo:
     state: ChunkState
     priority: int = 0
     metadata: Optional[Dict[str, Any]] = None
+    # Учтённые в лимите памяти байты и поколение буфера (clear_all начинает новое)
+    accounted_bytes: int = 0
+    generation: int = 0
     
     def __post_init__(self):
         """Инициализация после создания"""
         if self.metadata is None:
             self.metadata = {}
 
+class BufferFullError(Exception):
+    """Нет места в ChunkBuffer за отведённое время ожидания"""
+
 class ChunkBuffer:
     """
     Буфер для управления чанками аудио (2D: frames x channels)
     
+    Память ограничена max_memory_mb: учитываются чанки в очереди и чанки,
+    ещё не доигранные из кольцевого буфера. Место освобождается, когда
+    audio callback забрал все фреймы чанка (mark_chunk_completed), поэтому
+    кольцевой буфер не растёт сверх лимита. При нехватке места add_chunk
+    ждёт (BLOCK) или выбрасывает старые чанки очереди (DROP_OLDEST);
+    add_chunk_async ждёт места, не блокируя event loop.
+    
     ВАЖНО: Параметры по умолчанию - fallback значения.
     Рекомендуется передавать параметры из централизованной конфигурации.
     """
 
-    def __init__(self, max_memory_mb: int = 256, channels: int = 1, dtype: np.dtype = np.int16):
+    def __init__(self, max_memory_mb: int = 256, channels: int = 1, dtype: np.dtype = np.int16,
+                 capacity_frames: int = 1 << 18,
+                 overflow_policy: Union[BackpressurePolicy, str] = BackpressurePolicy.BLOCK,
+                 fade_stage: Optional[FadeStage] = None):
         """
         Инициализация буфера
 
@@ -52,20 +74,52 @@ class ChunkBuffer:
             max_memory_mb: Максимальное использование памяти в МБ
             channels: Количество каналов вывода
             dtype: Тип данных внутреннего буфера
+            capacity_frames: Начальная ёмкость кольцевого буфера воспроизведения (фреймы)
+            overflow_policy: Политика add_chunk при достижении лимита памяти
+            fade_stage: Сглаживание стыков при записи в кольцевой буфер (None - запись как есть)
         """
-        self._chunk_queue = queue.Queue()
+        # Очередь чанков: deque + Condition (пробуждение при добавлении и по wake_waiters)
+        self._chunk_queue: deque = deque()
+        self._queue_cond = threading.Condition()
+        self._wakeup_requested = False
+        # Чанк извлечён из очереди, но ещё не записан в кольцевой буфер
+        self._in_flight = 0
+        # Устанавливается audio callback, когда кольцевой буфер опустел
+        self._drained = threading.Event()
+        self._drained.set()
         self._channels = max(1, min(2, int(channels)))
         self._dtype = dtype
-        self._playback_buffer = np.zeros((0, self._channels), dtype=self._dtype)
+        # Предвыделенный кольцевой буфер вместо np.vstack на каждый чанк
+        self._playback_buffer = AudioRingBuffer(channels=self._channels, dtype=self._dtype, capacity_frames=capacity_frames)
         self._buffer_lock = threading.RLock()
+        self._fade_stage = fade_stage
         self._max_memory_bytes = max_memory_mb * 1024 * 1024
+        self._overflow_policy = BackpressurePolicy(overflow_policy)
+        # Учёт памяти - под _queue_cond (им же будятся ожидающие места)
         self._current_memory_usage = 0
+        self._generation = 0
+        # Ожидающие места корутины: (loop, future)
+        self._space_waiters: List[tuple] = []
         self._chunk_counter = 0
+        # Метрики горячего пути (общие для плеера speech_playback) вместо INFO лога на каждый чанк
+        metrics = get_registry('speech_playback')
+        self._m_chunks_added = metrics.counter('chunks_added')
+        self._m_chunks_buffered = metrics.counter('chunks_buffered')
+        self._m_queue_depth = metrics.gauge('queue_depth')
+        self._m_memory_bytes = metrics.gauge('buffer_memory_bytes')
+        self._m_ring_frames = metrics.gauge('ring_buffered_frames')
+        self._m_backpressure_wait = metrics.histogram('backpressure_wait_ms')
+        self._m_ring_write = metrics.histogram('ring_write_ms')
+        self._add_log = SampledLogger(logger)
+        self._buffered_log = SampledLogger(logger)
         self._stats = {
             'chunks_added': 0,
             'chunks_processed': 0,
             'chunks_completed': 0,
             'chunks_errors': 0,
+            'chunks_dropped': 0,
+            'backpressure_waits': 0,
+            'backpressure_wait_time': 0.0,
             'total_data_size': 0,
             'peak_memory_usage': 0
         }
@@ -80,19 +134,23 @@ class ChunkBuffer:
                 return
             # ✅ ПРАВИЛЬНО: Убраны конвертации каналов
             # Буфер переинициализируется при смене каналов
-            self._playback_buffer = np.zeros((0, new_ch), dtype=self._dtype)
+            self._playback_buffer.reset(new_ch)
             self._channels = new_ch
     
+    @property
+    def generation(self) -> int:
+        """Поколение буфера (увеличивается при clear_all)"""
+        return self._generation
+    
     @property
     def queue_size(self) -> int:
         """Размер очереди чанков"""
-        return self._chunk_queue.qsize()
+        return len(self._chunk_queue)
     
     @property
     def buffer_size(self) -> int:
         """Размер буфера воспроизведения"""
-        with self._buffer_lock:
-            return len(self._playback_buffer)
+        return self._playback_buffer.available
     
     @property
     def memory_usage_mb(self) -> float:
@@ -101,87 +159,279 @@ class ChunkBuffer:
     
     @property
     def is_empty(self) -> bool:
-        """Пуст ли буфер"""
-        return self.queue_size == 0 and self.buffer_size == 0
+        """Пуст ли буфер (очередь, чанк в пути и кольцевой буфер)"""
+        return self.queue_size == 0 and self._in_flight == 0 and self.buffer_size == 0
     
     @property
     def has_data(self) -> bool:
         """Есть ли данные для воспроизведения"""
         return self.buffer_size > 0
     
-    def add_chunk(self, audio_data: np.ndarray, priority: int = 0, metadata: Optional[Dict[str, Any]] = None) -> str:
+    @property
+    def frames_written(self) -> int:
+        """Всего фреймов записано в буфер воспроизведения (монотонный счётчик)"""
+        return self._playback_buffer.frames_written
+    
+    @property
+    def frames_read(self) -> int:
+        """Всего фреймов воспроизведено или сброшено (монотонный счётчик)"""
+        return self._playback_buffer.frames_read
+    
+    def add_chunk(self, audio_data: np.ndarray, priority: int = 0, metadata: Optional[Dict[str, Any]] = None,
+                  copy: Optional[bool] = None, policy: Optional[BackpressurePolicy] = None,
+                  timeout: Optional[float] = None, force: bool = False,
+                  generation: Optional[int] = None) -> Optional[str]:
         """
         Добавить чанк в буфер
         
+        ВАЖНО: С политикой BLOCK вызов ждёт освобождения места - из event
+        loop используйте add_chunk_async.
+        
         Args:
             audio_data: Аудио данные
             priority: Приоритет чанка
             metadata: Дополнительные метаданные
+            copy: Копировать данные (None - только изменяемые массивы;
+                  read-only вид на bytes хранится как есть до записи в кольцо)
+            policy: Политика при нехватке места (None - политика буфера)
+            timeout: Максимальное ожидание места для BLOCK (None - без ограничения)
+            force: Принять сразу, даже сверх лимита (хвост потока в несколько мс)
+            generation: Поколение буфера, в котором подготовлен чанк (None - текущее);
+                        после clear_all чанк прошлого поколения отбрасывается
             
         Returns:
-            ID чанка
+            ID чанка или None, если буфер очистили (clear_all) во время ожидания
+            
+        Raises:
+            BufferFullError: Место не освободилось за timeout
         """
         try:
             # Создаем ID чанка
             chunk_id = f"chunk_{self._chunk_counter}_{int(time.time() * 1000)}"
             self._chunk_counter += 1
             
+            if copy is None:
+                copy = audio_data.flags.writeable
+            
             # Создаем информацию о чанке
             chunk_info = ChunkInfo(
                 id=chunk_id,
-                data=audio_data.copy(),  # Копируем данные для безопасности
+                data=audio_data.copy() if copy else audio_data,  # Изменяемые данные вызывающего копируем
                 timestamp=time.time(),
                 size=len(audio_data),
                 state=ChunkState.PENDING,
                 priority=priority,
                 metadata=metadata or {}
             )
+            nbytes = audio_data.nbytes
+            policy = self._overflow_policy if policy is None else BackpressurePolicy(policy)
             
-            # Проверяем использование памяти
-            if self._current_memory_usage + audio_data.nbytes > self._max_memory_bytes:
-                logger.warning(f"⚠️ Превышен лимит памяти: {self.memory_usage_mb:.1f}MB")
-                self._emergency_cleanup()
-            
-            # Добавляем в очередь
-            self._chunk_queue.put(chunk_info)
-            
-            # Обновляем статистику
-            self._stats['chunks_added'] += 1
-            self._stats['total_data_size'] += audio_data.nbytes
-            self._current_memory_usage += audio_data.nbytes
+            with self._queue_cond:
+                if generation is None:
+                    generation = self._generation
+                if not force and generation == self._generation and not self._has_space(nbytes):
+                    if policy == BackpressurePolicy.DROP_OLDEST:
+                        self._drop_oldest(nbytes)
+                    if not self._has_space(nbytes):
+                        self._wait_for_space(nbytes, timeout, generation)
+                if generation != self._generation:
+                    # Остановка/прерывание до записи или во время ожидания - чанк устарел
+                    logger.debug("🧹 Буфер очищен до записи чанка - чанк отброшен")
+                    return None
+                
+                # Резервируем место и будим поток воспроизведения
+                chunk_info.accounted_bytes = nbytes
+                chunk_info.generation = self._generation
+                self._current_memory_usage += nbytes
+                self._chunk_queue.append(chunk_info)
+                self._queue_cond.notify_all()
             
-            if self._current_memory_usage > self._stats['peak_memory_usage']:
-                self._stats['peak_memory_usage'] = self._current_memory_usage
+                # Обновляем статистику
+                self._stats['chunks_added'] += 1
+                self._stats['total_data_size'] += nbytes
+                if self._current_memory_usage > self._stats['peak_memory_usage']:
+                    self._stats['peak_memory_usage'] = self._current_memory_usage
+                queue_depth = len(self._chunk_queue)
             
-            logger.info(f"✅ Чанк добавлен: {chunk_id} (size: {len(audio_data)}, queue: {self.queue_size})")
+            self._m_chunks_added.inc()
+            self._m_queue_depth.set(queue_depth)
+            self._m_memory_bytes.set(self._current_memory_usage)
+            self._add_log.debug("✅ Чанк добавлен: %s (size: %d, queue: %d)", chunk_id, len(audio_data), queue_depth)
             
             return chunk_id
             
+        except BufferFullError:
+            raise
         except Exception as e:
             logger.error(f"❌ Ошибка добавления чанка: {e}")
             raise
     
-    def get_next_chunk(self, timeout: float = 0.1) -> Optional[ChunkInfo]:
+    async def add_chunk_async(self, audio_data: np.ndarray, priority: int = 0,
+                              metadata: Optional[Dict[str, Any]] = None, copy: Optional[bool] = None,
+                              policy: Optional[BackpressurePolicy] = None,
+                              timeout: Optional[float] = None) -> Optional[str]:
+        """
+        Добавить чанк, ожидая место без блокировки event loop
+        
+        Пока корутина ждёт, вызывающий (например, чтение gRPC потока) не
+        забирает следующие сообщения - сервер притормаживается flow control.
+        
+        Args:
+            audio_data: Аудио данные
+            priority: Приоритет чанка
+            metadata: Дополнительные метаданные
+            copy: Копировать данные (см. add_chunk)
+            policy: Политика при нехватке места (None - политика буфера)
+            timeout: Максимальное ожидание места (None - без ограничения)
+            
+        Returns:
+            ID чанка или None, если буфер очистили (clear_all) во время ожидания
+        """
+        nbytes = audio_data.nbytes
+        policy = self._overflow_policy if policy is None else BackpressurePolicy(policy)
+        if policy == BackpressurePolicy.DROP_OLDEST:
+            with self._queue_cond:
+                if not self._has_space(nbytes):
+                    self._drop_oldest(nbytes)
+        # Места всё ещё нет (DROP_OLDEST - занято кольцом воспроизведения): ждём
+        generation = self._generation
+        await self.wait_for_space_async(nbytes, timeout)
+        if generation != self._generation:
+            # Остановка/прерывание во время ожидания - чанк устарел
+            logger.debug("🧹 Буфер очищен во время ожидания места - чанк отброшен")
+            return None
+        # Писатель один - место, дождавшееся здесь, никто не займёт
+        return self.add_chunk(audio_data, priority, metadata, copy=copy, policy=BackpressurePolicy.BLOCK)
+    
+    def has_space_for(self, nbytes: int) -> bool:
+        """Поместится ли чанк размером nbytes без ожидания"""
+        with self._queue_cond:
+            return self._has_space(nbytes)
+    
+    async def wait_for_space_async(self, nbytes: int, timeout: Optional[float] = None):
+        """
+        Дождаться места под nbytes (awaitable backpressure)
+        
+        Raises:
+            BufferFullError: Место не освободилось за timeout
+        """
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        waited = False
+        try:
+            while True:
+                with self._queue_cond:
+                    if self._has_space(nbytes):
+                        return
+                    future = loop.create_future()
+                    self._space_waiters.append((loop, future))
+                if not waited:
+                    waited = True
+                    self._stats['backpressure_waits'] += 1
+                    logger.debug(f"⏳ Backpressure: ждём {nbytes} bytes (занято {self.memory_usage_mb:.1f}MB)")
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise BufferFullError(f"Нет места под {nbytes} bytes за {timeout}s")
+                try:
+                    await asyncio.wait_for(future, remaining)
+                except asyncio.TimeoutError:
+                    raise BufferFullError(f"Нет места под {nbytes} bytes за {timeout}s")
+                finally:
+                    with self._queue_cond:
+                        if (loop, future) in self._space_waiters:
+                            self._space_waiters.remove((loop, future))
+        finally:
+            if waited:
+                elapsed = time.monotonic() - started
+                self._stats['backpressure_wait_time'] += elapsed
+                self._m_backpressure_wait.observe(elapsed * 1000.0)
+    
+    def _has_space(self, nbytes: int) -> bool:
+        """Место под чанк (вызывать под _queue_cond); чанк больше лимита принимается в пустой буфер"""
+        return self._current_memory_usage == 0 or self._current_memory_usage + nbytes <= self._max_memory_bytes
+    
+    def _wait_for_space(self, nbytes: int, timeout: Optional[float], generation: int):
+        """Блокирующее ожидание места или clear_all (смена generation); вызывать под _queue_cond"""
+        started = time.monotonic()
+        self._stats['backpressure_waits'] += 1
+        logger.debug(f"⏳ Backpressure: ждём {nbytes} bytes (занято {self.memory_usage_mb:.1f}MB)")
+        has_space = self._queue_cond.wait_for(
+            lambda: self._has_space(nbytes) or self._generation != generation, timeout
+        )
+        waited = time.monotonic() - started
+        self._stats['backpressure_wait_time'] += waited
+        self._m_backpressure_wait.observe(waited * 1000.0)
+        if not has_space:
+            raise BufferFullError(f"Нет места под {nbytes} bytes за {timeout}s")
+    
+    def _drop_oldest(self, nbytes: int):
+        """Выбросить старые чанки очереди, пока не хватит места (вызывать под _queue_cond)"""
+        dropped = 0
+        while self._chunk_queue and not self._has_space(nbytes):
+            chunk_info = self._chunk_queue.popleft()
+            self._release_locked(chunk_info)
+            chunk_info.state = ChunkState.CLEANED
+            dropped += 1
+        if dropped:
+            self._stats['chunks_dropped'] += dropped
+            logger.warning(f"⚠️ Лимит памяти: выброшено старых чанков из очереди: {dropped}")
+    
+    def _release_locked(self, chunk_info: ChunkInfo):
+        """Вернуть место чанка (вызывать под _queue_cond) и разбудить ожидающих"""
+        if chunk_info.accounted_bytes and chunk_info.generation == self._generation:
+            self._current_memory_usage = max(0, self._current_memory_usage - chunk_info.accounted_bytes)
+        chunk_info.accounted_bytes = 0
+        self._notify_space_locked()
+    
+    def _notify_space_locked(self):
+        """Разбудить ожидающих места потоки и корутины (вызывать под _queue_cond)"""
+        self._queue_cond.notify_all()
+        waiters, self._space_waiters = self._space_waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_resolve_future, future)
+            except RuntimeError:
+                # Event loop уже закрыт
+                pass
+    
+    def get_next_chunk(self, timeout: Optional[float] = 0.1) -> Optional[ChunkInfo]:
         """
         Получить следующий чанк из очереди
         
+        Блокируется до прихода чанка, таймаута или вызова wake_waiters().
+        
         Args:
-            timeout: Таймаут ожидания в секундах
+            timeout: Таймаут ожидания в секундах (None = без таймаута)
             
         Returns:
             Информация о чанке или None
         """
         try:
-            chunk_info = self._chunk_queue.get(timeout=timeout)
+            with self._queue_cond:
+                if not self._chunk_queue and not self._wakeup_requested:
+                    self._queue_cond.wait_for(lambda: self._chunk_queue or self._wakeup_requested, timeout)
+                if self._wakeup_requested:
+                    self._wakeup_requested = False
+                    return None
+                if not self._chunk_queue:
+                    return None
+                chunk_info = self._chunk_queue.popleft()
+                self._in_flight += 1
             chunk_info.state = ChunkState.QUEUED
             logger.debug(f"🔍 Получен чанк: {chunk_info.id}")
             return chunk_info
-        except queue.Empty:
-            return None
         except Exception as e:
             logger.error(f"❌ Ошибка получения чанка: {e}")
             return None
     
+    def wake_waiters(self):
+        """Разбудить поток, ожидающий чанк, и ожидающих завершения (например, при остановке)"""
+        with self._queue_cond:
+            self._wakeup_requested = True
+            self._queue_cond.notify_all()
+        self._drained.set()
+    
     def add_to_playback_buffer(self, chunk_info: ChunkInfo) -> bool:
         """
         Добавить чанк в буфер воспроизведения
@@ -194,29 +444,28 @@ class ChunkBuffer:
         """
         try:
             with self._buffer_lock:
-                old_size = len(self._playback_buffer)
+                started = time.perf_counter()
+                old_size = self._playback_buffer.available
 
                 data = chunk_info.data
                 # ✅ ПРАВИЛЬНО: Данные уже в правильном формате из SequentialSpeechPlayer
                 # Убраны все конвертации - плеер уже подготовил данные
-                
-                # Только проверяем форму (должна быть 2D)
-                if data.ndim == 1:
-                    data = data.reshape(-1, 1)
-                elif data.ndim > 2:
-                    data = data.reshape(data.shape[0], -1)
+                # Форма (1D/2D) нормализуется в AudioRingBuffer.write
 
-                # Добавляем в буфер (по rows)
-                if len(self._playback_buffer) == 0:
-                    self._playback_buffer = data
+                # Копируем в кольцевой буфер (амортизированно O(frames), без vstack)
+                if self._fade_stage is not None:
+                    self._fade_stage.write(self._playback_buffer, data)
                 else:
-                    self._playback_buffer = np.vstack([self._playback_buffer, data])
+                    self._playback_buffer.write(data)
 
                 chunk_info.state = ChunkState.BUFFERED
 
-                logger.info(
-                    f"✅ Чанк добавлен в буфер: {chunk_info.id} (frames: {len(data)}, buffer: {old_size} → {len(self._playback_buffer)}, ch={self._channels})"
-                )
+                self._m_ring_write.observe_since(started)
+                self._m_chunks_buffered.inc()
+                new_size = self._playback_buffer.available
+                self._m_ring_frames.set(new_size)
+                self._buffered_log.debug("✅ Чанк добавлен в буфер: %s (frames: %d, buffer: %d → %d, ch=%d)",
+                                         chunk_info.id, len(data), old_size, new_size, self._channels)
 
                 return True
                 
@@ -225,6 +474,9 @@ class ChunkBuffer:
             chunk_info.state = ChunkState.ERROR
             self._stats['chunks_errors'] += 1
             return False
+        finally:
+            with self._queue_cond:
+                self._in_flight = max(0, self._in_flight - 1)
     
     def get_playback_data(self, frames: int) -> np.ndarray:
         """
@@ -234,38 +486,37 @@ class ChunkBuffer:
             frames: Количество сэмплов
             
         Returns:
-            Аудио данные
+            Аудио данные (при нехватке дополняются тишиной)
         """
-        with self._buffer_lock:
-            if len(self._playback_buffer) >= frames:
-                data = self._playback_buffer[:frames]
-                self._playback_buffer = self._playback_buffer[frames:]
-                logger.debug(f"🎵 Воспроизведено: {frames} фреймов (осталось: {len(self._playback_buffer)})")
-                return data
-            else:
-                # Если данных недостаточно, возвращаем то что есть + тишина (2D)
-                if len(self._playback_buffer) > 0:
-                    data = self._playback_buffer.copy()
-                    current_dtype = self._playback_buffer.dtype
-                    current_ch = self._playback_buffer.shape[1]
-                    self._playback_buffer = np.zeros((0, current_ch), dtype=current_dtype)
-                    silence = np.zeros((frames - len(data), current_ch), dtype=current_dtype)
-                    result = np.vstack([data, silence])
-                    logger.debug(
-                        f"🎵 Воспроизведено: {len(data)} фреймов + {len(silence)} тишины (dtype={current_dtype}, ch={current_ch})"
-                    )
-                    return result
-                else:
-                    logger.debug(f"🎵 Нет данных, воспроизводим тишину: {frames} фреймов, ch={self._channels}")
-                    return np.zeros((frames, self._channels), dtype=self._dtype)
+        return self._playback_buffer.read(frames)
+    
+    def read_into(self, outdata: np.ndarray) -> int:
+        """
+        Заполнить массив вызывающего данными воспроизведения без аллокаций
+        
+        ВАЖНО: Вызывается из audio callback (единственный читатель) - без
+        блокировок и логирования. _buffer_lock защищает только писателей.
+        Событие опустошения выставляется только на переходе, а не на каждом блоке.
+        
+        Args:
+            outdata: Выходной массив (frames x channels), недостающее заполняется тишиной
+            
+        Returns:
+            Количество реально прочитанных фреймов
+        """
+        n = self._playback_buffer.read_into(outdata)
+        if n < outdata.shape[0] and not self._drained.is_set():
+            self._drained.set()
+        return n
     
     def mark_chunk_completed(self, chunk_info: ChunkInfo):
         """Отметить чанк как завершенный"""
         chunk_info.state = ChunkState.COMPLETED
         self._stats['chunks_completed'] += 1
         
-        # Освобождаем память
-        self._current_memory_usage -= chunk_info.data.nbytes
+        # Освобождаем память и будим ожидающих места
+        with self._queue_cond:
+            self._release_locked(chunk_info)
         chunk_info.data = np.array([], dtype=np.int16)  # Очищаем данные
         chunk_info.state = ChunkState.CLEANED
         
@@ -274,53 +525,46 @@ class ChunkBuffer:
     def clear_queue(self):
         """Очистить очередь чанков"""
         cleared_count = 0
-        while not self._chunk_queue.empty():
-            try:
-                chunk_info = self._chunk_queue.get_nowait()
-                self._current_memory_usage -= chunk_info.data.nbytes
+        with self._queue_cond:
+            while self._chunk_queue:
+                chunk_info = self._chunk_queue.popleft()
+                self._release_locked(chunk_info)
                 cleared_count += 1
-            except queue.Empty:
-                break
+            self._notify_space_locked()
         
         logger.info(f"🧹 Очередь очищена: {cleared_count} чанков")
     
     def clear_playback_buffer(self):
         """Очистить буфер воспроизведения"""
         with self._buffer_lock:
-            old_size = len(self._playback_buffer)
-            self._playback_buffer = np.zeros((0, self._channels), dtype=self._dtype)
+            old_size = self._playback_buffer.available
+            self._playback_buffer.clear()
             logger.info(f"🧹 Буфер воспроизведения очищен: {old_size} фреймов")
     
     def clear_all(self):
         """Очистить все буферы"""
         self.clear_queue()
         self.clear_playback_buffer()
-        self._current_memory_usage = 0
+        # Чанки, уже записанные в кольцо, больше не учитываются (новое поколение)
+        with self._queue_cond:
+            self._generation += 1
+            self._current_memory_usage = 0
+            self._notify_space_locked()
+        # Ожидающие завершения должны перепроверить состояние
+        self._drained.set()
         logger.info("🧹 Все буферы очищены")
     
-    def _emergency_cleanup(self):
-        """Экстренная очистка при превышении лимита памяти"""
-        logger.warning("🚨 Экстренная очистка памяти...")
-        
-        # Очищаем очередь
-        self.clear_queue()
-        
-        # Очищаем буфер воспроизведения
-        self.clear_playback_buffer()
-        
-        # Принудительная сборка мусора
-        import gc
-        gc.collect()
-        
-        logger.info("✅ Экстренная очистка завершена")
-    
     def get_stats(self) -> Dict[str, Any]:
         """Получить статистику буфера"""
         return {
             **self._stats,
             'current_memory_usage_mb': self.memory_usage_mb,
+            'max_memory_mb': self._max_memory_bytes / (1024 * 1024),
+            'overflow_policy': self._overflow_policy.value,
             'queue_size': self.queue_size,
             'buffer_size': self.buffer_size,
+            'buffer_capacity': self._playback_buffer.capacity,
+            'buffer_grow_count': self._playback_buffer.grow_count,
             'is_empty': self.is_empty,
             'has_data': self.has_data
         }
@@ -329,64 +573,34 @@ class ChunkBuffer:
         """
         Ждать завершения обработки всех чанков
         
+        Возвращается сразу после того, как audio callback забрал последний
+        фрейм (событие опустошения), без периодического опроса.
+        
         Args:
             timeout: Таймаут ожидания в секундах (None = без таймаута)
             
         Returns:
             Успешность завершения
         """
-        start_time = time.time()
+        start_time = time.monotonic()
+        deadline = None if timeout is None else start_time + timeout
         
-        while True:
+        while not self.is_empty:
+            # Сбрасываем событие и перепроверяем, чтобы не пропустить опустошение между проверками
+            self._drained.clear()
             if self.is_empty:
-                elapsed = time.time() - start_time
-                logger.info(f"✅ Все чанки обработаны за {elapsed:.1f}с")
-                return True
-            
-            # Проверяем таймаут только если он задан
-            if timeout is not None and time.time() - start_time >= timeout:
-                logger.warning(f"⚠️ Таймаут ожидания завершения ({timeout}s)")
+                break
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                logger.debug(f"⏱️ Таймаут ожидания завершения ({timeout}s)")
                 return False
-            
-            time.sleep(0.1)
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
-
+            self._drained.wait(remaining)
+        
+        elapsed = time.monotonic() - start_time
+        logger.info(f"✅ Все чанки обработаны за {elapsed:.1f}с")
+        return True
+
+def _resolve_future(future: asyncio.Future):
+    """Разбудить ожидающую место корутину (в потоке её event loop)"""
+    if not future.done():
+        future.set_result(True)
@@ -0,0 +1,179 @@
+"""
+Streaming Decoder - Декодирование сжатых чанков в рабочем потоке
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Event loop только ставит чанк в очередь - декодирование в отдельном потоке
+2. Порядок чанков сохраняется (один рабочий поток, FIFO)
+3. PCM отдаётся в sink (запись в буфер плеера) прямо из рабочего потока
+4. Очередь ограничена: заполненная очередь - сигнал backpressure для чтения сети
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Optional
+
+import numpy as np
+
+from modules.metrics import get_registry
+from ..utils.audio_codecs import AudioDecoder, get_decoder
+
+logger = logging.getLogger(__name__)
+
+# sink(session_id, pcm, sample_rate, channels, metadata)
+PcmSink = Callable[[Any, np.ndarray, int, int, Dict[str, Any]], None]
+
+
+@dataclass
+class _EncodedChunk:
+    session_id: Any
+    codec: str
+    payload: Any
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    queued_at: float = 0.0
+
+
+class StreamingDecoder:
+    """
+    Стадия декодирования между сетью и буфером плеера
+
+    submit() не блокирует; рабочий поток декодирует чанки по порядку и
+    передаёт PCM в sink. drain() ждёт, пока чанки сессии дойдут до sink
+    (перед end_stream), cancel() выбрасывает ещё не декодированные.
+    """
+
+    def __init__(self, sink: PcmSink, max_pending: int = 32):
+        """
+        Args:
+            sink: Получатель PCM (вызывается в рабочем потоке)
+            max_pending: Максимум чанков в очереди до backpressure
+        """
+        self._sink = sink
+        self.max_pending = max(1, int(max_pending))
+        self._queue: Deque[_EncodedChunk] = deque()
+        self._cond = threading.Condition()
+        self._pending: Dict[Any, int] = {}
+        self._decoders: Dict[Any, AudioDecoder] = {}
+        self._cancelled = set()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+
+        metrics = get_registry('speech_playback')
+        self._m_decode = metrics.histogram('decode_ms')
+        self._m_queue_wait = metrics.histogram('decode_queue_wait_ms')
+        self._m_decoded_bytes = metrics.counter('decoded_input_bytes')
+        self._m_decode_errors = metrics.counter('decode_errors')
+
+    def start(self):
+        """Запустить рабочий поток (идемпотентно)"""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="StreamingDecoder", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 1.0):
+        """Остановить рабочий поток; недекодированные чанки выбрасываются"""
+        with self._cond:
+            self._running = False
+            self._queue.clear()
+            self._pending.clear()
+            self._cond.notify_all()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, session_id: Any, codec: str, payload, metadata: Optional[Dict[str, Any]] = None):
+        """Поставить сжатый чанк в очередь декодирования (не блокирует)"""
+        if not self._running:
+            self.start()
+        chunk = _EncodedChunk(session_id, codec, payload, dict(metadata or {}), time.perf_counter())
+        with self._cond:
+            self._cancelled.discard(session_id)
+            self._queue.append(chunk)
+            self._pending[session_id] = self._pending.get(session_id, 0) + 1
+            self._cond.notify_all()
+
+    def has_space(self) -> bool:
+        """В очереди есть место (иначе - backpressure)"""
+        with self._cond:
+            return len(self._queue) < self.max_pending
+
+    def wait_for_space(self, timeout: Optional[float] = None) -> bool:
+        """Блокирующее ожидание места в очереди"""
+        with self._cond:
+            return self._cond.wait_for(lambda: len(self._queue) < self.max_pending or not self._running, timeout)
+
+    def pending(self, session_id: Any) -> int:
+        """Чанков сессии, ещё не переданных в sink"""
+        with self._cond:
+            return self._pending.get(session_id, 0)
+
+    def drain(self, session_id: Any, timeout: Optional[float] = None) -> bool:
+        """Дождаться, пока все чанки сессии будут декодированы и переданы в sink"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending.get(session_id) or not self._running, timeout)
+
+    def cancel(self, session_id: Any):
+        """Выбросить недекодированные чанки сессии (прерывание)"""
+        with self._cond:
+            self._cancelled.add(session_id)
+            kept = deque(c for c in self._queue if c.session_id != session_id)
+            self._queue = kept
+            self._pending.pop(session_id, None)
+            self._cond.notify_all()
+        self.forget(session_id)
+
+    def forget(self, session_id: Any):
+        """Освободить декодер завершённой сессии"""
+        decoder = self._decoders.pop(session_id, None)
+        if decoder is not None:
+            decoder.reset()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._queue or not self._running)
+                if not self._running:
+                    return
+                chunk = self._queue.popleft()
+                self._cond.notify_all()
+            try:
+                self._decode_one(chunk)
+            finally:
+                with self._cond:
+                    left = self._pending.get(chunk.session_id, 0) - 1
+                    if left > 0:
+                        self._pending[chunk.session_id] = left
+                    else:
+                        self._pending.pop(chunk.session_id, None)
+                    self._cond.notify_all()
+
+    def _decode_one(self, chunk: _EncodedChunk):
+        started = time.perf_counter()
+        self._m_queue_wait.observe((started - chunk.queued_at) * 1000.0)
+        try:
+            decoder = self._decoders.get(chunk.session_id)
+            if decoder is None or decoder.codec != chunk.codec:
+                decoder = get_decoder(chunk.codec)
+                self._decoders[chunk.session_id] = decoder
+            pcm, sample_rate, channels = decoder.decode(chunk.payload)
+        except Exception as e:
+            self._m_decode_errors.inc()
+            logger.warning(f"⚠️ Ошибка декодирования {chunk.codec} чанка сессии {chunk.session_id}: {e}")
+            return
+        self._m_decode.observe_since(started)
+        self._m_decoded_bytes.inc(len(chunk.payload))
+        if pcm.size == 0:
+            return
+        with self._cond:
+            # cancel() мог прийти, пока чанк декодировался
+            if chunk.session_id in self._cancelled:
+                return
+        try:
+            self._sink(chunk.session_id, pcm, sample_rate, channels, chunk.metadata)
+        except Exception as e:
+            logger.error(f"❌ Ошибка передачи PCM в плеер: {e}")
@@ -0,0 +1,155 @@
+"""
+Fade Stage - Сглаживание стыков чанков и остановки воспроизведения
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Таблицы fade вычисляются один раз на длину (get_fade_ramps, кэш)
+2. Всё на месте - в памяти кольцевого буфера или outdata, через предвыделенный scratch
+3. Стык сглаживается только при разрыве сигнала - непрерывный поток не трогается
+4. Остановка - несколько мс затухания в ближайшем блоке callback, а не обрыв
+"""
+
+import logging
+import numpy as np
+from typing import Dict, Any
+
+from .ring_buffer import AudioRingBuffer
+from ..utils.audio_utils import get_fade_ramps
+
+logger = logging.getLogger(__name__)
+
+
+class FadeStage:
+    """
+    Fade/crossfade стадия плеера
+
+    Писатель (поток воспроизведения, под блокировкой ChunkBuffer) вызывает
+    write() вместо AudioRingBuffer.write: если начало нового чанка
+    разрывно с хвостом уже записанного, хвост и начало смешиваются
+    (overlap-add на seam_frames фреймов); если кольцо пусто (старт или
+    underrun) и чанк начинается не с тишины - применяется короткий fade-in.
+
+    Audio callback вызывает render_stop_fade() после запроса остановки:
+    ближайшие stop_frames фреймов затухают, далее - тишина. Писатель и
+    callback используют разные scratch массивы.
+    """
+
+    def __init__(self, sample_rate: int, channels: int = 1, seam_ms: float = 2.5,
+                 stop_fade_ms: float = 5.0, guard_frames: int = 2048, jump_threshold: int = 256):
+        """
+        Инициализация стадии
+
+        Args:
+            sample_rate: Частота вывода
+            channels: Каналы вывода (outdata callback)
+            seam_ms: Длительность crossfade/fade-in на стыке (0 - выключено)
+            stop_fade_ms: Длительность затухания при остановке (0 - выключено)
+            guard_frames: Минимальный запас кольца сверх seam_frames, при котором хвост можно менять
+            jump_threshold: Скачок сэмпла int16 на стыке, считающийся разрывом (сверх наклона сигнала)
+        """
+        self.seam_frames = max(0, int(round(sample_rate * seam_ms / 1000.0)))
+        self.stop_frames = max(0, int(round(sample_rate * stop_fade_ms / 1000.0)))
+        self.guard_frames = max(0, int(guard_frames))
+        self.jump_threshold = int(jump_threshold)
+        if self.seam_frames:
+            self._seam_in, self._seam_out = get_fade_ramps(self.seam_frames)
+        if self.stop_frames:
+            self._stop_out = get_fade_ramps(self.stop_frames)[1]
+        # Scratch писателя (каналы кольца) и callback (каналы вывода)
+        self._seam_scratch = np.zeros((0, 1), dtype=np.float32)
+        self._seam_scratch_head = self._seam_scratch
+        self._stop_scratch = np.zeros((self.stop_frames, max(1, int(channels))), dtype=np.float32)
+        self._stats = {
+            'seams_checked': 0,
+            'seams_crossfaded': 0,
+            'fades_in': 0,
+        }
+
+    def set_output_channels(self, channels: int):
+        """Пересоздать scratch callback под новое число каналов (поток вывода остановлен)"""
+        self._stop_scratch = np.zeros((self.stop_frames, max(1, int(channels))), dtype=np.float32)
+
+    # -------- Писатель --------
+
+    def write(self, ring: AudioRingBuffer, data: np.ndarray) -> int:
+        """
+        Записать чанк в кольцевой буфер со сглаживанием стыка
+
+        Args:
+            ring: Кольцевой буфер воспроизведения
+            data: Аудио данные чанка (1D или 2D frames x channels)
+
+        Returns:
+            Количество фреймов, добавленных в кольцо (меньше чанка на seam_frames при crossfade)
+        """
+        n = self.seam_frames
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        if not n or data.shape[0] <= n:
+            return ring.write(data)
+
+        if self._seam_scratch.shape[0] != n or self._seam_scratch.shape[1] != ring.channels:
+            self._seam_scratch = np.zeros((n, ring.channels), dtype=np.float32)
+            self._seam_scratch_head = np.zeros((n, ring.channels), dtype=np.float32)
+
+        available = ring.available
+        if available == 0:
+            # Старт или underrun: вывод был тишиной - начинаем с нарастания
+            if abs(int(data[0, 0])) > self.jump_threshold:
+                self._stats['fades_in'] += 1
+                return ring.write(data, fade_in=self._seam_in, scratch=self._seam_scratch)
+            return ring.write(data)
+
+        self._stats['seams_checked'] += 1
+        if available < n + self.guard_frames or not self._is_discontinuous(ring, data):
+            return ring.write(data)
+
+        ring.crossfade_tail(data[:n], self._seam_out, self._seam_in,
+                            self._seam_scratch, self._seam_scratch_head)
+        self._stats['seams_crossfaded'] += 1
+        return ring.write(data[n:])
+
+    def _is_discontinuous(self, ring: AudioRingBuffer, data: np.ndarray) -> bool:
+        """Скачок на стыке заметно больше локального наклона сигнала"""
+        last = ring.last_frame(1)
+        head = int(data[0, 0])
+        slope = max(abs(last - ring.last_frame(2)), abs(int(data[1, 0]) - head))
+        return abs(head - last) > self.jump_threshold + 4 * slope
+
+    # -------- Audio callback --------
+
+    def render_stop_fade(self, reader, outdata: np.ndarray, position: int) -> int:
+        """
+        Заполнить блок callback затухающим звуком после запроса остановки
+
+        ВАЖНО: Вызывается из audio callback - без аллокаций массивов,
+        логирования и блокировок.
+
+        Args:
+            reader: Источник с read_into(outdata) (ChunkBuffer)
+            outdata: Выходной массив (frames x channels)
+            position: Сколько фреймов затухания уже выдано
+
+        Returns:
+            Новая позиция затухания (>= stop_frames - дальше только тишина)
+        """
+        remaining = self.stop_frames - position
+        if remaining <= 0 or outdata.shape[1] != self._stop_scratch.shape[1]:
+            outdata.fill(0)
+            return self.stop_frames
+        reader.read_into(outdata)
+        k = outdata.shape[0]
+        if k > remaining:
+            k = remaining
+        scaled = self._stop_scratch[:k]
+        np.copyto(scaled, outdata[:k])
+        np.multiply(scaled, self._stop_out[position:position + k], out=scaled)
+        np.copyto(outdata[:k], scaled, casting='unsafe')
+        outdata[k:] = 0
+        return position + k
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику сглаживания"""
+        stats = dict(self._stats)
+        stats['seam_frames'] = self.seam_frames
+        stats['stop_fade_frames'] = self.stop_frames
+        return stats
@@ -0,0 +1,230 @@
+"""
+Adaptive Jitter Buffer - Адаптивный порог старта воспроизведения
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Аудио не хранится здесь - данные лежат в кольцевом буфере, здесь только политика
+2. Порог старта (watermark) - сколько аудио накопить до первого сэмпла
+3. Оценка по сессиям - опоздание чанков относительно часов воспроизведения
+4. Адаптация - порог растёт при underrun и медленно сжимается при стабильной сети
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class JitterBufferConfig:
+    """
+    Конфигурация jitter buffer
+
+    ВАЖНО: Значения по умолчанию - fallback, рабочие значения приходят из
+    audio.speech_playback в unified_config.yaml через PlayerConfig.
+    """
+    enabled: bool = True
+    initial_watermark_ms: float = 60.0     # Порог для первой сессии (нет истории)
+    min_watermark_ms: float = 20.0
+    max_watermark_ms: float = 500.0
+    target_underrun_rate: float = 0.05     # Доля сессий с underrun, к которой стремимся
+    max_start_delay_ms: float = 400.0      # Старт не позже этого времени после первого чанка
+    history_sessions: int = 20             # Сколько сессий учитывать в оценке
+    underrun_growth: float = 1.5           # Рост порога при underrun внутри сессии
+    correction_step: float = 0.25          # Шаг коэффициента после сессии с underrun
+    min_correction: float = 0.5
+    max_correction: float = 4.0
+
+class AdaptiveJitterBuffer:
+    """
+    Адаптивный jitter buffer для потоковой речи
+
+    Для чанка i с временем прихода a_i и длительностью аудио до него D_i
+    опоздание L_i = (a_i - a_0) - D_i: если воспроизведение стартовало через
+    W после первого чанка, чанк i нужен в момент a_0 + W + D_i, значит
+    без underrun требуется W >= max(L_i). Порог следующей сессии - квантиль
+    (1 - target_underrun_rate) максимальных опозданий прошлых сессий,
+    умноженный на корректирующий коэффициент по фактической доле underrun.
+    """
+
+    def __init__(self, sample_rate: int, config: Optional[JitterBufferConfig] = None):
+        """
+        Инициализация jitter buffer
+
+        Args:
+            sample_rate: Частота вывода (фреймы кольцевого буфера)
+            config: Конфигурация (None - значения по умолчанию)
+        """
+        self.config = config or JitterBufferConfig()
+        self._sample_rate = int(sample_rate)
+        self._lock = threading.Lock()
+
+        self._lateness_history: deque = deque(maxlen=max(1, self.config.history_sessions))
+        self._underrun_history: deque = deque(maxlen=max(1, self.config.history_sessions))
+        self._correction = 1.0
+        self._watermark_ms = float(self.config.initial_watermark_ms)
+
+        # Состояние текущей сессии
+        self._session_id: Optional[Any] = None
+        self._first_arrival: Optional[float] = None
+        self._audio_before_ms = 0.0
+        self._max_lateness_ms = 0.0
+        self._session_underruns = 0
+        self._session_chunks = 0
+        self._started_at: Optional[float] = None
+        self._hold_since: Optional[float] = None
+        self._time_to_first_audio_ms: Optional[float] = None
+
+        # Накопительная статистика
+        self._sessions = 0
+        self._total_underruns = 0
+
+    @property
+    def watermark_ms(self) -> float:
+        """Текущий порог старта, мс"""
+        return self._watermark_ms
+
+    @property
+    def watermark_frames(self) -> int:
+        """Текущий порог старта, фреймы"""
+        return int(self._watermark_ms * self._sample_rate / 1000.0)
+
+    @property
+    def session_id(self) -> Optional[Any]:
+        """Текущая сессия"""
+        return self._session_id
+
+    def begin_session(self, session_id: Any):
+        """Начать сессию: порог выбирается по истории опозданий"""
+        with self._lock:
+            self._session_id = session_id
+            self._first_arrival = None
+            self._audio_before_ms = 0.0
+            self._max_lateness_ms = 0.0
+            self._session_underruns = 0
+            self._session_chunks = 0
+            self._started_at = None
+            self._hold_since = None
+            self._time_to_first_audio_ms = None
+            self._watermark_ms = self._estimate_watermark_ms()
+        logger.debug(f"📶 Jitter buffer: сессия {session_id}, watermark={self._watermark_ms:.0f}мс")
+
+    def on_chunk(self, frames: int, now: Optional[float] = None):
+        """Зафиксировать приход чанка (frames - длительность в фреймах вывода)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._first_arrival is None:
+                self._first_arrival = now
+                self._hold_since = now
+            lateness_ms = (now - self._first_arrival) * 1000.0 - self._audio_before_ms
+            if lateness_ms > self._max_lateness_ms:
+                self._max_lateness_ms = lateness_ms
+            self._audio_before_ms += frames * 1000.0 / self._sample_rate
+            self._session_chunks += 1
+
+    def start_deadline(self) -> Optional[float]:
+        """Крайний момент старта (monotonic) или None, если чанков ещё не было"""
+        hold_since = self._hold_since
+        if hold_since is None:
+            return None
+        return hold_since + self.config.max_start_delay_ms / 1000.0
+
+    def should_start(self, buffered_frames: int, stream_ended: bool, now: Optional[float] = None) -> bool:
+        """Пора ли открывать воспроизведение"""
+        if stream_ended or buffered_frames >= self.watermark_frames:
+            return buffered_frames > 0 or stream_ended
+        deadline = self.start_deadline()
+        now = time.monotonic() if now is None else now
+        return deadline is not None and now >= deadline and buffered_frames > 0
+
+    def on_started(self, now: Optional[float] = None) -> Optional[float]:
+        """
+        Воспроизведение сессии стартовало (первый раз или после underrun)
+
+        Returns:
+            Время до первого сэмпла (мс) при первом старте сессии, иначе None
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._started_at is not None or self._first_arrival is None:
+                return None
+            self._started_at = now
+            self._time_to_first_audio_ms = (now - self._first_arrival) * 1000.0
+            return self._time_to_first_audio_ms
+
+    def on_underrun(self, now: Optional[float] = None):
+        """Underrun посреди сессии: порог растёт сразу (для повторной буферизации)"""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._hold_since = now
+            self._session_underruns += 1
+            self._total_underruns += 1
+            self._watermark_ms = min(self.config.max_watermark_ms,
+                                     max(self.config.min_watermark_ms, self._watermark_ms * self.config.underrun_growth))
+
+    def end_session(self) -> Dict[str, Any]:
+        """Завершить сессию и обновить оценку для следующих"""
+        with self._lock:
+            if self._session_id is None:
+                return {}
+            summary = {
+                'session_id': self._session_id,
+                'chunks': self._session_chunks,
+                'underruns': self._session_underruns,
+                'max_lateness_ms': self._max_lateness_ms,
+                'time_to_first_audio_ms': self._time_to_first_audio_ms,
+                'watermark_ms': self._watermark_ms,
+            }
+            if self._session_chunks > 1:
+                self._lateness_history.append(self._max_lateness_ms)
+                self._underrun_history.append(1.0 if self._session_underruns else 0.0)
+                self._adapt_correction(self._session_underruns > 0)
+            self._sessions += 1
+            self._session_id = None
+            self._first_arrival = None
+            self._hold_since = None
+        logger.debug(f"📶 Jitter buffer: итог сессии {summary}")
+        return summary
+
+    def _adapt_correction(self, had_underrun: bool):
+        """
+        Подстроить коэффициент под целевую долю сессий с underrun
+
+        Шаг вверх после сессии с underrun и маленький шаг вниз после чистой
+        сессии подобраны так, что коэффициент стоит на месте ровно при
+        доле underrun = target_underrun_rate.
+        """
+        target = min(0.5, max(1e-3, self.config.target_underrun_rate))
+        step = self.config.correction_step
+        if had_underrun:
+            self._correction *= 1.0 + step
+        else:
+            self._correction *= 1.0 - step * target / (1.0 - target)
+        self._correction = min(self.config.max_correction, max(self.config.min_correction, self._correction))
+
+    def _estimate_watermark_ms(self) -> float:
+        """Порог новой сессии по истории опозданий"""
+        if not self._lateness_history:
+            base = self.config.initial_watermark_ms
+        else:
+            quantile = 100.0 * (1.0 - self.config.target_underrun_rate)
+            base = float(np.percentile(np.asarray(self._lateness_history), quantile))
+        return min(self.config.max_watermark_ms, max(self.config.min_watermark_ms, base * self._correction))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Получить статистику jitter buffer"""
+        return {
+            'enabled': self.config.enabled,
+            'watermark_ms': self._watermark_ms,
+            'correction': self._correction,
+            'underrun_rate': float(np.mean(self._underrun_history)) if self._underrun_history else 0.0,
+            'sessions': self._sessions,
+            'total_underruns': self._total_underruns,
+            'session_underruns': self._session_underruns,
+            'time_to_first_audio_ms': self._time_to_first_audio_ms,
+            'history_sessions': len(self._lateness_history),
+        }
@@ -0,0 +1,200 @@
+"""
+Output Backends - Подключаемые потоки вывода для SequentialSpeechPlayer
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Плеер создаёт поток вывода через фабрику с интерфейсом sd.OutputStream
+2. sounddevice - бэкенд по умолчанию, импорт необязателен (нет PortAudio - нет бэкенда)
+3. null/recording - без аудио железа: callback вызывается по виртуальным часам устройства
+4. Используются для бенчмарков и тестов на headless Linux
+"""
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, Any, List, Optional
+
+import numpy as np
+
+try:
+    import sounddevice as sd
+    _SOUNDDEVICE_AVAILABLE = True
+except Exception:  # OSError без PortAudio (headless Linux, CI)
+    sd = None
+    _SOUNDDEVICE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Фабрика потока вывода: принимает аргументы sd.OutputStream
+OutputStreamFactory = Callable[..., Any]
+
+
+class _CallbackFlags:
+    """Аналог sd.CallbackFlags для callback плеера"""
+
+    __slots__ = ('output_underflow',)
+
+    def __init__(self, output_underflow: bool = False):
+        self.output_underflow = output_underflow
+
+    def __bool__(self) -> bool:
+        return self.output_underflow
+
+
+class NullOutputStream:
+    """
+    Поток вывода без устройства
+
+    Отдельный поток вызывает callback блоками blocksize по дедлайнам
+    виртуальных часов: блок k должен быть готов к t0 + k * blocksize / samplerate
+    (деленное на speed). Опоздание больше чем на блок отмечается флагом
+    output_underflow - как пропуск дедлайна настоящим устройством.
+    """
+
+    def __init__(self, samplerate: float = 48000, blocksize: int = 512, channels: int = 1,
+                 dtype: str = 'int16', callback: Optional[Callable] = None, device: Any = None,
+                 speed: float = 1.0, **kwargs):
+        """
+        Args:
+            samplerate: Частота вывода
+            blocksize: Фреймов в блоке callback
+            channels: Каналы вывода
+            dtype: Тип сэмплов
+            callback: callback(outdata, frames, time_info, status) как у sounddevice
+            device: Игнорируется (совместимость с sd.OutputStream)
+            speed: Скорость виртуальных часов относительно реального времени
+        """
+        self.samplerate = float(samplerate)
+        self.blocksize = int(blocksize) or 512
+        self.channels = int(channels)
+        self.dtype = np.dtype(dtype)
+        self.speed = max(1e-3, float(speed))
+        self._callback = callback
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.frames_rendered = 0
+        self.late_blocks = 0
+        self.started_at: Optional[float] = None
+
+    @property
+    def active(self) -> bool:
+        """Поток вывода запущен"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Запустить виртуальное устройство"""
+        if self.active:
+            return
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="NullOutputStream", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Остановить вывод (ждёт текущий блок)"""
+        self._stop_event.set()
+        thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout=1.0)
+
+    def abort(self):
+        """Остановить вывод немедленно"""
+        self.stop()
+
+    def close(self):
+        """Освободить ресурсы"""
+        self.stop()
+        self._thread = None
+
+    def _run(self):
+        outdata = np.zeros((self.blocksize, self.channels), dtype=self.dtype)
+        period = self.blocksize / self.samplerate / self.speed
+        self.started_at = time.perf_counter()
+        block = 0
+        while not self._stop_event.is_set():
+            deadline = self.started_at + block * period
+            now = time.perf_counter()
+            if deadline > now:
+                if self._stop_event.wait(deadline - now):
+                    break
+                now = time.perf_counter()
+            late = now - deadline > period
+            if late:
+                self.late_blocks += 1
+            time_info = SimpleNamespace(currentTime=now, outputBufferDacTime=deadline + period)
+            try:
+                self._callback(outdata, self.blocksize, time_info, _CallbackFlags(late))
+            except Exception as e:
+                # Как sounddevice: исключение в callback останавливает поток
+                logger.debug(f"NullOutputStream: callback остановил поток: {e}")
+                break
+            self._on_block(outdata, now)
+            self.frames_rendered += self.blocksize
+            block += 1
+
+    def _on_block(self, outdata: np.ndarray, now: float):
+        """Обработка выданного блока (для наследников)"""
+        pass
+
+
+class RecordingOutputStream(NullOutputStream):
+    """
+    Поток вывода без устройства, сохраняющий выданный звук
+
+    Помимо данных отмечает моменты первого и последнего блока со звуком
+    (не тишина) - для измерения time-to-first-sample и задержки детекции конца.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._blocks: List[np.ndarray] = []
+        self.first_signal_at: Optional[float] = None
+        self.last_signal_at: Optional[float] = None
+
+    def _on_block(self, outdata: np.ndarray, now: float):
+        self._blocks.append(outdata.copy())
+        if outdata.any():
+            if self.first_signal_at is None:
+                self.first_signal_at = now
+            self.last_signal_at = now
+
+    def recording(self) -> np.ndarray:
+        """Весь выданный звук (frames x channels)"""
+        if not self._blocks:
+            return np.zeros((0, self.channels), dtype=self.dtype)
+        return np.concatenate(self._blocks)
+
+
+def _sounddevice_stream(**kwargs):
+    """sd.OutputStream (требует PortAudio)"""
+    if sd is None:
+        raise RuntimeError("sounddevice недоступен (PortAudio не найден) - используйте output_backend 'null'")
+    return sd.OutputStream(**kwargs)
+
+
+OUTPUT_BACKENDS: Dict[str, OutputStreamFactory] = {
+    'sounddevice': _sounddevice_stream,
+    'null': NullOutputStream,
+    'recording': RecordingOutputStream,
+}
+
+
+def get_output_backend(name: str) -> OutputStreamFactory:
+    """
+    Фабрика потока вывода по имени
+
+    Args:
+        name: sounddevice | null | recording
+
+    Returns:
+        Фабрика с аргументами sd.OutputStream
+    """
+    factory = OUTPUT_BACKENDS.get(str(name).lower())
+    if factory is None:
+        logger.warning(f"⚠️ Неизвестный output_backend '{name}', используем sounddevice")
+        return _sounddevice_stream
+    return factory
+
+
+def is_sounddevice_available() -> bool:
+    """Доступен ли sounddevice (PortAudio)"""
+    return _SOUNDDEVICE_AVAILABLE
@@ -3,7 +3,7 @@ Sequential Speech Player - Основной плеер для последова
 
 ОСНОВНЫЕ ПРИНЦИПЫ:
 1. Последовательное воспроизведение - один чанк за раз
-2. Без лимитов размера - накопление всех данных
+2. Ограниченный буфер - лимит памяти ChunkBuffer, при нехватке места backpressure
 3. Thread-safety - безопасная работа в многопоточной среде
 4. macOS совместимость - для PKG упаковки
 5. Простота и надежность - минимальная сложность
@@ -13,17 +13,21 @@ import logging
 import threading
 import time
 import asyncio
-import sounddevice as sd
 import numpy as np
-from typing import Optional, Callable, Dict, Any
+from collections import deque
+from typing import Optional, Callable, Dict, Any, Tuple
 from dataclasses import dataclass
 
 from .state import StateManager, PlaybackState, ChunkState
 from .buffer import ChunkBuffer, ChunkInfo
-from ..utils.audio_utils import resample_audio, convert_channels
+from .jitter_buffer import AdaptiveJitterBuffer, JitterBufferConfig
+from .fade import FadeStage
+from .output_backends import OutputStreamFactory, get_output_backend
+from ..utils.audio_utils import resample_audio, convert_channels, StreamingResampler
 from ..utils.device_utils import get_best_audio_device
 from ..macos.core_audio import CoreAudioManager
 from ..macos.performance import PerformanceMonitor
+from modules.metrics import get_registry, SampledLogger
 
 # ЦЕНТРАЛИЗОВАННАЯ КОНФИГУРАЦИЯ АУДИО
 from config.unified_config_loader import unified_config
@@ -45,6 +49,39 @@ class PlayerConfig:
     max_memory_mb: int = 1024 # Fallback - загружается из централизованной конфигурации
     device_id: Optional[int] = None
     auto_device_selection: bool = True
+    # Adaptive jitter buffer (порог старта воспроизведения потоковой речи)
+    jitter_buffer_enabled: bool = True
+    jitter_initial_ms: float = 60.0
+    jitter_min_ms: float = 20.0
+    jitter_max_ms: float = 500.0
+    jitter_target_underrun_rate: float = 0.05
+    jitter_max_start_delay_ms: float = 400.0
+    # Поведение при заполненном буфере: block (ждать воспроизведения) | drop_oldest
+    backpressure_policy: str = 'block'
+    # Сглаживание: crossfade на разрывных стыках чанков и затухание при остановке (0 - выключено)
+    seam_crossfade_ms: float = 2.5
+    stop_fade_ms: float = 5.0
+    # Поток вывода: sounddevice (PortAudio) | null | recording (без устройства - бенчмарки, CI)
+    output_backend: str = 'sounddevice'
+    
+    @staticmethod
+    def tuning_kwargs(config_dict: Dict[str, Any]) -> Dict[str, Any]:
+        """Параметры jitter buffer, backpressure и fade из секции audio.speech_playback (отсутствующие - по умолчанию)"""
+        keys = ('jitter_buffer_enabled', 'jitter_initial_ms', 'jitter_min_ms', 'jitter_max_ms',
+                'jitter_target_underrun_rate', 'jitter_max_start_delay_ms', 'backpressure_policy',
+                'seam_crossfade_ms', 'stop_fade_ms', 'output_backend')
+        return {key: config_dict[key] for key in keys if key in config_dict}
+    
+    def get_jitter_config(self) -> JitterBufferConfig:
+        """Конфигурация AdaptiveJitterBuffer"""
+        return JitterBufferConfig(
+            enabled=bool(self.jitter_buffer_enabled),
+            initial_watermark_ms=float(self.jitter_initial_ms),
+            min_watermark_ms=float(self.jitter_min_ms),
+            max_watermark_ms=float(self.jitter_max_ms),
+            target_underrun_rate=float(self.jitter_target_underrun_rate),
+            max_start_delay_ms=float(self.jitter_max_start_delay_ms),
+        )
     
     @classmethod
     def from_centralized_config(cls) -> 'PlayerConfig':
@@ -55,8 +92,7 @@ class PlayerConfig:
             PlayerConfig: Конфигурация из unified_config.yaml
         """
         try:
-            audio_config = unified_config.get_audio_config()
-            config_dict = audio_config.get_speech_playback_config()
+            config_dict = unified_config.get_speech_playback_config()
             
             return cls(
                 sample_rate=config_dict['sample_rate'],
@@ -65,7 +101,8 @@ class PlayerConfig:
                 buffer_size=config_dict['buffer_size'],
                 max_memory_mb=config_dict['max_memory_mb'],
                 auto_device_selection=config_dict['auto_device_selection'],
-                device_id=None  # Определяется автоматически
+                device_id=None,  # Определяется автоматически
+                **cls.tuning_kwargs(config_dict)
             )
         except Exception as e:
             logger.error(f"❌ Ошибка загрузки централизованной конфигурации: {e}")
@@ -75,12 +112,15 @@ class PlayerConfig:
 class SequentialSpeechPlayer:
     """Плеер для последовательного воспроизведения речи"""
     
-    def __init__(self, config: Optional[PlayerConfig] = None):
+    def __init__(self, config: Optional[PlayerConfig] = None,
+                 output_stream_factory: Optional[OutputStreamFactory] = None):
         """
         Инициализация плеера
         
         Args:
             config: Конфигурация плеера (если None, загружается из централизованной конфигурации)
+            output_stream_factory: Фабрика потока вывода с аргументами sd.OutputStream
+                (если None - по config.output_backend)
         """
         # Используем централизованную конфигурацию по умолчанию
         if config is None:
@@ -96,7 +136,12 @@ class SequentialSpeechPlayer:
         self.state_manager = StateManager()
         # Выбираем dtype буфера под конфиг (унифицировано на int16)
         buf_dtype = np.int16 if str(self.config.dtype).lower() in ('int16', 'short') else np.int16  # Всегда int16
-        self.chunk_buffer = ChunkBuffer(max_memory_mb=self.config.max_memory_mb, channels=self.config.channels, dtype=buf_dtype)
+        # Сглаживание стыков (поток воспроизведения) и затухание при остановке (audio callback)
+        self._fade = FadeStage(self.config.sample_rate, self.config.channels,
+                               seam_ms=self.config.seam_crossfade_ms, stop_fade_ms=self.config.stop_fade_ms,
+                               guard_frames=4 * self.config.buffer_size)
+        self.chunk_buffer = ChunkBuffer(max_memory_mb=self.config.max_memory_mb, channels=self.config.channels, dtype=buf_dtype,
+                                        overflow_policy=self.config.backpressure_policy, fade_stage=self._fade)
         
         # Потоки и синхронизация
         self._playback_thread: Optional[threading.Thread] = None
@@ -105,9 +150,37 @@ class SequentialSpeechPlayer:
         self._pause_event.set()  # Начинаем с разблокированной паузы
         
         # Аудио поток
-        self._audio_stream: Optional[sd.OutputStream] = None
+        self._output_stream_factory = output_stream_factory or get_output_backend(self.config.output_backend)
+        self._audio_stream: Optional[Any] = None
         self._stream_lock = threading.RLock()
         
+        # Счётчики real-time callback (изменяются только из audio callback)
+        self._reset_realtime_stats()
+        
+        # Потоковый resampler текущей сессии (состояние фильтра живёт между чанками)
+        self._resampler: Optional[StreamingResampler] = None
+        self._resampler_key: Optional[tuple] = None
+        
+        # Jitter buffer: пока "ворота" закрыты, callback выдаёт тишину и копит данные
+        self._jitter = AdaptiveJitterBuffer(self.config.sample_rate, self.config.get_jitter_config())
+        self._stream_session: Optional[Any] = None
+        self._stream_ended = True
+        self._gate_open = True
+        self._underruns_reported = 0
+        
+        # Затухание при остановке: позиция (-1 - не запрошено) и событие "звук затих"
+        self._stop_fade_pos = -1
+        self._stop_fade_done = threading.Event()
+        
+        # Метрики горячего пути (пространство speech_playback, общее с ChunkBuffer)
+        metrics = get_registry('speech_playback')
+        self._m_chunks_completed = metrics.counter('chunks_completed')
+        self._m_underruns = metrics.counter('underruns')
+        self._m_prepare = metrics.histogram('chunk_prepare_ms')
+        self._m_time_to_first_audio = metrics.histogram('time_to_first_audio_ms')
+        self._add_log = SampledLogger(logger)
+        self._completed_log = SampledLogger(logger)
+        
         # macOS компоненты
         self._core_audio_manager = CoreAudioManager()
         self._performance_monitor = PerformanceMonitor()
@@ -162,68 +235,61 @@ class SequentialSpeechPlayer:
             self.state_manager.set_state(PlaybackState.ERROR)
             return False
     
-    def add_audio_data(self, audio_data: np.ndarray, priority: int = 0, metadata: Optional[Dict[str, Any]] = None) -> str:
+    def add_audio_data(self, audio_data: np.ndarray, priority: int = 0,
+                       metadata: Optional[Dict[str, Any]] = None,
+                       generation: Optional[int] = None) -> Optional[str]:
         """
         Добавить аудио данные для воспроизведения
         
+        ВАЖНО: При заполненном буфере (политика BLOCK) ждёт освобождения
+        места - из event loop используйте add_audio_data_async.
+        
         Args:
             audio_data: Аудио данные
             priority: Приоритет чанка
             metadata: Дополнительные метаданные
+            generation: Поколение буфера на момент получения данных (см. ChunkBuffer.add_chunk)
             
         Returns:
-            ID чанка
+            ID чанка или None, если воспроизведение остановили во время ожидания
         """
         try:
-            # ✅ ПРАВИЛЬНО: ЕДИНСТВЕННАЯ конвертация в модуле плеера
-            # Только dtype конвертация - все остальные конвертации убраны
-            
-            # Проверяем и конвертируем dtype если необходимо
-            if audio_data.dtype == np.float32 or audio_data.dtype == np.float64:
-                # float32/float64 → int16
-                audio_data = np.clip(audio_data, -1.0, 1.0)
-                audio_data = (audio_data * 32767.0).astype(np.int16)
-                logger.debug(f"🔄 Конвертация: {audio_data.dtype} → int16")
-            elif audio_data.dtype != np.int16:
-                # другие типы → int16
-                audio_data = audio_data.astype(np.int16)
-                logger.debug(f"🔄 Конвертация: {audio_data.dtype} → int16")
-            # Если уже int16 - оставляем как есть
-            
-            # Убеждаемся, что данные в правильной форме [samples, channels]
-            if audio_data.ndim == 1:
-                # 1D → 2D [samples, 1] для моно
-                audio_data = audio_data.reshape(-1, 1)
-                current_channels = 1
-            elif audio_data.ndim > 2:
-                # 3D+ → 2D
-                audio_data = audio_data.reshape(audio_data.shape[0], -1)
-                current_channels = audio_data.shape[1]
-            else:
-                current_channels = audio_data.shape[1]
-
-            # ✅ ИСПРАВЛЕНИЕ: Упрощенная логика каналов
-            # Оставляем данные как есть - sounddevice сам разберется с конвертацией
-            target_channels = int(self.config.channels)
-            
-            # Только базовая конвертация если действительно необходимо
-            if current_channels != target_channels:
-                if current_channels == 1 and target_channels == 1:
-                    # Моно → Моно: оставляем как есть
-                    pass
-                elif current_channels == 1 and target_channels > 1:
-                    # Моно → Стерео: НЕ дублируем, пусть sounddevice разберется
-                    logger.debug(f"🔄 Моно аудио будет воспроизведено на {target_channels} каналах")
-                elif current_channels > 1 and target_channels == 1:
-                    # Стерео → Моно: берем первый канал
-                    audio_data = audio_data[:, :1]
-                    logger.debug(f"🔄 Стерео → Моно: взят первый канал")
-                # Остальные случаи оставляем как есть
-
+            audio_data, copy = self._prepare_audio_data(audio_data, metadata)
+            
             # Добавляем в буфер
-            chunk_id = self.chunk_buffer.add_chunk(audio_data, priority, metadata)
+            chunk_id = self.chunk_buffer.add_chunk(audio_data, priority, metadata, copy=copy,
+                                                   generation=generation)
+            if chunk_id is None:
+                return None
+            
+            self._add_log.debug("✅ Аудио данные добавлены: %s (size: %d)", chunk_id, len(audio_data))
+            
+            return chunk_id
+            
+        except Exception as e:
+            logger.error(f"❌ Ошибка добавления аудио данных: {e}")
+            self.state_manager.set_state(PlaybackState.ERROR)
+            raise
+    
+    async def add_audio_data_async(self, audio_data: np.ndarray, priority: int = 0,
+                                   metadata: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """
+        Добавить аудио данные, ожидая место в буфере без блокировки event loop
+        
+        Пока плеер отстаёт, корутина ждёт - вызывающий (чтение gRPC потока)
+        не забирает следующие сообщения.
+        
+        Returns:
+            ID чанка или None, если воспроизведение остановили во время ожидания
+        """
+        try:
+            audio_data, copy = self._prepare_audio_data(audio_data, metadata)
             
-            logger.info(f"✅ Аудио данные добавлены: {chunk_id} (size: {len(audio_data)})")
+            chunk_id = await self.chunk_buffer.add_chunk_async(audio_data, priority, metadata, copy=copy)
+            if chunk_id is None:
+                return None
+            
+            self._add_log.debug("✅ Аудио данные добавлены: %s (size: %d)", chunk_id, len(audio_data))
             
             return chunk_id
             
@@ -232,6 +298,136 @@ class SequentialSpeechPlayer:
             self.state_manager.set_state(PlaybackState.ERROR)
             raise
     
+    def has_buffer_space(self, nbytes: int) -> bool:
+        """Поместится ли nbytes в буфер без ожидания (backpressure)"""
+        return self.chunk_buffer.has_space_for(nbytes)
+    
+    def _prepare_audio_data(self, audio_data: np.ndarray, metadata: Optional[Dict[str, Any]]) -> Tuple[np.ndarray, bool]:
+        """
+        Привести данные к формату вывода (dtype, каналы, частота)
+        
+        Returns:
+            (данные, нужно ли буферу копировать их)
+        """
+        # ✅ ПРАВИЛЬНО: ЕДИНСТВЕННАЯ конвертация в модуле плеера
+        # Только dtype конвертация - все остальные конвертации убраны
+        started = time.perf_counter()
+        
+        # Массив создан здесь (конвертация/ресемплинг) - буферу не нужно копировать
+        owned = False
+        
+        # Проверяем и конвертируем dtype если необходимо
+        if audio_data.dtype == np.float32 or audio_data.dtype == np.float64:
+            # float32/float64 → int16
+            audio_data = np.clip(audio_data, -1.0, 1.0)
+            audio_data = (audio_data * 32767.0).astype(np.int16)
+            owned = True
+            logger.debug(f"🔄 Конвертация: {audio_data.dtype} → int16")
+        elif audio_data.dtype.kind == 'i' and audio_data.dtype.itemsize == 2:
+            # int16 (в т.ч. big-endian вид на payload) - порядок байт приводится при записи в кольцо
+            pass
+        else:
+            # другие типы → int16
+            audio_data = audio_data.astype(np.int16)
+            owned = True
+            logger.debug(f"🔄 Конвертация: {audio_data.dtype} → int16")
+        
+        # Убеждаемся, что данные в правильной форме [samples, channels]
+        if audio_data.ndim == 1:
+            # 1D → 2D [samples, 1] для моно
+            audio_data = audio_data.reshape(-1, 1)
+            current_channels = 1
+        elif audio_data.ndim > 2:
+            # 3D+ → 2D
+            audio_data = audio_data.reshape(audio_data.shape[0], -1)
+            current_channels = audio_data.shape[1]
+        else:
+            current_channels = audio_data.shape[1]
+
+        # ✅ ИСПРАВЛЕНИЕ: Упрощенная логика каналов
+        # Оставляем данные как есть - sounddevice сам разберется с конвертацией
+        target_channels = int(self.config.channels)
+        
+        # Только базовая конвертация если действительно необходимо
+        if current_channels != target_channels:
+            if current_channels == 1 and target_channels == 1:
+                # Моно → Моно: оставляем как есть
+                pass
+            elif current_channels == 1 and target_channels > 1:
+                # Моно → Стерео: НЕ дублируем, пусть sounddevice разберется
+                logger.debug(f"🔄 Моно аудио будет воспроизведено на {target_channels} каналах")
+            elif current_channels > 1 and target_channels == 1:
+                # Стерео → Моно: берем первый канал
+                audio_data = audio_data[:, :1]
+                logger.debug(f"🔄 Стерео → Моно: взят первый канал")
+            # Остальные случаи оставляем как есть
+
+        # Приводим частоту дискретизации к частоте вывода (если источник её сообщил)
+        src_rate = (metadata or {}).get('sample_rate')
+        if src_rate and int(src_rate) != int(self.config.sample_rate):
+            audio_data = self._get_resampler(metadata.get('session_id'), int(src_rate), audio_data.shape[1]).process(audio_data)
+            owned = True
+
+        # Фиксируем приход чанка для оценки джиттера
+        if self._stream_session is not None and not self._stream_ended:
+            self._jitter.on_chunk(len(audio_data))
+        
+        self._m_prepare.observe_since(started)
+        return audio_data, not owned and audio_data.flags.writeable
+    
+    def _get_resampler(self, session_id: Any, src_rate: int, channels: int) -> StreamingResampler:
+        """Resampler для сессии: новый экземпляр при смене сессии, частоты или каналов"""
+        key = (session_id, src_rate, channels)
+        if self._resampler is None or self._resampler_key != key:
+            self._resampler = StreamingResampler(src_rate, self.config.sample_rate, channels)
+            self._resampler_key = key
+            logger.debug(f"🔄 StreamingResampler: {src_rate}Hz → {self.config.sample_rate}Hz (session: {session_id})")
+        return self._resampler
+    
+    def _flush_resampler(self, session_id: Any):
+        """Хвост фильтра resampler сессии (задержка фильтра, несколько мс) - в буфер"""
+        resampler = self._resampler
+        if resampler is None or self._resampler_key[0] != session_id:
+            return
+        self._resampler = None
+        self._resampler_key = None
+        tail = resampler.flush()
+        if not len(tail):
+            return
+        tail = StreamingResampler._to_dtype(tail, np.dtype(np.int16))
+        # Хвост крошечный: кладём без ожидания места, чтобы не блокировать вызывающего
+        self.chunk_buffer.add_chunk(tail, metadata={'session_id': session_id, 'resampler_tail': True},
+                                    copy=False, force=True)
+    
+    def begin_stream(self, session_id: Any):
+        """
+        Начало потокового ответа: порог старта выбирается по истории сессий
+        
+        До накопления порога (или окончания потока, или max_start_delay)
+        audio callback выдаёт тишину, не расходуя буфер.
+        """
+        if self._stream_session is not None and not self._stream_ended:
+            self._jitter.end_session()
+        self._jitter.begin_session(session_id)
+        self._stream_session = session_id
+        self._stream_ended = False
+        self._gate_open = not self._jitter.config.enabled
+        self.chunk_buffer.wake_waiters()
+    
+    def end_stream(self, session_id: Any = None):
+        """Поток ответа завершён: весь остаток воспроизводится без ожидания порога"""
+        if self._stream_session is None or self._stream_ended:
+            return
+        if session_id is not None and session_id != self._stream_session:
+            return
+        self._flush_resampler(self._stream_session)
+        self._stream_ended = True
+        summary = self._jitter.end_session()
+        if summary:
+            logger.debug(f"📶 Jitter buffer сессии {session_id}: {summary}")
+        # Будим поток воспроизведения - он откроет ворота
+        self.chunk_buffer.wake_waiters()
+    
     def start_playback(self) -> bool:
         """Запуск воспроизведения"""
         try:
@@ -246,6 +442,7 @@ class SequentialSpeechPlayer:
             # НЕ очищаем данные - они уже добавлены в буфер
             
             # Запускаем аудио поток
+            self._reset_realtime_stats()
             if not self._start_audio_stream():
                 self.state_manager.set_state(PlaybackState.ERROR)
                 return False
@@ -266,7 +463,30 @@ class SequentialSpeechPlayer:
             return False
     
     def stop_playback(self) -> bool:
-        """Остановка воспроизведения"""
+        """
+        Остановка воспроизведения
+        
+        ВАЖНО: Ждёт затухание (несколько мс + блок callback) - из event loop
+        используйте stop_playback_async.
+        """
+        if not self._begin_stop():
+            return False
+        timeout = self._request_stop_fade()
+        if timeout is not None:
+            self._wait_stop_fade(timeout)
+        return self._finish_stop()
+    
+    async def stop_playback_async(self) -> bool:
+        """Остановка воспроизведения: затухание ждём в executor, event loop не блокируется"""
+        if not self._begin_stop():
+            return False
+        timeout = self._request_stop_fade()
+        if timeout is not None:
+            await asyncio.get_running_loop().run_in_executor(None, self._wait_stop_fade, timeout)
+        return self._finish_stop()
+    
+    def _begin_stop(self) -> bool:
+        """Проверка состояния и переход в STOPPING"""
         try:
             # Проверяем, что можем остановить воспроизведение
             if self.state_manager.current_state not in [PlaybackState.PLAYING, PlaybackState.PAUSED]:
@@ -275,16 +495,32 @@ class SequentialSpeechPlayer:
             
             # Переходим в состояние STOPPING
             self.state_manager.set_state(PlaybackState.STOPPING)
+            return True
             
+        except Exception as e:
+            logger.error(f"❌ Ошибка остановки воспроизведения: {e}")
+            self.state_manager.set_state(PlaybackState.ERROR)
+            return False
+    
+    def _finish_stop(self) -> bool:
+        """Очистка буферов и остановка потоков после затухания"""
+        try:
             # Останавливаем поток воспроизведения
             self._stop_event.set()
+            self._pause_event.set()
             
             # МГНОВЕННО прерываем аудио: очищаем буферы и останавливаем поток до ожидания join
             try:
                 self.chunk_buffer.clear_all()
             except Exception:
                 pass
+            self._resampler = None
+            self._resampler_key = None
+            self.end_stream()
+            self._gate_open = True
             self._stop_audio_stream()
+            # Будим поток воспроизведения и ожидающих завершения
+            self.chunk_buffer.wake_waiters()
             
             # Ждем завершения потока
             if self._playback_thread and self._playback_thread.is_alive():
@@ -301,6 +537,27 @@ class SequentialSpeechPlayer:
             self.state_manager.set_state(PlaybackState.ERROR)
             return False
     
+    def _request_stop_fade(self) -> Optional[float]:
+        """
+        Запросить затухание текущего звука в ближайшем блоке callback
+        
+        Тишина наступает в том же блоке callback, в котором раньше начинался
+        обрыв; ожидание нужно только чтобы поток вывода не остановили раньше.
+        
+        Returns:
+            Максимальное ожидание затухания (блок + fade) или None - затухать нечему
+        """
+        if (self._audio_stream is None or not self._fade.stop_frames or not self._gate_open
+                or self.chunk_buffer.buffer_size == 0):
+            return None
+        self._stop_fade_done.clear()
+        self._stop_fade_pos = 0
+        return (self._fade.stop_frames + 2 * self.config.buffer_size) / float(self.config.sample_rate)
+    
+    def _wait_stop_fade(self, timeout: float):
+        if not self._stop_fade_done.wait(timeout):
+            logger.debug("⚠️ Затухание не завершилось до остановки потока")
+    
     def pause_playback(self) -> bool:
         """Приостановка воспроизведения"""
         try:
@@ -358,7 +615,7 @@ class SequentialSpeechPlayer:
                 }
                 
                 # Создаем поток
-                self._audio_stream = sd.OutputStream(**stream_config)
+                self._audio_stream = self._output_stream_factory(**stream_config)
                 self._audio_stream.start()
                 
                 logger.info(f"🎵 Аудио поток запущен (device: {self.config.device_id}, channels: {self.config.channels})")
@@ -376,40 +633,84 @@ class SequentialSpeechPlayer:
                     self._audio_stream.stop()
                     self._audio_stream.close()
                     self._audio_stream = None
+                    self._stop_fade_pos = -1
                     logger.info("🛑 Аудио поток остановлен")
                     
         except Exception as e:
             logger.error(f"❌ Ошибка остановки аудио потока: {e}")
     
-    def _audio_callback(self, outdata, frames, time, status):
-        """Callback для воспроизведения аудио"""
+    def _audio_callback(self, outdata, frames, time_info, status):
+        """
+        Callback для воспроизведения аудио (real-time поток PortAudio)
+        
+        ВАЖНО: Без аллокаций, логирования и блокировок - только чтение из
+        SPSC кольцевого буфера прямо в outdata и обновление счётчиков.
+        """
+        started = time.perf_counter()
         try:
-            if status:
-                logger.warning(f"⚠️ Статус аудио потока: {status}")
-
-            # Получаем данные из буфера (2D: frames x channels)
-            data = self.chunk_buffer.get_playback_data(frames)
-            
-            # Логируем для отладки (только первые несколько вызовов)
-            if not hasattr(self, '_callback_debug_count'):
-                self._callback_debug_count = 0
-            if self._callback_debug_count < 3:
-                logger.debug(f"🎵 Audio callback: frames={frames}, data_shape={data.shape if len(data) > 0 else 'empty'}, target_channels={self.config.channels}")
-                self._callback_debug_count += 1
-            
-            # Формируем выходные данные (ожидаем 2D)
-            if len(data) == 0:
-                outdata[:] = 0
-            else:
-                copy_ch = min(self.config.channels, data.shape[1])
-                out_frames = min(frames, data.shape[0])
-                outdata[:out_frames, :copy_ch] = data[:out_frames, :copy_ch]
-                if out_frames < frames:
-                    outdata[out_frames:, :] = 0
-                
-        except Exception as e:
-            logger.error(f"❌ Ошибка в audio callback: {e}")
-            outdata[:] = 0
+            if self._stop_fade_pos >= 0:
+                # Остановка: затухание, затем тишина
+                self._stop_fade_pos = self._fade.render_stop_fade(self.chunk_buffer, outdata, self._stop_fade_pos)
+                if self._stop_fade_pos >= self._fade.stop_frames and not self._stop_fade_done.is_set():
+                    self._stop_fade_done.set()
+            elif not self._gate_open:
+                # Jitter buffer копит порог - тишина без расхода буфера
+                outdata.fill(0)
+            elif self.chunk_buffer.read_into(outdata) < frames and not self._stream_ended:
+                # Данные кончились посреди потока - underrun, снова копим порог
+                self._rt_underruns += 1
+                self._gate_open = False
+        except Exception:
+            outdata.fill(0)
+            self._rt_errors += 1
+        
+        missed = False
+        if status:
+            self._rt_status_flags += 1
+            # output_underflow - PortAudio не получил данные вовремя
+            missed = bool(status.output_underflow)
+        
+        elapsed = time.perf_counter() - started
+        self._rt_callbacks += 1
+        self._rt_time_total += elapsed
+        self._rt_time_last = elapsed
+        if elapsed > self._rt_time_max:
+            self._rt_time_max = elapsed
+        # Дедлайн callback - длительность блока
+        if missed or elapsed * self.config.sample_rate > frames:
+            self._rt_deadline_misses += 1
+
+    def _reset_realtime_stats(self):
+        """Сбросить счётчики real-time callback"""
+        self._rt_callbacks = 0
+        self._rt_time_total = 0.0
+        self._rt_time_last = 0.0
+        self._rt_time_max = 0.0
+        self._rt_deadline_misses = 0
+        self._rt_status_flags = 0
+        self._rt_errors = 0
+        self._rt_underruns = 0
+        self._underruns_reported = 0
+
+    def get_realtime_stats(self) -> Dict[str, Any]:
+        """
+        Получить статистику audio callback
+        
+        Returns:
+            Длительности callback (мс), бюджет блока и число пропущенных дедлайнов
+        """
+        count = self._rt_callbacks
+        return {
+            'callbacks': count,
+            'callback_avg_ms': (self._rt_time_total / count * 1000.0) if count else 0.0,
+            'callback_max_ms': self._rt_time_max * 1000.0,
+            'callback_last_ms': self._rt_time_last * 1000.0,
+            'block_budget_ms': self.config.buffer_size / self.config.sample_rate * 1000.0,
+            'deadline_misses': self._rt_deadline_misses,
+            'status_flags': self._rt_status_flags,
+            'errors': self._rt_errors,
+            'underruns': self._rt_underruns,
+        }
 
     def reconfigure_channels(self, new_channels: int) -> bool:
         """Безопасно переинициализировать аудиовывод под новое число каналов (1..2)"""
@@ -425,6 +726,7 @@ class SequentialSpeechPlayer:
                 self.chunk_buffer.set_channels(new_ch)
             except Exception:
                 pass
+            self._fade.set_output_channels(new_ch)
             # Запускаем заново если были в состоянии PLAYING
             if self.state_manager.is_playing or self.state_manager.is_paused:
                 return self._start_audio_stream()
@@ -434,16 +736,28 @@ class SequentialSpeechPlayer:
             return False
     
     def _playback_loop(self):
-        """Основной цикл воспроизведения - упрощенная версия"""
+        """
+        Основной цикл воспроизведения - event-driven
+        
+        Чанк переносится в кольцевой буфер сразу по приходу (пробуждение через
+        Condition очереди), не дожидаясь окончания предыдущего - стыки без
+        пауз. Завершение чанка определяется по счётчику прочитанных фреймов;
+        поток спит до прихода следующего чанка или до расчётного момента
+        окончания самого старого чанка.
+        """
         try:
             logger.info("🔄 Playback loop запущен")
+            # Чанки в кольцевом буфере: (chunk_info, счётчик frames_written на конце чанка)
+            pending = deque()
             
             while not self._stop_event.is_set():
                 # Проверяем паузу
                 self._pause_event.wait()
                 
-                # Получаем следующий чанк
-                chunk_info = self.chunk_buffer.get_next_chunk(timeout=0.1)
+                # Ждём следующий чанк, расчётное окончание воспроизводимого или дедлайн старта
+                chunk_info = self.chunk_buffer.get_next_chunk(timeout=self._next_wakeup(pending))
+                if self._stop_event.is_set():
+                    break
                 
                 if chunk_info is not None:
                     # Отмечаем начало обработки
@@ -458,21 +772,10 @@ class SequentialSpeechPlayer:
                         logger.error(f"❌ Ошибка добавления чанка {chunk_info.id} в буфер воспроизведения")
                         chunk_info.state = ChunkState.ERROR
                         continue
-                    
-                    # Ждем завершения воспроизведения этого чанка
-                    self._wait_for_chunk_completion(chunk_info)
-                    
-                    # Отмечаем завершение
-                    self.chunk_buffer.mark_chunk_completed(chunk_info)
-                    
-                    # Callback завершения чанка
-                    if self._on_chunk_completed:
-                        self._on_chunk_completed(chunk_info)
-                    
-                    logger.info(f"✅ Чанк обработан: {chunk_info.id}")
-                else:
-                    # Нет чанков - небольшая задержка
-                    time.sleep(0.01)
+                    pending.append((chunk_info, self.chunk_buffer.frames_written))
+                
+                self._update_jitter_gate()
+                self._complete_rendered_chunks(pending)
             
             logger.info("🔄 Playback loop завершен")
             # Устанавливаем состояние IDLE после естественного завершения
@@ -491,27 +794,69 @@ class SequentialSpeechPlayer:
             logger.error(f"❌ Ошибка в playback loop: {e}")
             self.state_manager.set_state(PlaybackState.ERROR)
     
-    def _wait_for_chunk_completion(self, chunk_info: ChunkInfo, timeout: float = 30.0):
-        """Ждать завершения воспроизведения чанка"""
-        start_time = time.time()
+    def _next_wakeup(self, pending: deque) -> Optional[float]:
+        """Таймаут ожидания: окончание самого старого чанка или дедлайн открытия ворот"""
+        timeout = self._time_until_rendered(pending)
+        if not self._gate_open:
+            deadline = self._jitter.start_deadline()
+            if deadline is not None:
+                until_deadline = max(0.0, deadline - time.monotonic())
+                timeout = until_deadline if timeout is None else min(timeout, until_deadline)
+        return timeout
+    
+    def _update_jitter_gate(self):
+        """Отчёт об underrun из callback и открытие ворот по порогу jitter buffer"""
+        underruns = self._rt_underruns
+        while self._underruns_reported < underruns:
+            self._underruns_reported += 1
+            self._jitter.on_underrun()
+            self._performance_monitor.record_buffer_underrun()
+            self._m_underruns.inc()
         
-        # Ожидаем, пока буфер воспроизведения не будет пустым
-        # Это означает, что весь чанк был воспроизведен
-        while time.time() - start_time < timeout:
-            # Немедленный выход при запросе остановки
-            if self._stop_event.is_set():
-                logger.info(f"⏹️ Прерывание чанка {chunk_info.id} по stop_event")
-                return
-            if not self.chunk_buffer.has_data:
-                logger.info(f"✅ Чанк {chunk_info.id} полностью воспроизведен")
-                return
+        if self._gate_open:
+            return
+        if self._jitter.should_start(self.chunk_buffer.buffer_size, self._stream_ended):
+            self._gate_open = True
+            time_to_first_audio_ms = self._jitter.on_started()
+            if time_to_first_audio_ms is not None:
+                self._performance_monitor.set_audio_latency(time_to_first_audio_ms)
+                self._m_time_to_first_audio.observe(time_to_first_audio_ms)
+                logger.info(f"📶 Первый сэмпл через {time_to_first_audio_ms:.0f}мс "
+                            f"(watermark={self._jitter.watermark_ms:.0f}мс)")
+    
+    def get_jitter_stats(self) -> Dict[str, Any]:
+        """Получить статистику jitter buffer"""
+        stats = self._jitter.get_stats()
+        stats['gate_open'] = self._gate_open
+        return stats
+    
+    def _time_until_rendered(self, pending: deque) -> Optional[float]:
+        """Сколько ждать до окончания самого старого чанка (None - ждать только новый чанк)"""
+        if not pending:
+            return None
+        frames_left = pending[0][1] - self.chunk_buffer.frames_read
+        if frames_left <= 0:
+            return 0.0
+        return frames_left / float(self.config.sample_rate)
+    
+    def _complete_rendered_chunks(self, pending: deque):
+        """Завершить чанки, все фреймы которых уже забрал audio callback"""
+        frames_read = self.chunk_buffer.frames_read
+        while pending and pending[0][1] <= frames_read:
+            chunk_info, _ = pending.popleft()
             
-            time.sleep(0.01)
-        
-        logger.warning(f"⚠️ Таймаут ожидания завершения чанка {chunk_info.id}")
+            # Отмечаем завершение
+            self.chunk_buffer.mark_chunk_completed(chunk_info)
+            
+            # Callback завершения чанка
+            if self._on_chunk_completed:
+                self._on_chunk_completed(chunk_info)
+            
+            self._m_chunks_completed.inc()
+            self._completed_log.debug("✅ Чанк обработан: %s", chunk_info.id)
     
     def wait_for_completion(self, timeout: float = None) -> bool:
-        """Ждать завершения воспроизведения всех чанков (без таймаута)"""
+        """Ждать завершения воспроизведения всех чанков (событие опустошения буфера)"""
         return self.chunk_buffer.wait_for_completion(timeout)
     
     def set_callbacks(self, 
@@ -529,10 +874,13 @@ class SequentialSpeechPlayer:
         """Получить статистику плеера"""
         return {
             'state': self.state_manager.current_state.value,
-            'is_playing': self.state_manager.is_playing,
-            'is_paused': self.state_manager.is_paused,
-            'has_error': self.state_manager.has_error,
+            'is_playing': self.state_manager.is_playing(),
+            'is_paused': self.state_manager.is_paused(),
+            'has_error': self.state_manager.current_state == PlaybackState.ERROR,
             'buffer_stats': self.chunk_buffer.get_stats(),
+            'realtime_stats': self.get_realtime_stats(),
+            'jitter_buffer': self.get_jitter_stats(),
+            'fades': self._fade.get_stats(),
             'performance_stats': self._performance_monitor.get_stats()
         }
     
@@ -0,0 +1,310 @@
+"""
+Ring Buffer - Кольцевой буфер воспроизведения (2D: frames x channels)
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Предвыделенная память - массив фиксированной ёмкости, без vstack на каждый чанк
+2. Wrap-around индексы - запись и чтение по кругу
+3. Рост только при переполнении - ёмкость удваивается, данные сохраняются
+4. read_into(outdata) - заполнение массива вызывающего без аллокаций
+5. Single-producer/single-consumer - audio callback читает без блокировок
+"""
+
+import logging
+import numpy as np
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class AudioRingBuffer:
+    """
+    Кольцевой буфер аудио фреймов (SPSC)
+
+    Модель потоков: один писатель (поток воспроизведения) и один читатель
+    (audio callback). Счётчики записи/чтения монотонные, каждый изменяет
+    только свой поток, поэтому читателю не нужны блокировки:
+    - писатель сначала кладёт данные, затем публикует _written;
+    - при расширении писатель копирует непрочитанное в новый массив и
+      атомарно подменяет _storage, старый массив остаётся валидным для
+      читателя, который успел его захватить;
+    - clear() не трогает счётчик читателя, а поднимает отметку _flush_to.
+
+    Несколько писателей должны синхронизироваться снаружи (ChunkBuffer).
+    """
+
+    def __init__(self, channels: int = 1, dtype: np.dtype = np.int16, capacity_frames: int = 1 << 18):
+        """
+        Инициализация буфера
+
+        Args:
+            channels: Количество каналов
+            dtype: Тип данных сэмплов
+            capacity_frames: Начальная ёмкость в фреймах
+        """
+        self._dtype = np.dtype(dtype)
+        self._initial_capacity = max(1, int(capacity_frames))
+        # (массив, ёмкость) публикуются одной ссылкой
+        self._storage = (np.zeros((self._initial_capacity, max(1, int(channels))), dtype=self._dtype),
+                         self._initial_capacity)
+        self._written = 0   # изменяет только писатель
+        self._read = 0      # изменяет только читатель
+        self._flush_to = 0  # отметка сброса (clear) от писателя
+        self._grow_count = 0
+
+    @property
+    def channels(self) -> int:
+        """Количество каналов"""
+        return self._storage[0].shape[1]
+
+    @property
+    def dtype(self) -> np.dtype:
+        """Тип данных сэмплов"""
+        return self._dtype
+
+    @property
+    def capacity(self) -> int:
+        """Текущая ёмкость в фреймах"""
+        return self._storage[1]
+
+    @property
+    def available(self) -> int:
+        """Количество фреймов, доступных для чтения"""
+        return max(0, self._written - max(self._read, self._flush_to))
+
+    @property
+    def free_space(self) -> int:
+        """Количество свободных фреймов до переполнения"""
+        return self.capacity - self.available
+
+    @property
+    def grow_count(self) -> int:
+        """Сколько раз буфер расширялся"""
+        return self._grow_count
+
+    @property
+    def nbytes(self) -> int:
+        """Размер выделенной памяти в байтах"""
+        return self._storage[0].nbytes
+
+    @property
+    def frames_written(self) -> int:
+        """Всего записано фреймов (монотонный счётчик)"""
+        return self._written
+
+    @property
+    def frames_read(self) -> int:
+        """Всего прочитано или сброшено фреймов (монотонный счётчик)"""
+        return max(self._read, self._flush_to)
+
+    # -------- Писатель --------
+
+    def write(self, data: np.ndarray, fade_in: Optional[np.ndarray] = None,
+              scratch: Optional[np.ndarray] = None) -> int:
+        """
+        Записать фреймы в буфер (с расширением при переполнении)
+
+        Args:
+            data: Аудио данные (1D или 2D frames x channels)
+            fade_in: Таблица fade-in (n x 1) для начала записанного - применяется до публикации
+            scratch: float32 массив не меньше (n x channels) для fade_in
+
+        Returns:
+            Количество записанных фреймов
+        """
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        elif data.ndim > 2:
+            data = data.reshape(data.shape[0], -1)
+
+        frames = data.shape[0]
+        if frames == 0:
+            return 0
+
+        if frames > self.free_space:
+            self._grow(self.available + frames)
+
+        buffer, capacity = self._storage
+        # Моно → многоканальный буфер: broadcasting по каналам; лишние каналы отбрасываем
+        src = data if data.shape[1] == 1 else data[:, :buffer.shape[1]]
+        pos = self._written % capacity
+        first = min(frames, capacity - pos)
+        buffer[pos:pos + first] = src[:first]
+        if first < frames:
+            buffer[:frames - first] = src[first:]
+        if fade_in is not None and scratch is not None:
+            # Читатель ещё не видит эти фреймы - меняем их без гонки
+            n = min(frames, fade_in.shape[0])
+            self._apply_ramp(self._written, self._written + n, fade_in, scratch)
+        # Публикуем только после того, как данные легли в массив
+        self._written += frames
+        return frames
+
+    def last_frame(self, back: int = 1) -> int:
+        """Сэмпл канала 0, записанный back фреймов назад (для анализа стыка)"""
+        buffer, capacity = self._storage
+        return int(buffer[(self._written - back) % capacity, 0])
+
+    def crossfade_tail(self, head: np.ndarray, fade_out: np.ndarray, fade_in: np.ndarray,
+                       scratch: np.ndarray, scratch_head: np.ndarray) -> int:
+        """
+        Смешать хвост записанного с началом следующего чанка на месте (overlap-add)
+
+        tail = tail * fade_out + head * fade_in для последних n = len(fade_out)
+        фреймов. Вызывающий гарантирует, что читатель далеко от хвоста
+        (available заметно больше n), иначе смешивание пропускается.
+
+        Args:
+            head: Первые n фреймов следующего чанка (n x 1 или n x channels)
+            fade_out: Таблица затухания хвоста (n x 1)
+            fade_in: Таблица нарастания начала (n x 1)
+            scratch: float32 массив не меньше (n x channels)
+            scratch_head: float32 массив не меньше (n x channels)
+
+        Returns:
+            Количество смешанных фреймов
+        """
+        n = fade_out.shape[0]
+        buffer, capacity = self._storage
+        if head.shape[1] > buffer.shape[1]:
+            head = head[:, :buffer.shape[1]]
+        offset = 0
+        for k0, k1 in self._segments(self._written - n, self._written, capacity):
+            m = k1 - k0
+            pos = k0 % capacity
+            segment = buffer[pos:pos + m]
+            mixed = scratch[:m]
+            incoming = scratch_head[:m]
+            # Приведение к float32 через copyto - смешанные типы в ufunc аллоцируют буфер
+            np.copyto(mixed, segment)
+            np.copyto(incoming, head[offset:offset + m])
+            np.multiply(mixed, fade_out[offset:offset + m], out=mixed)
+            np.multiply(incoming, fade_in[offset:offset + m], out=incoming)
+            np.add(mixed, incoming, out=mixed)
+            np.rint(mixed, out=mixed)
+            np.copyto(segment, mixed, casting='unsafe')
+            offset += m
+        return n
+
+    def _apply_ramp(self, start: int, end: int, ramp: np.ndarray, scratch: np.ndarray):
+        """Умножить фреймы [start, end) на таблицу на месте (через float32 scratch)"""
+        buffer, capacity = self._storage
+        offset = 0
+        for k0, k1 in self._segments(start, end, capacity):
+            m = k1 - k0
+            pos = k0 % capacity
+            segment = buffer[pos:pos + m]
+            scaled = scratch[:m]
+            np.copyto(scaled, segment)
+            np.multiply(scaled, ramp[offset:offset + m], out=scaled)
+            np.rint(scaled, out=scaled)
+            np.copyto(segment, scaled, casting='unsafe')
+            offset += m
+
+    def clear(self):
+        """Сбросить непрочитанные данные (память не освобождается)"""
+        self._flush_to = self._written
+
+    def reset(self, channels: int):
+        """Переинициализировать буфер под новое число каналов"""
+        self._flush_to = self._written
+        self._storage = (np.zeros((self._initial_capacity, max(1, int(channels))), dtype=self._dtype),
+                         self._initial_capacity)
+
+    def _grow(self, min_capacity: int):
+        """Расширить буфер (удвоение ёмкости) с сохранением непрочитанных данных"""
+        old_buffer, old_capacity = self._storage
+        new_capacity = old_capacity
+        while new_capacity < min_capacity:
+            new_capacity *= 2
+
+        new_buffer = np.zeros((new_capacity, old_buffer.shape[1]), dtype=self._dtype)
+        # Снимок позиции читателя: он мог уйти только вперёд, копия покрывает всё непрочитанное
+        start = max(self._read, self._flush_to)
+        for k0, k1 in self._segments(start, self._written, old_capacity):
+            n = k1 - k0
+            src_pos = k0 % old_capacity
+            chunk = old_buffer[src_pos:src_pos + n]
+            dst_pos = k0 % new_capacity
+            first = min(n, new_capacity - dst_pos)
+            new_buffer[dst_pos:dst_pos + first] = chunk[:first]
+            if first < n:
+                new_buffer[:n - first] = chunk[first:]
+
+        logger.debug(f"📈 AudioRingBuffer расширен: {old_capacity} → {new_capacity} фреймов")
+        self._storage = (new_buffer, new_capacity)
+        self._grow_count += 1
+
+    @staticmethod
+    def _segments(start: int, end: int, capacity: int):
+        """Разбить диапазон счётчиков [start, end) на непрерывные куски массива"""
+        while start < end:
+            stop = min(end, start - start % capacity + capacity)
+            yield start, stop
+            start = stop
+
+    # -------- Читатель (audio callback) --------
+
+    def read_into(self, outdata: np.ndarray) -> int:
+        """
+        Заполнить массив вызывающего данными из буфера без аллокаций и блокировок
+
+        Недостающие фреймы и каналы заполняются тишиной (нулями).
+
+        Args:
+            outdata: Выходной массив (frames x channels)
+
+        Returns:
+            Количество реально прочитанных фреймов
+        """
+        # Порядок важен: сначала счётчик писателя, затем хранилище
+        written = self._written
+        buffer, capacity = self._storage
+        read = self._read
+        flush_to = self._flush_to
+        if flush_to > read:
+            read = flush_to
+
+        frames = outdata.shape[0]
+        n = written - read
+        if n > frames:
+            n = frames
+        if n < 0:
+            n = 0
+
+        if n > 0:
+            pos = read % capacity
+            first = capacity - pos
+            if first > n:
+                first = n
+            if outdata.ndim == 2:
+                ch = outdata.shape[1]
+                if ch > buffer.shape[1]:
+                    ch = buffer.shape[1]
+                outdata[:first, :ch] = buffer[pos:pos + first, :ch]
+                if first < n:
+                    outdata[first:n, :ch] = buffer[:n - first, :ch]
+                if ch < outdata.shape[1]:
+                    outdata[:n, ch:] = 0
+            else:
+                outdata[:first] = buffer[pos:pos + first, 0]
+                if first < n:
+                    outdata[first:n] = buffer[:n - first, 0]
+
+        if n < frames:
+            outdata[n:] = 0
+        self._read = read + n
+        return n
+
+    def read(self, frames: int) -> np.ndarray:
+        """
+        Прочитать фреймы в новый массив (дополняется тишиной)
+
+        Args:
+            frames: Количество фреймов
+
+        Returns:
+            Массив (frames x channels)
+        """
+        out = np.zeros((frames, self.channels), dtype=self._dtype)
+        self.read_into(out)
+        return out
@@ -26,6 +26,11 @@ class ChunkState(Enum):
     ERROR = "error"
     FAILED = "failed"
 
+class BackpressurePolicy(Enum):
+    """Поведение ChunkBuffer при достижении лимита памяти"""
+    BLOCK = "block"              # Ждать, пока воспроизведение освободит место
+    DROP_OLDEST = "drop_oldest"  # Выбросить самые старые чанки из очереди
+
 @dataclass
 class ChunkInfo:
     """Информация о чанке"""
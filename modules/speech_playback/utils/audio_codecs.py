@@ -0,0 +1,125 @@
+"""
+Audio Codecs - Декодеры сжатых аудио чанков ответа
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Кодек согласуется по запросу: клиент перечисляет accept_codecs, сервер
+   помечает каждый AudioChunk полем codec (пусто/pcm - сырой PCM как раньше)
+2. Сжатый чанк самодостаточен (заголовок + фреймы) - декодируется отдельно,
+   без состояния между чанками и без seek по потоку
+3. Декодеры регистрируются по имени кодека - Opus добавляется так же, как FLAC
+4. Библиотеки кодеков опциональны: недоступный кодек просто не объявляется серверу
+"""
+
+import io
+import logging
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    import soundfile as sf
+    _SOUNDFILE_AVAILABLE = True
+except Exception:  # ImportError или отсутствует libsndfile
+    sf = None
+    _SOUNDFILE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Имена несжатого PCM в AudioChunk.codec
+PCM_CODECS = ('', 'pcm', 'raw')
+
+
+class AudioDecoder(ABC):
+    """Декодер одного сжатого чанка в int16 PCM"""
+
+    codec = ''
+
+    @abstractmethod
+    def decode(self, payload) -> Tuple[np.ndarray, int, int]:
+        """
+        Декодировать чанк
+
+        Args:
+            payload: bytes/memoryview самодостаточного сжатого чанка
+
+        Returns:
+            (int16 массив: 1D для моно, frames x channels иначе; частота; каналы)
+        """
+
+    def reset(self):
+        """Сбросить состояние между сессиями (для кодеков с состоянием)"""
+
+
+class SoundFileDecoder(AudioDecoder):
+    """Декодер через libsndfile (soundfile): FLAC, Ogg"""
+
+    def __init__(self, codec: str):
+        self.codec = codec
+
+    def decode(self, payload) -> Tuple[np.ndarray, int, int]:
+        data, sample_rate = sf.read(io.BytesIO(payload), dtype='int16', always_2d=False)
+        channels = 1 if data.ndim == 1 else data.shape[1]
+        return data, int(sample_rate), channels
+
+
+def _soundfile_supports(fmt: str) -> bool:
+    try:
+        return _SOUNDFILE_AVAILABLE and fmt in sf.available_formats()
+    except Exception:
+        return False
+
+
+# codec -> (проверка доступности, фабрика декодера); порядок - предпочтение
+_DECODERS: Dict[str, Tuple[Callable[[], bool], Callable[[], AudioDecoder]]] = {
+    'flac': (lambda: _soundfile_supports('FLAC'), lambda: SoundFileDecoder('flac')),
+}
+
+
+def register_decoder(codec: str, factory: Callable[[], AudioDecoder],
+                     available: Callable[[], bool] = lambda: True):
+    """Зарегистрировать декодер кодека (например, opus)"""
+    _DECODERS[codec.lower()] = (available, factory)
+
+
+def is_compressed(codec: Optional[str]) -> bool:
+    """Чанк сжат (нужен декодер), а не сырой PCM"""
+    return (codec or '').lower() not in PCM_CODECS
+
+
+def get_decoder(codec: str) -> AudioDecoder:
+    """
+    Декодер кодека
+
+    Raises:
+        ValueError: Кодек неизвестен или его библиотека недоступна
+    """
+    entry = _DECODERS.get((codec or '').lower())
+    if entry is None or not entry[0]():
+        raise ValueError(f"Нет декодера для кодека '{codec}'")
+    return entry[1]()
+
+
+def supported_codecs(preferred: Optional[List[str]] = None) -> List[str]:
+    """
+    Кодеки для accept_codecs запроса в порядке предпочтения
+
+    Args:
+        preferred: Желаемый порядок из конфигурации (None - все зарегистрированные)
+
+    Returns:
+        Доступные сжатые кодеки и 'pcm' последним (понимается всегда)
+    """
+    names = preferred if preferred is not None else list(_DECODERS)
+    result = []
+    for name in names:
+        name = (name or '').lower()
+        if name in PCM_CODECS or name in result:
+            continue
+        entry = _DECODERS.get(name)
+        if entry is not None and entry[0]():
+            result.append(name)
+        else:
+            logger.debug(f"Кодек '{name}' недоступен - не объявляем серверу")
+    result.append('pcm')
+    return result
@@ -2,22 +2,194 @@
 Audio Utils - Утилиты для обработки аудио
 
 ОСНОВНЫЕ ФУНКЦИИ:
-1. Resampling - пересчет частоты дискретизации
+1. Resampling - пересчет частоты дискретизации (потоковый polyphase resampler)
 2. Channel conversion - конвертация каналов
 3. Audio normalization - нормализация аудио
 4. Format conversion - конвертация форматов
+5. Fades - кэшированные таблицы fade-in/fade-out
 """
 
 import logging
 import numpy as np
-from typing import Union, Optional
-from scipy import signal
+from functools import lru_cache
+from math import gcd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Union, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Длина фильтра на одну фазу (в сэмплах входа): баланс качества и CPU для речи
+DEFAULT_TAPS_PER_PHASE = 32
+# До скольких фаз выгоднее отдельное матричное умножение на каждую фазу
+_MAX_PHASE_LOOP = 16
+
+def _filter_center(num_taps: int, down: int) -> int:
+    """Центр прототипа фильтра, ближайший к середине и кратный down"""
+    return max(0, min(num_taps - 1, down * int(round((num_taps - 1) / (2.0 * down)))))
+
+@lru_cache(maxsize=16)
+def get_polyphase_filter_bank(src_rate: int, dst_rate: int,
+                              taps_per_phase: int = DEFAULT_TAPS_PER_PHASE) -> Tuple[np.ndarray, int, int]:
+    """
+    Банк polyphase фильтров (windowed-sinc, окно Кайзера) для пары частот
+    
+    Кэшируется на пару (src_rate, dst_rate): все сессии с одинаковыми
+    частотами используют один и тот же банк.
+    
+    Args:
+        src_rate: Исходная частота дискретизации
+        dst_rate: Целевая частота дискретизации
+        taps_per_phase: Количество коэффициентов на фазу
+        
+    Returns:
+        (bank[up, taps_per_phase] только для чтения, up, down)
+    """
+    g = gcd(int(src_rate), int(dst_rate))
+    up = int(dst_rate) // g
+    down = int(src_rate) // g
+    num_taps = taps_per_phase * up
+
+    # Частота среза относительно частоты после upsample (Nyquist = 0.5), запас 10% на переход
+    cutoff = 0.5 * 0.9 / max(up, down)
+    # Центр фильтра кратен down - групповая задержка равна целому числу сэмплов выхода
+    center = _filter_center(num_taps, down)
+    t = np.arange(num_taps, dtype=np.float64) - center
+    half_width = max(center, num_taps - 1 - center)
+    window = np.i0(8.6 * np.sqrt(np.clip(1.0 - (t / half_width) ** 2, 0.0, None))) / np.i0(8.6)
+    prototype = 2.0 * cutoff * np.sinc(2.0 * cutoff * t) * window
+    # Компенсируем энергию нулей, вставленных upsample
+    prototype *= up / prototype.sum()
+
+    # bank[p, k] = h[p + k*up]
+    bank = prototype.reshape(taps_per_phase, up).T.astype(np.float32)
+    bank.setflags(write=False)
+    return bank, up, down
+
+class StreamingResampler:
+    """
+    Потоковый polyphase resampler с сохранением состояния между чанками
+    
+    В отличие от FFT resample по каждому чанку не делает чанк периодическим:
+    хвост предыдущего чанка остаётся в истории фильтра, поэтому стыки
+    непрерывны. Один экземпляр - на одну сессию (поток аудио).
+    """
+
+    def __init__(self, src_rate: int, dst_rate: int, channels: int = 1,
+                 taps_per_phase: int = DEFAULT_TAPS_PER_PHASE):
+        """
+        Инициализация resampler
+        
+        Args:
+            src_rate: Исходная частота дискретизации
+            dst_rate: Целевая частота дискретизации
+            channels: Количество каналов
+            taps_per_phase: Количество коэффициентов на фазу
+        """
+        self.src_rate = int(src_rate)
+        self.dst_rate = int(dst_rate)
+        self.channels = max(1, int(channels))
+        self._passthrough = self.src_rate == self.dst_rate
+        self._taps = int(taps_per_phase)
+        if not self._passthrough:
+            self._bank, self._up, self._down = get_polyphase_filter_bank(self.src_rate, self.dst_rate, self._taps)
+        else:
+            self._bank, self._up, self._down = None, 1, 1
+        self.reset()
+
+    @property
+    def output_delay(self) -> int:
+        """Групповая задержка фильтра в сэмплах выхода"""
+        if self._passthrough:
+            return 0
+        return _filter_center(self._taps * self._up, self._down) // self._down
+
+    def reset(self):
+        """Сбросить состояние фильтра (начало новой сессии)"""
+        self._history = np.zeros((max(0, self._taps - 1), self.channels), dtype=np.float32)
+        self._in_count = 0
+        self._out_count = 0
+
+    def process(self, chunk: np.ndarray) -> np.ndarray:
+        """
+        Пересчитать очередной чанк
+        
+        Args:
+            chunk: Аудио данные (1D или 2D frames x channels), int16 или float
+            
+        Returns:
+            Пересчитанные данные того же dtype и размерности
+        """
+        if self._passthrough:
+            return chunk
+
+        is_1d = chunk.ndim == 1
+        x = chunk.reshape(-1, 1) if is_1d else chunk
+        if x.shape[1] != self.channels:
+            raise ValueError(f"StreamingResampler: ожидалось {self.channels} каналов, получено {x.shape[1]}")
+
+        frames = x.shape[0]
+        if frames == 0:
+            return chunk[:0]
+
+        buf = np.concatenate([self._history, x.astype(np.float32, copy=False)])
+        # Все выходные сэмплы, для которых уже есть последний нужный входной сэмпл
+        last_in = self._in_count + frames - 1
+        out_end = ((last_in + 1) * self._up - 1) // self._down + 1
+        n = np.arange(self._out_count, out_end, dtype=np.int64)
+        pos = n * self._down
+        base = pos // self._up - (self._in_count - (self._taps - 1))
+        phase = pos % self._up
+
+        # windows[i, k] = buf[i + taps - 1 - k] - представление без копирования
+        rows = base - (self._taps - 1)
+        y = np.empty((len(n), self.channels), dtype=np.float32)
+        for c in range(self.channels):
+            windows = sliding_window_view(buf[:, c], self._taps)[:, ::-1]
+            if self._up <= _MAX_PHASE_LOOP:
+                # Фаза периодична с периодом up: по одному матричному умножению на фазу
+                for r in range(min(self._up, len(n))):
+                    y[r::self._up, c] = windows[rows[r::self._up]] @ self._bank[phase[r]]
+            else:
+                y[:, c] = np.einsum('nt,nt->n', self._bank[phase], windows[rows])
+
+        self._history = buf[frames:].copy() if self._taps > 1 else self._history
+        self._in_count += frames
+        self._out_count = out_end
+
+        y = self._to_dtype(y, chunk.dtype.newbyteorder('='))
+        return y[:, 0] if is_1d else y
+
+    def flush(self) -> np.ndarray:
+        """
+        Выдать хвост, оставшийся в истории фильтра, и сбросить состояние
+        
+        Вместе с выданным ранее выход составляет output_delay + длительность
+        входа: задержка фильтра дописывается, хвост отклика на нули - нет.
+        
+        Returns:
+            Оставшиеся сэмплы (2D frames x channels, float32)
+        """
+        if self._passthrough:
+            return np.zeros((0, self.channels), dtype=np.float32)
+        end = self.output_delay + self._in_count * self._up // self._down
+        produced = self._out_count
+        tail = self.process(np.zeros((self._taps, self.channels), dtype=np.float32))
+        self.reset()
+        return tail[:max(0, end - produced)]
+
+    @staticmethod
+    def _to_dtype(y: np.ndarray, dtype: np.dtype) -> np.ndarray:
+        """Привести результат к dtype входа (с насыщением для целых)"""
+        if np.issubdtype(dtype, np.integer):
+            info = np.iinfo(dtype)
+            return np.clip(np.rint(y), info.min, info.max).astype(dtype)
+        return y.astype(dtype, copy=False)
+
 def resample_audio(audio_data: np.ndarray, target_sample_rate: int, original_sample_rate: int = 48000) -> np.ndarray:
     """
-    Пересчет частоты дискретизации аудио
+    Пересчет частоты дискретизации аудио (целиком, без сохранения состояния)
+    
+    Для потока чанков используйте StreamingResampler - один экземпляр на сессию.
     
     Args:
         audio_data: Аудио данные
@@ -33,15 +205,15 @@ def resample_audio(audio_data: np.ndarray, target_sample_rate: int, original_sam
         
         # Вычисляем коэффициент пересчета
         ratio = target_sample_rate / original_sample_rate
+        channels = 1 if audio_data.ndim == 1 else audio_data.shape[1]
         
-        # Пересчитываем
-        resampled_data = signal.resample(audio_data, int(len(audio_data) * ratio))
-        
-        # Приводим к правильному типу
-        if audio_data.dtype == np.int16:
-            resampled_data = resampled_data.astype(np.int16)
-        elif audio_data.dtype == np.float32:
-            resampled_data = resampled_data.astype(np.float32)
+        # Пересчитываем и компенсируем групповую задержку фильтра
+        resampler = StreamingResampler(original_sample_rate, target_sample_rate, channels)
+        head = resampler.process(audio_data)
+        tail = resampler.flush()
+        tail = StreamingResampler._to_dtype(tail[:, 0] if audio_data.ndim == 1 else tail, audio_data.dtype)
+        delay = resampler.output_delay
+        resampled_data = np.concatenate([head, tail])[delay:delay + int(len(audio_data) * ratio)]
         
         logger.debug(f"🔄 Resampling: {original_sample_rate}Hz → {target_sample_rate}Hz (ratio: {ratio:.3f})")
         
@@ -136,9 +308,41 @@ def normalize_audio(audio_data: np.ndarray, target_level: float = 0.8) -> np.nda
         logger.error(f"❌ Ошибка нормализации: {e}")
         return audio_data
 
+@lru_cache(maxsize=32)
+def get_fade_ramps(length: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Таблицы fade-in/fade-out (raised cosine) заданной длины
+    
+    Кэшируются по длине: стык чанков и остановка используют одни и те же
+    массивы без пересчёта. fade_in + fade_out == 1 поэлементно, поэтому
+    crossfade двух int16 сигналов не выходит за диапазон.
+    
+    Args:
+        length: Длина в сэмплах
+        
+    Returns:
+        (fade_in, fade_out) формы (length, 1), float32, только для чтения
+    """
+    length = max(1, int(length))
+    t = (np.arange(length, dtype=np.float64) + 0.5) / length
+    fade_in = (0.5 - 0.5 * np.cos(np.pi * t)).astype(np.float32).reshape(-1, 1)
+    fade_out = (1.0 - fade_in).astype(np.float32)
+    fade_in.setflags(write=False)
+    fade_out.setflags(write=False)
+    return fade_in, fade_out
+
+def _apply_ramp(segment: np.ndarray, ramp: np.ndarray):
+    """Умножить сегмент на таблицу на месте (int16 - с округлением)"""
+    if segment.ndim == 1:
+        ramp = ramp[:, 0]
+    if segment.dtype.kind == 'f':
+        np.multiply(segment, ramp, out=segment)
+    else:
+        np.copyto(segment, np.rint(segment * ramp), casting='unsafe')
+
 def apply_fade_in(audio_data: np.ndarray, fade_samples: int = 1000) -> np.ndarray:
     """
-    Применение fade-in эффекта
+    Применение fade-in эффекта (на месте, таблица из get_fade_ramps)
     
     Args:
         audio_data: Аудио данные
@@ -151,16 +355,8 @@ def apply_fade_in(audio_data: np.ndarray, fade_samples: int = 1000) -> np.ndarra
         if len(audio_data) <= fade_samples:
             return audio_data
         
-        # Создаем fade-in маску
-        fade_mask = np.linspace(0, 1, fade_samples)
-        
-        # Применяем к началу данных
-        if len(audio_data.shape) == 1:
-            audio_data[:fade_samples] *= fade_mask
-        else:
-            audio_data[:fade_samples, :] *= fade_mask.reshape(-1, 1)
-        
-        logger.debug(f"🎵 Fade-in применен: {fade_samples} сэмплов")
+        fade_in, _ = get_fade_ramps(fade_samples)
+        _apply_ramp(audio_data[:fade_samples], fade_in)
         
         return audio_data
         
@@ -170,7 +366,7 @@ def apply_fade_in(audio_data: np.ndarray, fade_samples: int = 1000) -> np.ndarra
 
 def apply_fade_out(audio_data: np.ndarray, fade_samples: int = 1000) -> np.ndarray:
     """
-    Применение fade-out эффекта
+    Применение fade-out эффекта (на месте, таблица из get_fade_ramps)
     
     Args:
         audio_data: Аудио данные
@@ -183,16 +379,8 @@ def apply_fade_out(audio_data: np.ndarray, fade_samples: int = 1000) -> np.ndarr
         if len(audio_data) <= fade_samples:
             return audio_data
         
-        # Создаем fade-out маску
-        fade_mask = np.linspace(1, 0, fade_samples)
-        
-        # Применяем к концу данных
-        if len(audio_data.shape) == 1:
-            audio_data[-fade_samples:] *= fade_mask
-        else:
-            audio_data[-fade_samples:, :] *= fade_mask.reshape(-1, 1)
-        
-        logger.debug(f"🎵 Fade-out применен: {fade_samples} сэмплов")
+        _, fade_out = get_fade_ramps(fade_samples)
+        _apply_ramp(audio_data[-fade_samples:], fade_out)
         
         return audio_data
         
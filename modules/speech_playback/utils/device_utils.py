@@ -3,10 +3,14 @@ Device Utils - Утилиты для работы с аудио устройст
 """
 
 import logging
-import sounddevice as sd
 from typing import Optional, List, Dict, Any
 from dataclasses import dataclass
 
+try:
+    import sounddevice as sd
+except Exception:  # OSError без PortAudio (headless Linux, CI)
+    sd = None
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -27,6 +31,9 @@ def get_available_devices() -> List[AudioDevice]:
     Returns:
         Список AudioDevice объектов
     """
+    if sd is None:
+        logger.warning("⚠️ sounddevice недоступен - аудио устройств нет")
+        return []
     try:
         devices = []
         device_list = sd.query_devices()
@@ -102,6 +109,9 @@ def test_audio_device(device_id: int) -> bool:
     Returns:
         True если устройство работает, False иначе
     """
+    if sd is None:
+        logger.warning(f"⚠️ sounddevice недоступен - устройство {device_id} не проверить")
+        return False
     try:
         # Генерируем тестовый сигнал
         import numpy as np
@@ -134,6 +144,8 @@ def get_device_info(device_id: int) -> Optional[Dict[str, Any]]:
     Returns:
         Словарь с информацией об устройстве или None
     """
+    if sd is None:
+        return None
     try:
         device_info = sd.query_devices(device_id)
         
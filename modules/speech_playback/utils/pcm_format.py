@@ -0,0 +1,217 @@
+"""
+PCM Format - Согласование формата аудио чанков сессии и декодирование без копий
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Формат решается один раз на сессию - dtype, порядок байт, частота, каналы
+2. Эвристики (byteswap, float32) - только пока формат не определён
+3. Декодирование - memoryview → np.frombuffer, без копирования байт
+4. Единственная копия - запись в кольцевой буфер воспроизведения
+"""
+
+import logging
+import numpy as np
+from typing import Optional, Dict, Any, Tuple, Sequence
+from dataclasses import dataclass
+
+logger = logging.getLogger(__name__)
+
+# Явные названия форматов из AudioChunk.dtype
+_DECLARED_DTYPES = {
+    'float32': np.dtype('<f4'),
+    'float': np.dtype('<f4'),
+    'float32_le': np.dtype('<f4'),
+    'int16_be': np.dtype('>i2'),
+    'pcm_s16be': np.dtype('>i2'),
+    'int16_le': np.dtype('<i2'),
+    'pcm_s16le': np.dtype('<i2'),
+}
+
+# Названия, для которых порядок байт/тип проверяется эвристикой
+_AMBIGUOUS_DTYPES = ('int16', 'short', '')
+
+@dataclass(frozen=True)
+class PcmFormat:
+    """Согласованный формат PCM потока"""
+    dtype: np.dtype
+    sample_rate: Optional[int]
+    channels: int
+    source: str  # declared | wav | heuristic | default
+
+    @property
+    def frame_bytes(self) -> int:
+        """Размер фрейма в байтах"""
+        return self.dtype.itemsize * self.channels
+
+def parse_wav_header(payload) -> Optional[Tuple[int, Dict[str, int]]]:
+    """
+    Разобрать RIFF/WAVE заголовок
+
+    Args:
+        payload: bytes или memoryview начала потока
+
+    Returns:
+        (смещение данных, поля fmt) или None, если это не WAV
+    """
+    b = memoryview(payload)
+    if len(b) < 12 or b[:4] != b'RIFF' or b[8:12] != b'WAVE':
+        return None
+    fmt: Dict[str, int] = {}
+    i = 12
+    while i + 8 <= len(b):
+        chunk_id = bytes(b[i:i + 4])
+        chunk_size = int.from_bytes(b[i + 4:i + 8], 'little', signed=False)
+        i += 8
+        if chunk_id == b'fmt ' and chunk_size >= 16 and i + 16 <= len(b):
+            fmt = {
+                'audio_format': int.from_bytes(b[i:i + 2], 'little'),
+                'channels': int.from_bytes(b[i + 2:i + 4], 'little'),
+                'sample_rate': int.from_bytes(b[i + 4:i + 8], 'little'),
+                'bits_per_sample': int.from_bytes(b[i + 14:i + 16], 'little'),
+            }
+        elif chunk_id == b'data':
+            return i, fmt
+        i += chunk_size + (chunk_size & 1)
+    return None
+
+def _wav_dtype(fmt: Dict[str, int]) -> Optional[np.dtype]:
+    """dtype по полям fmt (PCM int16 / IEEE float32)"""
+    bits = fmt.get('bits_per_sample')
+    audio_format = fmt.get('audio_format')
+    if audio_format == 3 and bits == 32:
+        return np.dtype('<f4')
+    if audio_format in (1, 0xFFFE) and bits == 16:
+        return np.dtype('<i2')
+    return None
+
+def _roughness(x: np.ndarray) -> float:
+    """Средний модуль первой разности к среднему модулю сигнала (речь гладкая, шум - нет)"""
+    x = x.astype(np.float64)
+    level = float(np.abs(x).mean())
+    if level == 0.0 or not np.isfinite(level):
+        return float('inf')
+    return float(np.abs(np.diff(x)).mean()) / level
+
+def _guess_dtype(payload: memoryview) -> Optional[np.dtype]:
+    """
+    Эвристика порядка байт и float32 для int16 без явной эндианности
+
+    Неверная интерпретация байт превращает речь в широкополосный шум,
+    поэтому выбирается вариант с наименьшей "шероховатостью"; little-endian
+    int16 остаётся, если альтернатива не лучше в 1.8 раза.
+
+    Returns:
+        dtype или None, если по чанку нельзя судить (тишина)
+    """
+    usable = len(payload) - len(payload) % 2
+    le = np.frombuffer(payload[:usable], dtype='<i2')
+    if le.size < 2 or not le.any():
+        return None
+    best, best_score = np.dtype('<i2'), _roughness(le) / 1.8
+    candidates = [(np.dtype('>i2'), le.view('>i2'))]
+    if usable % 4 == 0:
+        f32 = le.view('<f4')
+        with np.errstate(all='ignore'):
+            peak_f32 = float(np.abs(f32).max())
+        # Речь в float32 - значения в [-1, 1]; мельчайшие значения - int16, прочитанный как float
+        if np.isfinite(peak_f32) and 1e-4 < peak_f32 <= 1.2:
+            candidates.append((np.dtype('<f4'), f32))
+    for dtype, view in candidates:
+        score = _roughness(view)
+        if score < best_score:
+            best, best_score = dtype, score
+    return best
+
+class PcmFormatNegotiator:
+    """
+    Формат PCM по сессиям
+
+    Первый содержательный чанк сессии определяет формат (заголовок WAV,
+    явный dtype или эвристика), последующие чанки декодируются как
+    np.frombuffer поверх memoryview исходного payload - без копий.
+    Пока чанки тишина, эвристика не фиксирует решение: нули одинаковы
+    в любом порядке байт.
+    """
+
+    def __init__(self, max_sessions: int = 32):
+        self._formats: Dict[Any, PcmFormat] = {}
+        self._max_sessions = max_sessions
+
+    def get_format(self, session_id: Any) -> Optional[PcmFormat]:
+        """Согласованный формат сессии (None - ещё не определён)"""
+        return self._formats.get(session_id)
+
+    def forget(self, session_id: Any):
+        """Забыть формат завершённой сессии"""
+        self._formats.pop(session_id, None)
+
+    def decode(self,
+               session_id: Any,
+               payload,
+               dtype_hint: Optional[str] = 'int16',
+               sample_rate: Optional[int] = None,
+               channels: Optional[int] = None,
+               shape: Optional[Sequence[int]] = None) -> Tuple[np.ndarray, PcmFormat]:
+        """
+        Декодировать чанк в ndarray без копирования
+
+        Args:
+            session_id: ID сессии
+            payload: bytes/bytearray/memoryview чанка
+            dtype_hint: dtype из AudioChunk
+            sample_rate: Частота из AudioChunk (если есть)
+            channels: Каналы из AudioChunk (если есть)
+            shape: Форма из AudioChunk (если есть)
+
+        Returns:
+            (массив-вид на payload: 1D для моно, frames x channels иначе; формат)
+        """
+        view = memoryview(payload).cast('B')
+        fmt = self._formats.get(session_id)
+        if fmt is None:
+            fmt, offset, final = self._negotiate(view, dtype_hint, sample_rate, channels, shape)
+            view = view[offset:]
+            if final:
+                if len(self._formats) >= self._max_sessions:
+                    self._formats.pop(next(iter(self._formats)))
+                self._formats[session_id] = fmt
+                logger.debug(f"🎚️ PCM формат сессии {session_id}: {fmt}")
+
+        # Хвост неполного фрейма отбрасываем (memoryview срез - без копии)
+        usable = len(view) - len(view) % fmt.frame_bytes
+        arr = np.frombuffer(view[:usable], dtype=fmt.dtype)
+        if fmt.channels > 1:
+            arr = arr.reshape(-1, fmt.channels)
+        return arr, fmt
+
+    def _negotiate(self, view: memoryview, dtype_hint: Optional[str], sample_rate: Optional[int],
+                   channels: Optional[int], shape: Optional[Sequence[int]]) -> Tuple[PcmFormat, int, bool]:
+        """Определить формат по первому чанку: (формат, смещение данных, решение окончательное)"""
+        hint = (dtype_hint or '').lower()
+        if not channels and shape and len(shape) == 2:
+            channels = int(shape[1])
+        channels = int(channels) if channels else 1
+        sample_rate = int(sample_rate) if sample_rate else None
+
+        wav = parse_wav_header(view)
+        if wav is not None:
+            offset, wav_fmt = wav
+            dtype = _wav_dtype(wav_fmt) or _DECLARED_DTYPES.get(hint, np.dtype('<i2'))
+            return PcmFormat(
+                dtype=dtype,
+                sample_rate=sample_rate or wav_fmt.get('sample_rate'),
+                channels=wav_fmt.get('channels') or channels,
+                source='wav',
+            ), offset, True
+
+        if hint in _DECLARED_DTYPES:
+            return PcmFormat(_DECLARED_DTYPES[hint], sample_rate, channels, 'declared'), 0, True
+
+        if hint in _AMBIGUOUS_DTYPES:
+            guessed = _guess_dtype(view)
+            if guessed is None:
+                # Тишина - декодируем как int16 LE, решение откладываем
+                return PcmFormat(np.dtype('<i2'), sample_rate, channels, 'default'), 0, False
+            return PcmFormat(guessed, sample_rate, channels, 'heuristic'), 0, True
+
+        logger.warning(f"⚠️ Неизвестный dtype аудио '{dtype_hint}', используем int16 LE")
+        return PcmFormat(np.dtype('<i2'), sample_rate, channels, 'default'), 0, True
@@ -0,0 +1,209 @@
+"""
+Бэкенды распознавания записи целиком (STT)
+
+Вызов бэкенда блокирующий (сеть или локальная модель), поэтому он
+выполняется только в пуле потоков RecognitionBackendExecutor - event loop
+на распознавании не блокируется.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import speech_recognition as sr
+
+from modules.metrics import get_registry
+
+from .streaming import VoskStreamingEngine
+
+logger = logging.getLogger(__name__)
+
+
+class RecognitionBackend:
+    """
+    Бэкенд распознавания
+
+    recognize() вызывается из рабочего потока пула. Речь не распознана -
+    sr.UnknownValueError, сбой сервиса - sr.RequestError. Установленный
+    cancel означает, что результат больше не нужен: бэкенд, который
+    умеет, прекращает работу как можно раньше.
+    """
+
+    name = "base"
+
+    def recognize(self, audio_data: sr.AudioData, language: str, cancel: threading.Event) -> str:
+        raise NotImplementedError
+
+    def close(self):
+        """Освободить ресурсы бэкенда"""
+
+
+class GoogleRecognitionBackend(RecognitionBackend):
+    """Google Web Speech API (speech_recognition); сокет ограничен таймаутом вызова"""
+
+    name = "google"
+
+    def __init__(self, timeout: Optional[float] = None):
+        self._recognizer = sr.Recognizer()
+        # Прерванный по таймауту вызов не держит поток пула дольше таймаута
+        self._recognizer.operation_timeout = timeout
+
+    def recognize(self, audio_data: sr.AudioData, language: str, cancel: threading.Event) -> str:
+        return self._recognizer.recognize_google(audio_data, language=language)
+
+
+class VoskRecognitionBackend(RecognitionBackend):
+    """Локальный офлайн бэкенд Vosk: запись подаётся движку блоками, отмена - между блоками"""
+
+    name = "vosk"
+    block_ms = 200
+
+    def __init__(self, model_path: str):
+        self._engine = VoskStreamingEngine(model_path)
+        self._lock = threading.Lock()
+
+    def recognize(self, audio_data: sr.AudioData, language: str, cancel: threading.Event) -> str:
+        pcm = np.frombuffer(audio_data.get_raw_data(convert_width=2), dtype=np.int16)
+        block = max(1, audio_data.sample_rate * self.block_ms // 1000)
+        # KaldiRecognizer один на бэкенд - вызовы по очереди
+        with self._lock:
+            self._engine.start(audio_data.sample_rate, language)
+            for offset in range(0, pcm.shape[0], block):
+                if cancel.is_set():
+                    self._engine.cancel()
+                    return ""
+                self._engine.accept(pcm[offset:offset + block])
+            text = self._engine.finish()
+        if not text:
+            raise sr.UnknownValueError()
+        return text
+
+
+class StubRecognitionBackend(RecognitionBackend):
+    """
+    Детерминированный бэкенд для тестов и офлайн отладки
+
+    Возвращает text через delay секунд (отмена прерывает ожидание),
+    пустая запись - sr.UnknownValueError, error - sr.RequestError.
+    """
+
+    name = "stub"
+
+    def __init__(self, text: str = "hello nexy", delay: float = 0.0, error: Optional[str] = None):
+        self.text = text
+        self.delay = delay
+        self.error = error
+        self.calls: List[int] = []
+        self.cancelled = 0
+
+    def recognize(self, audio_data: sr.AudioData, language: str, cancel: threading.Event) -> str:
+        self.calls.append(len(audio_data.frame_data))
+        if self.delay and cancel.wait(self.delay):
+            self.cancelled += 1
+            return ""
+        if self.error:
+            raise sr.RequestError(self.error)
+        if not audio_data.frame_data or not self.text:
+            raise sr.UnknownValueError()
+        return self.text
+
+
+# Бэкенды по имени из конфигурации: фабрика(config) -> RecognitionBackend
+RECOGNITION_BACKENDS: Dict[str, Callable[..., RecognitionBackend]] = {
+    "google": lambda config: GoogleRecognitionBackend(config.backend_timeout),
+    "vosk": lambda config: VoskRecognitionBackend(config.backend_model_path or config.streaming_model_path),
+    "stub": lambda config: StubRecognitionBackend(),
+}
+
+
+def register_recognition_backend(name: str, factory: Callable[..., RecognitionBackend]):
+    """Подключить бэкенд: factory(RecognitionConfig) -> RecognitionBackend"""
+    RECOGNITION_BACKENDS[name] = factory
+
+
+def create_recognition_backend(config) -> RecognitionBackend:
+    """Бэкенд из config.backend; недоступен - Google"""
+    factory = RECOGNITION_BACKENDS.get(config.backend)
+    if factory is None:
+        logger.warning(f"⚠️ Неизвестный бэкенд распознавания '{config.backend}' - используем google")
+    else:
+        try:
+            return factory(config)
+        except Exception as e:
+            logger.warning(f"⚠️ Бэкенд распознавания '{config.backend}' недоступен ({e}) - используем google")
+    return GoogleRecognitionBackend(config.backend_timeout)
+
+
+class RecognitionBackendExecutor:
+    """
+    Асинхронный вызов бэкенда в ограниченном пуле потоков
+
+    Не больше max_workers одновременных распознаваний, остальные ждут в
+    очереди пула. Таймаут считается от постановки в очередь; по таймауту
+    или отмене вызывающей задачи ещё не начатый вызов снимается с очереди,
+    а начатому выставляется cancel.
+
+    Метрики (реестр voice_recognition): backend_recognize_ms, backend_timeouts,
+    backend_cancellations, backend_in_flight.
+    """
+
+    def __init__(self, backend: RecognitionBackend, max_workers: int = 2, timeout: float = 8.0):
+        self.backend = backend
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                        thread_name_prefix=f"STT-{backend.name}")
+        self._in_flight = 0
+
+        metrics = get_registry('voice_recognition')
+        self._m_recognize = metrics.histogram('backend_recognize_ms')
+        self._m_timeouts = metrics.counter('backend_timeouts')
+        self._m_cancellations = metrics.counter('backend_cancellations')
+        self._m_in_flight = metrics.gauge('backend_in_flight')
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def recognize(self, audio_data: sr.AudioData, language: str, timeout: Optional[float] = None) -> str:
+        """
+        Распознать запись, не блокируя event loop
+
+        Raises:
+            asyncio.TimeoutError: бэкенд не ответил за timeout
+            sr.UnknownValueError, sr.RequestError: от бэкенда
+        """
+        cancel = threading.Event()
+        started = time.perf_counter()
+        future = asyncio.get_running_loop().run_in_executor(
+            self._pool, self.backend.recognize, audio_data, language, cancel
+        )
+        self._in_flight += 1
+        self._m_in_flight.set(self._in_flight)
+        try:
+            return await asyncio.wait_for(future, timeout if timeout is not None else self.timeout)
+        except asyncio.TimeoutError:
+            cancel.set()
+            self._m_timeouts.inc()
+            logger.warning(f"⏰ Бэкенд {self.backend.name} не ответил за "
+                           f"{timeout if timeout is not None else self.timeout:.1f}с")
+            raise
+        except asyncio.CancelledError:
+            cancel.set()
+            self._m_cancellations.inc()
+            raise
+        finally:
+            self._in_flight -= 1
+            self._m_in_flight.set(self._in_flight)
+            self._m_recognize.observe_since(started)
+
+    def close(self):
+        """Остановить пул: ожидающие вызовы снимаются, бэкенд освобождается"""
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        try:
+            self.backend.close()
+        except Exception as e:
+            logger.debug(f"backend close: {e}")
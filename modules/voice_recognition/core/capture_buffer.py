@@ -0,0 +1,229 @@
+"""
+Capture Buffer - буфер записи микрофона (2D: frames x channels)
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Предвыделенные блоки фиксированного размера - audio callback копирует
+   кадры на место, без indata.copy() и списка массивов
+2. Рост блоками - новый блок выделяется только когда заполнен последний,
+   блоки прошлых записей переиспользуются после reset()
+3. mono() - int16 вид записи для STT: без копии, пока запись помещается
+   в один блок, иначе одна склейка в переиспользуемый массив
+4. Single-producer - пишет только audio callback, читают после остановки потока
+5. PrerollBuffer - кольцо последних сотен мс до начала записи (тёплый
+   микрофон): при старте записи переносится в CaptureBuffer без потерь
+"""
+
+import logging
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class CaptureBuffer:
+    """
+    Растущий буфер записи из предвыделенных блоков
+
+    Блок по умолчанию вмещает 30с при 16 кГц: типичная фраза остаётся в
+    одном блоке и отдаётся распознаванию видом без копии. write() вызывается
+    из audio callback, чтение (mono(), view()) - после остановки записи.
+    """
+
+    def __init__(self, channels: int = 1, dtype: np.dtype = np.int16,
+                 block_frames: int = 16000 * 30, retain_blocks: int = 2):
+        """
+        Args:
+            channels: Количество каналов
+            dtype: Тип сэмплов
+            block_frames: Размер блока в фреймах
+            retain_blocks: Сколько блоков оставлять после reset() для следующих записей
+        """
+        self._channels = max(1, int(channels))
+        self._dtype = np.dtype(dtype)
+        self._block_frames = max(1, int(block_frames))
+        self._retain_blocks = max(1, int(retain_blocks))
+        self._blocks: List[np.ndarray] = [self._new_block()]
+        self._frames = 0
+        # Текущий блок и позиция в нём (быстрый путь write)
+        self._tail = self._blocks[0]
+        self._tail_pos = 0
+        self._writes = 0
+        self._allocations = 1
+        # Склейка многоблочной записи (переиспользуется, растёт при необходимости)
+        self._joined: Optional[np.ndarray] = None
+
+    @property
+    def channels(self) -> int:
+        return self._channels
+
+    @property
+    def frames(self) -> int:
+        """Записано фреймов"""
+        return self._frames
+
+    @property
+    def writes(self) -> int:
+        """Блоков audio callback с последнего reset()"""
+        return self._writes
+
+    @property
+    def allocations(self) -> int:
+        """Выделений памяти за всё время (блоки и склейки)"""
+        return self._allocations
+
+    @property
+    def capacity(self) -> int:
+        """Ёмкость выделенных блоков в фреймах"""
+        return len(self._blocks) * self._block_frames
+
+    def __len__(self) -> int:
+        return self._frames
+
+    def reset(self):
+        """Новая запись: блоки сверх retain_blocks освобождаются, остальные переиспользуются"""
+        del self._blocks[self._retain_blocks:]
+        self._frames = 0
+        self._writes = 0
+        self._tail = self._blocks[0]
+        self._tail_pos = 0
+
+    def write(self, indata: np.ndarray) -> np.ndarray:
+        """
+        Дописать кадры (из audio callback)
+
+        Returns:
+            Записанные кадры внутри буфера: вид без копии (копия - только если
+            кадры легли на границу блоков). Вид валиден до reset().
+        """
+        data = indata if indata.ndim == 2 else indata.reshape(-1, self._channels)
+        count = data.shape[0]
+        pos = self._tail_pos
+        if pos + count < self._block_frames:
+            # Кадры целиком в текущем блоке
+            written = self._tail[pos:pos + count]
+            written[...] = data
+            self._tail_pos = pos + count
+            self._frames += count
+            self._writes += 1
+            return written
+        start = self._frames
+        offset = 0
+        while offset < count:
+            index, pos = divmod(start + offset, self._block_frames)
+            if index == len(self._blocks):
+                self._blocks.append(self._new_block())
+                self._allocations += 1
+            block = self._blocks[index]
+            n = min(count - offset, self._block_frames - pos)
+            block[pos:pos + n] = data[offset:offset + n]
+            offset += n
+        self._frames = start + count
+        self._writes += 1
+        index, tail_pos = divmod(self._frames, self._block_frames)
+        if index < len(self._blocks):
+            self._tail, self._tail_pos = self._blocks[index], tail_pos
+        else:
+            # Следующий блок выделит следующий write()
+            self._tail_pos = self._block_frames
+        first, pos = divmod(start, self._block_frames)
+        if pos + count <= self._block_frames:
+            return self._blocks[first][pos:pos + count]
+        return self._range(start, self._frames)
+
+    def view(self) -> np.ndarray:
+        """Вся запись (frames x channels): без копии, если она в одном блоке"""
+        if self._frames <= self._block_frames:
+            return self._blocks[0][:self._frames]
+        if self._joined is None or self._joined.shape[0] < self._frames:
+            self._joined = np.empty((self.capacity, self._channels), dtype=self._dtype)
+            self._allocations += 1
+        return self._range(0, self._frames, out=self._joined[:self._frames])
+
+    def mono(self) -> np.ndarray:
+        """Запись моно (1D) для STT: вид без копии для одноканальной записи"""
+        data = self.view()
+        if self._channels == 1:
+            return data[:, 0]
+        return data.mean(axis=1).astype(self._dtype)
+
+    def _range(self, start: int, stop: int, out: Optional[np.ndarray] = None) -> np.ndarray:
+        if out is None:
+            out = np.empty((stop - start, self._channels), dtype=self._dtype)
+        filled = 0
+        while start < stop:
+            index, pos = divmod(start, self._block_frames)
+            n = min(stop - start, self._block_frames - pos)
+            out[filled:filled + n] = self._blocks[index][pos:pos + n]
+            filled += n
+            start += n
+        return out
+
+    def _new_block(self) -> np.ndarray:
+        return np.zeros((self._block_frames, self._channels), dtype=self._dtype)
+
+
+class PrerollBuffer:
+    """
+    Кольцевой буфер последних capacity фреймов (pre-roll)
+
+    Пока микрофон открыт, но запись не идёт, audio callback пишет сюда;
+    при старте записи segments() отдаёт звук до нажатия по порядку. Пишет и
+    читает только audio callback - блокировки не нужны.
+    """
+
+    def __init__(self, channels: int = 1, frames: int = 4800, dtype: np.dtype = np.int16):
+        """
+        Args:
+            channels: Количество каналов
+            frames: Ёмкость в фреймах (sample_rate * preroll_ms / 1000)
+            dtype: Тип сэмплов
+        """
+        self._channels = max(1, int(channels))
+        self._ring = np.zeros((max(1, int(frames)), self._channels), dtype=np.dtype(dtype))
+        self._pos = 0
+        self._filled = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._ring.shape[0]
+
+    @property
+    def frames(self) -> int:
+        """Фреймов в буфере (не больше capacity)"""
+        return self._filled
+
+    def __len__(self) -> int:
+        return self._filled
+
+    def clear(self):
+        self._pos = 0
+        self._filled = 0
+
+    def write(self, indata: np.ndarray):
+        """Дописать кадры, вытесняя самые старые"""
+        data = indata if indata.ndim == 2 else indata.reshape(-1, self._channels)
+        count = data.shape[0]
+        capacity = self._ring.shape[0]
+        if count >= capacity:
+            self._ring[:] = data[count - capacity:]
+            self._pos = 0
+            self._filled = capacity
+            return
+        pos = self._pos
+        end = pos + count
+        if end <= capacity:
+            self._ring[pos:end] = data
+        else:
+            split = capacity - pos
+            self._ring[pos:] = data[:split]
+            self._ring[:count - split] = data[split:]
+        self._pos = end % capacity
+        self._filled = min(capacity, self._filled + count)
+
+    def segments(self) -> Tuple[np.ndarray, ...]:
+        """Содержимое от старых кадров к новым: один или два вида без копии"""
+        if self._filled < self._ring.shape[0]:
+            # Кольцо ещё не переполнялось: данные с начала
+            return (self._ring[:self._filled],)
+        return (self._ring[self._pos:], self._ring[:self._pos])
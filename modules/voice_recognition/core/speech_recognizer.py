@@ -1,23 +1,59 @@
 """
 Основной класс распознавания речи с использованием SpeechRecognition
+
+В потоковом режиме (config.streaming) кадры записи уходят потоковому
+движку во время речи: частичные гипотезы - событие PARTIAL_RESULT,
+окончательный текст готов сразу после отпускания клавиши.
+
+VAD (core/vad.py) считается в audio callback: переходы речь/тишина -
+событие VOICE_ACTIVITY, тишина в начале и конце записи не отправляется.
+
+Запись целиком распознаёт бэкенд из config.backend (core/backends.py) в
+пуле потоков - event loop на распознавании не блокируется.
+
+Тёплый микрофон (config.warm_microphone): входной поток открыт между
+записями, audio callback держит последние preroll_ms в PrerollBuffer.
+start_listening не открывает устройство, запись начинается со звука до
+нажатия - первый слог не обрезается. Если тёплый поток ещё открывается,
+start_listening ждёт его, а не открывает второй; в запись пишет только
+поток, выбранный при старте записи.
 """
 
 import asyncio
+import functools
 import logging
 import time
 import threading
 from typing import Optional, Callable, Dict, Any, List
-import sounddevice as sd
 import numpy as np
 import speech_recognition as sr
 
+try:
+    import sounddevice as sd
+    _SOUNDDEVICE_AVAILABLE = True
+except Exception:  # OSError без PortAudio
+    sd = None
+    _SOUNDDEVICE_AVAILABLE = False
+
+from modules.metrics import get_registry
+
 from .types import (
     RecognitionConfig, RecognitionResult, RecognitionState, 
     RecognitionEventType, RecognitionMetrics
 )
+from .capture_buffer import CaptureBuffer, PrerollBuffer
+from .backends import RecognitionBackendExecutor, create_recognition_backend
+from .streaming import StreamingEngine, StreamingRecognitionSession, create_streaming_engine
+from .vad import VoiceActivityDetector
 
 logger = logging.getLogger(__name__)
 
+# Источники audio callback: тёплый поток и поток записи (холодный старт)
+SOURCE_WARM = "warm"
+SOURCE_COLD = "cold"
+# Сколько start_listening ждёт уже открывающийся тёплый поток
+WARM_OPEN_WAIT_SEC = 1.0
+
 class SpeechRecognizer:
     """Основной класс распознавания речи"""
     
@@ -25,15 +61,14 @@ class SpeechRecognizer:
         self.config = config
         self.state = RecognitionState.IDLE
         
-        # Аудио данные
-        self.audio_data = []
+        # Аудио данные: предвыделенный буфер, audio callback пишет в него на место
+        self.capture = CaptureBuffer(channels=self.config.channels, block_frames=self.config.sample_rate * 30)
         self.is_listening = False
         self.listen_start_time = None
         
         # Threading
         self.listen_thread = None
         self.stop_event = threading.Event()
-        self.audio_lock = threading.Lock()
         
         # Callbacks
         self.state_callbacks: Dict[RecognitionState, Callable] = {}
@@ -41,11 +76,55 @@ class SpeechRecognizer:
         
         # Метрики
         self.metrics = RecognitionMetrics()
+        registry = get_registry('voice_recognition')
+        self._m_release_to_final = registry.histogram('release_to_final_ms')
+        self._m_streaming_fallbacks = registry.counter('streaming_fallbacks')
+        self._m_voice_activity = registry.counter('voice_activity_events')
+        self._m_vad_trimmed = registry.histogram('vad_trimmed_ms')
+        # start_listening -> микрофон пишет в буфер записи (холодный старт - с открытием устройства)
+        self._m_listen_start = registry.histogram('listen_start_ms')
+        self._m_warm_starts = registry.counter('warm_starts')
+        self._m_cold_starts = registry.counter('cold_starts')
+        self._m_preroll = registry.histogram('preroll_captured_ms')
+        
+        # Потоковое распознавание: фабрика движка (по умолчанию - config.streaming_engine)
+        self.streaming_engine_factory: Optional[Callable[[], Optional[StreamingEngine]]] = None
+        self.streaming_session: Optional[StreamingRecognitionSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # VAD по кадрам записи (None - выключен)
+        self.vad: Optional[VoiceActivityDetector] = None
+        if self.config.vad_enabled:
+            self.vad = VoiceActivityDetector(
+                sample_rate=self.config.sample_rate,
+                energy_threshold=self.config.vad_energy_threshold,
+                hangover_ms=self.config.vad_hangover_ms,
+            )
+
+        # Бэкенд распознавания записи целиком
+        self.backend_executor = RecognitionBackendExecutor(
+            create_recognition_backend(self.config),
+            max_workers=self.config.backend_workers,
+            timeout=self.config.backend_timeout,
+        )
 
         # Параметры входного устройства
         self.input_device_index: Optional[int] = None
         self.actual_input_rate: int = self.config.sample_rate
         
+        # Тёплый микрофон: поток открыт между записями, callback пишет pre-roll
+        self.preroll: Optional[PrerollBuffer] = None
+        self._preroll_pending = False
+        self._warm_stream = None
+        self._warm_thread: Optional[threading.Thread] = None
+        self._warm_stop = threading.Event()
+        # Сброшен, пока тёплый поток открывается
+        self._warm_open_done = threading.Event()
+        self._warm_open_done.set()
+        # Поток, блоки которого идут в текущую запись
+        self._capture_source: Optional[str] = None
+        self._listen_requested_at: Optional[float] = None
+        
         # Инициализируем распознаватель
         self._init_recognizer()
         
@@ -143,10 +222,31 @@ class SpeechRecognizer:
                 logger.warning(f"⚠️ Невозможно начать прослушивание в состоянии {self.state.value}")
                 return False
                 
+            self._listen_requested_at = time.perf_counter()
             self.state = RecognitionState.LISTENING
-            self.is_listening = True
-            self.audio_data = []
+            self.capture.reset()
+            if self.vad is not None:
+                self.vad.reset()
             self.stop_event.clear()
+            self._loop = asyncio.get_running_loop()
+            if self.streaming_session is not None:
+                self.streaming_session.cancel()
+            self.streaming_session = self._open_streaming_session()
+            
+            # Поток уже открыт: первый же callback перенесёт pre-roll в запись
+            warm = self._warm_stream_active()
+            if not warm and not self._warm_open_done.is_set():
+                # Тёплый поток ещё открывается (long press перед записью) - ждём его,
+                # а не открываем второй поток на то же устройство
+                await asyncio.get_running_loop().run_in_executor(
+                    None, self._warm_open_done.wait, WARM_OPEN_WAIT_SEC
+                )
+                warm = self._warm_stream_active()
+            self._capture_source = SOURCE_WARM if warm else SOURCE_COLD
+            self._preroll_pending = warm
+            self.is_listening = True
+            if warm:
+                self._m_listen_start.observe_since(self._listen_requested_at)
             
             # Уведомляем о начале прослушивания
             await self._notify_state_change(RecognitionState.LISTENING)
@@ -159,7 +259,14 @@ class SpeechRecognizer:
                 self.config.dtype,
             )
             
+            if warm:
+                self._m_warm_starts.inc()
+                self.listen_thread = None
+                logger.info("🎤 Прослушивание микрофона начато (тёплый микрофон, pre-roll)")
+                return True
+            
             # Запускаем поток прослушивания
+            self._m_cold_starts.inc()
             self.listen_thread = threading.Thread(
                 target=self._run_listening,
                 name="SpeechListening",
@@ -184,6 +291,7 @@ class SpeechRecognizer:
                 logger.warning(f"⚠️ Невозможно остановить прослушивание в состоянии {self.state.value}")
                 return RecognitionResult(text="", error="Not listening")
                 
+            released_at = time.perf_counter()
             self.state = RecognitionState.PROCESSING
             self.is_listening = False
             self.stop_event.set()
@@ -195,15 +303,18 @@ class SpeechRecognizer:
             # Ждем завершения потока прослушивания
             if self.listen_thread and self.listen_thread.is_alive():
                 logger.debug("⏳ Ожидаем завершение потока записи...")
-                self.listen_thread.join(timeout=5.0)
+                await asyncio.get_running_loop().run_in_executor(None, self.listen_thread.join, 5.0)
             
             # Распознаем речь
             logger.debug(
                 "🎧 Завершаем запись: chunks=%s, thread_alive=%s",
-                len(self.audio_data),
+                self.capture.writes,
                 self.listen_thread.is_alive() if self.listen_thread else False,
             )
-            result = await self._recognize_audio()
+            result = await self._finish_streaming() if self.streaming_session is not None else None
+            if result is None:
+                result = await self._recognize_audio()
+            self._m_release_to_final.observe_since(released_at)
             
             # Обновляем метрики
             self._update_metrics(result)
@@ -215,71 +326,92 @@ class SpeechRecognizer:
                 logger.info(f"📝 Распознано: {result.text}")
             else:
                 logger.warning("⚠️ Речь не распознана")
+            
+            # Тёплый поток потерян (смена устройства) - переоткрываем к следующей записи
+            if self.config.warm_microphone and not self._warm_stream_active():
+                self.start_warm_microphone()
                 
             return result
             
+        except asyncio.CancelledError:
+            # Распознавание отменено (прерывание) - готовы к следующей записи
+            logger.info("🛑 Распознавание отменено")
+            self.state = RecognitionState.IDLE
+            raise
         except Exception as e:
             logger.error(f"❌ Ошибка остановки прослушивания: {e}")
             self.state = RecognitionState.ERROR
             await self._notify_state_change(RecognitionState.ERROR, error=str(e))
             return RecognitionResult(text="", error=str(e))
             
-    def _run_listening(self):
-        """Запускает прослушивание микрофона"""
+    def _open_input_stream(self, source: str):
+        """Подбирает устройство и открывает запущенный InputStream источника source (None - не удалось)"""
+        callback = functools.partial(self._audio_callback, source=source)
+        # Подбираем устройство
+        self.input_device_index = self._pick_input_device()
+        logger.info(
+            "🎛️ Используем устройство ввода: index=%s",
+            self.input_device_index if self.input_device_index is not None else "default",
+        )
+        device_param = self.input_device_index if self.input_device_index is not None else None
+        # Пробуем с желаемой частотой
         try:
-            # Подбираем устройство
-            self.input_device_index = self._pick_input_device()
+            self.actual_input_rate = self.config.sample_rate
+            stream = sd.InputStream(
+                device=device_param,
+                samplerate=self.config.sample_rate,
+                channels=self.config.channels,
+                dtype=self.config.dtype,
+                blocksize=self.config.chunk_size,
+                callback=callback
+            )
+            stream.start()
+            return stream
+        except Exception as e1:
+            logger.warning(f"⚠️ Не удалось открыть InputStream с {self.config.sample_rate} Hz: {e1}")
+        # Пробуем с дефолтной частотой устройства
+        try:
+            if device_param is not None:
+                dev_info = sd.query_devices(device_param)
+            else:
+                dev_info = sd.query_devices(None, 'input')
+            fallback_rate = int(dev_info.get('default_samplerate') or 16000)
+            self.actual_input_rate = fallback_rate
             logger.info(
-                "🎛️ Используем устройство ввода: index=%s",
-                self.input_device_index if self.input_device_index is not None else "default",
+                "🔁 Переходим на fallback частоту: %s Hz (device default)",
+                fallback_rate,
             )
-            device_param = self.input_device_index if self.input_device_index is not None else None
-            # Пробуем с желаемой частотой
-            try:
-                self.actual_input_rate = self.config.sample_rate
-                stream = sd.InputStream(
-                    device=device_param,
-                    samplerate=self.config.sample_rate,
-                    channels=self.config.channels,
-                    dtype=self.config.dtype,
-                    blocksize=self.config.chunk_size,
-                    callback=self._audio_callback
-                )
-                stream.start()
-            except Exception as e1:
-                logger.warning(f"⚠️ Не удалось открыть InputStream с {self.config.sample_rate} Hz: {e1}")
-                # Пробуем с дефолтной частотой устройства
-                try:
-                    if device_param is not None:
-                        dev_info = sd.query_devices(device_param)
-                    else:
-                        dev_info = sd.query_devices(None, 'input')
-                    fallback_rate = int(dev_info.get('default_samplerate') or 16000)
-                    self.actual_input_rate = fallback_rate
-                    logger.info(
-                        "🔁 Переходим на fallback частоту: %s Hz (device default)",
-                        fallback_rate,
-                    )
-                    stream = sd.InputStream(
-                        device=device_param,
-                        samplerate=fallback_rate,
-                        channels=self.config.channels,
-                        dtype=self.config.dtype,
-                        blocksize=self.config.chunk_size,
-                        callback=self._audio_callback
-                    )
-                    stream.start()
-                except Exception as e2:
-                    logger.error(f"❌ Ошибка открытия InputStream даже с дефолтной частотой: {e2}")
-                    self.state = RecognitionState.ERROR
-                    return
+            stream = sd.InputStream(
+                device=device_param,
+                samplerate=fallback_rate,
+                channels=self.config.channels,
+                dtype=self.config.dtype,
+                blocksize=self.config.chunk_size,
+                callback=callback
+            )
+            stream.start()
+            return stream
+        except Exception as e2:
+            logger.error(f"❌ Ошибка открытия InputStream даже с дефолтной частотой: {e2}")
+            return None
+
+    def _run_listening(self):
+        """Запускает прослушивание микрофона"""
+        try:
+            stream = self._open_input_stream(SOURCE_COLD)
+            if stream is None:
+                self.state = RecognitionState.ERROR
+                return
 
             with stream:
                 self.listen_start_time = time.time()
+                if self._listen_requested_at is not None:
+                    self._m_listen_start.observe_since(self._listen_requested_at)
                 logger.debug("⏱️ Поток записи запущен (actual_rate=%s)", self.actual_input_rate)
                 
+                # Ожидание события, а не sleep: поток выходит сразу после stop_listening
                 while self.is_listening and not self.stop_event.is_set():
-                    time.sleep(0.1)
+                    self.stop_event.wait(0.1)
                 
                 duration = time.time() - self.listen_start_time if self.listen_start_time else 0
                 logger.debug("🛑 Поток записи остановлен, длительность=%.2fs", duration)
@@ -287,43 +419,210 @@ class SpeechRecognizer:
         except Exception as e:
             logger.error(f"❌ Ошибка прослушивания микрофона: {e}")
             self.state = RecognitionState.ERROR
+    
+    def start_warm_microphone(self) -> bool:
+        """
+        Открывает входной поток заранее (config.warm_microphone)
+        
+        Поток остаётся открытым между записями, audio callback держит в
+        PrerollBuffer последние preroll_ms. Повторный вызов при открытом
+        потоке ничего не делает.
+        
+        Returns:
+            True - поток открыт или открывается
+        """
+        if not self.config.warm_microphone:
+            return False
+        thread = self._warm_thread
+        if thread is not None and thread.is_alive():
+            return True
+        self._warm_stop.clear()
+        self._warm_open_done.clear()
+        self._warm_thread = threading.Thread(
+            target=self._run_warm_microphone,
+            name="WarmMicrophone",
+            daemon=True
+        )
+        self._warm_thread.start()
+        return True
+    
+    def stop_warm_microphone(self):
+        """Закрывает тёплый входной поток (поток выходит в течение 0.1с)"""
+        self._warm_stop.set()
+    
+    def _warm_stream_active(self) -> bool:
+        stream = self._warm_stream
+        return stream is not None and bool(getattr(stream, 'active', False))
+    
+    def _run_warm_microphone(self):
+        """Держит входной поток открытым до stop_warm_microphone() или потери устройства"""
+        try:
+            stream = self._open_input_stream(SOURCE_WARM)
+            if stream is None:
+                logger.warning("⚠️ Тёплый микрофон недоступен - запись будет открывать устройство")
+                return
+            self.preroll = PrerollBuffer(
+                channels=self.config.channels,
+                frames=self.actual_input_rate * self.config.preroll_ms // 1000,
+                dtype=np.dtype(self.config.dtype),
+            )
+            with stream:
+                self._warm_stream = stream
+                self._warm_open_done.set()
+                logger.info(
+                    "🔥 Тёплый микрофон: поток открыт (rate=%s, pre-roll=%sms)",
+                    self.actual_input_rate,
+                    self.config.preroll_ms,
+                )
+                while not self._warm_stop.is_set() and stream.active:
+                    self._warm_stop.wait(0.1)
+                if not self._warm_stop.is_set():
+                    logger.warning("⚠️ Поток тёплого микрофона остановился - переоткроем после записи")
+        except Exception as e:
+            logger.error(f"❌ Ошибка тёплого микрофона: {e}")
+        finally:
+            self._warm_stream = None
+            self._preroll_pending = False
+            self._warm_open_done.set()
             
-    def _audio_callback(self, indata, frames, time, status):
-        """Callback для записи аудио"""
+    def _audio_callback(self, indata, frames, time, status, source: Optional[str] = None):
+        """Callback для записи аудио (source - поток-источник, None - без проверки)"""
         try:
             if status:
                 logger.warning(f"⚠️ Статус аудио: {status}")
                 
+            # Во время записи пишет только выбранный при старте поток, между записями - тёплый
+            if source is not None and source != (self._capture_source if self.is_listening else SOURCE_WARM):
+                return
             if self.is_listening:
-                with self.audio_lock:
-                    self.audio_data.append(indata.copy())
-                    if len(self.audio_data) == 1:
-                        logger.debug(
-                            "🔊 Первый чанк получен: frames=%s, dtype=%s",
-                            frames,
-                            indata.dtype,
-                        )
+                if self._preroll_pending:
+                    self._preroll_pending = False
+                    self._drain_preroll()
+                self._capture_block(indata)
+                if self.capture.writes == 1:
+                    logger.debug(
+                        "🔊 Первый чанк получен: frames=%s, dtype=%s",
+                        frames,
+                        indata.dtype,
+                    )
+            elif self.preroll is not None:
+                # Тёплый микрофон между записями: последние preroll_ms
+                self.preroll.write(indata)
                     
         except Exception as e:
             logger.error(f"❌ Ошибка в audio callback: {e}")
+    
+    def _capture_block(self, block: np.ndarray):
+        """Блок в запись: буфер, потоковый движок, VAD"""
+        # Копия на место в буфере; вид не меняется до следующей записи
+        written = self.capture.write(block)
+        session = self.streaming_session
+        if session is not None:
+            session.push(written, self.actual_input_rate)
+        vad = self.vad
+        if vad is not None:
+            if vad.sample_rate != self.actual_input_rate:
+                vad.set_sample_rate(self.actual_input_rate)
+            for speech, offset in vad.process(written):
+                self._on_voice_activity(speech, offset)
+    
+    def _drain_preroll(self):
+        """Звук до нажатия (pre-roll тёплого микрофона) - в начало записи"""
+        preroll = self.preroll
+        if preroll is None or not len(preroll):
+            return
+        frames = len(preroll)
+        for segment in preroll.segments():
+            if segment.shape[0]:
+                self._capture_block(segment)
+        preroll.clear()
+        self._m_preroll.observe(frames * 1000.0 / self.actual_input_rate)
             
+    def _open_streaming_session(self) -> Optional[StreamingRecognitionSession]:
+        """Сессия потокового движка на запись (None - распознавание целиком после записи)"""
+        if not self.config.streaming:
+            return None
+        factory = self.streaming_engine_factory or (lambda: create_streaming_engine(self.config))
+        try:
+            engine = factory()
+        except Exception as e:
+            logger.warning(f"⚠️ Потоковый движок не создан: {e}")
+            engine = None
+        if engine is None:
+            return None
+        return StreamingRecognitionSession(engine, self.config.language, on_partial=self._on_partial)
+    
+    def _on_partial(self, text: str):
+        """Частичная гипотеза (поток движка) -> событие PARTIAL_RESULT в event loop"""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        asyncio.run_coroutine_threadsafe(
+            self._notify_event(RecognitionEventType.PARTIAL_RESULT, data={"text": text}), loop
+        )
+    
+    def _on_voice_activity(self, speech: bool, offset: int):
+        """Переход речь/тишина (audio callback) -> событие VOICE_ACTIVITY в event loop"""
+        self._m_voice_activity.inc()
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        offset_ms = offset * 1000.0 / (self.actual_input_rate or self.config.sample_rate)
+        asyncio.run_coroutine_threadsafe(
+            self._notify_event(RecognitionEventType.VOICE_ACTIVITY, data={"speech": speech, "offset_ms": offset_ms}),
+            loop,
+        )
+    
+    async def _finish_streaming(self) -> Optional[RecognitionResult]:
+        """
+        Окончательный текст потокового движка
+        
+        Returns:
+            Результат или None - тогда распознаём записанное аудио целиком
+        """
+        session, self.streaming_session = self.streaming_session, None
+        start_time = time.time()
+        try:
+            text = await asyncio.get_running_loop().run_in_executor(
+                None, session.finish, self.config.streaming_finish_timeout
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Потоковое распознавание не удалось ({e}) - распознаём запись целиком")
+            self._m_streaming_fallbacks.inc()
+            return None
+        if not text:
+            logger.info("ℹ️ Потоковый движок не дал текста - распознаём запись целиком")
+            self._m_streaming_fallbacks.inc()
+            return None
+        result = RecognitionResult(
+            text=text,
+            language=self.config.language,
+            duration=time.time() - start_time,
+            timestamp=time.time()
+        )
+        await self._notify_event(RecognitionEventType.RECOGNITION_COMPLETE, result=result)
+        logger.info(
+            "✅ Потоковое распознавание: text_length=%s, partials=%s, finalize=%.0fms",
+            len(text), session.partials, result.duration * 1000,
+        )
+        return result
+    
     async def _recognize_audio(self) -> RecognitionResult:
         """Распознает записанное аудио"""
         try:
-            if not self.audio_data:
+            if not self.capture.frames:
                 logger.warning("⚠️ Нет аудио данных для распознавания")
                 return RecognitionResult(text="", error="No audio data")
                 
-            # Объединяем аудио чанки
-            with self.audio_lock:
-                audio_data = np.concatenate(self.audio_data, axis=0)
+            # Моно int16 запись: вид на буфер записи без копии
+            audio_data = self.capture.mono()
             sample_count = audio_data.shape[0]
             duration_sec = sample_count / float(self.actual_input_rate or self.config.sample_rate)
-            peak = float(np.max(np.abs(audio_data)))
-            rms = float(np.sqrt(np.mean(audio_data.astype(np.float64) ** 2)))
+            peak = float(max(-int(audio_data.min()), int(audio_data.max())))
+            rms = float(np.sqrt(np.einsum('i,i->', audio_data, audio_data, dtype=np.float64) / sample_count))
             logger.info(
                 "📈 Статистика аудио: chunks=%s, samples=%s, duration=%.2fs, peak=%.0f, rms=%.1f, actual_rate=%s, target_rate=%s",
-                len(self.audio_data),
+                self.capture.writes,
                 sample_count,
                 duration_sec,
                 peak,
@@ -331,10 +630,18 @@ class SpeechRecognizer:
                 self.actual_input_rate,
                 self.config.sample_rate,
             )
-                
-            # Конвертируем в формат для распознавания
-            if self.config.channels > 1:
-                audio_data = np.mean(audio_data, axis=1)
+            
+            # Тишина в начале и конце не уходит распознаванию (границы посчитаны VAD во время записи)
+            if self.vad is not None and self.config.vad_trim:
+                bounds = self.vad.stream_bounds(sample_count)
+                if bounds is None:
+                    logger.debug("🔇 VAD не нашёл речь - распознаём запись целиком")
+                elif bounds[1] - bounds[0] < sample_count:
+                    audio_data = audio_data[bounds[0]:bounds[1]]
+                    trimmed_ms = (sample_count - audio_data.shape[0]) * 1000.0 / float(self.actual_input_rate or self.config.sample_rate)
+                    self._m_vad_trimmed.observe(trimmed_ms)
+                    logger.info("✂️ VAD: обрезано %.0fмс тишины (речь %s..%s из %s сэмплов)",
+                                trimmed_ms, bounds[0], bounds[1], sample_count)
                 
             # Если запись велась не на той частоте, приводим к целевой
             try:
@@ -349,12 +656,9 @@ class SpeechRecognizer:
             except Exception as re:
                 logger.debug(f"Resample skipped: {re}")
 
-            # Нормализуем аудио
-            audio_data = audio_data.astype(np.float32) / np.iinfo(np.int16).max
-            
-            # Создаем AudioData для распознавания
-            audio_bytes = (audio_data * 32767).astype(np.int16).tobytes()
-            audio_data_obj = sr.AudioData(audio_bytes, self.config.sample_rate, 2)
+            # AudioData поверх тех же int16 сэмплов (bytes-like вид, без копии)
+            audio_data = np.ascontiguousarray(audio_data, dtype=np.int16)
+            audio_data_obj = sr.AudioData(memoryview(audio_data).cast('B'), self.config.sample_rate, 2)
             
             # Распознаем речь
             start_time = time.time()
@@ -381,9 +685,12 @@ class SpeechRecognizer:
                 )
                 return result
                 
+            except asyncio.TimeoutError:
+                return RecognitionResult(text="", error="Recognition timeout")
             except sr.UnknownValueError:
                 logger.warning(
-                    "⚠️ Google Speech Recognition не распознал аудио (duration=%.2fs, rms=%.1f, peak=%.0f)",
+                    "⚠️ Бэкенд %s не распознал аудио (duration=%.2fs, rms=%.1f, peak=%.0f)",
+                    self.backend_executor.backend.name,
                     duration_sec,
                     rms,
                     peak,
@@ -403,12 +710,13 @@ class SpeechRecognizer:
             return RecognitionResult(text="", error=str(e))
             
     async def _recognize_with_engine(self, audio_data: sr.AudioData) -> str:
-        """Распознает аудио с помощью Google Speech Recognition"""
+        """Распознает аудио бэкендом в пуле потоков (таймаут - config.backend_timeout)"""
         try:
-            return self.recognizer.recognize_google(audio_data, language=self.config.language)
-                
+            return await self.backend_executor.recognize(audio_data, self.config.language)
+        except (asyncio.TimeoutError, asyncio.CancelledError, sr.UnknownValueError):
+            raise
         except Exception as e:
-            logger.error(f"❌ Ошибка распознавания с Google Speech Recognition: {e}")
+            logger.error(f"❌ Ошибка распознавания бэкендом {self.backend_executor.backend.name}: {e}")
             raise
             
     def _update_metrics(self, result: RecognitionResult):
@@ -479,7 +787,11 @@ class SpeechRecognizer:
         return {
             "state": self.state.value,
             "is_listening": self.is_listening,
-            "audio_data_chunks": len(self.audio_data),
+            "audio_data_chunks": self.capture.writes,
+            "streaming": self.streaming_session is not None,
+            "backend": self.backend_executor.backend.name,
+            "speaking": self.vad.speaking if self.vad is not None else None,
+            "warm_microphone": self._warm_stream_active(),
             "config": {
                 "language": self.config.language,
                 "sample_rate": self.config.sample_rate,
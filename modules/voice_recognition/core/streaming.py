@@ -0,0 +1,224 @@
+"""
+Потоковое распознавание - кадры уходят движку, пока пользователь говорит
+"""
+
+import json
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+try:
+    import vosk
+    _VOSK_AVAILABLE = True
+except Exception:
+    vosk = None
+    _VOSK_AVAILABLE = False
+
+from modules.metrics import get_registry
+
+logger = logging.getLogger(__name__)
+
+# Конец записи в очереди кадров
+_END = object()
+
+
+class StreamingEngine:
+    """
+    Потоковый движок распознавания
+
+    Все вызовы идут из рабочего потока сессии по порядку:
+    start() -> accept()* -> finish() (или cancel()).
+    """
+
+    name = "base"
+
+    def start(self, sample_rate: int, language: str):
+        """Начало фразы: частота кадров, язык"""
+
+    def accept(self, pcm: np.ndarray) -> Optional[str]:
+        """Очередной блок int16 моно; возвращает текущую гипотезу (None - без изменений)"""
+        raise NotImplementedError
+
+    def finish(self) -> str:
+        """Конец записи: окончательный текст"""
+        raise NotImplementedError
+
+    def cancel(self):
+        """Запись отменена - результат не нужен"""
+
+
+class VoskStreamingEngine(StreamingEngine):
+    """Локальный офлайн движок Vosk (KaldiRecognizer): частичные гипотезы на каждый блок"""
+
+    name = "vosk"
+    _models: Dict[str, object] = {}
+
+    def __init__(self, model_path: str):
+        if not _VOSK_AVAILABLE:
+            raise RuntimeError("vosk не установлен")
+        if not model_path:
+            raise ValueError("Не задан путь к модели Vosk (streaming_model_path)")
+        # Модель загружается долго - одна на процесс
+        model = self._models.get(model_path)
+        if model is None:
+            model = self._models[model_path] = vosk.Model(model_path)
+        self._model = model
+        self._recognizer = None
+        self._phrases: List[str] = []
+
+    def start(self, sample_rate: int, language: str):
+        self._recognizer = vosk.KaldiRecognizer(self._model, float(sample_rate))
+        self._phrases = []
+
+    def accept(self, pcm: np.ndarray) -> Optional[str]:
+        if self._recognizer.AcceptWaveform(pcm.tobytes()):
+            # Конец фразы по паузе: текст зафиксирован
+            text = json.loads(self._recognizer.Result()).get('text', '')
+            if text:
+                self._phrases.append(text)
+            return " ".join(self._phrases) or None
+        partial = json.loads(self._recognizer.PartialResult()).get('partial', '')
+        return " ".join(self._phrases + ([partial] if partial else [])) or None
+
+    def finish(self) -> str:
+        text = json.loads(self._recognizer.FinalResult()).get('text', '')
+        if text:
+            self._phrases.append(text)
+        return " ".join(self._phrases)
+
+
+# Движки по имени из конфигурации: фабрика(config) -> StreamingEngine
+STREAMING_ENGINES: Dict[str, Callable[..., StreamingEngine]] = {
+    "vosk": lambda config: VoskStreamingEngine(config.streaming_model_path),
+}
+
+
+def register_streaming_engine(name: str, factory: Callable[..., StreamingEngine]):
+    """Подключить потоковый движок: factory(RecognitionConfig) -> StreamingEngine"""
+    STREAMING_ENGINES[name] = factory
+
+
+def create_streaming_engine(config) -> Optional[StreamingEngine]:
+    """Движок из config.streaming_engine или None (недоступен - пакетное распознавание)"""
+    factory = STREAMING_ENGINES.get(config.streaming_engine)
+    if factory is None:
+        logger.warning(f"⚠️ Неизвестный потоковый движок '{config.streaming_engine}'")
+        return None
+    try:
+        return factory(config)
+    except Exception as e:
+        logger.warning(f"⚠️ Потоковый движок '{config.streaming_engine}' недоступен: {e}")
+        return None
+
+
+class StreamingRecognitionSession:
+    """
+    Распознавание одной записи во время речи
+
+    push() вызывается из audio callback и не блокирует: кадр уходит в
+    очередь рабочего потока, который кормит движок и сообщает новые
+    гипотезы в on_partial(text). После отпускания клавиши finish() ждёт
+    только хвост очереди и финализацию движка, а не всю фразу.
+    """
+
+    def __init__(self, engine: StreamingEngine, language: str,
+                 on_partial: Optional[Callable[[str], None]] = None):
+        self.engine = engine
+        self.language = language
+        self._on_partial = on_partial
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._started = False
+        self._cancelled = False
+        self.partial_text = ""
+        self.partials = 0
+        self.frames = 0
+        self.final_text: Optional[str] = None
+        self.error: Optional[str] = None
+
+        metrics = get_registry('voice_recognition')
+        self._m_partials = metrics.counter('partial_results')
+        self._m_accept = metrics.histogram('streaming_accept_ms')
+        self._m_finalize = metrics.histogram('streaming_finalize_ms')
+
+        self._thread = threading.Thread(target=self._run, name="StreamingRecognition", daemon=True)
+        self._thread.start()
+
+    def push(self, frames: np.ndarray, sample_rate: int):
+        """Кадры записи (из audio callback; массив не должен меняться после вызова)"""
+        if not self._cancelled:
+            self._queue.put((frames, sample_rate))
+
+    def finish(self, timeout: float = 2.0) -> str:
+        """
+        Конец записи: дождаться окончательного текста
+
+        Raises:
+            TimeoutError: движок не успел финализировать
+            RuntimeError: ошибка движка во время записи
+        """
+        started = time.perf_counter()
+        self._queue.put(_END)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError(f"Потоковый движок не завершился за {timeout:.1f}с")
+        self._m_finalize.observe_since(started)
+        if self.error is not None:
+            raise RuntimeError(self.error)
+        return self.final_text or ""
+
+    def cancel(self):
+        """Отмена записи: очередь отбрасывается, движок сбрасывается"""
+        self._cancelled = True
+        self._queue.put(_END)
+
+    def _run(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is _END:
+                    break
+                if self._cancelled or self.error is not None:
+                    continue
+                frames, sample_rate = item
+                try:
+                    self._accept(frames, sample_rate)
+                except Exception as e:
+                    # Дальнейшие кадры отбрасываем - результат даст пакетное распознавание
+                    self.error = str(e)
+                    logger.warning(f"⚠️ Ошибка потокового движка {self.engine.name}: {e}")
+            if self._cancelled:
+                self.engine.cancel()
+            elif self.error is None and self._started:
+                self.final_text = self.engine.finish()
+            elif self.error is None:
+                self.final_text = ""
+        except Exception as e:
+            self.error = str(e)
+            logger.warning(f"⚠️ Ошибка финализации потокового движка {self.engine.name}: {e}")
+
+    def _accept(self, frames: np.ndarray, sample_rate: int):
+        if not self._started:
+            self.engine.start(sample_rate, self.language)
+            self._started = True
+        pcm = frames
+        if pcm.ndim > 1:
+            pcm = pcm.mean(axis=1) if pcm.shape[1] > 1 else pcm[:, 0]
+        if pcm.dtype != np.int16:
+            pcm = pcm.astype(np.int16)
+        self.frames += pcm.shape[0]
+        started = time.perf_counter()
+        hypothesis = self.engine.accept(pcm)
+        self._m_accept.observe_since(started)
+        if hypothesis and hypothesis != self.partial_text:
+            self.partial_text = hypothesis
+            self.partials += 1
+            self._m_partials.inc()
+            if self._on_partial is not None:
+                try:
+                    self._on_partial(hypothesis)
+                except Exception as e:
+                    logger.debug(f"on_partial: {e}")
@@ -10,6 +10,8 @@ import time
 class RecognitionEngine(Enum):
     """Доступные движки распознавания"""
     GOOGLE = "google"
+    VOSK = "vosk"
+    STUB = "stub"
 
 class RecognitionState(Enum):
     """Состояния распознавания"""
@@ -26,6 +28,8 @@ class RecognitionEventType(Enum):
     LISTENING_STOP = "listening_stop"
     RECOGNITION_START = "recognition_start"
     RECOGNITION_COMPLETE = "recognition_complete"
+    PARTIAL_RESULT = "partial_result"
+    VOICE_ACTIVITY = "voice_activity"
     RECOGNITION_ERROR = "recognition_error"
     TIMEOUT = "timeout"
 
@@ -58,6 +62,28 @@ class RecognitionConfig:
     max_alternatives: int = 1
     show_all: bool = False
     
+    # Бэкенд распознавания записи (см. core/backends.py): пул потоков и таймаут вызова
+    backend: str = "google"
+    backend_workers: int = 2
+    backend_timeout: float = 8.0
+    backend_model_path: str = ""
+    
+    # VAD (core/vad.py): события речь/тишина во время записи, обрезка тишины перед распознаванием
+    vad_enabled: bool = True
+    vad_trim: bool = True
+    vad_energy_threshold: float = 0.01
+    vad_hangover_ms: int = 300
+    
+    # Тёплый микрофон: входной поток открыт между записями, запись начинается с pre-roll
+    warm_microphone: bool = False
+    preroll_ms: int = 300
+    
+    # Потоковое распознавание: кадры уходят движку во время записи
+    streaming: bool = False
+    streaming_engine: str = "vosk"
+    streaming_model_path: str = ""
+    streaming_finish_timeout: float = 2.0
+    
     # Дополнительные настройки
     enable_logging: bool = True
     enable_metrics: bool = True
@@ -0,0 +1,203 @@
+"""
+VAD - детектор речи по кадрам (энергия + zero-crossing rate)
+
+ОСНОВНЫЕ ПРИНЦИПЫ:
+1. Векторизация - признаки считаются NumPy сразу для всех кадров блока,
+   без цикла по сэмплам
+2. Кадр речи - RMS выше порога, либо RMS выше половины порога при высоком
+   ZCR (глухие согласные: "с", "ф", "ш")
+3. Сглаживание - речь подтверждается min_speech_ms подряд, после
+   последнего подтверждённого кадра держится hangover_ms
+4. Одинаковый результат офлайн и в потоке - сглаживание причинное, его
+   состояние переносится между блоками audio callback
+"""
+
+import logging
+from math import ceil
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Ещё не было подтверждённой речи
+_NEVER = -(1 << 62)
+
+
+class _VadState:
+    """Состояние сглаживания между блоками"""
+
+    def __init__(self, min_speech_frames: int):
+        # Последние min_speech_frames-1 сырых флагов (до записи - тишина)
+        self.raw_tail = np.zeros(min_speech_frames - 1, dtype=np.int16)
+        self.last_confirmed = _NEVER             # номер последнего подтверждённого кадра речи
+        self.frame_index = 0                     # кадров обработано
+        self.first_speech: Optional[int] = None  # первый кадр речи (после сглаживания)
+        self.last_speech: Optional[int] = None   # последний кадр речи (с hangover)
+        self.speaking = False
+
+
+class VoiceActivityDetector:
+    """
+    Детектор речи по кадрам frame_ms
+
+    Офлайн: frame_flags(audio), speech_bounds(audio), trim(audio).
+    В потоке: process(block) из audio callback возвращает переходы
+    речь/тишина, stream_bounds() - границы речи в записи без пересчёта.
+    Порог энергии - RMS в долях полной шкалы (0.01 = -40 dBFS).
+    """
+
+    def __init__(self, sample_rate: int = 16000, frame_ms: int = 20, energy_threshold: float = 0.01,
+                 zcr_threshold: float = 0.25, min_speech_ms: int = 60, hangover_ms: int = 300,
+                 padding_ms: int = 200):
+        self.frame_ms = frame_ms
+        self.energy_threshold = energy_threshold
+        self.zcr_threshold = zcr_threshold
+        self.min_speech_ms = min_speech_ms
+        self.hangover_ms = hangover_ms
+        self.padding_ms = padding_ms
+        self.set_sample_rate(sample_rate)
+
+    def set_sample_rate(self, sample_rate: int):
+        """Частота записи (кадры пересчитываются, потоковое состояние сбрасывается)"""
+        self.sample_rate = int(sample_rate)
+        self.frame_len = max(1, self.sample_rate * self.frame_ms // 1000)
+        self.min_speech_frames = max(1, ceil(self.min_speech_ms / self.frame_ms))
+        self.hangover_frames = max(0, round(self.hangover_ms / self.frame_ms))
+        self.padding_frames = max(0, round(self.padding_ms / self.frame_ms))
+        self._ones = np.ones(self.min_speech_frames, dtype=np.int16)
+        self._positions = np.arange(64, dtype=np.int64)
+        # Неполный кадр прошлого блока + текущий блок (растёт под размер блока)
+        self._work = np.zeros(self.frame_len * 8, dtype=np.int16)
+        self.reset()
+
+    def reset(self):
+        """Новая запись"""
+        self._state = _VadState(self.min_speech_frames)
+        self._pending = 0
+
+    # Офлайн
+
+    def frame_flags(self, audio: np.ndarray) -> np.ndarray:
+        """Флаг речи на каждый полный кадр записи"""
+        raw = self._raw_flags(self._frames(self._mono(audio)), self._scale(audio))
+        return self._smooth(raw, _VadState(self.min_speech_frames))
+
+    def speech_bounds(self, audio: np.ndarray) -> Optional[Tuple[int, int]]:
+        """Границы речи в сэмплах (с запасом padding_ms) или None - речи нет"""
+        state = _VadState(self.min_speech_frames)
+        self._smooth(self._raw_flags(self._frames(self._mono(audio)), self._scale(audio)), state)
+        return self._bounds(state, len(audio))
+
+    def trim(self, audio: np.ndarray) -> np.ndarray:
+        """Запись без тишины в начале и конце (вид без копии); без речи - как есть"""
+        bounds = self.speech_bounds(audio)
+        return audio if bounds is None else audio[bounds[0]:bounds[1]]
+
+    # Поток
+
+    def process(self, block: np.ndarray) -> List[Tuple[bool, int]]:
+        """
+        Очередной блок записи (из audio callback)
+
+        Returns:
+            Переходы [(речь, смещение в сэмплах от начала записи)]
+        """
+        samples = self._mono(block)
+        pending = self._pending
+        total = pending + samples.shape[0]
+        if self._work.dtype != samples.dtype or self._work.shape[0] < total:
+            work = np.zeros(max(total, self._work.shape[0]), dtype=samples.dtype)
+            work[:pending] = self._work[:pending]
+            self._work = work
+        work = self._work
+        work[pending:total] = samples
+        full = total // self.frame_len * self.frame_len
+        raw = self._raw_flags(work[:full].reshape(-1, self.frame_len), self._scale(block))
+        # Неполный кадр - в начало буфера до следующего блока
+        self._pending = total - full
+        work[:self._pending] = work[full:total]
+        if raw.shape[0] == 0:
+            return []
+
+        state = self._state
+        start = state.frame_index
+        speech = self._smooth(raw, state)
+        changes = (speech[1:] != speech[:-1]).nonzero()[0] + 1
+        if speech[0] != state.speaking:
+            changes = np.concatenate(([0], changes))
+        state.speaking = bool(speech[-1])
+        return [(bool(speech[i]), (start + int(i)) * self.frame_len) for i in changes]
+
+    @property
+    def speaking(self) -> bool:
+        return self._state.speaking
+
+    def stream_bounds(self, total_samples: int) -> Optional[Tuple[int, int]]:
+        """Границы речи в записи, поданной через process()"""
+        return self._bounds(self._state, total_samples)
+
+    # Внутреннее
+
+    def _bounds(self, state: _VadState, total_samples: int) -> Optional[Tuple[int, int]]:
+        if state.first_speech is None:
+            return None
+        # Подтверждение речи запаздывает на min_speech_frames-1 кадров
+        first = state.first_speech - (self.min_speech_frames - 1) - self.padding_frames
+        last = state.last_speech + 1 + self.padding_frames
+        return max(0, first * self.frame_len), min(total_samples, last * self.frame_len)
+
+    @staticmethod
+    def _mono(audio: np.ndarray) -> np.ndarray:
+        if audio.ndim == 1:
+            return audio
+        return audio[:, 0] if audio.shape[1] == 1 else audio.mean(axis=1)
+
+    @staticmethod
+    def _scale(audio: np.ndarray) -> float:
+        """Полная шкала формата: int16 -> 32768, float -> 1"""
+        if audio.dtype.kind in 'iu':
+            return float(np.iinfo(audio.dtype).max) + 1.0
+        return 1.0
+
+    def _frames(self, samples: np.ndarray) -> np.ndarray:
+        count = samples.shape[0] // self.frame_len
+        return samples[:count * self.frame_len].reshape(count, self.frame_len)
+
+    def _raw_flags(self, frames: np.ndarray, scale: float) -> np.ndarray:
+        """Сырые флаги речи по кадрам: энергия и ZCR"""
+        if frames.shape[0] == 0:
+            return np.zeros(0, dtype=bool)
+        # Сравнение суммы квадратов с порогом RMS, без sqrt и деления на кадр
+        energy = np.einsum('ij,ij->i', frames, frames, dtype=np.float64)
+        threshold = (self.energy_threshold * scale) ** 2 * self.frame_len
+        signs = np.signbit(frames)
+        crossings = (signs[:, 1:] != signs[:, :-1]).sum(axis=1)
+        unvoiced = (energy >= threshold * 0.25) & (crossings >= self.zcr_threshold * self.frame_len)
+        return (energy >= threshold) | unvoiced
+
+    def _smooth(self, raw: np.ndarray, state: _VadState) -> np.ndarray:
+        """Причинное сглаживание: min_speech_frames подряд, затем hangover_frames"""
+        count = raw.shape[0]
+        if count == 0:
+            return np.zeros(0, dtype=bool)
+        # Кадр подтверждает речь, если он и min_speech_frames-1 предыдущих - речь
+        ext = np.concatenate((state.raw_tail, raw.view(np.int8)))
+        confirmed = np.convolve(ext, self._ones, 'valid') == self.min_speech_frames
+
+        if self._positions.shape[0] < count:
+            self._positions = np.arange(count, dtype=np.int64)
+        positions = self._positions[:count]
+        # Позиция последнего подтверждённого кадра (в кадрах блока, прошлые - отрицательные)
+        last = np.maximum.accumulate(np.where(confirmed, positions, state.last_confirmed - state.frame_index))
+        speech = (positions - last) <= self.hangover_frames
+
+        state.last_confirmed = int(last[-1]) + state.frame_index
+        state.raw_tail = ext[count:]
+        hits = speech.nonzero()[0]
+        if hits.shape[0]:
+            if state.first_speech is None:
+                state.first_speech = state.frame_index + int(hits[0])
+            state.last_speech = state.frame_index + int(hits[-1])
+        state.frame_index += count
+        return speech
@@ -41,18 +41,14 @@ def normalize_audio(audio_data: np.ndarray, target_dtype: np.dtype = np.int16) -
         return audio_data
 
 def resample_audio(audio_data: np.ndarray, original_rate: int, target_rate: int) -> np.ndarray:
-    """Изменяет частоту дискретизации аудио"""
+    """Изменяет частоту дискретизации аудио (polyphase фильтр из speech_playback)"""
     try:
         if original_rate == target_rate:
             return audio_data
             
-        # Простое изменение частоты дискретизации
-        ratio = target_rate / original_rate
-        new_length = int(len(audio_data) * ratio)
-        
-        # Линейная интерполяция
-        indices = np.linspace(0, len(audio_data) - 1, new_length)
-        return np.interp(indices, np.arange(len(audio_data)), audio_data).astype(audio_data.dtype)
+        # Общий polyphase resampler: банки фильтров кэшируются на пару частот
+        from modules.speech_playback.utils.audio_utils import resample_audio as polyphase_resample
+        return polyphase_resample(audio_data, target_rate, original_rate)
         
     except Exception as e:
         logger.error(f"❌ Ошибка изменения частоты дискретизации: {e}")
@@ -84,64 +80,41 @@ def convert_channels(audio_data: np.ndarray, target_channels: int) -> np.ndarray
         logger.error(f"❌ Ошибка конвертации каналов: {e}")
         return audio_data
 
+def _silence_mask(audio_data: np.ndarray, threshold: float) -> np.ndarray:
+    """Маска тихих сэмплов (для 2D - по RMS каналов)"""
+    if len(audio_data.shape) == 2:
+        energy = np.sqrt(np.einsum('ij,ij->i', audio_data, audio_data, dtype=np.float64) / audio_data.shape[1])
+    else:
+        energy = np.abs(audio_data)
+    return energy < threshold
+
 def detect_silence(audio_data: np.ndarray, threshold: float = 0.01) -> List[Tuple[int, int]]:
-    """Обнаруживает тишину в аудио"""
+    """
+    Обнаруживает тишину в аудио (по сэмплам)
+
+    Для распознавания речи по кадрам используйте core.vad.VoiceActivityDetector.
+    """
     try:
-        # Вычисляем энергию сигнала
-        if len(audio_data.shape) == 2:
-            energy = np.sqrt(np.mean(audio_data ** 2, axis=1))
-        else:
-            energy = np.abs(audio_data)
-            
-        # Находим участки тишины
-        silence_mask = energy < threshold
-        silence_regions = []
-        
-        in_silence = False
-        start = 0
-        
-        for i, is_silent in enumerate(silence_mask):
-            if is_silent and not in_silence:
-                start = i
-                in_silence = True
-            elif not is_silent and in_silence:
-                silence_regions.append((start, i))
-                in_silence = False
-                
-        if in_silence:
-            silence_regions.append((start, len(silence_mask)))
-            
-        return silence_regions
+        silence_mask = _silence_mask(audio_data, threshold)
+        if silence_mask.shape[0] == 0:
+            return []
+
+        # Участки тишины - пары смен значения маски
+        padded = np.concatenate(([False], silence_mask, [False]))
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        return [(int(start), int(end)) for start, end in zip(edges[0::2], edges[1::2])]
         
     except Exception as e:
         logger.error(f"❌ Ошибка обнаружения тишины: {e}")
         return []
 
 def trim_silence(audio_data: np.ndarray, threshold: float = 0.01) -> np.ndarray:
-    """Удаляет тишину с начала и конца аудио"""
+    """Удаляет тишину с начала и конца аудио (вид без копии)"""
     try:
-        silence_regions = detect_silence(audio_data, threshold)
-        
-        if not silence_regions:
-            return audio_data
-            
-        # Удаляем тишину с начала
-        start_idx = 0
-        for start, end in silence_regions:
-            if start == 0:
-                start_idx = end
-            else:
-                break
-                
-        # Удаляем тишину с конца
-        end_idx = len(audio_data)
-        for start, end in reversed(silence_regions):
-            if end == len(audio_data):
-                end_idx = start
-            else:
-                break
-                
-        return audio_data[start_idx:end_idx]
+        loud = np.flatnonzero(~_silence_mask(audio_data, threshold))
+        if loud.shape[0] == 0:
+            return audio_data[:0]
+        return audio_data[loud[0]:loud[-1] + 1]
         
     except Exception as e:
         logger.error(f"❌ Ошибка удаления тишины: {e}")
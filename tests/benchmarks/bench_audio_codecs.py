@@ -0,0 +1,163 @@
+"""
+Бенчмарк сжатого аудио транспорта: PCM int16 vs FLAC чанки
+
+Локальный энкодер (soundfile/libsndfile) кодирует речь чанками так, как
+их отправлял бы сервер: каждый AudioChunk - самодостаточный FLAC поток.
+Клиентская сторона - StreamingDecoder (рабочий поток) с sink, как у
+SpeechPlaybackIntegration.
+
+Метрики:
+- bytes/s речи: трафик PCM и FLAC (с заголовками чанков), степень сжатия
+- decode CPU: время декодирования чанка и доля реального времени
+- добавленная задержка: от submit() до PCM в sink (очередь + декодирование)
+
+Речь - WAV/FLAC файл (--input) или синтетический голос (гармоники
+основного тона с формантной огибающей, паузы и шум).
+
+Запуск:
+    python tests/benchmarks/bench_audio_codecs.py --seconds 30 --chunk-ms 100
+    python tests/benchmarks/bench_audio_codecs.py --input speech.wav --json
+"""
+
+import argparse
+import io
+import json
+import logging
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.decoder_stage import StreamingDecoder
+from modules.speech_playback.utils.audio_codecs import get_decoder
+
+
+def synthetic_speech(seconds: float, rate: int, seed: int) -> np.ndarray:
+    """Синтетический голос: слоги 150-300мс с паузами, дрейф основного тона, шум"""
+    rng = np.random.default_rng(seed)
+    total = int(seconds * rate)
+    out = np.zeros(total, dtype=np.float64)
+    pos = 0
+    while pos < total:
+        syllable = int(rng.uniform(0.15, 0.3) * rate)
+        t = np.arange(syllable) / rate
+        f0 = rng.uniform(100, 220) * (1 + 0.1 * np.sin(2 * np.pi * 3 * t))
+        phase = 2 * np.pi * np.cumsum(f0) / rate
+        formants = rng.uniform([400, 1200, 2400], [900, 2000, 3200])
+        voice = sum(np.sin(k * phase) / k * np.exp(-((k * f0 - formants[:, None]) ** 2).min(axis=0) / 2e5)
+                    for k in range(1, 20))
+        envelope = np.sin(np.pi * np.arange(syllable) / syllable) ** 0.5
+        end = min(total, pos + syllable)
+        out[pos:end] = (voice * envelope)[:end - pos]
+        pos = end + int(rng.uniform(0.02, 0.2) * rate)
+    out += rng.normal(0, 0.003, total)
+    return (out / max(1e-9, np.abs(out).max()) * 12000).astype(np.int16)
+
+
+def encode_flac(samples: np.ndarray, rate: int) -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, samples, rate, format='FLAC', subtype='PCM_16')
+    return buf.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PCM vs FLAC: трафик, CPU декодирования, задержка")
+    parser.add_argument("--input", type=str, default=None, help="WAV/FLAC файл с речью (моно/стерео)")
+    parser.add_argument("--seconds", type=float, default=30.0, help="Длительность синтетической речи")
+    parser.add_argument("--rate", type=int, default=24000, help="Частота синтетической речи")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Длительность AudioChunk")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Вывести результат JSON")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    if args.input:
+        samples, rate = sf.read(args.input, dtype='int16')
+    else:
+        samples, rate = synthetic_speech(args.seconds, args.rate, args.seed), args.rate
+    frames = rate * args.chunk_ms // 1000
+    pieces = [samples[i:i + frames] for i in range(0, len(samples) - frames + 1, frames)]
+    seconds = len(pieces) * frames / rate
+
+    encode_started = time.perf_counter()
+    payloads = [encode_flac(piece, rate) for piece in pieces]
+    encode_sec = time.perf_counter() - encode_started
+
+    # Декодирование напрямую (CPU)
+    decoder = get_decoder('flac')
+    decode_times = []
+    for payload, piece in zip(payloads, pieces):
+        started = time.perf_counter()
+        pcm, _, _ = decoder.decode(payload)
+        decode_times.append(time.perf_counter() - started)
+        assert np.array_equal(pcm, piece), "FLAC должен декодироваться без потерь"
+
+    # Через StreamingDecoder в темпе потока: задержка submit -> sink
+    latencies = []
+    submitted = {}
+    done = threading.Event()
+
+    def sink(session_id, pcm, sample_rate, channels, metadata):
+        latencies.append(time.perf_counter() - submitted[metadata['n']])
+        if metadata['n'] == len(payloads) - 1:
+            done.set()
+
+    stage = StreamingDecoder(sink, max_pending=len(payloads) + 1)
+    stage.start()
+    for n, payload in enumerate(payloads):
+        submitted[n] = time.perf_counter()
+        stage.submit("bench", 'flac', payload, {'n': n})
+        time.sleep(0.002)  # чанки приходят из сети не пачкой
+    done.wait(30.0)
+    stage.stop()
+
+    pcm_bytes = sum(piece.nbytes for piece in pieces)
+    flac_bytes = sum(len(p) for p in payloads)
+    decode_ms = np.array(decode_times) * 1000.0
+    latency_ms = np.array(latencies) * 1000.0
+    result = {
+        'chunks': len(payloads),
+        'chunk_ms': args.chunk_ms,
+        'sample_rate': rate,
+        'pcm_bytes_per_sec': pcm_bytes / seconds,
+        'flac_bytes_per_sec': flac_bytes / seconds,
+        'compression_ratio': pcm_bytes / max(1, flac_bytes),
+        # Тихий чанк кодируется константными субфреймами - почти весь его размер заголовок
+        'flac_overhead_bytes_per_chunk': len(encode_flac(np.zeros(frames, dtype=np.int16), rate)),
+        'decode_ms_mean': float(decode_ms.mean()),
+        'decode_ms_p99': float(np.percentile(decode_ms, 99)),
+        'decode_cpu_realtime_pct': float(decode_ms.sum() / 1000.0 / seconds * 100.0),
+        'encode_cpu_realtime_pct': encode_sec / seconds * 100.0,
+        'added_latency_ms_mean': float(latency_ms.mean()) if latency_ms.size else None,
+        'added_latency_ms_p99': float(np.percentile(latency_ms, 99)) if latency_ms.size else None,
+    }
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print("=" * 80)
+    print(f"🧪 PCM vs FLAC: {result['chunks']} чанков x {args.chunk_ms}мс, {rate}Гц ({seconds:.1f}с речи)")
+    print("=" * 80)
+    print("\n📦 Трафик")
+    print(f"   PCM int16: {result['pcm_bytes_per_sec'] / 1024:.1f} KB/s")
+    print(f"   FLAC:      {result['flac_bytes_per_sec'] / 1024:.1f} KB/s "
+          f"(x{result['compression_ratio']:.2f}, заголовок ~{result['flac_overhead_bytes_per_chunk']} bytes/чанк)")
+    print("\n⚙️ CPU")
+    print(f"   Декодирование чанка: {result['decode_ms_mean']:.3f}мс (p99 {result['decode_ms_p99']:.3f}мс), "
+          f"{result['decode_cpu_realtime_pct']:.2f}% реального времени")
+    print(f"   Кодирование (сервер): {result['encode_cpu_realtime_pct']:.2f}% реального времени")
+    print("\n⏱️ Добавленная задержка (submit → PCM в sink)")
+    print(f"   Среднее {result['added_latency_ms_mean']:.3f}мс, p99 {result['added_latency_ms_p99']:.3f}мс")
+
+
+if __name__ == "__main__":
+    main()
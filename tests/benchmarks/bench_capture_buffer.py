@@ -0,0 +1,155 @@
+"""
+Бенчмарк буфера записи SpeechRecognizer
+
+Сравнивает прежний путь (indata.copy() под lock на каждый блок, затем
+np.concatenate и int16 -> float32 -> int16 перед sr.AudioData) с
+предвыделенным CaptureBuffer (копия на место, int16 вид без копии).
+
+Для фраз 5с и 60с меряется: audio callback, аллокации во время записи
+и время передачи записи распознаванию (stop -> sr.AudioData).
+
+Запуск:
+    python tests/benchmarks/bench_capture_buffer.py --durations 5 60
+"""
+
+import argparse
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.capture_buffer import CaptureBuffer
+
+
+class LegacyCapture:
+    """Копия прежней логики SpeechRecognizer (список копий + склейка) для сравнения"""
+
+    def __init__(self):
+        self.audio_data = []
+        self.audio_lock = threading.Lock()
+
+    def callback(self, indata):
+        frames = indata.copy()
+        with self.audio_lock:
+            self.audio_data.append(frames)
+
+    def handoff(self, sample_rate: int) -> sr.AudioData:
+        with self.audio_lock:
+            audio_data = np.concatenate(self.audio_data, axis=0)
+        audio_data = np.mean(audio_data, axis=1) if audio_data.shape[1] > 1 else audio_data
+        audio_data = audio_data.astype(np.float32) / np.iinfo(np.int16).max
+        audio_bytes = (audio_data * 32767).astype(np.int16).tobytes()
+        return sr.AudioData(audio_bytes, sample_rate, 2)
+
+
+class BufferedCapture:
+    """Путь SpeechRecognizer с CaptureBuffer"""
+
+    def __init__(self, sample_rate: int):
+        self.capture = CaptureBuffer(channels=1, block_frames=sample_rate * 30)
+
+    def callback(self, indata):
+        self.capture.write(indata)
+
+    def handoff(self, sample_rate: int) -> sr.AudioData:
+        audio_data = np.ascontiguousarray(self.capture.mono(), dtype=np.int16)
+        return sr.AudioData(memoryview(audio_data).cast('B'), sample_rate, 2)
+
+
+def make_blocks(seconds: float, sample_rate: int, blocksize: int) -> list:
+    """Блоки как из sd.InputStream: int16 (blocksize, 1), один массив на все вызовы"""
+    rng = np.random.default_rng(0)
+    block = (rng.standard_normal((blocksize, 1)) * 3000).astype(np.int16)
+    return [block] * int(seconds * sample_rate / blocksize)
+
+
+def record(capture, blocks, sample_rate: int, traced: bool) -> dict:
+    """
+    Запись + передача распознаванию
+
+    traced=False - время callback и передачи, traced=True - память
+    (tracemalloc замедляет вызовы, поэтому проходы раздельные).
+    """
+    callback_times = []
+    if traced:
+        tracemalloc.start()
+    for block in blocks:
+        t0 = time.perf_counter()
+        capture.callback(block)
+        callback_times.append(time.perf_counter() - t0)
+    record_bytes = tracemalloc.get_traced_memory()[0] if traced else 0
+    if traced:
+        tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    audio = capture.handoff(sample_rate)
+    handoff_s = time.perf_counter() - t0
+    handoff_peak = max(0, tracemalloc.get_traced_memory()[1] - record_bytes) if traced else 0
+    if traced:
+        tracemalloc.stop()
+    assert len(audio.frame_data) == len(blocks) * blocks[0].shape[0] * 2
+    return {
+        "callback_times": callback_times,
+        "record_bytes": record_bytes,
+        "handoff_peak": handoff_peak,
+        "handoff_s": handoff_s,
+    }
+
+
+def report(name: str, timing: dict, memory: dict, allocations: int):
+    ct = np.array(timing["callback_times"]) * 1e6
+    print(f"\n📊 {name}")
+    print(f"   callback p50={np.percentile(ct, 50):.2f}µs p99={np.percentile(ct, 99):.2f}µs max={ct.max():.1f}µs")
+    print(f"   Аллокаций массивов за запись: {allocations}, прирост памяти: {memory['record_bytes'] / (1024 * 1024):.2f}MB")
+    print(f"   stop -> AudioData: {timing['handoff_s'] * 1000:.2f}ms, "
+          f"пик памяти передачи: {memory['handoff_peak'] / (1024 * 1024):.2f}MB")
+
+
+def run_buffered(blocks, sample_rate: int, traced: bool):
+    """Первая и повторная запись одним CaptureBuffer; (результат, аллокации) для каждой"""
+    capture = BufferedCapture(sample_rate)
+    cold = record(capture, blocks, sample_rate, traced)
+    # Вместе с блоком, выделенным в конструкторе
+    cold_allocations = capture.capture.allocations
+    # Следующая запись переиспользует блоки прошлой
+    capture.capture.reset()
+    allocations = capture.capture.allocations
+    warm = record(capture, blocks, sample_rate, traced)
+    return (cold, cold_allocations), (warm, capture.capture.allocations - allocations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SpeechRecognizer: список копий vs CaptureBuffer")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5.0, 60.0], help="Длительность фраз, с")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="Частота записи")
+    parser.add_argument("--blocksize", type=int, default=1024, help="Размер блока audio callback")
+    args = parser.parse_args()
+
+    for seconds in args.durations:
+        blocks = make_blocks(seconds, args.sample_rate, args.blocksize)
+        print("=" * 80)
+        print(f"🧪 Фраза {seconds:.0f}с: {len(blocks)} блоков по {args.blocksize} @ {args.sample_rate} Гц")
+        print("=" * 80)
+
+        legacy = record(LegacyCapture(), blocks, args.sample_rate, traced=False)
+        report("Legacy (indata.copy + concatenate + float round-trip)", legacy,
+               record(LegacyCapture(), blocks, args.sample_rate, traced=True), len(blocks))
+
+        (cold, cold_allocations), (warm, warm_allocations) = run_buffered(blocks, args.sample_rate, traced=False)
+        (cold_memory, _), (warm_memory, _) = run_buffered(blocks, args.sample_rate, traced=True)
+        report("CaptureBuffer, первая запись", cold, cold_memory, cold_allocations)
+        report("CaptureBuffer, повторная запись", warm, warm_memory, warm_allocations)
+
+        print(f"\n🏁 stop -> AudioData: {legacy['handoff_s'] / max(warm['handoff_s'], 1e-9):.0f}x быстрее")
+
+
+if __name__ == "__main__":
+    main()
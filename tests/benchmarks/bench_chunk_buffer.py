@@ -0,0 +1,164 @@
+"""
+Микро-бенчмарк буфера воспроизведения ChunkBuffer
+
+Сравнивает прежнюю реализацию (np.vstack на каждый чанк + срезы/копии в
+get_playback_data) с кольцевым буфером AudioRingBuffer на длинных ответах.
+
+Сценарий: сервер присылает чанки быстрее реального времени (--speedup),
+audio callback забирает блоки по --blocksize фреймов.
+
+Запуск:
+    python tests/benchmarks/bench_chunk_buffer.py --minutes 10
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.buffer import ChunkBuffer, ChunkInfo
+from modules.speech_playback.core.state import ChunkState
+
+
+class LegacyPlaybackBuffer:
+    """Копия прежней логики ChunkBuffer (vstack/срезы) для сравнения"""
+
+    def __init__(self, channels: int = 1, dtype=np.int16):
+        self._channels = channels
+        self._dtype = dtype
+        self._playback_buffer = np.zeros((0, channels), dtype=dtype)
+
+    def add(self, data: np.ndarray):
+        if data.ndim == 1:
+            data = data.reshape(-1, 1)
+        if len(self._playback_buffer) == 0:
+            self._playback_buffer = data
+        else:
+            self._playback_buffer = np.vstack([self._playback_buffer, data])
+
+    def get_playback_data(self, frames: int) -> np.ndarray:
+        if len(self._playback_buffer) >= frames:
+            data = self._playback_buffer[:frames]
+            self._playback_buffer = self._playback_buffer[frames:]
+            return data
+        if len(self._playback_buffer) > 0:
+            data = self._playback_buffer.copy()
+            self._playback_buffer = np.zeros((0, self._channels), dtype=self._dtype)
+            silence = np.zeros((frames - len(data), self._channels), dtype=self._dtype)
+            return np.vstack([data, silence])
+        return np.zeros((frames, self._channels), dtype=self._dtype)
+
+
+def make_chunks(total_frames: int, chunk_frames: int) -> list:
+    """Синтетическая речь: синус 220 Гц, int16 mono"""
+    t = np.arange(chunk_frames, dtype=np.float32)
+    base = (np.sin(2 * np.pi * 220.0 * t / 48000.0) * 8000).astype(np.int16)
+    return [base.copy() for _ in range(total_frames // chunk_frames)]
+
+
+def run_legacy(chunks, blocksize: int, reads_per_chunk: int) -> dict:
+    buf = LegacyPlaybackBuffer()
+    outdata = np.zeros((blocksize, 1), dtype=np.int16)
+    callback_times = []
+    start = time.perf_counter()
+    for chunk in chunks:
+        buf.add(chunk.copy())
+        for _ in range(reads_per_chunk):
+            t0 = time.perf_counter()
+            data = buf.get_playback_data(blocksize)
+            outdata[:len(data)] = data
+            callback_times.append(time.perf_counter() - t0)
+    # Дочитываем остаток
+    while len(buf._playback_buffer) > 0:
+        t0 = time.perf_counter()
+        data = buf.get_playback_data(blocksize)
+        outdata[:len(data)] = data
+        callback_times.append(time.perf_counter() - t0)
+    return {"total_s": time.perf_counter() - start, "callback_times": callback_times}
+
+
+def run_ring(chunks, blocksize: int, reads_per_chunk: int) -> dict:
+    buf = ChunkBuffer(max_memory_mb=4096, channels=1)
+    outdata = np.zeros((blocksize, 1), dtype=np.int16)
+    callback_times = []
+    start = time.perf_counter()
+    for i, chunk in enumerate(chunks):
+        info = ChunkInfo(id=f"c{i}", data=chunk, timestamp=0.0, size=len(chunk), state=ChunkState.QUEUED)
+        buf.add_to_playback_buffer(info)
+        for _ in range(reads_per_chunk):
+            t0 = time.perf_counter()
+            buf.read_into(outdata)
+            callback_times.append(time.perf_counter() - t0)
+    while buf.has_data:
+        t0 = time.perf_counter()
+        buf.read_into(outdata)
+        callback_times.append(time.perf_counter() - t0)
+    stats = buf.get_stats()
+    return {
+        "total_s": time.perf_counter() - start,
+        "callback_times": callback_times,
+        "capacity": stats["buffer_capacity"],
+        "grow_count": stats["buffer_grow_count"],
+    }
+
+
+def measure_allocations(fn, *args) -> int:
+    """Пиковый прирост памяти Python-аллокатора во время прогона"""
+    tracemalloc.start()
+    fn(*args)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def report(name: str, result: dict, peak_bytes: int):
+    ct = np.array(result["callback_times"]) * 1e6
+    print(f"\n📊 {name}")
+    print(f"   Всего: {result['total_s']:.2f}s, callbacks: {len(ct)}")
+    print(f"   callback p50={np.percentile(ct, 50):.1f}µs p99={np.percentile(ct, 99):.1f}µs max={ct.max():.1f}µs")
+    print(f"   Пик аллокаций: {peak_bytes / (1024 * 1024):.1f}MB")
+    if "capacity" in result:
+        print(f"   Ёмкость кольца: {result['capacity']} фреймов, расширений: {result['grow_count']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ChunkBuffer: vstack vs ring buffer")
+    parser.add_argument("--minutes", type=float, default=10.0, help="Длительность ответа")
+    parser.add_argument("--chunk-ms", type=int, default=200, help="Длительность чанка от сервера")
+    parser.add_argument("--blocksize", type=int, default=512, help="Размер блока audio callback")
+    parser.add_argument("--speedup", type=float, default=2.0, help="Во сколько раз сервер быстрее реального времени")
+    parser.add_argument("--skip-legacy", action="store_true", help="Не запускать прежнюю реализацию")
+    args = parser.parse_args()
+
+    sample_rate = 48000
+    chunk_frames = sample_rate * args.chunk_ms // 1000
+    total_frames = int(args.minutes * 60 * sample_rate)
+    # За время прихода одного чанка callback успевает прочитать chunk/speedup фреймов
+    reads_per_chunk = max(1, int(chunk_frames / args.speedup / args.blocksize))
+    chunks = make_chunks(total_frames, chunk_frames)
+
+    print("=" * 80)
+    print(f"🧪 ChunkBuffer benchmark: {args.minutes} мин, {len(chunks)} чанков по {args.chunk_ms}мс, "
+          f"blocksize={args.blocksize}, speedup={args.speedup}x")
+    print("=" * 80)
+
+    ring = run_ring(chunks, args.blocksize, reads_per_chunk)
+    report("AudioRingBuffer (read_into)", ring, measure_allocations(run_ring, chunks, args.blocksize, reads_per_chunk))
+
+    if not args.skip_legacy:
+        legacy = run_legacy(chunks, args.blocksize, reads_per_chunk)
+        report("Legacy vstack (get_playback_data)", legacy,
+               measure_allocations(run_legacy, chunks, args.blocksize, reads_per_chunk))
+        print(f"\n🏁 Ускорение: {legacy['total_s'] / ring['total_s']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Сквозной бенчмарк задержки ответа: запрос -> первый звук
+
+GrpcClientIntegration + SpeechPlaybackIntegration на общем EventBus,
+сервер - локальный StreamingService (tests/fake_streaming_server.py) с
+заданным темпом, джиттером, медленными стартами и ошибками. Вывод звука -
+поток без устройства (RecordingOutputStream): момент первого блока со
+звуком фиксируется в audio callback, как его услышал бы пользователь.
+
+Метрики по сессиям (перцентили p50/p95/p99):
+- request -> first sample: от voice.recognition_completed до первого
+  звукового блока на выходе
+- из них на сервере: first_audio_ms вызова (RpcMetricsInterceptor), и
+  клиентская часть - остаток (EventBus, ожидание канала, буфер плеера)
+- ошибки и прерванные потоки
+
+С --interrupt-after-ms каждый ответ прерывается (grpc.request_cancel +
+playback.cancelled, как ProcessingWorkflow) через заданное время после
+первого звука: interrupt -> тишина на выходе, interrupt -> остановка
+генерации на сервере и аудио чанки, отправленные сервером после прерывания.
+
+Запуск:
+    python tests/benchmarks/bench_e2e_latency.py --sessions 20 --stream-api v2 --jitter-ms 20
+    python tests/benchmarks/bench_e2e_latency.py --sessions 50 --slow-start-rate 0.1 --error-rate 0.05 --json
+    python tests/benchmarks/bench_e2e_latency.py --sessions 20 --audio-chunks 100 --interrupt-after-ms 300
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+sys.path.insert(0, str(CLIENT_ROOT / "tests"))
+
+from integration.core.event_bus import EventBus
+from integration.core.state_manager import ApplicationStateManager
+from integration.core.error_handler import ErrorHandler
+from integration.integrations.grpc_client_integration import GrpcClientIntegration, GrpcClientIntegrationConfig
+from integration.integrations.speech_playback_integration import SpeechPlaybackIntegration
+from modules.grpc_client.core.grpc_client import GrpcClient
+from modules.metrics import get_registry
+from modules.speech_playback.core.output_backends import RecordingOutputStream
+
+from fake_streaming_server import FakeStreamingServer, add_config_arguments, config_from_args
+
+
+class FirstSampleSink(RecordingOutputStream):
+    """Выход без устройства: отмечает первый и последний звуковой блок после arm(), звук не хранит"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.armed_at: Optional[float] = None
+        self.first_sample_at: Optional[float] = None
+        self.last_sample_at: Optional[float] = None
+
+    def arm(self):
+        self.first_sample_at = None
+        self.last_sample_at = None
+        self.armed_at = time.perf_counter()
+
+    def _on_block(self, outdata: np.ndarray, now: float):
+        if self.armed_at is not None and outdata.any():
+            if self.first_sample_at is None:
+                self.first_sample_at = now
+            self.last_sample_at = now
+
+
+def percentiles(values) -> dict:
+    if not values:
+        return {'count': 0}
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        'count': int(arr.size),
+        'mean': float(arr.mean()),
+        'p50': float(np.percentile(arr, 50)),
+        'p95': float(np.percentile(arr, 95)),
+        'p99': float(np.percentile(arr, 99)),
+        'max': float(arr.max()),
+    }
+
+
+async def run(args) -> dict:
+    server = FakeStreamingServer(config_from_args(args))
+    await server.start()
+
+    event_bus = EventBus()
+    event_bus.attach_loop()
+    state_manager = ApplicationStateManager()
+    error_handler = ErrorHandler(event_bus)
+
+    grpc_integration = GrpcClientIntegration(event_bus, state_manager, error_handler, config=GrpcClientIntegrationConfig(
+        server='local',
+        aggregate_timeout_sec=0.0,
+        use_network_gate=False,
+        stream_api=args.stream_api,
+        warmup_on_start=True,
+        warmup_on_long_press=False,
+        audio_codecs=tuple(args.audio_codecs.split(',')),
+    ))
+    speech_integration = SpeechPlaybackIntegration(event_bus, state_manager, error_handler)
+    assert await grpc_integration.initialize() and await speech_integration.initialize()
+
+    # Клиент на локальный сервер, плеер - на выход без устройства
+    await grpc_integration._client.cleanup()
+    grpc_integration._client = GrpcClient(config={**server.client_config(), 'stream_v2': args.stream_api == "v2"})
+    grpc_integration._hardware_id = "bench-hardware-id"
+    sinks = []
+
+    def factory(**kwargs):
+        # Поток вывода открывается по ходу сессии - сразу ждёт первый звук
+        sink = FirstSampleSink(**kwargs)
+        sink.arm()
+        sinks.append(sink)
+        return sink
+
+    player = speech_integration._player
+    player.config.auto_device_selection = False
+    player._output_stream_factory = factory
+
+    done = {}
+
+    async def on_finished(event):
+        sid = (event or {}).get('data', {}).get('session_id')
+        if sid in done and not done[sid].done():
+            done[sid].set_result(event.get('type'))
+
+    for name in ("playback.completed", "grpc.request_failed", "playback.failed"):
+        await event_bus.subscribe(name, on_finished)
+
+    await grpc_integration.start()
+    await speech_integration.start()
+    await asyncio.sleep(0.2)  # прогрев канала при старте
+
+    results = []
+    try:
+        for n in range(args.sessions):
+            sid = f"bench-{n}"
+            done[sid] = asyncio.get_running_loop().create_future()
+            for sink in sinks:
+                sink.arm()
+            # Запись речи (для v2 вызов открывается здесь), затем результат распознавания
+            await event_bus.publish("voice.recording_start", {"session_id": sid})
+            await asyncio.sleep(args.speech_ms / 1000.0)
+            requested_at = time.perf_counter()
+            await event_bus.publish("voice.recognition_completed", {"session_id": sid, "text": f"bench request {n}"})
+            interrupt = None
+            if args.interrupt_after_ms > 0:
+                interrupt = await interrupt_after_first_sample(args, event_bus, server, sinks, sid, done[sid])
+            try:
+                outcome = await asyncio.wait_for(done[sid], timeout=args.session_timeout)
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+            if interrupt is not None:
+                # Поздние чанки сервера успели бы прийти за это время
+                await asyncio.sleep(0.1)
+                interrupt['chunks_after_interrupt'] = server.stats.audio_chunks - interrupt.pop('sent_before')
+                outcome = "interrupted"
+            heard = [s.first_sample_at for s in sinks if s.first_sample_at is not None]
+            first_sample_ms = (min(heard) - requested_at) * 1000.0 if heard else None
+            last_calls = grpc_integration._client.rpc_metrics.last_calls
+            call = last_calls[-1] if last_calls else None
+            results.append({
+                'session_id': sid,
+                'outcome': outcome,
+                'first_sample_ms': first_sample_ms,
+                'server_first_audio_ms': call.first_audio_ms if call else None,
+                'rpc_status': call.status if call else None,
+                **(interrupt or {}),
+            })
+            await asyncio.sleep(args.pause_ms / 1000.0)
+    finally:
+        await grpc_integration.stop()
+        await speech_integration.stop()
+        await server.stop(None)
+
+    first_samples = [r['first_sample_ms'] for r in results if r['first_sample_ms'] is not None]
+    server_part = [r['server_first_audio_ms'] for r in results
+                   if r['first_sample_ms'] is not None and r['server_first_audio_ms'] is not None]
+    client_part = [r['first_sample_ms'] - r['server_first_audio_ms'] for r in results
+                   if r['first_sample_ms'] is not None and r['server_first_audio_ms'] is not None]
+    interrupted = [r for r in results if 'interrupt_to_silence_ms' in r]
+    closed = get_registry('grpc_client').snapshot()['histograms'].get('interrupt_to_stream_closed_ms')
+    return {
+        'sessions': args.sessions,
+        'stream_api': args.stream_api,
+        'request_to_first_sample_ms': percentiles(first_samples),
+        'server_first_audio_ms': percentiles(server_part),
+        'client_overhead_ms': percentiles(client_part),
+        'interrupt_to_silence_ms': percentiles([r['interrupt_to_silence_ms'] for r in interrupted]),
+        'interrupt_to_server_stop_ms': percentiles([r['interrupt_to_server_stop_ms'] for r in interrupted
+                                                    if r['interrupt_to_server_stop_ms'] is not None]),
+        'interrupt_to_stream_closed_ms': closed if interrupted and closed else {'count': 0},
+        'chunks_after_interrupt': sum(r['chunks_after_interrupt'] for r in interrupted),
+        'outcomes': {o: sum(1 for r in results if r['outcome'] == o) for o in {r['outcome'] for r in results}},
+        'server': {
+            'requests': server.stats.requests,
+            'completed': server.stats.completed,
+            'errors': server.stats.errors,
+            'slow_starts': server.stats.slow_starts,
+            'interrupted': server.stats.interrupted,
+        },
+        'results': results,
+    }
+
+
+async def interrupt_after_first_sample(args, event_bus, server, sinks, sid, finished) -> Optional[dict]:
+    """Прервать ответ через interrupt_after_ms после первого звука (None - ответ кончился раньше)"""
+    while not finished.done() and not any(s.first_sample_at is not None for s in sinks):
+        await asyncio.sleep(0.005)
+    await asyncio.sleep(args.interrupt_after_ms / 1000.0)
+    if finished.done():
+        return None
+    sent_before = server.stats.audio_chunks
+    interrupted_at = time.perf_counter()
+    await event_bus.publish("grpc.request_cancel", {"session_id": sid, "reason": "user_interrupt"})
+    await event_bus.publish("playback.cancelled", {"session_id": sid, "reason": "user_interrupt", "source": "bench"})
+    # Сервер прекратил генерацию: ни одного активного потока
+    server_stop_ms = None
+    deadline = interrupted_at + args.session_timeout
+    while time.perf_counter() < deadline:
+        if not any(server.servicer._active.values()):
+            server_stop_ms = (time.perf_counter() - interrupted_at) * 1000.0
+            break
+        await asyncio.sleep(0.001)
+    # Последний звуковой блок на выходе после прерывания (0 - тишина уже была)
+    last = max((s.last_sample_at for s in sinks if s.last_sample_at is not None), default=interrupted_at)
+    return {
+        'sent_before': sent_before,
+        'interrupt_to_silence_ms': max(0.0, (last - interrupted_at) * 1000.0),
+        'interrupt_to_server_stop_ms': server_stop_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Сквозная задержка: запрос -> первый звук (локальный сервер)")
+    parser.add_argument("--sessions", type=int, default=20, help="Количество запросов подряд")
+    parser.add_argument("--stream-api", choices=("v1", "v2"), default="v2", help="StreamAudio или StreamAudioV2")
+    parser.add_argument("--audio-codecs", type=str, default="pcm", help="accept_codecs клиента через запятую")
+    parser.add_argument("--speech-ms", type=float, default=300.0, help="Длительность 'речи' до распознавания")
+    parser.add_argument("--pause-ms", type=float, default=200.0, help="Пауза между запросами")
+    parser.add_argument("--session-timeout", type=float, default=30.0, help="Таймаут ответа, сек")
+    parser.add_argument("--interrupt-after-ms", type=float, default=0.0,
+                        help="Прерывать каждый ответ через N мс после первого звука (0 - не прерывать)")
+    parser.add_argument("--json", action="store_true", help="Вывести результат JSON")
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    result = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(result, indent=2, default=str))
+        return
+
+    print("=" * 80)
+    print(f"🧪 Запрос -> первый звук: {args.sessions} запросов, {args.stream_api}, "
+          f"сервер {args.server_first_chunk_delay_ms:.0f}мс до первого ответа, темп {args.server_cadence_ms:.0f}мс")
+    print("=" * 80)
+    for title, key in (("⏱️ Запрос -> первый звук", 'request_to_first_sample_ms'),
+                       ("🖥️ Сервер (первый audio_chunk)", 'server_first_audio_ms'),
+                       ("💻 Клиент (остаток)", 'client_overhead_ms'),
+                       ("🔇 Прерывание -> тишина", 'interrupt_to_silence_ms'),
+                       ("🛑 Прерывание -> сервер остановился", 'interrupt_to_server_stop_ms'),
+                       ("🔌 Прерывание -> поток закрыт", 'interrupt_to_stream_closed_ms')):
+        stats = result[key]
+        if not stats['count']:
+            if not key.startswith('interrupt'):
+                print(f"{title}: нет данных")
+            continue
+        print(f"{title}: p50 {stats['p50']:.1f}мс, p95 {stats['p95']:.1f}мс, "
+              f"p99 {stats['p99']:.1f}мс, max {stats['max']:.1f}мс")
+    print(f"\n📊 Исходы: {result['outcomes']}, сервер: {result['server']}")
+    if args.interrupt_after_ms > 0:
+        print(f"📦 Аудио чанков от сервера после прерывания: {result['chunks_after_interrupt']}")
+
+
+if __name__ == "__main__":
+    main()
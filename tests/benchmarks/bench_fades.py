@@ -0,0 +1,104 @@
+"""
+Микро-бенчмарк fade/crossfade стадии плеера
+
+Сравнивает запись чанков в кольцевой буфер напрямую и через FadeStage
+(проверка стыка + crossfade на каждом разрывном стыке - худший случай),
+а также стоимость блока audio callback обычного чтения и блока с
+затуханием при остановке.
+
+Запуск:
+    python tests/benchmarks/bench_fades.py --chunks 2000 --chunk-ms 100
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.fade import FadeStage
+from modules.speech_playback.core.ring_buffer import AudioRingBuffer
+
+
+def time_writes(chunks, write) -> float:
+    """Среднее время записи чанка (мкс); в кольце остаётся запас, как при воспроизведении"""
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 18)
+    outdata = np.zeros((chunks[0].shape[0], 1), dtype=np.int16)
+    write(ring, chunks[0])
+    total = 0.0
+    for chunk in chunks[1:]:
+        started = time.perf_counter()
+        write(ring, chunk)
+        total += time.perf_counter() - started
+        if ring.available > 2 * outdata.shape[0]:
+            ring.read_into(outdata)
+    return total / (len(chunks) - 1) * 1e6
+
+
+def time_callback(render, blocks: int) -> float:
+    """Среднее время блока callback (мкс)"""
+    total = 0.0
+    for _ in range(blocks):
+        total += render()
+    return total / blocks * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Стоимость fade/crossfade стадии плеера")
+    parser.add_argument("--chunks", type=int, default=2000, help="Количество чанков")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Длительность чанка")
+    parser.add_argument("--sample-rate", type=int, default=48000, help="Частота вывода")
+    parser.add_argument("--block", type=int, default=512, help="Размер блока callback")
+    args = parser.parse_args()
+
+    frames = args.sample_rate * args.chunk_ms // 1000
+    # Чередование знака - каждый стык разрывный (crossfade на каждом чанке)
+    chunks = [np.full(frames, 12000 if i % 2 else -12000, dtype=np.int16) for i in range(args.chunks)]
+    stage = FadeStage(args.sample_rate, guard_frames=4 * args.block)
+
+    print("=" * 80)
+    print(f"🧪 Fade стадия: {args.chunks} x {args.chunk_ms}мс, crossfade {stage.seam_frames} фреймов, "
+          f"затухание {stage.stop_frames} фреймов")
+    print("=" * 80)
+
+    plain_us = time_writes(chunks, lambda ring, data: ring.write(data))
+    faded_us = time_writes(chunks, stage.write)
+    print("\n📊 Запись чанка в кольцевой буфер")
+    print(f"   Напрямую:       {plain_us:.1f}µs")
+    print(f"   Через FadeStage: {faded_us:.1f}µs (+{faded_us - plain_us:.1f}µs, "
+          f"crossfade: {stage.get_stats()['seams_crossfaded']})")
+
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 18)
+    outdata = np.zeros((args.block, 1), dtype=np.int16)
+
+    def render_plain() -> float:
+        if ring.available < args.block:
+            ring.write(chunks[1])
+        started = time.perf_counter()
+        ring.read_into(outdata)
+        return time.perf_counter() - started
+
+    def render_stop() -> float:
+        if ring.available < args.block:
+            ring.write(chunks[1])
+        started = time.perf_counter()
+        stage.render_stop_fade(ring, outdata, 0)
+        return time.perf_counter() - started
+
+    blocks = 20000
+    plain_cb = time_callback(render_plain, blocks)
+    stop_cb = time_callback(render_stop, blocks)
+    budget_us = args.block / args.sample_rate * 1e6
+    print("\n📊 Блок audio callback")
+    print(f"   Чтение:              {plain_cb:.2f}µs")
+    print(f"   Чтение + затухание:  {stop_cb:.2f}µs (бюджет блока {budget_us:.0f}µs)")
+
+
+if __name__ == "__main__":
+    main()
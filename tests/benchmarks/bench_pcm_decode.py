@@ -0,0 +1,166 @@
+"""
+Микро-бенчмарк декодирования аудио чанков gRPC → кольцевой буфер
+
+Сравнивает прежний путь SpeechPlaybackIntegration._on_audio_chunk
+(разбор WAV, эвристики порядка байт/float32 на каждом чанке, min/max для
+лога, копия в ChunkBuffer.add_chunk) с PcmFormatNegotiator (формат
+решается на первом чанке, далее вид memoryview → ndarray).
+
+Скопированные байты на чанк считаются по tracemalloc: пик аллокаций на
+каждой строке пути, просуммированный по строкам. Сюда входят и мелкие
+объекты Python (ChunkInfo, id чанка) - около 1-3KB в обоих вариантах.
+Запись в предвыделенный кольцевой буфер - единственная необходимая
+копия, новой памяти она не аллоцирует.
+
+Запуск:
+    python tests/benchmarks/bench_pcm_decode.py --chunks 500 --chunk-ms 100
+"""
+
+import argparse
+import logging
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.buffer import ChunkBuffer
+from modules.speech_playback.utils.pcm_format import PcmFormatNegotiator
+
+
+def legacy_decode(audio_bytes: bytes, dtype: str, shape, wav_header_skipped: dict, sid: Any) -> np.ndarray:
+    """Копия прежнего декодирования из _on_audio_chunk (без логирования)"""
+    audio_bytes = bytes(audio_bytes)
+    audio_bytes_in = audio_bytes
+    if sid is not None and not wav_header_skipped.get(sid):
+        b = audio_bytes
+        if len(b) >= 12 and b[:4] == b'RIFF' and b[8:12] == b'WAVE':
+            i = 12
+            data_offset = None
+            while i + 8 <= len(b):
+                chunk_id = b[i:i+4]
+                chunk_size = int.from_bytes(b[i+4:i+8], 'little', signed=False)
+                i += 8
+                if chunk_id == b'data':
+                    data_offset = i
+                    break
+                i += chunk_size
+            if data_offset is not None:
+                audio_bytes_in = b[data_offset:]
+                wav_header_skipped[sid] = True
+        else:
+            wav_header_skipped[sid] = True
+    dt = np.dtype('<i2')
+    arr = np.frombuffer(audio_bytes_in, dtype=dt)
+    if dt.kind == 'i' and dt.itemsize == 2 and dtype in ('int16', 'short'):
+        peak = float(np.max(np.abs(arr))) if arr.size else 0.0
+        swapped = arr.byteswap().view(arr.dtype.newbyteorder())
+        peak_sw = float(np.max(np.abs(swapped))) if swapped.size else 0.0
+        if peak_sw > peak * 1.8:
+            arr = swapped
+    if dtype in ('int16', 'short') and (len(audio_bytes_in) % 4 == 0):
+        peak_i16 = float(np.max(np.abs(arr))) if arr.size else 0.0
+        arr_f32 = np.frombuffer(audio_bytes_in, dtype=np.float32)
+        peak_f32 = float(np.max(np.abs(arr_f32))) if arr_f32.size else 0.0
+        if (0 < peak_f32 <= 1.2) and (0 < peak_i16 < 256):
+            arr = arr_f32
+    if shape and len(shape) > 0:
+        arr = arr.reshape(shape)
+    # Диагностика для лога
+    _min = float(arr.min()) if arr.size else 0.0
+    _max = float(arr.max()) if arr.size else 0.0
+    return arr
+
+
+def run_legacy(buffer: ChunkBuffer, payload: bytes, state: dict):
+    arr = legacy_decode(payload, 'int16', [len(payload) // 2], state, "s")
+    buffer.add_chunk(arr, copy=True)  # прежний add_chunk всегда копировал
+    info = buffer.get_next_chunk(timeout=0)
+    buffer.add_to_playback_buffer(info)
+
+
+def run_negotiated(buffer: ChunkBuffer, payload: bytes, negotiator: PcmFormatNegotiator):
+    arr, _ = negotiator.decode("s", payload, dtype_hint='int16', shape=[len(payload) // 2])
+    buffer.add_chunk(arr)
+    info = buffer.get_next_chunk(timeout=0)
+    buffer.add_to_playback_buffer(info)
+
+
+def allocated_bytes(fn, *args) -> int:
+    """Сумма пиков аллокаций по строкам вызова (≈ байты, скопированные в новые массивы)"""
+    total = [0]
+    base = [0]
+
+    def account():
+        current, peak = tracemalloc.get_traced_memory()
+        total[0] += max(0, peak - base[0])
+        tracemalloc.reset_peak()
+        base[0] = tracemalloc.get_traced_memory()[0]
+
+    def tracer(frame, event, arg):
+        if event == 'line':
+            account()
+        return tracer
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base[0] = tracemalloc.get_traced_memory()[0]
+    sys.settrace(tracer)
+    try:
+        fn(*args)
+    finally:
+        sys.settrace(None)
+        account()
+        tracemalloc.stop()
+    return total[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Декодирование аудио чанков: прежний путь vs PcmFormatNegotiator")
+    parser.add_argument("--chunks", type=int, default=500, help="Количество чанков")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Длительность чанка")
+    parser.add_argument("--sample-rate", type=int, default=48000, help="Частота чанков")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    frames = args.sample_rate * args.chunk_ms // 1000
+    t = np.arange(frames, dtype=np.float32)
+    payloads = [(np.sin(2 * np.pi * 437.3 * (t + i * frames) / args.sample_rate) * 8000).astype('<i2').tobytes()
+                for i in range(args.chunks)]
+
+    print("=" * 80)
+    print(f"🧪 Декодирование чанков: {args.chunks} x {args.chunk_ms}мс ({len(payloads[0])} bytes)")
+    print("=" * 80)
+
+    for name, fn, state_factory in (
+        ("Прежний путь", run_legacy, dict),
+        ("PcmFormatNegotiator", run_negotiated, PcmFormatNegotiator),
+    ):
+        buffer = ChunkBuffer(max_memory_mb=4096, channels=1, capacity_frames=frames * (args.chunks + 1))
+        state = state_factory()
+        fn(buffer, payloads[0], state)  # первый чанк - согласование формата
+        copied = allocated_bytes(fn, buffer, payloads[1], state)
+        started = time.perf_counter()
+        for payload in payloads[2:]:
+            fn(buffer, payload, state)
+        per_chunk_us = (time.perf_counter() - started) / max(1, len(payloads) - 2) * 1e6
+        print(f"\n📊 {name}")
+        print(f"   Аллокации на чанк: {copied} bytes ({copied / len(payloads[0]):.1f}x payload)")
+        print(f"   Время на чанк (декодирование + очередь + кольцо): {per_chunk_us:.1f}µs")
+
+    negotiator = PcmFormatNegotiator()
+    negotiator.decode("s", payloads[0])
+    arr, _ = negotiator.decode("s", payloads[1])
+    shares = np.shares_memory(arr, np.frombuffer(payloads[1], dtype=np.uint8))
+    print(f"\n🔗 Массив чанка - вид на payload gRPC: {'да' if shares else 'нет'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Офлайн бенчмарк воспроизведения речи (без аудио устройства)
+
+Прогоняет SequentialSpeechPlayer через RecordingOutputStream - audio
+callback вызывается по виртуальным часам устройства, PortAudio не нужен.
+Чанки приходят как из gRPC потока: PCM int16 с частотой сервера, с
+заданным интервалом и случайным джиттером.
+
+Метрики:
+- time-to-first-sample: от прихода первого чанка до первого блока со звуком
+- underruns: опустошения буфера посреди потока (по audio callback плеера)
+- callback CPU: среднее/максимум времени блока и доля бюджета
+- peak memory: пик буфера чанков и пиковый RSS процесса
+- end detection: от выдачи последнего блока со звуком до wait_for_completion
+
+Пороги (--max-*) позволяют использовать скрипт как гейт: код выхода 1
+при превышении.
+
+Запуск:
+    python tests/benchmarks/bench_playback_offline.py --sessions 3 --chunks 20 --jitter-ms 30
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import resource
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.player import SequentialSpeechPlayer, PlayerConfig
+from modules.speech_playback.core.output_backends import RecordingOutputStream
+
+
+def make_chunks(count: int, chunk_ms: int, rate: int) -> list:
+    """PCM чанки синтетической речи (тон 220Гц) как payload gRPC сообщений"""
+    frames = rate * chunk_ms // 1000
+    t = np.arange(count * frames) / rate
+    signal = (np.sin(2 * np.pi * 220.0 * t) * 8000).astype(np.int16)
+    return [signal[i * frames:(i + 1) * frames].tobytes() for i in range(count)]
+
+
+async def run_session(player: SequentialSpeechPlayer, streams: list, session_id: str,
+                      payloads: list, args, rng: random.Random) -> dict:
+    """Одна сессия: поток чанков -> воспроизведение -> детекция конца"""
+    loop = asyncio.get_running_loop()
+    player.begin_stream(session_id)
+    first_chunk_at = None
+    for i, payload in enumerate(payloads):
+        if i:
+            delay = args.cadence_ms + rng.uniform(0, args.jitter_ms)
+            await asyncio.sleep(delay / 1000.0)
+        audio = np.frombuffer(payload, dtype=np.int16)
+        await player.add_audio_data_async(audio, metadata={
+            'sample_rate': args.src_rate, 'channels': 1, 'session_id': session_id})
+        if first_chunk_at is None:
+            first_chunk_at = time.perf_counter()
+            player.start_playback()
+    player.end_stream(session_id)
+
+    completed = await loop.run_in_executor(None, player.wait_for_completion, 30.0)
+    completed_at = time.perf_counter()
+    sink = streams[-1]
+    realtime = player.get_realtime_stats()
+    buffer_stats = player.chunk_buffer.get_stats()
+    if player.state_manager.is_playing():
+        player.stop_playback()
+
+    return {
+        'completed': completed,
+        'ttfs_ms': ((sink.first_signal_at - first_chunk_at) * 1000.0) if sink.first_signal_at else None,
+        'end_detect_ms': ((completed_at - sink.last_signal_at) * 1000.0) if sink.last_signal_at else None,
+        'underruns': realtime['underruns'],
+        'late_blocks': sink.late_blocks,
+        'callbacks': realtime['callbacks'],
+        'callback_avg_ms': realtime['callback_avg_ms'],
+        'callback_max_ms': realtime['callback_max_ms'],
+        'block_budget_ms': realtime['block_budget_ms'],
+        'peak_buffer_mb': buffer_stats['peak_memory_usage'] / (1024 * 1024),
+    }
+
+
+async def run(args) -> list:
+    rng = random.Random(args.seed)
+    streams = []
+
+    def factory(**kwargs):
+        stream = RecordingOutputStream(speed=args.speed, **kwargs)
+        streams.append(stream)
+        return stream
+
+    config = PlayerConfig(sample_rate=args.sample_rate, buffer_size=args.block,
+                          auto_device_selection=False, output_backend='recording')
+    player = SequentialSpeechPlayer(config, output_stream_factory=factory)
+    player.initialize()
+    payloads = make_chunks(args.chunks, args.chunk_ms, args.src_rate)
+    results = []
+    try:
+        for n in range(args.sessions):
+            results.append(await run_session(player, streams, f"bench-{n}", payloads, args, rng))
+    finally:
+        player.shutdown()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Офлайн бенчмарк воспроизведения речи")
+    parser.add_argument("--sessions", type=int, default=3, help="Количество ответов подряд")
+    parser.add_argument("--chunks", type=int, default=20, help="Чанков в ответе")
+    parser.add_argument("--chunk-ms", type=int, default=100, help="Длительность чанка")
+    parser.add_argument("--cadence-ms", type=float, default=60.0, help="Интервал между чанками")
+    parser.add_argument("--jitter-ms", type=float, default=30.0, help="Случайная добавка к интервалу (0..jitter)")
+    parser.add_argument("--src-rate", type=int, default=24000, help="Частота PCM от сервера")
+    parser.add_argument("--sample-rate", type=int, default=48000, help="Частота вывода")
+    parser.add_argument("--block", type=int, default=512, help="Размер блока callback")
+    parser.add_argument("--speed", type=float, default=1.0, help="Скорость виртуальных часов устройства")
+    parser.add_argument("--seed", type=int, default=1, help="Seed джиттера")
+    parser.add_argument("--json", action="store_true", help="Вывести результаты в JSON")
+    parser.add_argument("--max-underruns", type=int, default=None, help="Гейт: максимум underruns за прогон")
+    parser.add_argument("--max-ttfs-ms", type=float, default=None, help="Гейт: максимум time-to-first-sample")
+    parser.add_argument("--max-end-detect-ms", type=float, default=None, help="Гейт: максимум детекции конца")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(args))
+
+    ttfs = [r['ttfs_ms'] for r in results if r['ttfs_ms'] is not None]
+    end_detect = [r['end_detect_ms'] for r in results if r['end_detect_ms'] is not None]
+    summary = {
+        'sessions': results,
+        'ttfs_ms_max': max(ttfs) if ttfs else None,
+        'end_detect_ms_max': max(end_detect) if end_detect else None,
+        'underruns': sum(r['underruns'] for r in results),
+        'callback_avg_ms': sum(r['callback_avg_ms'] for r in results) / len(results),
+        'callback_max_ms': max(r['callback_max_ms'] for r in results),
+        'peak_buffer_mb': max(r['peak_buffer_mb'] for r in results),
+        # ru_maxrss: КБ на Linux, байты на macOS
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                       / (1024 * 1024 if sys.platform == 'darwin' else 1024),
+    }
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+    else:
+        print("=" * 80)
+        print(f"🧪 Офлайн воспроизведение: {args.sessions} x {args.chunks} чанков по {args.chunk_ms}мс, "
+              f"интервал {args.cadence_ms:.0f}+[0..{args.jitter_ms:.0f}]мс, {args.src_rate}→{args.sample_rate}Hz")
+        print("=" * 80)
+        for n, r in enumerate(results):
+            print(f"\n📊 Сессия {n}: {'✅' if r['completed'] else '❌ не завершилась'}")
+            print(f"   Time-to-first-sample: {r['ttfs_ms']:.1f}мс" if r['ttfs_ms'] is not None
+                  else "   Time-to-first-sample: звука не было")
+            print(f"   Underruns: {r['underruns']} (пропущенных дедлайнов устройства: {r['late_blocks']})")
+            print(f"   Callback: {r['callback_avg_ms'] * 1000:.1f}µs среднее, {r['callback_max_ms'] * 1000:.1f}µs макс "
+                  f"(бюджет {r['block_budget_ms']:.1f}мс)")
+            if r['end_detect_ms'] is not None:
+                print(f"   Детекция конца: {r['end_detect_ms']:.1f}мс")
+        print(f"\n💾 Пик буфера чанков: {summary['peak_buffer_mb']:.2f}MB, пиковый RSS: {summary['peak_rss_mb']:.1f}MB")
+
+    failures = []
+    if not all(r['completed'] for r in results):
+        failures.append("не все сессии завершились")
+    if args.max_underruns is not None and summary['underruns'] > args.max_underruns:
+        failures.append(f"underruns {summary['underruns']} > {args.max_underruns}")
+    if args.max_ttfs_ms is not None and (summary['ttfs_ms_max'] is None or summary['ttfs_ms_max'] > args.max_ttfs_ms):
+        failures.append(f"time-to-first-sample {summary['ttfs_ms_max']} > {args.max_ttfs_ms}мс")
+    if (args.max_end_detect_ms is not None and summary['end_detect_ms_max'] is not None
+            and summary['end_detect_ms_max'] > args.max_end_detect_ms):
+        failures.append(f"детекция конца {summary['end_detect_ms_max']:.1f} > {args.max_end_detect_ms}мс")
+    for failure in failures:
+        print(f"❌ {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""
+Бенчмарк пересчёта частоты дискретизации для потока чанков
+
+Сравнивает прежний подход (scipy.signal.resample - FFT по каждому чанку
+отдельно) с потоковым StreamingResampler (polyphase windowed-sinc с
+состоянием между чанками).
+
+Метрики:
+- CPU на секунду аудио (мс)
+- Артефакты на стыках чанков: ошибка относительно идеального синуса
+  в окне вокруг стыков и в середине чанков (дБ относительно сигнала)
+
+Запуск:
+    python tests/benchmarks/bench_resampler.py --src 24000 --dst 48000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.utils.audio_utils import StreamingResampler
+
+AMPLITUDE = 10000.0
+TONE_HZ = 437.3  # нецелое число периодов в чанке
+
+
+def legacy_resample(chunk: np.ndarray, src: int, dst: int) -> np.ndarray:
+    """Прежняя реализация resample_audio (FFT по чанку)"""
+    from scipy import signal
+    out = signal.resample(chunk, int(len(chunk) * dst / src))
+    return out.astype(np.int16)
+
+
+def run(name: str, chunks, process, src: int, dst: int, chunk_frames: int, delay: int, duration_s: float):
+    start = time.process_time()
+    outputs = [process(c) for c in chunks]
+    cpu = time.process_time() - start
+
+    y = np.concatenate(outputs).astype(np.float64)[delay:]
+    ref = AMPLITUDE * np.sin(2 * np.pi * TONE_HZ * np.arange(len(y)) / dst)
+    err = y - ref
+
+    # Индексы стыков в выходе (с учётом задержки фильтра)
+    boundaries = np.cumsum([len(o) for o in outputs])[:-1] - delay
+    near = np.zeros(len(y), dtype=bool)
+    for b in boundaries:
+        near[max(0, b - 8):max(0, b + 8)] = True
+    near[:64] = False  # разгон фильтра
+    far = ~near
+    far[:64] = False
+
+    def db(mask):
+        rms = np.sqrt(np.mean(err[mask] ** 2)) if mask.any() else 0.0
+        return 20 * np.log10(max(rms, 1e-9) / (AMPLITUDE / np.sqrt(2)))
+
+    print(f"\n📊 {name}")
+    print(f"   CPU: {cpu / duration_s * 1000:.2f} мс на секунду аудио")
+    print(f"   Ошибка у стыков: {db(near):.1f} дБ, в середине чанков: {db(far):.1f} дБ")
+    print(f"   Пик ошибки у стыков: {np.abs(err[near]).max() if near.any() else 0:.0f} LSB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="scipy.signal.resample per chunk vs StreamingResampler")
+    parser.add_argument("--src", type=int, default=24000)
+    parser.add_argument("--dst", type=int, default=48000)
+    parser.add_argument("--seconds", type=float, default=60.0)
+    parser.add_argument("--chunk-ms", type=int, default=100)
+    args = parser.parse_args()
+
+    chunk_frames = args.src * args.chunk_ms // 1000
+    total = int(args.seconds * args.src) // chunk_frames * chunk_frames
+    x = (AMPLITUDE * np.sin(2 * np.pi * TONE_HZ * np.arange(total) / args.src)).astype(np.int16)
+    chunks = [x[i:i + chunk_frames] for i in range(0, total, chunk_frames)]
+
+    print("=" * 80)
+    print(f"🧪 Resampler benchmark: {args.src}Hz → {args.dst}Hz, {args.seconds}s, чанки по {args.chunk_ms}мс")
+    print("=" * 80)
+
+    duration = total / args.src
+    run("scipy.signal.resample по чанку (прежний)", chunks,
+        lambda c: legacy_resample(c, args.src, args.dst), args.src, args.dst, chunk_frames, 0, duration)
+
+    resampler = StreamingResampler(args.src, args.dst)
+    run("StreamingResampler (polyphase, с состоянием)", chunks, resampler.process,
+        args.src, args.dst, chunk_frames, resampler.output_delay, duration)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Бенчмарк поиска тишины в записи
+
+Сравнивает прежний detect_silence (цикл Python по сэмплам) + trim_silence
+с векторизованными audio_utils и VoiceActivityDetector: офлайн на всей
+записи и в потоке блоками audio callback.
+
+Запуск:
+    python tests/benchmarks/bench_vad.py --durations 5 60
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (бенчмарки в tests/benchmarks/)
+CLIENT_ROOT = Path(__file__).parent.parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.vad import VoiceActivityDetector
+from modules.voice_recognition.utils.audio_utils import detect_silence, trim_silence
+
+
+def legacy_detect_silence(audio_data: np.ndarray, threshold: float = 0.01):
+    """Копия прежнего detect_silence (цикл по сэмплам) для сравнения"""
+    if len(audio_data.shape) == 2:
+        energy = np.sqrt(np.mean(audio_data ** 2, axis=1))
+    else:
+        energy = np.abs(audio_data)
+    silence_mask = energy < threshold
+    silence_regions = []
+    in_silence = False
+    start = 0
+    for i, is_silent in enumerate(silence_mask):
+        if is_silent and not in_silence:
+            start = i
+            in_silence = True
+        elif not is_silent and in_silence:
+            silence_regions.append((start, i))
+            in_silence = False
+    if in_silence:
+        silence_regions.append((start, len(silence_mask)))
+    return silence_regions
+
+
+def legacy_trim_silence(audio_data: np.ndarray, threshold: float = 0.01) -> np.ndarray:
+    """Копия прежнего trim_silence поверх legacy_detect_silence"""
+    silence_regions = legacy_detect_silence(audio_data, threshold)
+    if not silence_regions:
+        return audio_data
+    start_idx = 0
+    for start, end in silence_regions:
+        if start == 0:
+            start_idx = end
+        else:
+            break
+    end_idx = len(audio_data)
+    for start, end in reversed(silence_regions):
+        if end == len(audio_data):
+            end_idx = start
+        else:
+            break
+    return audio_data[start_idx:end_idx]
+
+
+def make_recording(seconds: float, sample_rate: int) -> np.ndarray:
+    """Фраза: 0.5с тишины (шум -60 dBFS), речь слогами по 200мс, 0.5с тишины"""
+    rng = np.random.default_rng(0)
+    total = int(seconds * sample_rate)
+    audio = rng.standard_normal(total) * 30
+    t = np.arange(total) / sample_rate
+    lead = int(0.5 * sample_rate)
+    syllable = int(0.2 * sample_rate)
+    for start in range(lead, total - lead - syllable, syllable * 2):
+        audio[start:start + syllable] += np.sin(2 * np.pi * 180 * t[start:start + syllable]) * 6000
+    return audio.astype(np.int16)
+
+
+def best_of(fn, repeats: int) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="detect_silence: цикл по сэмплам vs векторный VAD")
+    parser.add_argument("--durations", type=float, nargs="+", default=[5.0, 60.0], help="Длительность записей, с")
+    parser.add_argument("--sample-rate", type=int, default=16000, help="Частота записи")
+    parser.add_argument("--blocksize", type=int, default=1024, help="Размер блока audio callback")
+    parser.add_argument("--repeats", type=int, default=3, help="Повторов (берётся лучший)")
+    args = parser.parse_args()
+
+    for seconds in args.durations:
+        audio = make_recording(seconds, args.sample_rate)
+        # Порог прежних функций сравнивается с сэмплами как есть: переводим запись в float
+        audio_float = audio.astype(np.float32) / 32768.0
+        print("=" * 80)
+        print(f"🧪 Запись {seconds:.0f}с @ {args.sample_rate} Гц")
+        print("=" * 80)
+
+        assert detect_silence(audio_float) == legacy_detect_silence(audio_float)
+        assert np.array_equal(trim_silence(audio_float), legacy_trim_silence(audio_float))
+
+        legacy = best_of(lambda: legacy_trim_silence(audio_float), args.repeats)
+        vectorized = best_of(lambda: trim_silence(audio_float), args.repeats)
+        vad = VoiceActivityDetector(sample_rate=args.sample_rate)
+        offline = best_of(lambda: vad.trim(audio), args.repeats)
+
+        blocks = [audio[i:i + args.blocksize].reshape(-1, 1) for i in range(0, len(audio), args.blocksize)]
+        block_times = []
+        vad.reset()
+        for block in blocks:
+            t0 = time.perf_counter()
+            vad.process(block)
+            block_times.append(time.perf_counter() - t0)
+        bt = np.array(block_times) * 1e6
+        bounds = vad.stream_bounds(len(audio))
+        assert bounds == vad.speech_bounds(audio)
+
+        print(f"\n📊 trim_silence, цикл по сэмплам:   {legacy * 1000:.2f}ms")
+        print(f"📊 trim_silence, векторный:         {vectorized * 1000:.2f}ms ({legacy / vectorized:.0f}x)")
+        print(f"📊 VoiceActivityDetector.trim:      {offline * 1000:.2f}ms ({legacy / offline:.0f}x)")
+        print(f"📊 VAD в потоке, блок {args.blocksize}: p50={np.percentile(bt, 50):.1f}µs "
+              f"p99={np.percentile(bt, 99):.1f}µs, всего {bt.sum() / 1000:.2f}ms")
+        print(f"   Речь: {bounds[0] / args.sample_rate:.2f}..{bounds[1] / args.sample_rate:.2f}с из {seconds:.0f}с")
+
+
+if __name__ == "__main__":
+    main()
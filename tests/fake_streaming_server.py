@@ -0,0 +1,267 @@
+"""
+Локальный StreamingService для тестов и бенчмарков клиента без production
+
+Реализация сервиса из streaming_pb2_grpc с управляемым поведением:
+темп и размер текстовых/аудио чанков, джиттер, медленный старт
+(задержка до первого ответа), ошибки посреди потока и InterruptSession,
+прерывающий активные потоки по hardware_id.
+
+Используется в тестах (FakeStreamingServer в том же event loop) и
+отдельно - чтобы направить на него клиент:
+
+Запуск:
+    python tests/fake_streaming_server.py --port 50051 --audio-chunks 30 --cadence-ms 40 --jitter-ms 20
+"""
+
+import argparse
+import asyncio
+import io
+import logging
+import random
+import sys
+import time
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import grpc
+import numpy as np
+
+# Protobuf модули клиента (как в GrpcClient._import_proto_modules)
+CLIENT_ROOT = Path(__file__).parent.parent
+PROTO_DIR = CLIENT_ROOT / "modules" / "grpc_client" / "proto"
+if str(PROTO_DIR) not in sys.path:
+    sys.path.insert(0, str(PROTO_DIR))
+
+import streaming_pb2  # noqa: E402
+import streaming_pb2_grpc  # noqa: E402
+
+try:
+    import soundfile as sf
+    SOUNDFILE_AVAILABLE = True
+except Exception:
+    sf = None
+    SOUNDFILE_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FakeServerConfig:
+    """Поведение сервера (все задержки - миллисекунды)"""
+    text_chunks: int = 1
+    text_chunk_chars: int = 40
+    audio_chunks: int = 20
+    chunk_ms: int = 100                 # длительность звука в аудио чанке
+    sample_rate: int = 48000
+    cadence_ms: float = 40.0            # интервал между чанками
+    jitter_ms: float = 0.0              # случайная добавка к интервалу [0, jitter)
+    first_chunk_delay_ms: float = 150.0 # "обдумывание" до первого ответа
+    slow_start_rate: float = 0.0        # доля запросов с медленным стартом
+    slow_start_ms: float = 1000.0       # дополнительная задержка медленного старта
+    error_rate: float = 0.0             # доля запросов, обрывающихся ошибкой
+    error_after_chunks: int = 5         # после скольких аудио чанков ошибка
+    error_status: str = "UNAVAILABLE"   # статус ошибки ("message" - error_message в потоке)
+    codec: str = "pcm"                  # pcm | flac (если клиент объявил flac в accept_codecs)
+    welcome_audio_chunks: int = 10
+    seed: Optional[int] = None
+
+
+@dataclass
+class FakeServerStats:
+    requests: int = 0
+    completed: int = 0
+    errors: int = 0
+    slow_starts: int = 0
+    interrupted: int = 0
+    audio_chunks: int = 0               # отправлено аудио чанков (все потоки)
+    methods: Dict[str, int] = field(default_factory=dict)
+
+
+class FakeStreamingServicer(streaming_pb2_grpc.StreamingServiceServicer):
+    """StreamAudio, StreamAudioV2, GenerateWelcomeAudio и InterruptSession с управляемым темпом"""
+
+    def __init__(self, config: Optional[FakeServerConfig] = None):
+        self.config = config or FakeServerConfig()
+        self.stats = FakeServerStats()
+        self.requests: List[dict] = []
+        self._rng = random.Random(self.config.seed)
+        # hardware_id -> активные потоки: событие прерывания -> session_id
+        self._active: Dict[str, Dict[asyncio.Event, str]] = {}
+        self._pcm = self._make_pcm()
+        self._flac = self._encode_flac(self._pcm) if SOUNDFILE_AVAILABLE else None
+
+    def _make_pcm(self) -> np.ndarray:
+        frames = self.config.sample_rate * self.config.chunk_ms // 1000
+        t = np.arange(frames) / self.config.sample_rate
+        return (np.sin(2 * np.pi * 220.0 * t) * 8000).astype(np.int16)
+
+    def _encode_flac(self, pcm: np.ndarray) -> bytes:
+        buf = io.BytesIO()
+        sf.write(buf, pcm, self.config.sample_rate, format='FLAC', subtype='PCM_16')
+        return buf.getvalue()
+
+    def _audio_chunk(self, accept_codecs) -> streaming_pb2.AudioChunk:
+        if self.config.codec == "flac" and self._flac is not None and "flac" in accept_codecs:
+            return streaming_pb2.AudioChunk(audio_data=self._flac, codec="flac")
+        return streaming_pb2.AudioChunk(audio_data=self._pcm.tobytes(), dtype="int16", shape=[self._pcm.size])
+
+    async def _pause(self, interrupted: asyncio.Event, delay_ms: float):
+        """Задержка, прерываемая InterruptSession; True - поток прерван"""
+        if delay_ms > 0:
+            try:
+                await asyncio.wait_for(interrupted.wait(), timeout=delay_ms / 1000.0)
+            except asyncio.TimeoutError:
+                pass
+        return interrupted.is_set()
+
+    def _gap_ms(self) -> float:
+        return self.config.cadence_ms + (self._rng.uniform(0, self.config.jitter_ms) if self.config.jitter_ms else 0.0)
+
+    async def _respond(self, method: str, prompt: str, hardware_id: str, session_id: str, accept_codecs, context):
+        cfg = self.config
+        self.stats.requests += 1
+        self.stats.methods[method] = self.stats.methods.get(method, 0) + 1
+        self.requests.append({'method': method, 'prompt': prompt, 'hardware_id': hardware_id,
+                              'accept_codecs': list(accept_codecs), 'at': time.perf_counter()})
+        interrupted = asyncio.Event()
+        self._active.setdefault(hardware_id, {})[interrupted] = session_id or method
+        fail = self._rng.random() < cfg.error_rate
+        try:
+            delay = cfg.first_chunk_delay_ms
+            if self._rng.random() < cfg.slow_start_rate:
+                self.stats.slow_starts += 1
+                delay += cfg.slow_start_ms
+            if await self._pause(interrupted, delay):
+                return
+            for i in range(cfg.text_chunks):
+                if i and await self._pause(interrupted, self._gap_ms()):
+                    return
+                yield streaming_pb2.StreamResponse(text_chunk=(prompt or "ok")[:cfg.text_chunk_chars])
+            for i in range(cfg.audio_chunks):
+                if fail and i == cfg.error_after_chunks:
+                    self.stats.errors += 1
+                    if cfg.error_status == "message":
+                        yield streaming_pb2.StreamResponse(error_message="fake server error")
+                        return
+                    await context.abort(getattr(grpc.StatusCode, cfg.error_status), "fake server error")
+                if (i or cfg.text_chunks) and await self._pause(interrupted, self._gap_ms()):
+                    return
+                self.stats.audio_chunks += 1
+                yield streaming_pb2.StreamResponse(audio_chunk=self._audio_chunk(accept_codecs))
+            yield streaming_pb2.StreamResponse(end_message="done")
+            self.stats.completed += 1
+        finally:
+            self._active.get(hardware_id, {}).pop(interrupted, None)
+
+    async def StreamAudio(self, request, context):
+        async for response in self._respond("StreamAudio", request.prompt, request.hardware_id,
+                                            request.session_id, request.accept_codecs, context):
+            yield response
+
+    async def StreamAudioV2(self, request_iterator, context):
+        prompt, hardware_id, session_id, accept_codecs = "", "", "", []
+        async for part in request_iterator:
+            kind = part.WhichOneof('part')
+            if kind == 'start':
+                hardware_id = part.start.hardware_id
+                session_id = part.start.session_id
+                accept_codecs = list(part.start.accept_codecs)
+            elif kind == 'prompt':
+                prompt = part.prompt.prompt
+                hardware_id = part.prompt.hardware_id or hardware_id
+        async for response in self._respond("StreamAudioV2", prompt, hardware_id, session_id, accept_codecs, context):
+            yield response
+
+    async def GenerateWelcomeAudio(self, request, context):
+        cfg = self.config
+        self.stats.methods["GenerateWelcomeAudio"] = self.stats.methods.get("GenerateWelcomeAudio", 0) + 1
+        await asyncio.sleep(cfg.first_chunk_delay_ms / 1000.0)
+        duration = cfg.welcome_audio_chunks * cfg.chunk_ms / 1000.0
+        yield streaming_pb2.WelcomeResponse(metadata=streaming_pb2.WelcomeMetadata(
+            method="server", duration_sec=duration, sample_rate=cfg.sample_rate, channels=1))
+        for i in range(cfg.welcome_audio_chunks):
+            if i:
+                await asyncio.sleep(self._gap_ms() / 1000.0)
+            yield streaming_pb2.WelcomeResponse(audio_chunk=self._audio_chunk(()))
+        yield streaming_pb2.WelcomeResponse(end_message="done")
+
+    async def InterruptSession(self, request, context):
+        active = dict(self._active.get(request.hardware_id, {}))
+        for event in active:
+            event.set()
+        self.stats.interrupted += len(active)
+        return streaming_pb2.InterruptResponse(
+            success=True,
+            interrupted_sessions=list(active.values()),
+            message=f"interrupted {len(active)}",
+        )
+
+
+class FakeStreamingServer:
+    """grpc.aio сервер с FakeStreamingServicer на 127.0.0.1"""
+
+    def __init__(self, config: Optional[FakeServerConfig] = None, port: int = 0):
+        self.servicer = FakeStreamingServicer(config)
+        self._requested_port = port
+        self.port: Optional[int] = None
+        self._server: Optional[grpc.aio.Server] = None
+
+    @property
+    def stats(self) -> FakeServerStats:
+        return self.servicer.stats
+
+    async def start(self) -> int:
+        self._server = grpc.aio.server()
+        streaming_pb2_grpc.add_StreamingServiceServicer_to_server(self.servicer, self._server)
+        self.port = self._server.add_insecure_port(f"127.0.0.1:{self._requested_port}")
+        await self._server.start()
+        return self.port
+
+    async def stop(self, grace: Optional[float] = None):
+        if self._server is not None:
+            await self._server.stop(grace)
+            self._server = None
+
+    def client_config(self, timeout: int = 5) -> dict:
+        """Конфиг GrpcClient с единственным сервером 'local' - этим"""
+        return {'servers': {'local': {'address': '127.0.0.1', 'port': self.port, 'timeout': timeout}}}
+
+
+def add_config_arguments(parser: argparse.ArgumentParser):
+    """Аргументы командной строки для полей FakeServerConfig (--cadence-ms, --error-rate, ...)"""
+    defaults = FakeServerConfig()
+    for f in fields(FakeServerConfig):
+        default = getattr(defaults, f.name)
+        kind = type(default) if default is not None else int
+        parser.add_argument(f"--{f.name.replace('_', '-')}", type=kind, default=default, dest=f"server_{f.name}")
+
+
+def config_from_args(args) -> FakeServerConfig:
+    return FakeServerConfig(**{f.name: getattr(args, f"server_{f.name}") for f in fields(FakeServerConfig)})
+
+
+async def _serve(args):
+    server = FakeStreamingServer(config_from_args(args), port=args.port)
+    port = await server.start()
+    print(f"🧪 Fake StreamingService на 127.0.0.1:{port} (Ctrl+C - остановить)")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Локальный StreamingService с управляемым темпом ответов")
+    parser.add_argument("--port", type=int, default=50051)
+    add_config_arguments(parser)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        asyncio.run(_serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
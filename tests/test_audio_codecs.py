@@ -0,0 +1,167 @@
+"""
+Тест сжатого аудио транспорта
+
+FLAC чанк самодостаточен и декодируется без потерь; StreamingDecoder
+декодирует в рабочем потоке по порядку, drain() ждёт последний PCM
+сессии, cancel() выбрасывает недекодированное; PCM, ждавший места в
+буфере, после прерывания отбрасывается.
+"""
+
+import io
+import sys
+import threading
+from pathlib import Path
+
+import numpy as np
+import soundfile as sf
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.buffer import ChunkBuffer
+from modules.speech_playback.core.decoder_stage import StreamingDecoder
+from modules.speech_playback.utils.audio_codecs import (
+    AudioDecoder, get_decoder, is_compressed, register_decoder, supported_codecs,
+)
+
+
+def speech_like(frames: int = 4800, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(frames)
+    voiced = np.sin(t * 0.07) * 6000 + np.sin(t * 0.19) * 2500
+    return (voiced * (0.6 + 0.4 * np.sin(t * 0.002)) + rng.normal(0, 300, frames)).astype(np.int16)
+
+
+def flac_chunk(samples: np.ndarray, sample_rate: int = 24000) -> bytes:
+    buf = io.BytesIO()
+    sf.write(buf, samples, sample_rate, format='FLAC', subtype='PCM_16')
+    return buf.getvalue()
+
+
+def test_flac_chunk_is_lossless_and_smaller():
+    samples = speech_like()
+    payload = flac_chunk(samples)
+    assert len(payload) < samples.nbytes
+    pcm, sample_rate, channels = get_decoder('flac').decode(payload)
+    assert (sample_rate, channels) == (24000, 1)
+    assert pcm.dtype == np.int16
+    np.testing.assert_array_equal(pcm, samples)
+
+
+def test_codec_negotiation_lists_only_available_decoders():
+    assert supported_codecs(['opus', 'flac', 'pcm']) == ['flac', 'pcm']
+    assert supported_codecs(['pcm']) == ['pcm']
+    assert not is_compressed('') and not is_compressed('pcm') and is_compressed('flac')
+
+    class _Unavailable(AudioDecoder):
+        codec = 'test-unavailable'
+    register_decoder('test-unavailable', _Unavailable, available=lambda: False)
+    assert 'test-unavailable' not in supported_codecs(['test-unavailable'])
+    try:
+        get_decoder('test-unavailable')
+        assert False, "недоступный декодер не должен создаваться"
+    except ValueError:
+        pass
+
+
+def test_streaming_decoder_keeps_order_and_drains():
+    received = []
+
+    def sink(session_id, pcm, sample_rate, channels, metadata):
+        received.append((session_id, metadata['n'], pcm))
+
+    decoder = StreamingDecoder(sink, max_pending=64)
+    chunks = [speech_like(2400, seed=i) for i in range(10)]
+    for i, samples in enumerate(chunks):
+        decoder.submit("s1", 'flac', flac_chunk(samples), {'n': i})
+    assert decoder.drain("s1", timeout=5.0)
+    assert decoder.pending("s1") == 0
+    assert [n for _, n, _ in received] == list(range(10))
+    for (_, n, pcm) in received:
+        np.testing.assert_array_equal(pcm, chunks[n])
+    decoder.stop()
+
+
+def test_cancel_drops_queued_chunks_and_bad_chunk_does_not_stop_worker():
+    received = []
+    entered = threading.Event()
+    gate = threading.Event()
+
+    def sink(session_id, pcm, sample_rate, channels, metadata):
+        entered.set()
+        gate.wait(5.0)
+        received.append((session_id, metadata['n']))
+
+    decoder = StreamingDecoder(sink, max_pending=4)
+    payload = flac_chunk(speech_like(2400))
+    decoder.submit("old", 'flac', payload, {'n': 0})
+    # Рабочий поток занят первым чанком (плеер "заполнен"), остальные ждут в очереди
+    assert entered.wait(5.0)
+    for i in range(1, 5):
+        decoder.submit("old", 'flac', payload, {'n': i})
+    assert not decoder.has_space()
+    decoder.cancel("old")
+    assert decoder.has_space()
+    gate.set()
+    decoder.submit("new", 'flac', b"not flac", {'n': -1})
+    decoder.submit("new", 'flac', payload, {'n': 0})
+    assert decoder.drain("new", timeout=5.0)
+    decoder.stop()
+    # Уже декодированный чанк старой сессии дошёл, очередь - нет
+    assert received == [("old", 0), ("new", 0)]
+
+
+def test_interrupt_drops_pcm_blocked_on_full_buffer():
+    buffer = ChunkBuffer(max_memory_mb=0.01)
+    blocked = threading.Event()
+    results = []
+
+    def sink(session_id, pcm, sample_rate, channels, metadata):
+        # Как SpeechPlaybackIntegration._on_decoded_pcm: поколение до ожидания места
+        generation = buffer.generation
+        if not buffer.has_space_for(pcm.nbytes):
+            blocked.set()
+        results.append(buffer.add_chunk(pcm, metadata={'session_id': session_id}, generation=generation))
+
+    decoder = StreamingDecoder(sink, max_pending=8)
+    payload = flac_chunk(speech_like(2400))
+    for i in range(4):
+        decoder.submit("old", 'flac', payload, {'n': i})
+    assert blocked.wait(5.0)
+    # Прерывание: отмена декодера, затем очистка буфера (освобождает ожидающего)
+    decoder.cancel("old")
+    buffer.clear_all()
+    decoder.submit("new", 'flac', payload, {'n': 0})
+    assert decoder.drain("new", timeout=5.0)
+    decoder.stop()
+    # PCM прерванной сессии не попал в очищенный буфер
+    assert results[-2] is None and results[-1] is not None
+    assert [c.metadata['session_id'] for c in buffer._chunk_queue] == ["new"]
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Сжатый аудио транспорт (FLAC)")
+    print("=" * 80)
+    tests = [
+        test_flac_chunk_is_lossless_and_smaller,
+        test_codec_negotiation_lists_only_available_decoders,
+        test_streaming_decoder_keeps_order_and_drains,
+        test_cancel_drops_queued_chunks_and_bad_chunk_does_not_stop_worker,
+        test_interrupt_drops_pcm_blocked_on_full_buffer,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""
+Тест буфера записи микрофона (CaptureBuffer)
+
+audio callback пишет кадры в предвыделенные блоки без аллокаций, запись
+отдаётся распознаванию int16 видом без копии.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.backends import RecognitionBackendExecutor, StubRecognitionBackend
+from modules.voice_recognition.core.capture_buffer import CaptureBuffer
+from modules.voice_recognition.core.speech_recognizer import SpeechRecognizer
+from modules.voice_recognition.core.types import RecognitionConfig
+
+
+def test_writes_across_block_boundaries():
+    rng = np.random.default_rng(1)
+    for block_frames in (7, 100, 1000):
+        capture = CaptureBuffer(channels=2, block_frames=block_frames)
+        for _ in range(3):
+            capture.reset()
+            parts = []
+            for _ in range(50):
+                data = rng.integers(-3000, 3000, (int(rng.integers(1, 250)), 2)).astype(np.int16)
+                assert np.array_equal(capture.write(data), data)
+                parts.append(data)
+            expected = np.concatenate(parts)
+            assert len(capture) == expected.shape[0]
+            assert np.array_equal(capture.view(), expected)
+            assert np.array_equal(capture.mono(), expected.mean(axis=1).astype(np.int16))
+
+
+def test_zero_copy_and_reuse():
+    capture = CaptureBuffer(channels=1, block_frames=16000, retain_blocks=4)
+    block = np.arange(1024, dtype=np.int16).reshape(-1, 1)
+    for _ in range(10):
+        written = capture.write(block)
+    # Вид на последний записанный блок и на всю запись - та же память
+    mono = capture.mono()
+    assert np.shares_memory(written, mono) and mono.flags['C_CONTIGUOUS']
+    assert capture.allocations == 1
+
+    # Запись длиннее блока: одна склейка, следующая запись без новых блоков
+    for _ in range(40):
+        capture.write(block)
+    assert capture.mono().shape[0] == 50 * 1024
+    allocations = capture.allocations
+    capture.reset()
+    for _ in range(40):
+        capture.write(block)
+    capture.mono()
+    assert capture.allocations == allocations
+
+
+def test_recognizer_hands_off_buffer_without_copy():
+    async def run():
+        backend = StubRecognitionBackend(text="ok")
+        recognizer = SpeechRecognizer(RecognitionConfig(sample_rate=16000, backend="stub"))
+        recognizer.backend_executor = RecognitionBackendExecutor(backend)
+        recognizer._run_listening = lambda: None
+        seen = []
+
+        async def recognize_with_engine(audio_data):
+            seen.append(audio_data)
+            return await recognizer.backend_executor.recognize(audio_data, "en-US")
+
+        recognizer._recognize_with_engine = recognize_with_engine
+        assert await recognizer.start_listening()
+        block = np.full((1024, 1), 700, dtype=np.int16)
+        for _ in range(5):
+            recognizer._audio_callback(block, 1024, None, None)
+        result = await recognizer.stop_listening()
+        return recognizer, seen[0], result
+
+    recognizer, audio_data, result = asyncio.run(run())
+    assert result.text == "ok"
+    samples = np.frombuffer(audio_data.frame_data, dtype=np.int16)
+    assert samples.shape[0] == 5 * 1024 and np.all(samples == 700)
+    # Без int16 -> float32 -> int16 и без копии буфера записи
+    assert np.shares_memory(samples, recognizer.capture.view())
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Буфер записи микрофона")
+    print("=" * 80)
+    tests = [
+        test_writes_across_block_boundaries,
+        test_zero_copy_and_reuse,
+        test_recognizer_hands_off_buffer_without_copy,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+Тест backpressure ограниченного ChunkBuffer
+
+Производитель пишет быстрее, чем "воспроизведение" забирает данные.
+Память должна оставаться в пределах лимита, а аудио - доходить целиком
+(политики BLOCK и add_chunk_async). DROP_OLDEST выбрасывает только
+старые чанки очереди (и в add_chunk_async); clear_all отпускает ожидающих
+без записи устаревшего чанка, чанк прошлого поколения отбрасывается.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.buffer import ChunkBuffer, BufferFullError
+from modules.speech_playback.core.state import BackpressurePolicy
+
+CHUNK_FRAMES = 4800           # 100мс при 48кГц
+CHUNK_BYTES = CHUNK_FRAMES * 2
+LIMIT_MB = 0.1                # ~10 чанков
+
+
+class SimulatedPlayback:
+    """Поток воспроизведения + audio callback: переносит чанки в кольцо и завершает доигранные"""
+
+    def __init__(self, buffer: ChunkBuffer, block_frames: int = 1024, period: float = 0.0005):
+        self.buffer = buffer
+        self.block_frames = block_frames
+        self.period = period
+        self.stop = threading.Event()
+        self.peak_usage = 0
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        outdata = np.zeros((self.block_frames, 1), dtype=np.int16)
+        pending = deque()
+        while not self.stop.is_set():
+            chunk = self.buffer.get_next_chunk(timeout=0)
+            if chunk is not None:
+                self.buffer.add_to_playback_buffer(chunk)
+                pending.append((chunk, self.buffer.frames_written))
+            self.peak_usage = max(self.peak_usage, self.buffer._current_memory_usage)
+            self.buffer.read_into(outdata)
+            while pending and pending[0][1] <= self.buffer.frames_read:
+                self.buffer.mark_chunk_completed(pending.popleft()[0])
+            time.sleep(self.period)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop.set()
+        self.thread.join(timeout=1.0)
+
+
+def chunk(i: int) -> np.ndarray:
+    return np.full(CHUNK_FRAMES, i % 1000 + 1, dtype=np.int16)
+
+
+def test_blocking_policy_bounds_memory_without_loss():
+    buffer = ChunkBuffer(max_memory_mb=LIMIT_MB, overflow_policy=BackpressurePolicy.BLOCK)
+    chunks = 60
+    with SimulatedPlayback(buffer) as playback:
+        for i in range(chunks):
+            buffer.add_chunk(chunk(i), timeout=5.0)
+        assert buffer.wait_for_completion(timeout=5.0)
+    stats = buffer.get_stats()
+    assert playback.peak_usage <= buffer._max_memory_bytes
+    assert stats['peak_memory_usage'] <= buffer._max_memory_bytes
+    assert stats['chunks_dropped'] == 0
+    assert stats['backpressure_waits'] > 0
+    assert buffer.frames_read == chunks * CHUNK_FRAMES
+
+
+def test_blocking_policy_timeout_raises():
+    buffer = ChunkBuffer(max_memory_mb=LIMIT_MB)
+    while buffer.has_space_for(CHUNK_BYTES):
+        buffer.add_chunk(chunk(0))
+    started = time.monotonic()
+    try:
+        buffer.add_chunk(chunk(1), timeout=0.05)
+        assert False, "ожидался BufferFullError"
+    except BufferFullError:
+        pass
+    assert time.monotonic() - started < 1.0
+
+
+def test_drop_oldest_policy_keeps_newest():
+    buffer = ChunkBuffer(max_memory_mb=LIMIT_MB, overflow_policy=BackpressurePolicy.DROP_OLDEST)
+    for i in range(30):
+        buffer.add_chunk(chunk(i))
+    stats = buffer.get_stats()
+    assert stats['chunks_dropped'] > 0
+    assert stats['current_memory_usage_mb'] * 1024 * 1024 <= buffer._max_memory_bytes
+    newest = list(buffer._chunk_queue)[-1]
+    assert newest.data[0] == 30
+
+
+def test_async_add_waits_without_blocking_loop():
+    async def scenario():
+        buffer = ChunkBuffer(max_memory_mb=LIMIT_MB)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.001)
+
+        tick_task = asyncio.create_task(ticker())
+        try:
+            with SimulatedPlayback(buffer, period=0.002):
+                for i in range(40):
+                    assert await buffer.add_chunk_async(chunk(i), timeout=5.0) is not None
+                assert await asyncio.get_running_loop().run_in_executor(None, buffer.wait_for_completion, 5.0)
+        finally:
+            tick_task.cancel()
+        return buffer, ticks
+
+    buffer, ticks = asyncio.run(scenario())
+    assert buffer.get_stats()['backpressure_waits'] > 0
+    assert buffer.frames_read == 40 * CHUNK_FRAMES
+    # Event loop продолжал работать, пока производитель ждал место
+    assert ticks > 10
+
+
+def test_clear_all_releases_async_waiter():
+    async def scenario():
+        buffer = ChunkBuffer(max_memory_mb=LIMIT_MB)
+        while buffer.has_space_for(CHUNK_BYTES):
+            buffer.add_chunk(chunk(0))
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, buffer.clear_all)
+        return await asyncio.wait_for(buffer.add_chunk_async(chunk(1)), timeout=2.0)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_async_add_honors_drop_oldest():
+    async def scenario():
+        buffer = ChunkBuffer(max_memory_mb=LIMIT_MB, overflow_policy=BackpressurePolicy.DROP_OLDEST)
+        for i in range(30):
+            # Без воспроизведения: DROP_OLDEST не ждёт место
+            assert await asyncio.wait_for(buffer.add_chunk_async(chunk(i)), timeout=1.0) is not None
+        return buffer
+
+    buffer = asyncio.run(scenario())
+    stats = buffer.get_stats()
+    assert stats['chunks_dropped'] > 0 and stats['backpressure_waits'] == 0
+    assert list(buffer._chunk_queue)[-1].data[0] == 30
+
+
+def test_clear_all_releases_blocked_writer():
+    buffer = ChunkBuffer(max_memory_mb=LIMIT_MB)
+    while buffer.has_space_for(CHUNK_BYTES):
+        buffer.add_chunk(chunk(0))
+    threading.Timer(0.05, buffer.clear_all).start()
+    # Чанк прерванной сессии не попадает в очищенный буфер
+    assert buffer.add_chunk(chunk(1), timeout=2.0) is None
+    assert buffer.queue_size == 0
+
+
+def test_chunk_of_previous_generation_is_dropped():
+    buffer = ChunkBuffer(max_memory_mb=LIMIT_MB)
+    generation = buffer.generation
+    # Прерывание между получением данных и записью: места хватает, но чанк устарел
+    buffer.clear_all()
+    assert buffer.add_chunk(chunk(0), generation=generation) is None
+    assert buffer.add_chunk(chunk(1), generation=buffer.generation) is not None
+    assert buffer.queue_size == 1
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Backpressure ChunkBuffer")
+    print("=" * 80)
+    tests = [
+        test_blocking_policy_bounds_memory_without_loss,
+        test_blocking_policy_timeout_raises,
+        test_drop_oldest_policy_keeps_newest,
+        test_async_add_waits_without_blocking_loop,
+        test_clear_all_releases_async_waiter,
+        test_async_add_honors_drop_oldest,
+        test_clear_all_releases_blocked_writer,
+        test_chunk_of_previous_generation_is_dropped,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Тест локального StreamingService (tests/fake_streaming_server.py)
+
+Сервер-заглушка должен выдерживать заданный темп и форму потока: иначе
+бенчмарки клиента на нём измеряют саму заглушку.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import grpc
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+sys.path.insert(0, str(CLIENT_ROOT / "tests"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+from fake_streaming_server import FakeServerConfig, FakeStreamingServer
+
+
+async def _collect(config: FakeServerConfig, prompt: str = "hi"):
+    server = FakeStreamingServer(config)
+    await server.start()
+    client = GrpcClient(config=server.client_config())
+    kinds, stamps, error = [], [], None
+    try:
+        started = time.perf_counter()
+        try:
+            async for response in client.stream_audio(prompt, None, {}, "hw", accept_codecs=["flac", "pcm"]):
+                kinds.append((response.WhichOneof('content'), response))
+                stamps.append(time.perf_counter() - started)
+        except grpc.aio.AioRpcError as e:
+            error = e.code()
+        return kinds, stamps, error, server.stats
+    finally:
+        await client.cleanup()
+        await server.stop(None)
+
+
+def test_cadence_and_shape():
+    config = FakeServerConfig(text_chunks=2, audio_chunks=5, cadence_ms=30, first_chunk_delay_ms=80, seed=1)
+    kinds, stamps, error, stats = asyncio.run(_collect(config))
+    assert error is None
+    assert [k for k, _ in kinds] == ['text_chunk'] * 2 + ['audio_chunk'] * 5 + ['end_message']
+    assert stamps[0] >= 0.08
+    # 6 интервалов по 30мс между первым текстом и последним аудио
+    assert stamps[-2] - stamps[0] >= 6 * 0.03 * 0.9
+    audio = kinds[2][1].audio_chunk
+    assert audio.dtype == "int16" and len(audio.audio_data) == config.sample_rate * config.chunk_ms // 1000 * 2
+    assert stats.requests == 1 and stats.completed == 1
+
+
+def test_mid_stream_error_and_slow_start():
+    config = FakeServerConfig(audio_chunks=10, cadence_ms=5, first_chunk_delay_ms=0, error_rate=1.0,
+                              error_after_chunks=3, slow_start_rate=1.0, slow_start_ms=100, seed=1)
+    kinds, stamps, error, stats = asyncio.run(_collect(config))
+    assert error == grpc.StatusCode.UNAVAILABLE
+    assert [k for k, _ in kinds].count('audio_chunk') == 3
+    assert stamps[0] >= 0.1 and stats.slow_starts == 1 and stats.errors == 1
+
+
+def test_interrupt_session_stops_active_stream():
+    async def run():
+        server = FakeStreamingServer(FakeServerConfig(audio_chunks=100, cadence_ms=20, first_chunk_delay_ms=0))
+        await server.start()
+        client = GrpcClient(config=server.client_config())
+        streaming_pb2, streaming_pb2_grpc = client._import_proto_modules()
+        try:
+            received = 0
+            async for response in client.stream_audio("hi", None, {}, "hw-1"):
+                received += 1
+                if received == 3:
+                    stub = streaming_pb2_grpc.StreamingServiceStub(client.connection_manager.channel)
+                    reply = await stub.InterruptSession(streaming_pb2.InterruptRequest(hardware_id="hw-1"))
+            return received, reply, server.stats
+        finally:
+            await client.cleanup()
+            await server.stop(None)
+
+    received, reply, stats = asyncio.run(run())
+    assert reply.success and len(reply.interrupted_sessions) == 1
+    assert received < 10 and stats.interrupted == 1 and stats.completed == 0
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Локальный StreamingService")
+    print("=" * 80)
+    tests = [
+        test_cadence_and_shape,
+        test_mid_stream_error_and_slow_start,
+        test_interrupt_session_stops_active_stream,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
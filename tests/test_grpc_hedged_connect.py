@@ -0,0 +1,179 @@
+"""
+Тест hedged подключения к нескольким серверам
+
+Два StreamingService за TCP прокси с разной задержкой соединения.
+Медленный сервер первый в конфигурации: без замеров RTT hedge через
+initial_delay запускает второй, побеждает быстрый. Дальше быстрый -
+первый кандидат по RTT, и второй канал уже не открывается.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import grpc
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+from modules.grpc_client.core.latency_tracker import ServerLatencyTracker
+
+SLOW_DELAY = 0.6
+FAST_DELAY = 0.02
+HEDGE_DELAY = 0.08
+
+
+async def _start_server(client: GrpcClient):
+    streaming_pb2, streaming_pb2_grpc = client._import_proto_modules()
+
+    class Servicer(streaming_pb2_grpc.StreamingServiceServicer):
+        async def StreamAudio(self, request, context):
+            yield streaming_pb2.StreamResponse(end_message="done")
+
+    server = grpc.aio.server()
+    streaming_pb2_grpc.add_StreamingServiceServicer_to_server(Servicer(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port
+
+
+async def _start_slow_proxy(target_port: int, delay: float):
+    """TCP прокси с задержкой установки каждого соединения"""
+    connections = []
+
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        connections.append(time.perf_counter())
+        await asyncio.sleep(delay)
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", target_port)
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer))
+
+    proxy = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return proxy, proxy.sockets[0].getsockname()[1], connections
+
+
+def _make_client(slow_port: int, fast_port: int, hedge_servers) -> GrpcClient:
+    return GrpcClient(config={
+        'servers': {
+            'slow': {'address': '127.0.0.1', 'port': slow_port, 'timeout': 5},
+            'fast': {'address': '127.0.0.1', 'port': fast_port, 'timeout': 5},
+        },
+        'hedge': {'servers': hedge_servers, 'initial_delay': HEDGE_DELAY},
+    })
+
+
+async def _run(hedge_servers):
+    probe = GrpcClient(config={'servers': {}})
+    server, port = await _start_server(probe)
+    slow_proxy, slow_port, slow_connections = await _start_slow_proxy(port, SLOW_DELAY)
+    fast_proxy, fast_port, fast_connections = await _start_slow_proxy(port, FAST_DELAY)
+    client = _make_client(slow_port, fast_port, hedge_servers)
+    try:
+        waits = []
+        for _ in range(2):
+            waits.append(await client.ensure_ready('slow'))
+            winner = client.connection_manager.current_server
+            await client.disconnect()
+        return {
+            'waits_ms': waits,
+            'winner': winner,
+            'hedged': client.connection_manager.hedged_connects,
+            'slow_connections': len(slow_connections),
+            'fast_connections': len(fast_connections),
+            'latency': client.get_server_latency(),
+        }
+    finally:
+        await client.cleanup()
+        slow_proxy.close()
+        fast_proxy.close()
+        await server.stop(None)
+
+
+def test_hedge_wins_over_slow_primary_and_learns_rtt():
+    result = asyncio.run(_run(['slow', 'fast']))
+    first_wait, second_wait = result['waits_ms']
+    assert result['winner'] == 'fast'
+    # Первое подключение: hedge delay + быстрый сервер, а не задержка медленного
+    assert first_wait < SLOW_DELAY * 1000 / 2, first_wait
+    # Второе: быстрый сервер первый по RTT - без hedge, одно соединение к медленному за всё время
+    assert second_wait < HEDGE_DELAY * 1000, second_wait
+    assert result['hedged'] == 1
+    assert result['slow_connections'] == 1
+    # Отменённое подключение - только нижняя граница: оценки у медленного сервера нет
+    assert result['latency']['slow']['samples'] == 0
+    assert result['latency']['fast']['samples'] == 2
+
+
+def test_without_hedge_group_connects_to_requested_server_only():
+    result = asyncio.run(_run([]))
+    assert result['winner'] == 'slow'
+    assert result['waits_ms'][0] >= SLOW_DELAY * 1000 * 0.9, result['waits_ms']
+    assert result['hedged'] == 0 and result['fast_connections'] == 0
+
+
+def test_tracker_ranks_by_rtt_and_bounds_hedge_delay():
+    tracker = ServerLatencyTracker(alpha=0.5, initial_delay=0.3, min_delay=0.05, max_delay=1.0)
+    assert tracker.rank(['a', 'b', 'c'], preferred='b') == ['b', 'a', 'c']
+    assert tracker.hedge_delay('a') == 0.3
+    for rtt in (0.1, 0.12, 0.09):
+        tracker.observe('a', rtt)
+    tracker.observe('c', 0.04)
+    assert tracker.rank(['a', 'b', 'c'], preferred='b') == ['c', 'a', 'b']
+    # p95 выше среднего, но в пределах [min_delay, max_delay]
+    assert tracker.estimate('a') < tracker.hedge_delay('a') < 0.3
+    assert tracker.hedge_delay('c') >= 0.05
+    tracker.observe_censored('c', 5.0)
+    assert tracker.hedge_delay('c') == 1.0
+    assert tracker.rank(['a', 'c']) == ['a', 'c']
+
+
+def test_censored_and_failed_samples_do_not_outrank_measured_server():
+    tracker = ServerLatencyTracker()
+    tracker.observe('production', 0.4)
+    # Отменённое подключение: нижняя граница не становится оценкой
+    tracker.observe_censored('fallback', 0.1)
+    assert tracker.estimate('fallback') is None
+    assert tracker.rank(['production', 'fallback']) == ['production', 'fallback']
+    assert tracker.rank(['fallback', 'production'], preferred='fallback') == ['production', 'fallback']
+    # Только неудачи - после измеренных и после серверов без данных
+    tracker.observe_failure('broken', 0.05)
+    assert tracker.estimate('broken') is None
+    assert tracker.rank(['broken', 'fallback', 'production']) == ['production', 'fallback', 'broken']
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Hedged подключение к gRPC серверам")
+    print("=" * 80)
+    tests = [
+        test_hedge_wins_over_slow_primary_and_learns_rtt,
+        test_without_hedge_group_connects_to_requested_server_only,
+        test_tracker_ranks_by_rtt_and_bounds_hedge_delay,
+        test_censored_and_failed_samples_do_not_outrank_measured_server,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,147 @@
+"""
+Тест прерывания ответа: отмена вызова и InterruptSession на сервере
+
+После прерывания сервер не должен ни генерировать, ни передавать аудио,
+даже если задача чтения ответа ещё не дошла до точки отмены.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+sys.path.insert(0, str(CLIENT_ROOT / "tests"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+from fake_streaming_server import FakeServerConfig, FakeStreamingServer
+
+
+async def _wait_idle(server: FakeStreamingServer, timeout: float = 1.0) -> bool:
+    """Сервер закончил все активные потоки"""
+    deadline = time.perf_counter() + timeout
+    while any(server.servicer._active.values()):
+        if time.perf_counter() > deadline:
+            return False
+        await asyncio.sleep(0.005)
+    return True
+
+
+def test_cancel_active_calls_stops_stalled_reader():
+    async def run():
+        server = FakeStreamingServer(FakeServerConfig(audio_chunks=100, cadence_ms=10, first_chunk_delay_ms=0))
+        await server.start()
+        client = GrpcClient(config=server.client_config())
+        received = 0
+        got_three = asyncio.Event()
+        never = asyncio.Event()
+
+        async def reader():
+            nonlocal received
+            async for _ in client.stream_audio("hi", None, {}, "hw-1"):
+                received += 1
+                if received == 3:
+                    got_three.set()
+                    # Читатель занят (например, ждёт плеер) и не видит task.cancel()
+                    await asyncio.shield(never.wait())
+
+        task = asyncio.create_task(reader())
+        try:
+            await asyncio.wait_for(got_three.wait(), 2.0)
+            interrupted_at = time.perf_counter()
+            cancelled = client.cancel_active_calls()
+            idle = await _wait_idle(server)
+            closed_ms = (time.perf_counter() - interrupted_at) * 1000.0
+            return cancelled, idle, closed_ms, received, server.stats, client._active_calls
+        finally:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+            await client.cleanup()
+            await server.stop(None)
+
+    cancelled, idle, closed_ms, received, stats, active = asyncio.run(run())
+    assert cancelled == 1 and not active
+    assert idle and closed_ms < 500
+    assert received == 3 and stats.completed == 0
+
+
+def test_cancel_active_calls_covers_stream_v2():
+    async def run():
+        server = FakeStreamingServer(FakeServerConfig(audio_chunks=100, cadence_ms=10, first_chunk_delay_ms=0))
+        await server.start()
+        client = GrpcClient(config=server.client_config())
+        try:
+            stream = await client.open_stream(session_id="s1", hardware_id="hw-2")
+            stream.send_prompt("hi", "hw-2")
+            received = 0
+            reader_cancelled = False
+            try:
+                async for _ in stream.responses():
+                    received += 1
+                    if received == 2:
+                        assert client.cancel_active_calls() == 1
+            except asyncio.CancelledError:
+                # Локально отменённый вызов завершает чтение как отмена задачи
+                reader_cancelled = True
+            idle = await _wait_idle(server)
+            return received, reader_cancelled, idle, stream.done(), server.stats
+        finally:
+            await client.cleanup()
+            await server.stop(None)
+
+    received, reader_cancelled, idle, done, stats = asyncio.run(run())
+    assert received == 2 and reader_cancelled
+    assert idle and done and stats.completed == 0
+
+
+def test_interrupt_session():
+    async def run():
+        server = FakeStreamingServer(FakeServerConfig(audio_chunks=100, cadence_ms=10, first_chunk_delay_ms=0))
+        await server.start()
+        client = GrpcClient(config=server.client_config())
+        try:
+            # Без открытого канала прерывать нечего - подключения ради InterruptSession нет
+            before = await client.interrupt_session("hw-3")
+            received = 0
+            interrupted = None
+            async for _ in client.stream_audio("hi", None, {}, "hw-3"):
+                received += 1
+                if received == 3:
+                    interrupted = await client.interrupt_session("hw-3")
+            return before, interrupted, received, server.stats
+        finally:
+            await client.cleanup()
+            await server.stop(None)
+
+    before, interrupted, received, stats = asyncio.run(run())
+    assert before == []
+    assert len(interrupted) == 1
+    # Сервер закрыл поток сам: ни end_message, ни остальных чанков
+    assert received < 10 and stats.interrupted == 1 and stats.completed == 0
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Прерывание ответа gRPC")
+    print("=" * 80)
+    tests = [
+        test_cancel_active_calls_stops_stalled_reader,
+        test_cancel_active_calls_covers_stream_v2,
+        test_interrupt_session,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
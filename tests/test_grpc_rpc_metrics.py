@@ -0,0 +1,136 @@
+"""
+Тест метрик вызовов gRPC (RpcMetricsInterceptor)
+
+Локальный StreamingService с заданной "задержкой сервера" до первого
+ответа и интервалом между аудио чанками: метрики вызова должны показать
+именно их, а время отправки запроса - остаться клиентским и малым.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import grpc
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+
+SERVER_THINK = 0.12
+CHUNK_GAP = 0.03
+CHUNKS = 4
+PROMPT_DELAY = 0.2
+
+
+async def _start_server(client: GrpcClient):
+    streaming_pb2, streaming_pb2_grpc = client._import_proto_modules()
+
+    async def respond(prompt):
+        if prompt == "fail":
+            raise RuntimeError("server failure")
+        await asyncio.sleep(SERVER_THINK)
+        yield streaming_pb2.StreamResponse(text_chunk="ok")
+        for _ in range(CHUNKS):
+            await asyncio.sleep(CHUNK_GAP)
+            chunk = streaming_pb2.AudioChunk(audio_data=bytes(4800), dtype="int16", shape=[2400])
+            yield streaming_pb2.StreamResponse(audio_chunk=chunk)
+        yield streaming_pb2.StreamResponse(end_message="done")
+
+    class Servicer(streaming_pb2_grpc.StreamingServiceServicer):
+        async def StreamAudio(self, request, context):
+            async for response in respond(request.prompt):
+                yield response
+
+        async def StreamAudioV2(self, request_iterator, context):
+            prompt = ""
+            async for part in request_iterator:
+                if part.WhichOneof('part') == 'prompt':
+                    prompt = part.prompt.prompt
+            async for response in respond(prompt):
+                yield response
+
+    server = grpc.aio.server()
+    streaming_pb2_grpc.add_StreamingServiceServicer_to_server(Servicer(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port
+
+
+async def _run():
+    probe = GrpcClient(config={'servers': {}})
+    server, port = await _start_server(probe)
+    client = GrpcClient(config={'servers': {'local': {'address': '127.0.0.1', 'port': port, 'timeout': 5}}})
+    client.rpc_metrics.reset()
+    try:
+        assert await client.ensure_ready('local') is not None
+        async for _ in client.stream_audio("hi", None, {"width": 1, "height": 1}, "hw"):
+            pass
+
+        stream = await client.open_stream(session_id="s1", hardware_id="hw")
+        await asyncio.sleep(PROMPT_DELAY)  # "распознавание" - вызов уже открыт
+        stream.send_prompt("hi")
+        async for _ in stream.responses():
+            pass
+
+        try:
+            async for _ in client.stream_audio("fail", None, {}, "hw"):
+                pass
+            assert False, "ожидалась ошибка сервера"
+        except grpc.aio.AioRpcError:
+            pass
+        return client.get_metrics()
+    finally:
+        await client.cleanup()
+        await server.stop(None)
+
+
+def test_rpc_metrics_split_client_and_server_time():
+    metrics = asyncio.run(_run())
+    v1, v2, failed = metrics.rpc['last_calls']
+
+    assert v1['method'] == "StreamAudio" and v1['status'] == "OK"
+    assert v1['responses'] == CHUNKS + 2
+    assert v1['response_bytes'] >= CHUNKS * 4800
+    # Клиентская часть мала, серверная - задержка сервера и интервалы генерации
+    assert v1['queue_to_send_ms'] is not None and v1['queue_to_send_ms'] < SERVER_THINK * 1000 / 2
+    assert v1['first_response_ms'] >= SERVER_THINK * 1000 * 0.9
+    assert v1['first_audio_ms'] >= v1['first_response_ms'] + CHUNK_GAP * 1000 * 0.9
+    assert v1['max_gap_ms'] >= CHUNK_GAP * 1000 * 0.9
+    assert v1['duration_ms'] >= (SERVER_THINK + CHUNKS * CHUNK_GAP) * 1000 * 0.9
+
+    # StreamAudioV2: первый ответ от промпта, а не от открытия вызова
+    assert v2['method'] == "StreamAudioV2" and v2['status'] == "OK"
+    assert v2['first_response_ms'] < (SERVER_THINK + PROMPT_DELAY / 2) * 1000
+    assert v2['duration_ms'] >= (PROMPT_DELAY + SERVER_THINK) * 1000
+
+    assert failed['status'] == "UNKNOWN"
+    assert (metrics.total_requests, metrics.successful_requests, metrics.failed_requests) == (3, 2, 1)
+    counters = metrics.rpc['methods']['counters']
+    assert counters['StreamAudio.calls'] == 2 and counters['StreamAudio.errors'] == 1
+    histograms = metrics.rpc['methods']['histograms']
+    assert histograms['StreamAudio.chunk_gap_ms']['count'] == CHUNKS + 1
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Метрики вызовов gRPC")
+    print("=" * 80)
+    metrics = asyncio.run(_run())
+    for call in metrics.rpc['last_calls']:
+        print(f"📊 {call['method']} {call['status']}: отправка {call['queue_to_send_ms'] or 0:.1f}мс, "
+              f"первый ответ {call['first_response_ms'] or 0:.1f}мс, первое аудио {call['first_audio_ms'] or 0:.1f}мс, "
+              f"макс. интервал {call['max_gap_ms']:.1f}мс, {call['response_bytes']} байт за {call['duration_ms']:.0f}мс")
+    try:
+        test_rpc_metrics_split_client_and_server_time()
+        print("✅ test_rpc_metrics_split_client_and_server_time")
+        return 0
+    except AssertionError as e:
+        print(f"❌ test_rpc_metrics_split_client_and_server_time: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Тест StreamAudioV2 - запрос частями
+
+Вызов открывается до готовности промпта: скриншот доходит до сервера,
+пока клиент ещё "распознаёт" речь, промпт уходит последним. Сервер без
+StreamAudioV2 (UNIMPLEMENTED) - ответ через прежний StreamAudio; ошибка
+сервера после промпта не повторяется. Таймаут считается от промпта.
+"""
+
+import asyncio
+import base64
+import sys
+import time
+from pathlib import Path
+
+import grpc
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+
+JPEG = b"\xff\xd8" + bytes(200_000) + b"\xff\xd9"
+STT_DELAY = 0.2
+CAPTURE_DELAY = 0.05
+
+
+async def _start_server(client: GrpcClient, with_v2: bool, v2_mode: str = "ok"):
+    """Локальный StreamingService; события сервера - с отметками времени
+
+    v2_mode: ok - ответ, internal - INTERNAL после всех частей, hang - нет ответа
+    """
+    streaming_pb2, streaming_pb2_grpc = client._import_proto_modules()
+    events = []
+
+    class Servicer(streaming_pb2_grpc.StreamingServiceServicer):
+        async def StreamAudio(self, request, context):
+            events.append(("v1", time.perf_counter(), request))
+            yield streaming_pb2.StreamResponse(text_chunk=f"v1:{request.prompt}")
+            yield streaming_pb2.StreamResponse(end_message="done")
+
+    if with_v2:
+        async def StreamAudioV2(self, request_iterator, context):
+            async for part in request_iterator:
+                events.append((part.WhichOneof('part'), time.perf_counter(), part))
+            prompt = next(p for kind, _, p in events if kind == 'prompt').prompt.prompt
+            if v2_mode == "internal":
+                await context.abort(grpc.StatusCode.INTERNAL, "server failure")
+            elif v2_mode == "hang":
+                await asyncio.sleep(10)
+            yield streaming_pb2.StreamResponse(text_chunk=f"v2:{prompt}")
+            yield streaming_pb2.StreamResponse(end_message="done")
+        Servicer.StreamAudioV2 = StreamAudioV2
+
+    server = grpc.aio.server()
+    streaming_pb2_grpc.add_StreamingServiceServicer_to_server(Servicer(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port, events
+
+
+async def _run_session(with_v2: bool, capture_delay: float = CAPTURE_DELAY):
+    probe = GrpcClient(config={'servers': {}})
+    server, port, events = await _start_server(probe, with_v2)
+    client = GrpcClient(config={'servers': {'local': {'address': '127.0.0.1', 'port': port, 'timeout': 5}}})
+    try:
+        # Нажатие клавиши: вызов открыт; скриншот уходит сразу после захвата
+        stream = await client.open_stream(session_id="s1", hardware_id="hw")
+        assert stream is not None
+        await asyncio.sleep(capture_delay)
+        stream.send_screenshot(JPEG, "image/jpeg", 1280, 720)
+        # Распознавание речи
+        await asyncio.sleep(STT_DELAY)
+        prompt_at = time.perf_counter()
+        stream.send_prompt("hello")
+        texts = [r.text_chunk async for r in stream.responses() if r.text_chunk]
+        reopened = await client.open_stream(session_id="s2")
+        return texts, events, prompt_at, stream, reopened
+    finally:
+        await client.cleanup()
+        await server.stop(None)
+
+
+def test_screenshot_uploaded_before_prompt():
+    texts, events, prompt_at, stream, _ = asyncio.run(_run_session(with_v2=True))
+    assert texts == ["v2:hello"]
+    kinds = [kind for kind, _, _ in events]
+    assert kinds == ["start", "screenshot", "prompt"]
+    _, screenshot_at, part = events[1]
+    assert part.screenshot.data == JPEG and part.screenshot.screen_width == 1280
+    # Скриншот пришёл на сервер во время "распознавания", а не после промпта
+    assert screenshot_at < prompt_at
+    assert events[0][2].start.hardware_id == "hw" and events[0][2].start.session_id == "s1"
+    assert not stream.used_fallback
+
+
+def test_fallback_to_stream_audio_when_unimplemented():
+    texts, events, _, stream, reopened = asyncio.run(_run_session(with_v2=False))
+    assert texts == ["v1:hello"]
+    assert stream.used_fallback
+    (kind, _, request), = events
+    assert kind == "v1"
+    # Сервер без V2 может не знать screenshot_data - скриншот в прежнем base64 поле
+    assert not request.HasField("screenshot_data") and request.hardware_id == "hw"
+    assert base64.b64decode(request.screenshot) == JPEG
+    assert request.screen_width == 1280
+    # Сервер без V2 запомнен - следующие сессии сразу через StreamAudio
+    assert reopened is None
+
+
+def test_fallback_when_server_closes_call_during_upload():
+    # Скриншот пишется, пока сервер уже отвечает UNIMPLEMENTED: grpc отдаёт
+    # INTERNAL вместо статуса сервера - запрос всё равно повторяется через StreamAudio
+    for _ in range(3):
+        texts, events, _, stream, _ = asyncio.run(_run_session(with_v2=False, capture_delay=0.0))
+        assert texts == ["v1:hello"] and stream.used_fallback
+        assert [kind for kind, _, _ in events] == ["v1"]
+
+
+async def _run_v2_mode(v2_mode: str, timeout: float, stt_delay: float):
+    probe = GrpcClient(config={'servers': {}})
+    server, port, events = await _start_server(probe, True, v2_mode)
+    client = GrpcClient(config={'servers': {'local': {'address': '127.0.0.1', 'port': port, 'timeout': 5}}})
+    try:
+        stream = await client.open_stream(session_id="s1", hardware_id="hw", timeout=timeout)
+        await asyncio.sleep(stt_delay)
+        stream.send_prompt("hello")
+        started = time.perf_counter()
+        try:
+            texts = [r.text_chunk async for r in stream.responses() if r.text_chunk]
+            return texts, events, stream, time.perf_counter() - started
+        except Exception as e:
+            return e, events, stream, time.perf_counter() - started
+    finally:
+        await client.cleanup()
+        await server.stop(None)
+
+
+def test_server_error_after_prompt_not_replayed():
+    error, events, stream, _ = asyncio.run(_run_v2_mode("internal", timeout=5.0, stt_delay=0.05))
+    assert isinstance(error, grpc.aio.AioRpcError) and error.code() == grpc.StatusCode.INTERNAL
+    # Запрос выполнен сервером один раз - без повтора через StreamAudio
+    assert not stream.used_fallback
+    assert "v1" not in [kind for kind, _, _ in events]
+
+
+def test_deadline_starts_at_prompt():
+    # Запись и распознавание дольше таймаута - ответ всё равно приходит
+    texts, _, stream, _ = asyncio.run(_run_v2_mode("ok", timeout=0.3, stt_delay=0.6))
+    assert texts == ["v2:hello"] and not stream.used_fallback
+    # Нет ответа за таймаут после промпта - ошибка таймаута
+    error, _, _, elapsed = asyncio.run(_run_v2_mode("hang", timeout=0.3, stt_delay=0.05))
+    assert isinstance(error, asyncio.TimeoutError), error
+    assert 0.25 < elapsed < 2.0, elapsed
+
+
+def main():
+    print("=" * 80)
+    print("🧪 StreamAudioV2 - запрос частями")
+    print("=" * 80)
+    tests = [
+        test_screenshot_uploaded_before_prompt,
+        test_fallback_to_stream_audio_when_unimplemented,
+        test_fallback_when_server_closes_call_during_upload,
+        test_server_error_after_prompt_not_replayed,
+        test_deadline_starts_at_prompt,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+"""
+Тест прогрева gRPC канала
+
+Локальный StreamingService за TCP прокси, который задерживает каждое
+новое соединение (имитация DNS/TCP/TLS на реальной сети). Первый запрос
+холодного клиента платит за соединение, прогретого - нет.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import grpc
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+
+CONNECT_DELAY = 0.15
+
+
+async def _start_server(client: GrpcClient):
+    """Локальный StreamingService: на запрос - один текстовый чанк и end_message"""
+    streaming_pb2, streaming_pb2_grpc = client._import_proto_modules()
+
+    class Servicer(streaming_pb2_grpc.StreamingServiceServicer):
+        async def StreamAudio(self, request, context):
+            yield streaming_pb2.StreamResponse(text_chunk="ok")
+            yield streaming_pb2.StreamResponse(end_message="done")
+
+    server = grpc.aio.server()
+    streaming_pb2_grpc.add_StreamingServiceServicer_to_server(Servicer(), server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    return server, port
+
+
+async def _start_slow_proxy(target_port: int):
+    """TCP прокси с задержкой установки каждого соединения"""
+    connections = []
+
+    async def pipe(reader, writer):
+        try:
+            while data := await reader.read(65536):
+                writer.write(data)
+                await writer.drain()
+        except Exception:
+            pass
+        finally:
+            writer.close()
+
+    async def handle(client_reader, client_writer):
+        connections.append(time.perf_counter())
+        await asyncio.sleep(CONNECT_DELAY)
+        upstream_reader, upstream_writer = await asyncio.open_connection("127.0.0.1", target_port)
+        await asyncio.gather(pipe(client_reader, upstream_writer), pipe(upstream_reader, client_writer))
+
+    proxy = await asyncio.start_server(handle, "127.0.0.1", 0)
+    return proxy, proxy.sockets[0].getsockname()[1], connections
+
+
+def _make_client(port: int) -> GrpcClient:
+    return GrpcClient(config={'servers': {'local': {'address': '127.0.0.1', 'port': port, 'timeout': 5}}})
+
+
+async def _first_request(client: GrpcClient) -> float:
+    """Время от начала запроса до первого ответа (с ожиданием соединения)"""
+    started = time.perf_counter()
+    assert await client.ensure_ready('local') is not None
+    async for response in client.stream_audio("hi", "", {"width": 1, "height": 1}, "hw"):
+        break
+    return time.perf_counter() - started
+
+
+async def _run():
+    probe = _make_client(1)
+    server, server_port = await _start_server(probe)
+    # Отдельный прокси (адрес) на клиента: gRPC делит подканалы по адресу между каналами процесса
+    cold_proxy, cold_port, cold_connections = await _start_slow_proxy(server_port)
+    warm_proxy, warm_port, warm_connections = await _start_slow_proxy(server_port)
+    try:
+        cold = _make_client(cold_port)
+        cold_latency = await _first_request(cold)
+        cold_wait = cold.last_connect_wait_ms
+        await cold.cleanup()
+
+        warm = _make_client(warm_port)
+        assert await warm.warm_up('local')
+        warm_latency = await _first_request(warm)
+        warm_wait = warm.last_connect_wait_ms
+        state_changes = warm.connection_manager.channel_state_changes
+        await warm.cleanup()
+        connections = (len(cold_connections), len(warm_connections))
+        return cold_latency, cold_wait, warm_latency, warm_wait, connections, state_changes
+    finally:
+        cold_proxy.close()
+        warm_proxy.close()
+        await server.stop(None)
+
+
+def test_warm_channel_removes_connect_from_first_request():
+    cold_latency, cold_wait, warm_latency, warm_wait, connections, _ = asyncio.run(_run())
+    assert cold_latency >= CONNECT_DELAY
+    assert cold_wait >= CONNECT_DELAY * 1000 * 0.9
+    assert warm_wait < CONNECT_DELAY * 1000 / 3, warm_wait
+    assert warm_latency < cold_latency - CONNECT_DELAY / 2, (cold_latency, warm_latency)
+    assert connections == (1, 1)  # по одному соединению на клиента
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Прогрев gRPC канала")
+    print("=" * 80)
+    cold_latency, cold_wait, warm_latency, warm_wait, connections, state_changes = asyncio.run(_run())
+    print(f"❄️ Холодный клиент: первый ответ {cold_latency * 1000:.1f}мс (ожидание соединения {cold_wait:.1f}мс)")
+    print(f"🔥 Прогретый клиент: первый ответ {warm_latency * 1000:.1f}мс (ожидание соединения {warm_wait:.1f}мс)")
+    print(f"   Соединений: {connections}, переходов состояния канала: {state_changes}")
+    ok = warm_latency < cold_latency - CONNECT_DELAY / 2
+    print("✅ Прогрев убирает установку соединения из первого запроса" if ok else "❌ Прогрев не дал выигрыша")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Тест мемоизированного Hardware ID (HardwareIdProvider)
+
+Запрос не должен ждать определения ID: оно идёт один раз в фоне при
+старте, обновление не убирает прежнее значение, после неудачи
+wait_ready() дожидается повтора.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.hardware_id.core.provider import HardwareIdProvider
+from modules.hardware_id.core.types import HardwareIdResult, HardwareIdStatus
+
+
+class SlowIdentifier:
+    """HardwareIdentifier с задержкой system_profiler и управляемым результатом"""
+
+    def __init__(self, delay: float = 0.1, uuids=("uuid-1",)):
+        self.delay = delay
+        self.uuids = list(uuids)
+        self.calls = 0
+        self.release = threading.Event()
+        self.release.set()
+
+    def get_hardware_id(self, force_regenerate: bool = False) -> HardwareIdResult:
+        self.calls += 1
+        time.sleep(self.delay)
+        self.release.wait(5)
+        uuid = self.uuids.pop(0) if self.uuids else ""
+        if not uuid:
+            return HardwareIdResult(uuid="", status=HardwareIdStatus.ERROR, source="system_profiler",
+                                    cached=False, error_message="system_profiler timeout")
+        return HardwareIdResult(uuid=uuid, status=HardwareIdStatus.SUCCESS, source="system_profiler", cached=False)
+
+
+def test_prefetch_is_non_blocking_and_memoized():
+    identifier = SlowIdentifier(delay=0.1)
+    provider = HardwareIdProvider(lambda: identifier)
+    started = time.perf_counter()
+    assert provider.prefetch()
+    assert not provider.prefetch()  # определение уже идёт
+    assert (time.perf_counter() - started) < 0.05
+    assert provider.uuid is None
+
+    assert provider.wait(2.0) == "uuid-1"
+    assert not provider.prefetch()  # уже определён
+    assert provider.uuid == "uuid-1" and identifier.calls == 1
+    assert provider.cold_start_ms is not None and provider.cold_start_ms >= 100
+
+
+def test_refresh_keeps_previous_value():
+    identifier = SlowIdentifier(delay=0.0, uuids=("uuid-1", "", "uuid-2"))
+    provider = HardwareIdProvider(lambda: identifier)
+    assert provider.wait(2.0) == "uuid-1"
+
+    # Неудачное обновление не затирает ID
+    assert provider.refresh()
+    provider._thread.join(2.0)
+    assert provider.uuid == "uuid-1"
+
+    # Во время обновления читается прежнее значение
+    identifier.release.clear()
+    assert provider.refresh(force=True)
+    assert provider.uuid == "uuid-1"
+    identifier.release.set()
+    provider._thread.join(2.0)
+    assert provider.uuid == "uuid-2" and identifier.calls == 3
+
+
+def test_wait_ready_does_not_block_event_loop():
+    async def run():
+        identifier = SlowIdentifier(delay=0.2)
+        provider = HardwareIdProvider(lambda: identifier)
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        task = asyncio.create_task(ticker())
+        try:
+            early = await provider.wait_ready(timeout=0.05)
+            uuid = await provider.wait_ready(timeout=2.0)
+        finally:
+            task.cancel()
+        return early, uuid, ticks, identifier.calls
+
+    early, uuid, ticks, calls = asyncio.run(run())
+    assert early is None and uuid == "uuid-1"
+    assert ticks >= 10 and calls == 1
+
+
+def test_wait_ready_waits_for_retry_after_failure():
+    async def run():
+        identifier = SlowIdentifier(delay=0.05, uuids=("", "uuid-2"))
+        provider = HardwareIdProvider(lambda: identifier)
+        # Первое определение неудачно
+        assert await provider.wait_ready(timeout=2.0) is None
+        provider._thread.join(2.0)
+        # Повтор запущен - ждём его результат, а не прошлую неудачу
+        uuid = await provider.wait_ready(timeout=2.0)
+        return uuid, identifier.calls
+
+    uuid, calls = asyncio.run(run())
+    assert uuid == "uuid-2" and calls == 2
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Мемоизированный Hardware ID")
+    print("=" * 80)
+    tests = [
+        test_prefetch_is_non_blocking_and_memoized,
+        test_refresh_keeps_previous_value,
+        test_wait_ready_does_not_block_event_loop,
+        test_wait_ready_waits_for_retry_after_failure,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Тест адаптивного jitter buffer (порог старта потоковой речи)
+
+Времена прихода чанков задаются явно (параметр now), поэтому тест
+детерминированный и не зависит от аудио устройства.
+"""
+
+import sys
+from pathlib import Path
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.jitter_buffer import AdaptiveJitterBuffer, JitterBufferConfig
+
+SAMPLE_RATE = 48000
+CHUNK_MS = 100
+CHUNK_FRAMES = SAMPLE_RATE * CHUNK_MS // 1000
+
+
+def run_session(jb: AdaptiveJitterBuffer, session_id, arrivals_ms, underruns: int = 0) -> dict:
+    """Сессия с заданными временами прихода чанков (мс от начала)"""
+    jb.begin_session(session_id)
+    for arrival in arrivals_ms:
+        jb.on_chunk(CHUNK_FRAMES, now=arrival / 1000.0)
+    for _ in range(underruns):
+        jb.on_underrun(now=arrivals_ms[-1] / 1000.0)
+    return jb.end_session()
+
+
+def test_first_session_uses_initial_watermark():
+    jb = AdaptiveJitterBuffer(SAMPLE_RATE, JitterBufferConfig(initial_watermark_ms=60.0))
+    jb.begin_session("s1")
+    assert jb.watermark_ms == 60.0
+    assert not jb.should_start(0, stream_ended=False, now=0.0)
+    jb.on_chunk(CHUNK_FRAMES, now=0.0)
+    # Чанк длиннее порога - старт сразу
+    assert jb.should_start(CHUNK_FRAMES, stream_ended=False, now=0.0)
+    assert jb.on_started(now=0.002) == 2.0
+
+
+def test_max_start_delay_forces_start():
+    jb = AdaptiveJitterBuffer(SAMPLE_RATE, JitterBufferConfig(initial_watermark_ms=300.0, max_start_delay_ms=200.0))
+    jb.begin_session("s1")
+    jb.on_chunk(480, now=1.0)
+    assert not jb.should_start(480, stream_ended=False, now=1.1)
+    assert jb.should_start(480, stream_ended=False, now=1.2)
+    # Окончание потока открывает воспроизведение независимо от порога
+    assert jb.should_start(480, stream_ended=True, now=1.0)
+
+
+def test_watermark_follows_observed_lateness():
+    jb = AdaptiveJitterBuffer(SAMPLE_RATE, JitterBufferConfig(min_watermark_ms=10.0))
+    # Чанки по 100мс приходят с периодом 100мс, но каждый четвёртый опаздывает на 150мс
+    arrivals = [i * CHUNK_MS + (150 if i % 4 == 3 else 0) for i in range(12)]
+    for s in range(5):
+        summary = run_session(jb, s, arrivals)
+        assert summary["max_lateness_ms"] == 150.0
+    jb.begin_session("next")
+    assert 100.0 < jb.watermark_ms < 200.0
+
+
+def test_steady_network_shrinks_watermark():
+    jb = AdaptiveJitterBuffer(SAMPLE_RATE, JitterBufferConfig(min_watermark_ms=20.0))
+    # Сервер присылает быстрее реального времени - опоздание отрицательное
+    arrivals = [i * 10 for i in range(10)]
+    for s in range(3):
+        run_session(jb, s, arrivals)
+    jb.begin_session("next")
+    assert jb.watermark_ms == 20.0
+
+
+def test_underruns_grow_watermark():
+    jb = AdaptiveJitterBuffer(SAMPLE_RATE, JitterBufferConfig(min_watermark_ms=10.0))
+    arrivals = [i * CHUNK_MS + 50 * (i % 2) for i in range(10)]
+    run_session(jb, "calm", arrivals)
+    jb.begin_session("probe")
+    baseline = jb.watermark_ms
+    jb.end_session()
+
+    jb.begin_session("bad")
+    jb.on_chunk(CHUNK_FRAMES, now=0.0)
+    jb.on_chunk(CHUNK_FRAMES, now=0.15)
+    jb.on_underrun(now=0.2)
+    # Повторная буферизация - порог растёт сразу
+    assert jb.watermark_ms > baseline
+    jb.end_session()
+
+    stats = jb.get_stats()
+    assert stats["total_underruns"] == 1
+    assert stats["correction"] > 1.0
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Adaptive jitter buffer")
+    print("=" * 80)
+    tests = [
+        test_first_session_uses_initial_watermark,
+        test_max_start_delay_forces_start,
+        test_watermark_follows_observed_lateness,
+        test_steady_network_shrinks_watermark,
+        test_underruns_grow_watermark,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
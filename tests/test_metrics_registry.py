@@ -0,0 +1,142 @@
+"""
+Тест реестра метрик горячего пути
+
+Счётчики, gauge и гистограммы с фиксированными корзинами; прореженный
+DEBUG лог форматирует сообщение только для записываемых событий;
+аудио путь ChunkBuffer пишет метрики вместо INFO лога на каждый чанк.
+"""
+
+import logging
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.metrics import MetricsRegistry, Histogram, SampledLogger, get_registry
+from modules.speech_playback.core.buffer import ChunkBuffer
+
+
+class _Records(logging.Handler):
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class _Formatted:
+    """Аргумент лога, считающий, сколько раз его форматировали"""
+    calls = 0
+
+    def __str__(self):
+        _Formatted.calls += 1
+        return "x"
+
+
+def test_histogram_buckets_and_percentiles():
+    hist = Histogram("latency", bounds=(1, 5, 10))
+    for value in (0.5, 0.7, 3, 4, 8, 50):
+        hist.observe(value)
+    snapshot = hist.snapshot()
+    assert snapshot['count'] == 6
+    assert snapshot['buckets'] == {'le_1': 2, 'le_5': 2, 'le_10': 1, 'inf': 1}
+    assert snapshot['p50'] == 5 and snapshot['max'] == 50
+    assert snapshot['p99'] == 50
+    hist.reset()
+    assert hist.snapshot()['count'] == 0 and sum(hist.counts) == 0
+
+
+def test_registry_shares_metrics_by_name():
+    registry = MetricsRegistry("test")
+    counter = registry.counter("chunks")
+    counter.inc()
+    registry.counter("chunks").inc(2)
+    registry.gauge("depth").set(4)
+    registry.gauge("depth").set(1)
+    snapshot = registry.snapshot()
+    assert snapshot['counters'] == {'chunks': 3}
+    assert snapshot['gauges']['depth'] == {'value': 1, 'max': 4}
+    registry.reset()
+    counter.inc()
+    assert registry.snapshot()['counters'] == {'chunks': 1}
+    assert get_registry("test_shared") is get_registry("test_shared")
+
+
+def test_sampled_logger_formats_only_sampled_events():
+    log = logging.getLogger("test_metrics.sampled")
+    handler = _Records()
+    log.addHandler(handler)
+    log.setLevel(logging.DEBUG)
+    log.propagate = False
+    try:
+        sampled = SampledLogger(log, every=10)
+        _Formatted.calls = 0
+        for _ in range(25):
+            sampled.debug("chunk %s", _Formatted())
+        for record in handler.records:
+            record.getMessage()
+        assert len(handler.records) == 3  # события 1, 11, 21
+        assert _Formatted.calls == 3
+        assert sampled.count == 25
+
+        log.setLevel(logging.INFO)
+        sampled.debug("chunk %s", _Formatted())
+        sampled.debug("chunk %s", _Formatted())
+        assert len(handler.records) == 3
+    finally:
+        log.removeHandler(handler)
+
+
+def test_chunk_path_records_metrics_without_info_logs():
+    handler = _Records()
+    buffer_logger = logging.getLogger("modules.speech_playback.core.buffer")
+    buffer_logger.addHandler(handler)
+    previous_level = buffer_logger.level
+    buffer_logger.setLevel(logging.INFO)
+    metrics = get_registry('speech_playback')
+    added_before = metrics.counter('chunks_added').value
+    try:
+        buffer = ChunkBuffer(max_memory_mb=16)
+        handler.records.clear()
+        for _ in range(50):
+            buffer.add_chunk(np.zeros(480, dtype=np.int16))
+            buffer.add_to_playback_buffer(buffer.get_next_chunk(timeout=0))
+        assert not [r for r in handler.records if r.levelno >= logging.INFO]
+    finally:
+        buffer_logger.removeHandler(handler)
+        buffer_logger.setLevel(previous_level)
+    snapshot = metrics.snapshot()
+    assert snapshot['counters']['chunks_added'] - added_before == 50
+    assert snapshot['histograms']['ring_write_ms']['count'] >= 50
+    assert snapshot['gauges']['ring_buffered_frames']['value'] == 50 * 480
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Реестр метрик горячего пути")
+    print("=" * 80)
+    tests = [
+        test_histogram_buckets_and_percentiles,
+        test_registry_shares_metrics_by_name,
+        test_sampled_logger_formats_only_sampled_events,
+        test_chunk_path_records_metrics_without_info_logs,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
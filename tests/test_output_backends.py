@@ -0,0 +1,148 @@
+"""
+Тест подключаемых потоков вывода плеера
+
+null/recording потоки вызывают callback по виртуальным часам без
+PortAudio; плеер воспроизводит через фабрику потока вывода.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.output_backends import (
+    NullOutputStream, RecordingOutputStream, get_output_backend, OUTPUT_BACKENDS,
+)
+from modules.speech_playback.core.player import SequentialSpeechPlayer, PlayerConfig
+from modules.speech_playback.core.state import PlaybackState
+
+
+def test_null_stream_paces_callback_by_virtual_clock():
+    calls = []
+
+    def callback(outdata, frames, time_info, status):
+        calls.append((frames, outdata.shape, bool(status)))
+
+    stream = NullOutputStream(samplerate=48000, blocksize=480, channels=2, callback=callback, speed=10.0)
+    stream.start()
+    time.sleep(0.1)
+    stream.stop()
+    stream.close()
+    # 10мс блок при speed=10 - около 100 блоков за 0.1с
+    assert 50 <= len(calls) <= 110, len(calls)
+    assert calls[0][:2] == (480, (480, 2))
+    assert stream.frames_rendered == 480 * len(calls)
+    assert not stream.active
+
+
+def test_callback_exception_stops_stream():
+    def callback(outdata, frames, time_info, status):
+        raise RuntimeError("stop")
+
+    stream = NullOutputStream(samplerate=48000, blocksize=256, callback=callback)
+    stream.start()
+    time.sleep(0.05)
+    assert not stream.active
+    stream.close()
+
+
+def test_backend_lookup():
+    assert get_output_backend('null') is NullOutputStream
+    assert get_output_backend('Recording') is RecordingOutputStream
+    assert get_output_backend('unknown') is OUTPUT_BACKENDS['sounddevice']
+
+
+def test_player_plays_through_recording_backend():
+    streams = []
+
+    def factory(**kwargs):
+        stream = RecordingOutputStream(speed=4.0, **kwargs)
+        streams.append(stream)
+        return stream
+
+    player = SequentialSpeechPlayer(PlayerConfig(auto_device_selection=False), output_stream_factory=factory)
+    assert player.initialize()
+    tone = (np.sin(np.arange(4800) / 10.0) * 8000).astype(np.int16)
+    player.begin_stream('s1')
+    for _ in range(3):
+        player.add_audio_data(tone, metadata={'sample_rate': 48000, 'session_id': 's1'})
+    assert player.start_playback()
+    player.end_stream('s1')
+    assert player.wait_for_completion(5.0)
+    sink = streams[-1]
+    assert sink.first_signal_at is not None and sink.last_signal_at >= sink.first_signal_at
+    if player.state_manager.is_playing():
+        player.stop_playback()
+    player.shutdown()
+    recording = sink.recording()[:, 0]
+    assert np.count_nonzero(recording) > 3 * 4800 * 0.9
+
+
+def test_async_stop_fades_without_blocking_loop():
+    async def run():
+        streams = []
+
+        def factory(**kwargs):
+            stream = RecordingOutputStream(**kwargs)
+            streams.append(stream)
+            return stream
+
+        player = SequentialSpeechPlayer(PlayerConfig(auto_device_selection=False), output_stream_factory=factory)
+        assert player.initialize()
+        tone = (np.sin(np.arange(48000) / 10.0) * 8000).astype(np.int16)
+        player.add_audio_data(tone, metadata={'sample_rate': 48000})
+        assert player.start_playback()
+        for _ in range(200):
+            if streams[-1].first_signal_at is not None:
+                break
+            await asyncio.sleep(0.005)
+
+        # Пока затухание идёт в callback, event loop выполняет другие задачи
+        seen = []
+
+        async def observer():
+            seen.append(player.state_manager.current_state)
+
+        task = asyncio.create_task(observer())
+        assert await player.stop_playback_async()
+        await task
+        player.shutdown()
+        return seen, player.state_manager.current_state, streams[-1]
+
+    seen, state, sink = asyncio.run(run())
+    assert seen == [PlaybackState.STOPPING] and state == PlaybackState.IDLE
+    # Последний выданный блок затих, а не оборван
+    assert not sink.recording()[-1].any()
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Подключаемые потоки вывода плеера")
+    print("=" * 80)
+    tests = [
+        test_null_stream_paces_callback_by_virtual_clock,
+        test_callback_exception_stops_stream,
+        test_backend_lookup,
+        test_player_plays_through_recording_backend,
+        test_async_stop_fades_without_blocking_loop,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
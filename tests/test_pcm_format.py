@@ -0,0 +1,119 @@
+"""
+Тест согласования формата PCM и декодирования без копий
+
+Формат решается на первом содержательном чанке сессии (WAV заголовок,
+явный dtype или эвристика порядка байт/float32), последующие чанки
+декодируются видом на исходные bytes.
+"""
+
+import struct
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.utils.pcm_format import PcmFormatNegotiator, parse_wav_header
+
+
+def tone(frames: int = 4800, amplitude: float = 8000.0) -> np.ndarray:
+    return (np.sin(np.arange(frames) * 0.05) * amplitude).astype(np.int16)
+
+
+def wav_bytes(samples: np.ndarray, sample_rate: int = 24000, channels: int = 1) -> bytes:
+    data = samples.astype('<i2').tobytes()
+    fmt = struct.pack('<HHIIHH', 1, channels, sample_rate, sample_rate * channels * 2, channels * 2, 16)
+    return (b'RIFF' + struct.pack('<I', 36 + len(data)) + b'WAVE'
+            + b'fmt ' + struct.pack('<I', len(fmt)) + fmt
+            + b'data' + struct.pack('<I', len(data)) + data)
+
+
+def test_later_chunks_are_zero_copy_views():
+    negotiator = PcmFormatNegotiator()
+    first = tone().astype('<i2').tobytes()
+    negotiator.decode("s", first)
+    payload = tone().astype('<i2').tobytes()
+    arr, fmt = negotiator.decode("s", payload)
+    assert fmt.source == "heuristic"
+    assert np.shares_memory(arr, np.frombuffer(payload, dtype=np.uint8))
+    assert not arr.flags.writeable
+    np.testing.assert_array_equal(arr, tone())
+
+
+def test_wav_header_parsed_once():
+    negotiator = PcmFormatNegotiator()
+    samples = tone()
+    payload = wav_bytes(samples, sample_rate=24000)
+    offset, fmt = parse_wav_header(payload)
+    assert offset == 44 and fmt["sample_rate"] == 24000
+
+    arr, pcm_format = negotiator.decode("s", payload)
+    assert pcm_format.source == "wav" and pcm_format.sample_rate == 24000
+    np.testing.assert_array_equal(arr, samples)
+    # Следующий чанк - чистый PCM без заголовка
+    arr2, _ = negotiator.decode("s", samples.tobytes())
+    np.testing.assert_array_equal(arr2, samples)
+
+
+def test_big_endian_detected_by_heuristic():
+    negotiator = PcmFormatNegotiator()
+    samples = tone(amplitude=200.0)
+    arr, fmt = negotiator.decode("s", samples.astype('>i2').tobytes())
+    assert fmt.dtype == np.dtype('>i2')
+    np.testing.assert_array_equal(arr.astype(np.int16), samples)
+
+
+def test_float32_detected_by_heuristic():
+    negotiator = PcmFormatNegotiator()
+    samples = (np.sin(np.arange(4800) * 0.05) * 0.5).astype('<f4')
+    arr, fmt = negotiator.decode("s", samples.tobytes())
+    assert fmt.dtype == np.dtype('<f4')
+    np.testing.assert_allclose(arr, samples)
+
+
+def test_silence_defers_decision():
+    negotiator = PcmFormatNegotiator()
+    arr, fmt = negotiator.decode("s", bytes(960))
+    assert fmt.source == "default" and not arr.any()
+    assert negotiator.get_format("s") is None
+    negotiator.decode("s", tone(amplitude=200.0).astype('>i2').tobytes())
+    assert negotiator.get_format("s").dtype == np.dtype('>i2')
+
+
+def test_declared_format_and_stereo_shape():
+    negotiator = PcmFormatNegotiator()
+    stereo = np.stack([tone(), -tone()], axis=1)
+    arr, fmt = negotiator.decode("s", stereo.astype('<i2').tobytes(), dtype_hint="int16_le", channels=2)
+    assert fmt.source == "declared" and arr.shape == stereo.shape
+    np.testing.assert_array_equal(arr, stereo)
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Согласование формата PCM")
+    print("=" * 80)
+    tests = [
+        test_later_chunks_are_zero_copy_views,
+        test_wav_header_parsed_once,
+        test_big_endian_detected_by_heuristic,
+        test_float32_detected_by_heuristic,
+        test_silence_defers_decision,
+        test_declared_format_and_stereo_shape,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""
+Тест задержки обнаружения окончания воспроизведения
+
+Audio callback имитируется потоком, который забирает блоки из ChunkBuffer
+в реальном времени. Измеряется время между моментом, когда callback забрал
+последний фрейм, и возвратом ChunkBuffer.wait_for_completion().
+До перехода на события ожидание опрашивало буфер раз в 100 мс.
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.buffer import ChunkBuffer
+
+SAMPLE_RATE = 48000
+BLOCKSIZE = 512
+MAX_DETECTION_MS = 20.0
+
+
+def _simulated_callback(buffer: ChunkBuffer, stop: threading.Event, result: dict):
+    """Забирает блоки с периодом BLOCKSIZE/SAMPLE_RATE, фиксирует момент последнего фрейма"""
+    outdata = np.zeros((BLOCKSIZE, 1), dtype=np.int16)
+    period = BLOCKSIZE / SAMPLE_RATE
+    next_tick = time.perf_counter()
+    had_data = False
+    while not stop.is_set():
+        n = buffer.read_into(outdata)
+        if n > 0:
+            had_data = True
+        if had_data and n < BLOCKSIZE and "last_frame_at" not in result:
+            result["last_frame_at"] = time.perf_counter()
+        next_tick += period
+        time.sleep(max(0.0, next_tick - time.perf_counter()))
+
+
+def _feed_chunks(buffer: ChunkBuffer, chunks: int, chunk_ms: int):
+    """Поток воспроизведения: переносит чанки из очереди в кольцевой буфер"""
+    frames = SAMPLE_RATE * chunk_ms // 1000
+    tone = (np.sin(np.arange(frames) * 0.05) * 4000).astype(np.int16)
+    for _ in range(chunks):
+        buffer.add_chunk(tone)
+    for _ in range(chunks):
+        chunk_info = buffer.get_next_chunk(timeout=1.0)
+        buffer.add_to_playback_buffer(chunk_info)
+
+
+def measure_end_detection_ms(chunks: int = 5, chunk_ms: int = 100) -> float:
+    """Задержка обнаружения окончания воспроизведения, мс"""
+    buffer = ChunkBuffer(max_memory_mb=64, channels=1)
+    stop = threading.Event()
+    result = {}
+
+    _feed_chunks(buffer, chunks, chunk_ms)
+    callback = threading.Thread(target=_simulated_callback, args=(buffer, stop, result), daemon=True)
+    callback.start()
+    try:
+        assert buffer.wait_for_completion(timeout=5.0), "wait_for_completion не дождался окончания"
+        detected_at = time.perf_counter()
+    finally:
+        stop.set()
+        callback.join(timeout=1.0)
+
+    assert "last_frame_at" in result, "callback не зафиксировал последний фрейм"
+    return (detected_at - result["last_frame_at"]) * 1000.0
+
+
+def test_end_of_playback_detected_immediately():
+    latencies = [measure_end_detection_ms() for _ in range(5)]
+    assert max(latencies) < MAX_DETECTION_MS, f"Слишком медленно: {latencies}"
+
+
+def test_wait_for_completion_released_by_clear():
+    buffer = ChunkBuffer(max_memory_mb=64, channels=1)
+    buffer.add_chunk(np.ones(SAMPLE_RATE, dtype=np.int16))
+    # Потребителя нет - ожидание снимается только остановкой (clear_all)
+    threading.Timer(0.05, buffer.clear_all).start()
+    started = time.perf_counter()
+    assert buffer.wait_for_completion(timeout=2.0)
+    assert time.perf_counter() - started < 0.5
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Задержка обнаружения окончания воспроизведения")
+    print("=" * 80)
+    latencies = [measure_end_detection_ms() for _ in range(10)]
+    print(f"   p50={np.percentile(latencies, 50):.2f}мс max={max(latencies):.2f}мс "
+          f"(блок callback: {BLOCKSIZE / SAMPLE_RATE * 1000:.1f}мс)")
+    ok = max(latencies) < MAX_DETECTION_MS
+    print("✅ OK" if ok else "❌ FAIL")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
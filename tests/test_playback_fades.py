@@ -0,0 +1,147 @@
+"""
+Тест fade/crossfade стадии плеера
+
+Разрывный стык чанков сглаживается crossfade прямо в кольцевом буфере,
+непрерывный поток проходит без изменений, старт из тишины получает
+короткий fade-in, остановка - затухание за несколько мс. Горячий путь
+не аллоцирует массивов.
+"""
+
+import sys
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.fade import FadeStage
+from modules.speech_playback.core.ring_buffer import AudioRingBuffer
+from modules.speech_playback.utils.audio_utils import get_fade_ramps, apply_fade_in
+
+SAMPLE_RATE = 48000
+CHUNK_FRAMES = 4800
+
+
+def make_stage(seam_ms: float = 2.5, stop_fade_ms: float = 5.0) -> FadeStage:
+    return FadeStage(SAMPLE_RATE, channels=1, seam_ms=seam_ms, stop_fade_ms=stop_fade_ms, guard_frames=1024)
+
+
+def drain(ring: AudioRingBuffer) -> np.ndarray:
+    return ring.read(ring.available)[:, 0].astype(np.int32)
+
+
+def test_ramps_cached_and_complementary():
+    fade_in, fade_out = get_fade_ramps(120)
+    assert get_fade_ramps(120)[0] is fade_in
+    assert fade_in.shape == (120, 1) and not fade_in.flags.writeable
+    np.testing.assert_allclose(fade_in + fade_out, 1.0, atol=1e-6)
+    assert np.all(np.diff(fade_in[:, 0]) > 0)
+
+
+def test_discontinuous_seam_is_crossfaded():
+    stage = make_stage()
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 15)
+    stage.write(ring, np.full(CHUNK_FRAMES, 12000, dtype=np.int16))
+    added = stage.write(ring, np.full(CHUNK_FRAMES, -12000, dtype=np.int16))
+    assert added == CHUNK_FRAMES - stage.seam_frames
+    out = drain(ring)
+    # Перепад 24000 размазан по seam_frames фреймам вместо одного скачка
+    assert np.abs(np.diff(out)).max() < 24000 * np.pi / stage.seam_frames
+    assert stage.get_stats()['seams_crossfaded'] == 1
+
+
+def test_continuous_seam_untouched():
+    stage = make_stage()
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 15)
+    tone = (np.sin(np.arange(2 * CHUNK_FRAMES) * 0.05) * 12000).astype(np.int16)
+    stage.write(ring, tone[:CHUNK_FRAMES])
+    stage.write(ring, tone[CHUNK_FRAMES:])
+    np.testing.assert_array_equal(drain(ring), tone)
+    assert stage.get_stats()['seams_crossfaded'] == 0
+
+
+def test_start_from_silence_fades_in():
+    stage = make_stage()
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 15)
+    data = np.full(CHUNK_FRAMES, 12000, dtype=np.int16)
+    stage.write(ring, data)
+    out = drain(ring)
+    assert abs(out[0]) < 100
+    assert np.all(np.diff(out[:stage.seam_frames]) >= 0)
+    assert np.all(out[stage.seam_frames:] == 12000)
+    # Данные чанка (в т.ч. вид на payload) не изменяются
+    assert np.all(data == 12000)
+
+
+def test_stop_fade_reaches_silence_within_fade():
+    stage = make_stage()
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 15)
+    ring.write(np.full(CHUNK_FRAMES, 12000, dtype=np.int16))
+    outdata = np.zeros((512, 1), dtype=np.int16)
+    position = stage.render_stop_fade(ring, outdata, 0)
+    assert position == stage.stop_frames
+    envelope = outdata[:, 0].astype(np.int32)
+    assert envelope[0] > 11000 and np.all(np.diff(envelope) <= 0)
+    assert np.all(envelope[stage.stop_frames:] == 0)
+    stage.render_stop_fade(ring, outdata, position)
+    assert not outdata.any()
+
+
+def test_hot_path_does_not_allocate_arrays():
+    # Длинные fade (50мс): временный массив размером с fade был бы заметен на фоне видов numpy
+    stage = make_stage(seam_ms=50.0, stop_fade_ms=50.0)
+    ring = AudioRingBuffer(channels=1, capacity_frames=1 << 15)
+    chunks = [np.full(CHUNK_FRAMES, v, dtype=np.int16) for v in (12000, -12000, 12000)]
+    outdata = np.zeros((4096, 1), dtype=np.int16)
+    stage.write(ring, chunks[0])  # scratch создаётся на первом стыке
+    stage.write(ring, chunks[1])
+
+    tracemalloc.start()
+    try:
+        stage.write(ring, chunks[2])
+        stage.render_stop_fade(ring, outdata, 0)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    # Только объекты-виды numpy (~2KB), без буферов размером с fade (9.6KB float32)
+    assert peak < stage.seam_frames * 2, peak
+    assert stage.get_stats()['seams_crossfaded'] == 2
+
+
+def test_apply_fade_in_int16_in_place():
+    data = np.full(2000, 10000, dtype=np.int16)
+    result = apply_fade_in(data, 100)
+    assert result is data
+    assert data[0] < 100 and data[99] > 9900 and data[100] == 10000
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Fade/crossfade стадия плеера")
+    print("=" * 80)
+    tests = [
+        test_ramps_cached_and_complementary,
+        test_discontinuous_seam_is_crossfaded,
+        test_continuous_seam_untouched,
+        test_start_from_silence_fades_in,
+        test_stop_fade_reaches_silence_within_fade,
+        test_hot_path_does_not_allocate_arrays,
+        test_apply_fade_in_int16_in_place,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
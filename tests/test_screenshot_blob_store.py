@@ -0,0 +1,96 @@
+"""
+Тест хранилища скриншотов в памяти
+
+Захват кладёт байты по session_id и публикует handle, gRPC интеграция
+забирает тот же объект bytes; бюджет по байтам и количеству с LRU
+вытеснением.
+"""
+
+import sys
+from pathlib import Path
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.screenshot_capture.core.blob_store import ScreenshotBlobStore, get_screenshot_store
+
+
+def test_take_returns_same_bytes_object_once():
+    store = ScreenshotBlobStore(max_bytes=1024)
+    data = bytes(300)
+    handle = store.put(1.5, data, mime_type="image/jpeg", width=10, height=20)
+    assert handle and store.size_bytes == 300
+    blob = store.take(handle)
+    assert blob.data is data  # без копии
+    assert (blob.mime_type, blob.width, blob.height) == ("image/jpeg", 10, 20)
+    assert store.take(handle) is None
+    assert store.size_bytes == 0 and len(store) == 0
+    assert store.get_stats()['misses'] == 1
+
+
+def test_lru_eviction_by_byte_budget():
+    store = ScreenshotBlobStore(max_bytes=1000, max_items=10)
+    first = store.put("s1", bytes(400))
+    second = store.put("s2", bytes(400))
+    third = store.put("s3", bytes(400))
+    assert store.take(first) is None  # вытеснен самый старый
+    assert store.take(second) is not None and store.take(third) is not None
+    assert store.get_stats()['evictions'] == 1
+
+
+def test_eviction_by_item_count_and_oversize_reject():
+    store = ScreenshotBlobStore(max_bytes=10_000, max_items=2)
+    handles = [store.put(f"s{i}", bytes(10)) for i in range(3)]
+    assert len(store) == 2 and store.take(handles[0]) is None
+    assert store.put("big", bytes(20_000)) is None
+    assert store.get_stats()['rejected'] == 1
+
+
+def test_new_capture_replaces_session_blob():
+    store = ScreenshotBlobStore(max_bytes=10_000)
+    old = store.put("s1", bytes(100))
+    new = store.put("s1", bytes(200))
+    assert old != new
+    assert store.take(old) is None
+    assert len(store.take(new).data) == 200
+    store.put("s2", bytes(50))
+    store.discard_session("s2")
+    assert store.size_bytes == 0
+
+
+def test_configure_shrinks_budget():
+    store = get_screenshot_store()
+    assert store is get_screenshot_store()
+    local = ScreenshotBlobStore(max_bytes=10_000)
+    for i in range(5):
+        local.put(i, bytes(1000))
+    local.configure(max_bytes=2500)
+    assert local.size_bytes <= 2500 and len(local) == 2
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Хранилище скриншотов в памяти")
+    print("=" * 80)
+    tests = [
+        test_take_returns_same_bytes_object_once,
+        test_lru_eviction_by_byte_budget,
+        test_eviction_by_item_count_and_oversize_reject,
+        test_new_capture_replaces_session_blob,
+        test_configure_shrinks_budget,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
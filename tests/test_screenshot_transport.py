@@ -0,0 +1,109 @@
+"""
+Тест передачи скриншота байтами в StreamRequest
+
+Скриншот идёт от моста захвата до gRPC запроса без base64: поле
+screenshot_data + screenshot_mime_type; строковое поле screenshot
+остаётся для legacy транспорта.
+"""
+
+import asyncio
+import base64
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.grpc_client.core.grpc_client import GrpcClient
+from modules.grpc_client.proto import streaming_pb2
+from modules.screenshot_capture.core.types import ScreenshotData, ScreenshotFormat, ScreenshotResult
+
+JPEG = b"\xff\xd8\xff\xe0" + bytes(range(256)) * 200 + b"\xff\xd9"
+
+
+class _FakeStub:
+    requests = []
+
+    def __init__(self, channel):
+        pass
+
+    def StreamAudio(self, request, timeout=None):
+        _FakeStub.requests.append(request)
+
+        async def responses():
+            yield streaming_pb2.StreamResponse(end_message="done")
+        return responses()
+
+
+def _send(**kwargs) -> streaming_pb2.StreamRequest:
+    client = GrpcClient(config={'servers': {}})
+    client.is_connected = lambda: True
+    client._import_proto_modules = lambda: (streaming_pb2, SimpleNamespace(StreamingServiceStub=_FakeStub))
+    _FakeStub.requests.clear()
+
+    async def run():
+        async for _ in client.stream_audio(prompt="hi", screen_info={"width": 1280, "height": 720},
+                                           hardware_id="hw", **kwargs):
+            pass
+    asyncio.run(run())
+    return _FakeStub.requests[-1]
+
+
+def test_bytes_transport_sets_binary_field():
+    request = _send(screenshot_base64="", screenshot_bytes=JPEG, screenshot_mime_type="image/jpeg")
+    assert request.screenshot_data == JPEG
+    assert request.screenshot_mime_type == "image/jpeg"
+    assert not request.HasField("screenshot")
+
+
+def test_legacy_base64_transport_kept():
+    b64 = base64.b64encode(JPEG).decode("ascii")
+    request = _send(screenshot_base64=b64)
+    assert request.screenshot == b64
+    assert not request.HasField("screenshot_data")
+
+
+def test_bytes_transport_is_smaller_on_the_wire():
+    binary = _send(screenshot_base64="", screenshot_bytes=JPEG).SerializeToString()
+    legacy = _send(screenshot_base64=base64.b64encode(JPEG).decode("ascii")).SerializeToString()
+    assert len(legacy) > len(binary) * 1.3
+
+
+def test_screenshot_data_keeps_bytes_and_lazy_base64():
+    data = ScreenshotData(raw_bytes=JPEG, format=ScreenshotFormat.JPEG, width=1280, height=720,
+                          size_bytes=len(JPEG), mime_type="image/jpeg", metadata={})
+    assert data.get_bytes() is JPEG
+    assert data.base64_data is None  # base64 не вычисляется без запроса
+    assert base64.b64decode(data.get_base64()) == JPEG
+    assert ScreenshotResult(success=True, data=data).is_valid()
+
+    legacy = ScreenshotData.from_dict({"data": base64.b64encode(JPEG).decode("ascii"), "mime_type": "image/jpeg"})
+    assert legacy.get_bytes() == JPEG
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Передача скриншота байтами")
+    print("=" * 80)
+    tests = [
+        test_bytes_transport_sets_binary_field,
+        test_legacy_base64_transport_kept,
+        test_bytes_transport_is_smaller_on_the_wire,
+        test_screenshot_data_keeps_bytes_and_lazy_base64,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+Тест потокового распознавания во время записи
+
+Частичные гипотезы должны приходить, пока пользователь говорит, а
+окончательный текст - в пределах десятков миллисекунд после отпускания
+клавиши. Движок - сценарий вместо Vosk.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.speech_recognizer import SpeechRecognizer
+from modules.voice_recognition.core.streaming import StreamingEngine, StreamingRecognitionSession
+from modules.voice_recognition.core.types import RecognitionConfig, RecognitionEventType
+
+SAMPLE_RATE = 16000
+BLOCK = 1024  # 64мс
+
+
+class ScriptedEngine(StreamingEngine):
+    """Гипотезы по сценарию: (мс звука, текст); финализация - finalize_ms"""
+
+    name = "scripted"
+
+    def __init__(self, script, final_text: str, finalize_ms: float = 5.0, fail_after_ms: float = None):
+        self.script = list(script)
+        self.final_text = final_text
+        self.finalize_ms = finalize_ms
+        self.fail_after_ms = fail_after_ms
+        self.heard_ms = 0.0
+        self.sample_rate = None
+        self.cancelled = False
+
+    def start(self, sample_rate, language):
+        self.sample_rate = sample_rate
+
+    def accept(self, pcm):
+        assert pcm.dtype == np.int16 and pcm.ndim == 1
+        self.heard_ms += pcm.shape[0] * 1000.0 / self.sample_rate
+        if self.fail_after_ms is not None and self.heard_ms >= self.fail_after_ms:
+            raise RuntimeError("engine crashed")
+        text = None
+        while self.script and self.script[0][0] <= self.heard_ms:
+            text = self.script.pop(0)[1]
+        return text
+
+    def finish(self):
+        time.sleep(self.finalize_ms / 1000.0)
+        return self.final_text
+
+    def cancel(self):
+        self.cancelled = True
+
+
+SCRIPT = [(200, "open"), (500, "open the"), (900, "open the browser")]
+
+
+def _block():
+    return (np.random.default_rng(0).standard_normal((BLOCK, 1)) * 1000).astype(np.int16)
+
+
+def test_session_partials_during_speech():
+    partials = []
+    engine = ScriptedEngine(SCRIPT, "open the browser please")
+    session = StreamingRecognitionSession(engine, "en-US", on_partial=lambda text: partials.append((text, time.perf_counter())))
+    for _ in range(16):  # ~1с речи
+        session.push(_block(), SAMPLE_RATE)
+        time.sleep(0.004)
+    time.sleep(0.05)
+    released = time.perf_counter()
+    final = session.finish()
+    finalize_ms = (time.perf_counter() - released) * 1000.0
+
+    assert [text for text, _ in partials] == ["open", "open the", "open the browser"]
+    assert all(at < released for _, at in partials)
+    assert final == "open the browser please"
+    assert finalize_ms < 50, f"финализация {finalize_ms:.1f}мс"
+
+
+def test_session_cancel_and_engine_error():
+    engine = ScriptedEngine(SCRIPT, "unused")
+    session = StreamingRecognitionSession(engine, "en-US")
+    session.push(_block(), SAMPLE_RATE)
+    session.cancel()
+    session._thread.join(1.0)
+    assert engine.cancelled and session.final_text is None
+
+    failing = StreamingRecognitionSession(ScriptedEngine(SCRIPT, "unused", fail_after_ms=100), "en-US")
+    for _ in range(4):
+        failing.push(_block(), SAMPLE_RATE)
+    try:
+        failing.finish()
+        assert False, "ошибка движка должна подниматься из finish()"
+    except RuntimeError as e:
+        assert "engine crashed" in str(e)
+
+
+def _recognizer(engine: ScriptedEngine) -> SpeechRecognizer:
+    recognizer = SpeechRecognizer(RecognitionConfig(sample_rate=SAMPLE_RATE, streaming=True))
+    recognizer.streaming_engine_factory = lambda: engine
+    # Без микрофона: кадры подаются прямо в audio callback
+    recognizer._run_listening = lambda: None
+    return recognizer
+
+
+async def _speak(recognizer: SpeechRecognizer, blocks: int = 16):
+    for _ in range(blocks):
+        recognizer._audio_callback(_block(), BLOCK, None, None)
+        await asyncio.sleep(0.004)
+    await asyncio.sleep(0.05)
+
+
+def test_recognizer_streams_partial_events():
+    async def run():
+        recognizer = _recognizer(ScriptedEngine(SCRIPT, "open the browser"))
+        partials = []
+
+        async def on_partial(event):
+            partials.append(event.data["text"])
+
+        recognizer.register_event_callback(RecognitionEventType.PARTIAL_RESULT, on_partial)
+        assert await recognizer.start_listening()
+        await _speak(recognizer)
+        seen_before_release = list(partials)
+        released = time.perf_counter()
+        result = await recognizer.stop_listening()
+        return seen_before_release, result, (time.perf_counter() - released) * 1000.0
+
+    partials, result, release_to_final_ms = asyncio.run(run())
+    assert partials == ["open", "open the", "open the browser"]
+    assert result.text == "open the browser" and not result.error
+    assert release_to_final_ms < 80, f"release -> final {release_to_final_ms:.1f}мс"
+
+
+def test_recognizer_falls_back_to_batch():
+    async def run():
+        recognizer = _recognizer(ScriptedEngine(SCRIPT, "unused", fail_after_ms=100))
+        batch_calls = []
+
+        async def recognize_with_engine(audio_data):
+            batch_calls.append(len(audio_data.frame_data))
+            return "batch text"
+
+        recognizer._recognize_with_engine = recognize_with_engine
+        assert await recognizer.start_listening()
+        await _speak(recognizer, blocks=4)
+        return await recognizer.stop_listening(), batch_calls
+
+    result, batch_calls = asyncio.run(run())
+    # Вся запись ушла пакетному распознаванию
+    assert result.text == "batch text"
+    assert batch_calls == [4 * BLOCK * 2]
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Потоковое распознавание")
+    print("=" * 80)
+    tests = [
+        test_session_partials_during_speech,
+        test_session_cancel_and_engine_error,
+        test_recognizer_streams_partial_events,
+        test_recognizer_falls_back_to_batch,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+Тест потокового resampler (StreamingResampler) в плеере
+
+Чанки сессии пересчитываются одним экземпляром; end_stream дописывает
+хвост фильтра - длительность ответа не теряет задержку фильтра.
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.speech_playback.core.player import SequentialSpeechPlayer, PlayerConfig
+from modules.speech_playback.utils.audio_utils import StreamingResampler, resample_audio
+
+
+def _speech(frames: int) -> np.ndarray:
+    return (np.random.default_rng(0).standard_normal(frames) * 3000).astype(np.int16)
+
+
+def test_flush_completes_output_length():
+    audio = _speech(24000)
+    for src, dst in ((24000, 48000), (16000, 48000), (44100, 48000), (48000, 16000)):
+        resampler = StreamingResampler(src, dst)
+        delay = resampler.output_delay
+        head = np.concatenate([resampler.process(audio[i:i + 1000]) for i in range(0, len(audio), 1000)])
+        tail = resampler.flush()
+        assert len(head) + len(tail) == delay + len(audio) * dst // src, (src, dst)
+        # Без задержки фильтра - то же, что пересчёт записи целиком
+        whole = resample_audio(audio, dst, src)
+        streamed = np.concatenate([head, StreamingResampler._to_dtype(tail[:, 0], np.dtype(np.int16))])
+        assert np.array_equal(streamed[delay:delay + len(whole)], whole)
+
+
+def test_end_stream_writes_resampler_tail():
+    player = SequentialSpeechPlayer(PlayerConfig(auto_device_selection=False, sample_rate=48000))
+    audio = _speech(24000)
+    player.begin_stream('s1')
+    for i in range(0, len(audio), 2400):
+        player.add_audio_data(audio[i:i + 2400], metadata={'sample_rate': 24000, 'session_id': 's1'})
+    delay = player._resampler.output_delay
+    player.end_stream('s1')
+
+    queued = list(player.chunk_buffer._chunk_queue)
+    assert sum(chunk.size for chunk in queued) == delay + 2 * len(audio)
+    assert queued[-1].metadata.get('resampler_tail') and player._resampler is None
+    # Повторный end_stream ничего не дописывает
+    player.end_stream('s1')
+    assert player.chunk_buffer.queue_size == len(queued)
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Потоковый resampler")
+    print("=" * 80)
+    tests = [
+        test_flush_completes_output_length,
+        test_end_stream_writes_resampler_tail,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Тест бэкендов распознавания (core/backends.py)
+
+Распознавание записи не должно блокировать event loop: вызов бэкенда идёт
+в ограниченном пуле потоков с таймаутом и отменой.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import speech_recognition as sr
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.backends import (
+    GoogleRecognitionBackend, RecognitionBackendExecutor, StubRecognitionBackend, create_recognition_backend,
+)
+from modules.voice_recognition.core.speech_recognizer import SpeechRecognizer
+from modules.voice_recognition.core.types import RecognitionConfig, RecognitionState
+
+SAMPLE_RATE = 16000
+
+
+def _audio(seconds: float = 0.5) -> sr.AudioData:
+    return sr.AudioData(np.zeros(int(SAMPLE_RATE * seconds), dtype=np.int16).tobytes(), SAMPLE_RATE, 2)
+
+
+async def _ticks_while(awaitable):
+    """Сколько раз event loop успел проснуться (шаг 10мс), пока ждём awaitable"""
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    try:
+        result = await awaitable
+    finally:
+        task.cancel()
+    return result, ticks
+
+
+def test_executor_does_not_block_loop():
+    backend = StubRecognitionBackend(text="open the browser", delay=0.3)
+    executor = RecognitionBackendExecutor(backend, max_workers=2, timeout=2.0)
+
+    async def run():
+        return await _ticks_while(executor.recognize(_audio(), "en-US"))
+
+    text, ticks = asyncio.run(run())
+    executor.close()
+    assert text == "open the browser"
+    assert ticks >= 20, f"loop проснулся {ticks} раз за 300мс"
+    assert executor.in_flight == 0
+
+
+def test_timeout_cancels_running_call():
+    backend = StubRecognitionBackend(delay=5.0)
+    executor = RecognitionBackendExecutor(backend, max_workers=1, timeout=0.1)
+
+    async def run():
+        started = time.perf_counter()
+        try:
+            await executor.recognize(_audio(), "en-US")
+            return None
+        except asyncio.TimeoutError:
+            return (time.perf_counter() - started) * 1000.0
+
+    elapsed_ms = asyncio.run(run())
+    assert elapsed_ms is not None and elapsed_ms < 500
+    # Рабочий поток получил cancel и освободился, не дожидаясь 5с
+    deadline = time.perf_counter() + 1.0
+    while backend.cancelled == 0 and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    assert backend.cancelled == 1
+    executor.close()
+
+
+def test_bounded_pool_and_cancellation():
+    backend = StubRecognitionBackend(delay=0.2)
+    executor = RecognitionBackendExecutor(backend, max_workers=1, timeout=2.0)
+
+    async def run():
+        first = asyncio.create_task(executor.recognize(_audio(), "en-US"))
+        queued = asyncio.create_task(executor.recognize(_audio(), "en-US"))
+        await asyncio.sleep(0.05)
+        in_flight = executor.in_flight
+        queued.cancel()
+        results = await asyncio.gather(first, queued, return_exceptions=True)
+        return in_flight, results
+
+    in_flight, (first, queued) = asyncio.run(run())
+    executor.close()
+    assert in_flight == 2
+    assert first == "hello nexy"
+    assert isinstance(queued, asyncio.CancelledError)
+    # Второй вызов снят с очереди пула и до бэкенда не дошёл
+    assert len(backend.calls) == 1
+
+
+def test_backend_selection_falls_back_to_google():
+    assert isinstance(create_recognition_backend(RecognitionConfig(backend="stub")), StubRecognitionBackend)
+    assert isinstance(create_recognition_backend(RecognitionConfig(backend="nope")), GoogleRecognitionBackend)
+    # Vosk без модели недоступен
+    assert isinstance(create_recognition_backend(RecognitionConfig(backend="vosk")), GoogleRecognitionBackend)
+
+
+def _recognizer(backend: StubRecognitionBackend, timeout: float = 2.0) -> SpeechRecognizer:
+    recognizer = SpeechRecognizer(RecognitionConfig(sample_rate=SAMPLE_RATE, backend="stub", backend_timeout=timeout))
+    recognizer.backend_executor = RecognitionBackendExecutor(backend, max_workers=1, timeout=timeout)
+    # Без микрофона: кадры подаются прямо в audio callback
+    recognizer._run_listening = lambda: None
+    return recognizer
+
+
+async def _record(recognizer: SpeechRecognizer):
+    assert await recognizer.start_listening()
+    for _ in range(4):
+        recognizer._audio_callback(np.full((1024, 1), 500, dtype=np.int16), 1024, None, None)
+
+
+def test_speech_recognizer_uses_backend():
+    async def run():
+        ok = _recognizer(StubRecognitionBackend(text="what time is it", delay=0.2))
+        await _record(ok)
+        result, ticks = await _ticks_while(ok.stop_listening())
+
+        slow = _recognizer(StubRecognitionBackend(delay=5.0), timeout=0.1)
+        await _record(slow)
+        timed_out = await slow.stop_listening()
+
+        cancelled = _recognizer(StubRecognitionBackend(delay=5.0))
+        await _record(cancelled)
+        task = asyncio.create_task(cancelled.stop_listening())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+        return result, ticks, timed_out, task.cancelled(), cancelled.state
+
+    result, ticks, timed_out, was_cancelled, state_after_cancel = asyncio.run(run())
+    assert result.text == "what time is it" and not result.error
+    assert ticks >= 10
+    assert timed_out.text == "" and timed_out.error == "Recognition timeout"
+    assert was_cancelled and state_after_cancel == RecognitionState.IDLE
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Бэкенды распознавания")
+    print("=" * 80)
+    tests = [
+        test_executor_does_not_block_loop,
+        test_timeout_cancels_running_call,
+        test_bounded_pool_and_cancellation,
+        test_backend_selection_falls_back_to_google,
+        test_speech_recognizer_uses_backend,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,162 @@
+"""
+Тест VAD (VoiceActivityDetector) и векторных detect_silence/trim_silence
+
+Детектор одинаково работает на всей записи и блоками audio callback,
+SpeechRecognizer публикует переходы речь/тишина и не отправляет тишину
+в начале и конце записи.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.backends import RecognitionBackendExecutor, StubRecognitionBackend
+from modules.voice_recognition.core.speech_recognizer import SpeechRecognizer
+from modules.voice_recognition.core.types import RecognitionConfig, RecognitionEventType
+from modules.voice_recognition.core.vad import VoiceActivityDetector
+from modules.voice_recognition.utils.audio_utils import detect_silence, trim_silence
+
+SAMPLE_RATE = 16000
+
+
+def _recording(segments, seed: int = 0) -> np.ndarray:
+    """Запись из сегментов (секунды, вид): silence - шум -60 dBFS, voiced - тон, fricative - тихий шум"""
+    rng = np.random.default_rng(seed)
+    parts = []
+    for seconds, kind in segments:
+        n = int(seconds * SAMPLE_RATE)
+        part = rng.standard_normal(n) * 30
+        if kind == "voiced":
+            part += np.sin(2 * np.pi * 180 * np.arange(n) / SAMPLE_RATE) * 6000
+        elif kind == "fricative":
+            # Ниже порога энергии, но с высоким ZCR
+            part += rng.standard_normal(n) * 250
+        parts.append(part)
+    return np.concatenate(parts).astype(np.int16)
+
+
+def test_vectorized_silence_utils_match_loop():
+    rng = np.random.default_rng(2)
+    audio = (rng.standard_normal(20000) * np.repeat(rng.random(50) > 0.5, 400) * 0.1).astype(np.float32)
+
+    expected, in_silence, start = [], False, 0
+    for i, silent in enumerate(np.abs(audio) < 0.01):
+        if silent and not in_silence:
+            start, in_silence = i, True
+        elif not silent and in_silence:
+            expected.append((start, i))
+            in_silence = False
+    if in_silence:
+        expected.append((start, len(audio)))
+
+    assert detect_silence(audio) == expected
+    trimmed = trim_silence(audio)
+    loud = np.flatnonzero(np.abs(audio) >= 0.01)
+    assert np.array_equal(trimmed, audio[loud[0]:loud[-1] + 1])
+    assert np.shares_memory(trimmed, audio)
+    assert trim_silence(np.zeros(100, dtype=np.float32)).shape[0] == 0
+
+
+def test_speech_bounds_hangover_and_fricatives():
+    vad = VoiceActivityDetector(SAMPLE_RATE, hangover_ms=300, padding_ms=200)
+    audio = _recording([(1.0, "silence"), (0.5, "voiced"), (0.2, "silence"), (0.3, "fricative"),
+                        (1.5, "silence")])
+    start, end = vad.speech_bounds(audio)
+    # Речь 1.0..2.0с: запас 200мс до, hangover 300мс + запас 200мс после
+    assert abs(start / SAMPLE_RATE - 0.8) < 0.03
+    assert abs(end / SAMPLE_RATE - 2.5) < 0.05
+    # Пауза 200мс внутри фразы закрыта hangover - один сегмент речи
+    flags = vad.frame_flags(audio)
+    assert np.count_nonzero(np.diff(flags.astype(np.int8))) == 2
+    assert np.shares_memory(vad.trim(audio), audio)
+
+    # Щелчок короче min_speech_ms и тишина - не речь
+    click = _recording([(1.0, "silence")])
+    click[8000:8200] = 12000
+    assert vad.speech_bounds(click) is None
+    assert vad.trim(click) is click
+
+
+def test_streaming_matches_offline():
+    rng = np.random.default_rng(3)
+    for trial in range(20):
+        audio = _recording([(float(rng.uniform(0.1, 1.0)), kind)
+                            for kind in rng.choice(["silence", "voiced", "fricative"], size=6)], seed=trial)
+        vad = VoiceActivityDetector(SAMPLE_RATE, min_speech_ms=int(rng.choice([20, 60, 100])),
+                                    hangover_ms=int(rng.choice([0, 100, 300])))
+        flags = vad.frame_flags(audio)
+        changes = np.flatnonzero(np.diff(np.concatenate(([False], flags)).astype(np.int8)))
+        expected = [(bool(flags[i]), int(i) * vad.frame_len) for i in changes]
+
+        vad.reset()
+        events, offset = [], 0
+        while offset < audio.shape[0]:
+            size = int(rng.integers(1, 3000))
+            events += vad.process(audio[offset:offset + size].reshape(-1, 1))
+            offset += size
+        assert events == expected, trial
+        assert vad.stream_bounds(audio.shape[0]) == vad.speech_bounds(audio)
+
+
+def test_recognizer_emits_activity_and_trims():
+    audio = _recording([(1.0, "silence"), (1.0, "voiced"), (1.5, "silence")])
+
+    async def run():
+        backend = StubRecognitionBackend(text="ok")
+        recognizer = SpeechRecognizer(RecognitionConfig(sample_rate=SAMPLE_RATE, backend="stub"))
+        recognizer.backend_executor = RecognitionBackendExecutor(backend)
+        recognizer._run_listening = lambda: None
+        events = []
+
+        async def on_activity(event):
+            events.append((event.data["speech"], event.data["offset_ms"]))
+
+        recognizer.register_event_callback(RecognitionEventType.VOICE_ACTIVITY, on_activity)
+        assert await recognizer.start_listening()
+        for offset in range(0, audio.shape[0], 1024):
+            block = audio[offset:offset + 1024].reshape(-1, 1)
+            recognizer._audio_callback(block, block.shape[0], None, None)
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        result = await recognizer.stop_listening()
+        return events, result, backend.calls
+
+    events, result, calls = asyncio.run(run())
+    assert result.text == "ok"
+    assert [speech for speech, _ in events] == [True, False]
+    assert abs(events[0][1] - 1040) < 30 and abs(events[1][1] - 2300) < 60
+    # Бэкенду ушла речь с запасом, а не 3.5с записи
+    sent_sec = calls[0] / 2 / SAMPLE_RATE
+    assert 1.4 < sent_sec < 1.8, sent_sec
+
+
+def main():
+    print("=" * 80)
+    print("🧪 VAD")
+    print("=" * 80)
+    tests = [
+        test_vectorized_silence_utils_match_loop,
+        test_speech_bounds_hangover_and_fricatives,
+        test_streaming_matches_offline,
+        test_recognizer_emits_activity_and_trims,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
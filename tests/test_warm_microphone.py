@@ -0,0 +1,209 @@
+"""
+Тест тёплого микрофона (warm_microphone) и PrerollBuffer
+
+Входной поток открыт между записями, audio callback держит последние
+preroll_ms: start_listening не открывает устройство, запись начинается
+со звука до нажатия. Потерянный поток переоткрывается после записи;
+открывающийся тёплый поток не дублируется холодным.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Добавляем пути к модулям (тесты в tests/)
+CLIENT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(CLIENT_ROOT))
+sys.path.insert(0, str(CLIENT_ROOT / "modules"))
+
+from modules.voice_recognition.core.backends import RecognitionBackendExecutor, StubRecognitionBackend
+from modules.voice_recognition.core.capture_buffer import PrerollBuffer
+from modules.voice_recognition.core.speech_recognizer import SOURCE_COLD, SOURCE_WARM, SpeechRecognizer
+from modules.voice_recognition.core.types import RecognitionConfig
+
+SAMPLE_RATE = 16000
+BLOCK = 1024
+
+
+class FakeInputStream:
+    """Запущенный sd.InputStream без устройства"""
+
+    def __init__(self):
+        self.active = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.active = False
+
+
+def _recognizer(open_delay: float = 0.0):
+    """Распознаватель со stub-бэкендом; открытие устройства - FakeInputStream через open_delay"""
+    backend = StubRecognitionBackend(text="ok")
+    recognizer = SpeechRecognizer(RecognitionConfig(
+        sample_rate=SAMPLE_RATE, backend="stub", vad_enabled=False, warm_microphone=True, preroll_ms=300,
+    ))
+    recognizer.backend_executor = RecognitionBackendExecutor(backend)
+    opened = []
+
+    def open_input_stream(source):
+        time.sleep(open_delay)
+        stream = FakeInputStream()
+        opened.append((source, stream))
+        return stream
+
+    recognizer._open_input_stream = open_input_stream
+    return recognizer, backend, opened
+
+
+def _feed(recognizer, values, source=SOURCE_WARM):
+    for value in values:
+        block = np.full((BLOCK, 1), value, dtype=np.int16)
+        recognizer._audio_callback(block, BLOCK, None, None, source=source)
+
+
+def _wait(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return predicate()
+
+
+def test_preroll_keeps_latest_frames_in_order():
+    rng = np.random.default_rng(4)
+    for capacity in (1, 100, 4800):
+        preroll = PrerollBuffer(channels=2, frames=capacity)
+        assert preroll.segments()[0].shape[0] == 0
+        history = np.zeros((0, 2), dtype=np.int16)
+        for _ in range(60):
+            data = rng.integers(-3000, 3000, (int(rng.integers(1, 2 * capacity + 2)), 2)).astype(np.int16)
+            preroll.write(data)
+            history = np.concatenate((history, data))[-capacity:]
+            assert len(preroll) == history.shape[0]
+            assert np.array_equal(np.concatenate(preroll.segments()), history)
+        preroll.clear()
+        assert len(preroll) == 0 and preroll.segments()[0].shape[0] == 0
+
+
+def test_warm_start_prepends_preroll_without_opening_device():
+    async def run():
+        recognizer, backend, opened = _recognizer()
+        assert recognizer.start_warm_microphone()
+        assert _wait(recognizer._warm_stream_active)
+        assert recognizer.preroll.capacity == SAMPLE_RATE * 300 // 1000
+
+        # До нажатия: блоки 1..10, в pre-roll остаются последние 300мс
+        _feed(recognizer, range(1, 11))
+        warm_starts = recognizer._m_warm_starts.value
+        assert await recognizer.start_listening()
+        assert recognizer.listen_thread is None and len(opened) == 1
+        assert recognizer._m_warm_starts.value == warm_starts + 1
+        _feed(recognizer, [100] * 5)
+        result = await recognizer.stop_listening()
+
+        samples = recognizer.capture.mono()
+        recognizer.stop_warm_microphone()
+        assert _wait(lambda: not recognizer._warm_thread.is_alive())
+        return recognizer, result, samples, backend.calls
+
+    recognizer, result, samples, calls = asyncio.run(run())
+    assert result.text == "ok"
+    expected = np.concatenate((np.repeat(np.arange(1, 11), BLOCK)[-4800:], np.full(5 * BLOCK, 100)))
+    assert np.array_equal(samples, expected)
+    assert calls == [expected.shape[0] * 2]
+    assert recognizer._warm_stream is None and not recognizer.get_status()["warm_microphone"]
+
+
+def test_listen_start_latency_and_reopen_after_lost_stream():
+    async def run():
+        recognizer, _, opened = _recognizer(open_delay=0.05)
+        histogram = recognizer._m_listen_start
+
+        # Холодный старт: устройство открывается в потоке записи
+        recognizer.config.warm_microphone = False
+        count = histogram.count
+        assert await recognizer.start_listening()
+        assert recognizer.listen_thread is not None
+        assert await asyncio.get_running_loop().run_in_executor(None, _wait, lambda: histogram.count == count + 1)
+        cold_ms = histogram.max_value
+        await recognizer.stop_listening()
+
+        # Тёплый старт: без открытия устройства
+        recognizer.config.warm_microphone = True
+        recognizer.start_warm_microphone()
+        assert _wait(recognizer._warm_stream_active)
+        histogram.reset()
+        assert await recognizer.start_listening()
+        warm_ms = histogram.max_value
+        await recognizer.stop_listening()
+
+        # Поток потерян: запись холодная, после неё поток переоткрывается
+        opened[-1][1].active = False
+        assert _wait(lambda: not recognizer._warm_thread.is_alive())
+        cold_starts = recognizer._m_cold_starts.value
+        assert await recognizer.start_listening()
+        assert recognizer._m_cold_starts.value == cold_starts + 1
+        await recognizer.stop_listening()
+        assert _wait(recognizer._warm_stream_active)
+        recognizer.stop_warm_microphone()
+        return cold_ms, warm_ms, len(opened)
+
+    cold_ms, warm_ms, opens = asyncio.run(run())
+    assert cold_ms >= 50 and warm_ms < 5, (cold_ms, warm_ms)
+    # Холодная, тёплый поток, холодная после потери, переоткрытый тёплый
+    assert opens == 4
+
+
+def test_listen_while_warm_stream_opens_uses_single_stream():
+    async def run():
+        recognizer, _, opened = _recognizer(open_delay=0.1)
+        # Long press открывает тёплый поток, recording_start приходит раньше, чем он открыт
+        assert recognizer.start_warm_microphone()
+        assert await recognizer.start_listening()
+        assert recognizer.listen_thread is None and recognizer._warm_stream_active()
+
+        # Блоки чужого потока в запись не попадают
+        _feed(recognizer, [7] * 3, source=SOURCE_COLD)
+        _feed(recognizer, [100] * 4)
+        await recognizer.stop_listening()
+        samples = recognizer.capture.mono()
+
+        # Между записями pre-roll пишет только тёплый поток
+        _feed(recognizer, [9], source=SOURCE_COLD)
+        preroll = len(recognizer.preroll)
+        recognizer.stop_warm_microphone()
+        return [source for source, _ in opened], samples, preroll
+
+    sources, samples, preroll = asyncio.run(run())
+    assert sources == [SOURCE_WARM]
+    assert np.array_equal(samples, np.full(4 * BLOCK, 100))
+    assert preroll == 0
+
+
+def main():
+    print("=" * 80)
+    print("🧪 Тёплый микрофон и pre-roll")
+    print("=" * 80)
+    tests = [
+        test_preroll_keeps_latest_frames_in_order,
+        test_warm_start_prepends_preroll_without_opening_device,
+        test_listen_start_latency_and_reopen_after_lost_stream,
+        test_listen_while_warm_stream_opens_uses_single_stream,
+    ]
+    failed = 0
+    for test in tests:
+        try:
+            test()
+            print(f"✅ {test.__name__}")
+        except AssertionError as e:
+            failed += 1
+            print(f"❌ {test.__name__}: {e}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())